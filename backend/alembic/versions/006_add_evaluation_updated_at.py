@@ -0,0 +1,31 @@
+"""add evaluation_updated_at to query_logs
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Track when evaluation_status last changed so the sweeper can detect stuck rows
+    op.add_column(
+        'query_logs',
+        sa.Column('evaluation_updated_at', sa.TIMESTAMP(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    # Drop column
+    op.drop_column('query_logs', 'evaluation_updated_at')
@@ -0,0 +1,36 @@
+"""add heuristic scores and score_source to query_logs
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Provisional zero-LLM scores computed at log time
+    op.add_column('query_logs', sa.Column('heuristic_faithfulness_score', sa.DECIMAL(precision=3, scale=2), nullable=True))
+    op.add_column('query_logs', sa.Column('heuristic_answer_relevance_score', sa.DECIMAL(precision=3, scale=2), nullable=True))
+    op.add_column('query_logs', sa.Column('heuristic_context_utilization_score', sa.DECIMAL(precision=3, scale=2), nullable=True))
+
+    # Which tier filled the main score columns: 'ragas' or 'heuristic'
+    op.add_column('query_logs', sa.Column('score_source', sa.String(20), nullable=True))
+
+
+def downgrade() -> None:
+    # Drop columns
+    op.drop_column('query_logs', 'score_source')
+    op.drop_column('query_logs', 'heuristic_context_utilization_score')
+    op.drop_column('query_logs', 'heuristic_answer_relevance_score')
+    op.drop_column('query_logs', 'heuristic_faithfulness_score')
@@ -0,0 +1,28 @@
+"""index query_logs.evaluation_updated_at
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # MAX(evaluation_updated_at) is part of the analysis report ETag; keep it an index lookup
+    op.create_index('idx_query_logs_evaluation_updated_at', 'query_logs', ['evaluation_updated_at'])
+
+
+def downgrade() -> None:
+    # Drop index
+    op.drop_index('idx_query_logs_evaluation_updated_at', table_name='query_logs')
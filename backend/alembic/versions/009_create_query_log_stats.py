@@ -0,0 +1,46 @@
+"""create query_log_stats table
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '009'
+down_revision: Union[str, None] = '008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNT_COLUMNS = (
+    'query_count', 'faithfulness_count', 'answer_relevance_count', 'context_precision_count',
+    'complete_count', 'weak_count', 'weak_low_faithfulness', 'weak_low_answer_relevance',
+    'weak_low_context_precision', 'weak_salary', 'weak_short',
+)
+SUM_COLUMNS = (
+    'faithfulness_sum', 'answer_relevance_sum', 'context_precision_sum',
+    'complete_faithfulness_sum', 'complete_answer_relevance_sum', 'complete_context_precision_sum',
+)
+
+
+def upgrade() -> None:
+    # Running report aggregates per day and query type (see app/services/stats_service.py)
+    op.create_table(
+        'query_log_stats',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('query_type', sa.String(20), nullable=False),
+        *(sa.Column(name, sa.Integer(), server_default=sa.text('0'), nullable=False) for name in COUNT_COLUMNS),
+        *(sa.Column(name, sa.NUMERIC(14, 2), server_default=sa.text('0'), nullable=False) for name in SUM_COLUMNS),
+        sa.PrimaryKeyConstraint('day', 'query_type')
+    )
+    # Existing history is loaded by `python -m app.db.rebuild_stats --if-empty` (run after migrations)
+
+
+def downgrade() -> None:
+    # Drop table
+    op.drop_table('query_log_stats')
@@ -0,0 +1,37 @@
+"""add query_type and sql_fingerprint to query_logs
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '010'
+down_revision: Union[str, None] = '009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Filled in at log time (see app/services/query_classifier.py); nullable until backfilled
+    op.add_column('query_logs', sa.Column('query_type', sa.String(20), nullable=True))
+    op.add_column('query_logs', sa.Column('sql_fingerprint', sa.String(16), nullable=True))
+
+    # Per-type breakdowns and repeated-query counts are GROUP BYs on these
+    op.create_index('idx_query_logs_query_type', 'query_logs', ['query_type'])
+    op.create_index('idx_query_logs_sql_fingerprint', 'query_logs', ['sql_fingerprint'])
+    # Existing rows are filled in by `python -m app.db.backfill_query_types` (run after migrations)
+
+
+def downgrade() -> None:
+    # Drop indexes and columns
+    op.drop_index('idx_query_logs_sql_fingerprint', table_name='query_logs')
+    op.drop_index('idx_query_logs_query_type', table_name='query_logs')
+    op.drop_column('query_logs', 'sql_fingerprint')
+    op.drop_column('query_logs', 'query_type')
@@ -0,0 +1,32 @@
+"""add per-stage timings to query_logs
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '011'
+down_revision: Union[str, None] = '010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STAGE_COLUMNS = ('llm_time_ms', 'validation_time_ms', 'db_time_ms')
+
+
+def upgrade() -> None:
+    # Breakdown of execution_time_ms by stage (NULL for rows logged before this)
+    for name in STAGE_COLUMNS:
+        op.add_column('query_logs', sa.Column(name, sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    # Drop columns
+    for name in reversed(STAGE_COLUMNS):
+        op.drop_column('query_logs', name)
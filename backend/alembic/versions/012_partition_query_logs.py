@@ -0,0 +1,100 @@
+"""partition query_logs by month
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '012'
+down_revision: Union[str, None] = '011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partitions created ahead of the current month (app.services.partition_service keeps this up)
+MONTHS_AHEAD = 3
+
+# (name, columns, method) recreated on the partitioned table
+INDEXES = (
+    ('idx_created_at', 'created_at DESC', 'btree'),
+    ('idx_faithfulness', 'faithfulness_score', 'btree'),
+    ('idx_evaluation_status', 'evaluation_status', 'btree'),
+    ('idx_query_logs_evaluation_updated_at', 'evaluation_updated_at', 'btree'),
+    ('idx_query_logs_query_type', 'query_type', 'btree'),
+    ('idx_query_logs_sql_fingerprint', 'sql_fingerprint', 'btree'),
+)
+
+
+def _create_indexes():
+    for name, columns, method in INDEXES:
+        op.execute(f"CREATE INDEX {name} ON query_logs USING {method} ({columns})")
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE query_logs RENAME TO query_logs_unpartitioned")
+    op.execute("ALTER TABLE query_logs_unpartitioned RENAME CONSTRAINT query_logs_pkey TO query_logs_unpartitioned_pkey")
+
+    # Same columns, defaults (including the id sequence) and checks, partitioned by created_at.
+    # The primary key must contain the partition key; ids stay unique through the sequence.
+    op.execute("""
+        CREATE TABLE query_logs (
+            LIKE query_logs_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+
+    # Monthly partitions from the oldest row through MONTHS_AHEAD months from now
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month date;
+        BEGIN
+            FOR month IN
+                SELECT generate_series(
+                    date_trunc('month', COALESCE((SELECT MIN(created_at) FROM query_logs_unpartitioned),
+                                                 LOCALTIMESTAMP)),
+                    date_trunc('month', LOCALTIMESTAMP) + interval '{MONTHS_AHEAD} months',
+                    interval '1 month'
+                )::date
+            LOOP
+                EXECUTE format('CREATE TABLE %I PARTITION OF query_logs FOR VALUES FROM (%L) TO (%L)',
+                               'query_logs_' || to_char(month, 'YYYY_MM'), month, (month + interval '1 month')::date);
+            END LOOP;
+        END $$;
+    """)
+    # Catches rows outside the monthly partitions if maintenance falls behind
+    op.execute("CREATE TABLE query_logs_default PARTITION OF query_logs DEFAULT")
+
+    op.execute("INSERT INTO query_logs SELECT * FROM query_logs_unpartitioned")
+    op.execute("ALTER SEQUENCE query_logs_id_seq OWNED BY query_logs.id")
+    op.execute("DROP TABLE query_logs_unpartitioned")
+
+    # Indexes are built per partition after the copy. Each partition's primary key
+    # (id leading) keeps lookups by id to one index probe per partition.
+    _create_indexes()
+    # Block-range index for time-window scans (reports, latency, archive): a few pages per partition
+    op.execute("CREATE INDEX idx_query_logs_created_at_brin ON query_logs USING brin (created_at)")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE query_logs RENAME TO query_logs_partitioned")
+    op.execute("ALTER TABLE query_logs_partitioned RENAME CONSTRAINT query_logs_pkey TO query_logs_partitioned_pkey")
+    # Indexes are recreated under their names on the plain table
+    for name, _, _ in INDEXES:
+        op.execute(f"DROP INDEX {name}")
+    op.execute("DROP INDEX idx_query_logs_created_at_brin")
+    op.execute("""
+        CREATE TABLE query_logs (
+            LIKE query_logs_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+            PRIMARY KEY (id)
+        )
+    """)
+    op.execute("INSERT INTO query_logs SELECT * FROM query_logs_partitioned")
+    op.execute("ALTER SEQUENCE query_logs_id_seq OWNED BY query_logs.id")
+    op.execute("DROP TABLE query_logs_partitioned")
+    _create_indexes()
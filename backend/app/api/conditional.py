@@ -0,0 +1,34 @@
+"""Helpers for conditional GET (ETag / If-None-Match) responses."""
+
+import json
+import hashlib
+from fastapi import Request, Response
+
+
+def compute_etag(*parts) -> str:
+    """
+    Build a strong ETag from JSON-serializable parts.
+
+    Returns:
+        Quoted ETag value, e.g. '"3f2a..."'
+    """
+    digest = hashlib.sha1(
+        json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str).encode()
+    ).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match covers etag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [value.strip().removeprefix("W/") for value in if_none_match.split(",")]
+    return etag in candidates
+
+
+def not_modified(etag: str, headers: dict | None = None) -> Response:
+    """Build an empty 304 response carrying the current ETag."""
+    return Response(status_code=304, headers={"ETag": etag, **(headers or {})})
@@ -3,6 +3,9 @@
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any
 
+# Maximum query log IDs per bulk status request
+MAX_STATUS_IDS = 100
+
 
 class QueryRequest(BaseModel):
     """Request model for natural language query endpoint."""
@@ -28,6 +31,19 @@ class QueryResponse(BaseModel):
     query_log_id: int | None = None  # ID for polling RAGAS scores
     evaluation_status: str | None = None  # 'pending', 'evaluating', 'completed', 'failed'
     ragas_scores: Dict[str, float] | None = None  # Ragas evaluation scores (populated after async evaluation)
+    provisional_scores: Dict[str, float] | None = None  # Instant heuristic scores (no LLM), available at response time
+    timings: Dict[str, int] | None = None  # Milliseconds per stage, also sent as the Server-Timing header
+
+
+class QueryStatusRequest(BaseModel):
+    """Request model for bulk evaluation status lookup."""
+
+    ids: List[int] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_STATUS_IDS,
+        description="Query log IDs"
+    )
 
 
 class HealthResponse(BaseModel):
@@ -36,5 +52,6 @@ class HealthResponse(BaseModel):
     status: str  # 'healthy' or 'unhealthy'
     database: str  # 'connected' or 'disconnected'
     timestamp: str
+    checked_at: str | None = None  # When the database was last probed
     pool_status: Dict[str, Any] | None = None
     error: str | None = None
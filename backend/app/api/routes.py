@@ -1,40 +1,75 @@
 """API route handlers for query and health endpoints."""
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Request, Response, Query
+from fastapi.responses import StreamingResponse, JSONResponse, FileResponse
+import os
+import json
 import asyncio
 from datetime import datetime, timezone
-from app.api.models import QueryRequest, QueryResponse, HealthResponse
-from app.db.session import get_db_session, get_pool_status
-from app.db.models import QueryLog
+from typing import List, Optional
+import structlog
+
+from app.api.models import QueryRequest, QueryResponse, HealthResponse, QueryStatusRequest, MAX_STATUS_IDS
+from app.api.conditional import compute_etag, etag_matches, not_modified
 from app.services.query_service import execute_query
-from app.services import report_service, ragas_service
+from app.services import report_cache, report_service, ragas_service, status_service, evaluation_events, query_log_service, latency_service, health_service, metrics, profiling
+
+logger = structlog.get_logger()
 
 router = APIRouter()
 
+# Polling interval suggested to clients while an evaluation is pending/evaluating
+STATUS_RETRY_AFTER_SECONDS = int(os.getenv("STATUS_RETRY_AFTER_SECONDS", "2"))
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+SSE_MAX_STREAM_SECONDS = float(os.getenv("SSE_MAX_STREAM_SECONDS", "180"))
+
+
+def _server_timing(timings: dict, total_ms: int) -> str:
+    """Format stage timings as a Server-Timing header value (shown in browser devtools)."""
+    entries = [f"{stage};dur={ms}" for stage, ms in timings.items()]
+    return ", ".join([*entries, f"total;dur={total_ms}"])
+
 
 @router.post("/api/query", response_model=QueryResponse)
-async def query(request: QueryRequest, background_tasks: BackgroundTasks):
+async def query(request: QueryRequest, background_tasks: BackgroundTasks, http_response: Response,
+                http_request: Request):
     """
     Process natural language query and return structured results.
 
     Returns results immediately with evaluation_status='pending'.
     RAGAS evaluation runs in background task, updating query_log asynchronously.
-    Use GET /api/query/{query_log_id} to poll for updated scores.
+    Use GET /api/query/{query_log_id}/events to stream updated scores
+    (or GET /api/query/{query_log_id} to poll).
 
     Multi-layered security validation:
     1. Input sanitization (remove comments, semicolons)
     2. LLM SQL generation
     3. SQL validation (sqlparse, whitelist SELECT)
     4. Database execution with timeout (3s)
+
+    Per-stage durations are returned in `timings` and the Server-Timing header.
+    Requests can be profiled on demand (see app.services.profiling).
     """
+    if profiling.ENABLED and profiling.should_profile(http_request.headers):
+        with profiling.profile(http_request.state.request_id):
+            return await _run_query(request, background_tasks, http_response)
+    return await _run_query(request, background_tasks, http_response)
+
+
+async def _run_query(request: QueryRequest, background_tasks: BackgroundTasks, http_response: Response):
+    """Execute the query under the 3s deadline and queue its RAGAS evaluation."""
     try:
         # Apply 3s timeout for query processing (RAGAS runs separately in background)
         async with asyncio.timeout(3):
             # Execute query through query service
             response = await execute_query(request.query)
+            metrics.record_query(response.execution_time_ms, None if response.success else response.error_type)
+            if response.timings is not None:
+                http_response.headers["Server-Timing"] = _server_timing(response.timings, response.execution_time_ms)
 
             # Queue RAGAS evaluation as background task if query succeeded
-            if response.success and response.query_log_id:
+            # ('completed' means the heuristic tier already produced final scores)
+            if response.success and response.query_log_id and response.evaluation_status == 'pending':
                 background_tasks.add_task(
                     ragas_service.evaluate_and_update_async,
                     response.query_log_id,
@@ -46,6 +81,7 @@ async def query(request: QueryRequest, background_tasks: BackgroundTasks):
             return response
 
     except asyncio.TimeoutError:
+        metrics.record_query(3000, "TIMEOUT")
         raise HTTPException(
             status_code=500,
             detail="Request timeout"
@@ -53,10 +89,17 @@ async def query(request: QueryRequest, background_tasks: BackgroundTasks):
 
 
 @router.get("/api/reports/analysis")
-async def get_analysis():
+async def get_analysis(request: Request):
     """
     Generate comparative analysis report with weak query identification and recommendations.
 
+    Served from report_cache: a cached copy is reused for
+    REPORT_CACHE_TTL_SECONDS or until an evaluation completes, and refreshed
+    in the background while the stale copy keeps being served.
+
+    Supports If-None-Match: the ETag is derived from the cached report's
+    version (see report_service.get_report_version).
+
     Returns:
         Dictionary with:
         - total_queries: Total number of queries logged
@@ -65,90 +108,333 @@ async def get_analysis():
         - recommendations: Actionable improvement suggestions
     """
     try:
-        report = report_service.get_analysis_report()
-        return report
+        report, version = await report_cache.get_report()
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to generate analysis report: {str(e)}"
         )
 
+    # Without a version the report is served without conditional support
+    etag = compute_etag("analysis", version) if version is not None else None
+    if etag and etag_matches(request, etag):
+        return not_modified(etag)
 
-@router.get("/api/health", response_model=HealthResponse)
-async def health():
+    return JSONResponse(content=report, headers={"ETag": etag} if etag else None)
+
+
+@router.get("/api/reports/top-queries")
+async def get_top_queries(limit: int = Query(report_service.TOP_QUERY_LIMIT, ge=1, le=100)):
     """
-    Health check endpoint that verifies API and database connectivity.
+    List the most frequently repeated SQL shapes (grouped by sql_fingerprint).
 
     Returns:
-        HealthResponse with status, database connection state, pool status, and timestamp.
-        Returns 200 if healthy, 503 if unhealthy.
+        Dictionary with top_queries: fingerprint, query_type, count, last_seen,
+        example_query and example_sql per shape
     """
     try:
-        # Test database connection
-        from sqlalchemy import text
-        db = get_db_session()
-        db.execute(text("SELECT 1"))
-        db.close()
-
-        pool_status = get_pool_status()
-
-        return HealthResponse(
-            status="healthy",
-            database="connected",
-            timestamp=datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
-            pool_status=pool_status
+        top_queries = await asyncio.to_thread(report_service.get_top_repeated_queries, limit)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to load top queries: {str(e)}"
         )
 
+    return {"top_queries": top_queries}
+
+
+@router.get("/api/reports/baseline")
+async def get_historical_baseline(since: Optional[datetime] = None, until: Optional[datetime] = None):
+    """
+    Score baseline of archived query logs (computed from the Parquet archive).
+
+    Returns:
+        Dictionary with total_queries, evaluated, average_scores and zero_faithfulness
+    """
+    try:
+        return await asyncio.to_thread(report_service.get_historical_baseline, since, until)
     except Exception as e:
-        return HealthResponse(
-            status="unhealthy",
-            database="disconnected",
-            timestamp=datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
-            error=str(e)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to compute archive baseline: {str(e)}"
         )
 
 
+@router.get("/api/reports/latency")
+async def get_latency(days: int = Query(latency_service.DEFAULT_WINDOW_DAYS, ge=1, le=latency_service.MAX_WINDOW_DAYS)):
+    """
+    Latency percentiles (p50/p90/p99) overall, per query type and per day.
+
+    Each entry breaks total execution time down into LLM, validation and
+    database stages, so a regression can be attributed to OpenAI or Postgres.
+
+    Returns:
+        Dictionary with window_days, overall, by_query_type and by_day
+    """
+    try:
+        return await asyncio.to_thread(latency_service.get_latency_report, days)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to generate latency report: {str(e)}"
+        )
+
+
+@router.get("/api/query-logs")
+async def list_query_logs(
+    since: Optional[datetime] = Query(None, description="Only logs created at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only logs created before this time"),
+    status: Optional[List[str]] = Query(None, description="Evaluation status (repeatable)"),
+    min_faithfulness: Optional[float] = Query(None, ge=0, le=1),
+    max_faithfulness: Optional[float] = Query(None, ge=0, le=1),
+    min_answer_relevance: Optional[float] = Query(None, ge=0, le=1),
+    max_answer_relevance: Optional[float] = Query(None, ge=0, le=1),
+    min_context_precision: Optional[float] = Query(None, ge=0, le=1),
+    max_context_precision: Optional[float] = Query(None, ge=0, le=1),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(query_log_service.DEFAULT_PAGE_SIZE, ge=1, le=query_log_service.MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return (id and created_at always included)")
+):
+    """
+    Browse query history newest first with keyset pagination on (created_at, id).
+
+    Returns:
+        - items: Query logs with the requested fields
+        - next_cursor: Pass as cursor to get the next page (None on the last page)
+    """
+    bounds = {
+        "faithfulness": (min_faithfulness, max_faithfulness),
+        "answer_relevance": (min_answer_relevance, max_answer_relevance),
+        "context_precision": (min_context_precision, max_context_precision),
+    }
+    score_range = {name: bound for name, bound in bounds.items() if bound != (None, None)}
+    field_names = [name.strip() for name in fields.split(",") if name.strip()] if fields else None
+
+    try:
+        return await asyncio.to_thread(
+            query_log_service.list_query_logs, since=since, until=until, statuses=status,
+            score_range=score_range, cursor=cursor, limit=limit, fields=field_names
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to list query logs: {str(e)}"
+        )
+
+
+@router.get("/api/health", response_model=HealthResponse)
+async def health(deep: bool = False):
+    """
+    Health check endpoint that reports API and database connectivity.
+
+    By default the database state comes from the background prober (see
+    health_service) and is returned without touching the pool; ?deep=1
+    checks the database now, with a short timeout.
+
+    Returns:
+        HealthResponse with status, database connection state, pool status,
+        timestamp and when the database was last checked.
+    """
+    return HealthResponse(**await health_service.get_health(deep=deep))
+
+
+@router.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """
+    Prometheus scrape endpoint.
+
+    Exposes per-stage latency histograms, query error counters by type, and
+    gauges for pool checkouts and in-flight evaluations (see app.services.metrics).
+    """
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
+
+
+@router.get("/api/profiles/{request_id}", include_in_schema=False)
+async def download_profile(request_id: str, request: Request):
+    """
+    Download the cProfile profile of a profiled /api/query request (pstats format).
+
+    Requires the X-Profile-Token admin header. request_id is the X-Request-ID
+    returned with the profiled response.
+    """
+    if not profiling.is_admin(request.headers.get(profiling.PROFILE_HEADER)):
+        raise HTTPException(status_code=403, detail="Profile access requires a valid admin token")
+
+    path = profiling.profile_path(request_id)
+    if path is None or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail=f"No profile for request {request_id}")
+    return FileResponse(path, media_type="application/octet-stream", filename=os.path.basename(path))
+
+
+async def _bulk_status_response(request: Request, query_log_ids: list, conditional: bool):
+    """Resolve many statuses in one query and answer with an ETag (304 if unchanged)."""
+    try:
+        statuses = await asyncio.to_thread(status_service.get_statuses, query_log_ids)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to retrieve query statuses: {str(e)}"
+        )
+
+    etag = compute_etag(statuses)
+    headers = _retry_after_headers(statuses)
+    if conditional and etag_matches(request, etag):
+        return not_modified(etag, headers)
+
+    found = {status["query_log_id"] for status in statuses}
+    return JSONResponse(
+        content={
+            "statuses": statuses,
+            "missing": [id for id in dict.fromkeys(query_log_ids) if id not in found]
+        },
+        headers={"ETag": etag, **headers}
+    )
+
+
+@router.get("/api/query/status")
+async def get_query_statuses(request: Request, ids: str = Query(..., description="Comma-separated query log IDs")):
+    """
+    Get evaluation status and scores for many queries at once.
+
+    Resolves all IDs in a single query. Supports If-None-Match: returns 304
+    when none of the statuses or scores changed since the client's ETag.
+
+    Returns:
+        - statuses: Status payloads (same shape as GET /api/query/{query_log_id})
+        - missing: Requested IDs with no query log
+    """
+    try:
+        query_log_ids = [int(id) for id in ids.split(",") if id.strip()]
+    except ValueError:
+        raise HTTPException(status_code=422, detail="ids must be comma-separated integers")
+
+    if not query_log_ids or len(query_log_ids) > MAX_STATUS_IDS:
+        raise HTTPException(status_code=422, detail=f"Provide between 1 and {MAX_STATUS_IDS} ids")
+
+    return await _bulk_status_response(request, query_log_ids, conditional=True)
+
+
+@router.post("/api/query/status")
+async def post_query_statuses(body: QueryStatusRequest, request: Request):
+    """
+    Get evaluation status and scores for many queries at once.
+
+    Same as GET /api/query/status for ID lists too long for a URL. The
+    response carries an ETag, but conditional 304s are only served for GET.
+    """
+    return await _bulk_status_response(request, body.ids, conditional=False)
+
+
 @router.get("/api/query/{query_log_id}")
-async def get_query_status(query_log_id: int):
+async def get_query_status(query_log_id: int, request: Request):
     """
     Get RAGAS evaluation status and scores for a query.
 
-    Frontend polls this endpoint to check if background RAGAS evaluation completed.
+    Frontend polls this endpoint when Server-Sent Events are unavailable
+    (see GET /api/query/{query_log_id}/events). Supports If-None-Match (304
+    while status and scores are unchanged); non-terminal statuses include a
+    Retry-After hint.
 
     Returns:
         - evaluation_status: 'pending', 'evaluating', 'completed', 'failed'
         - ragas_scores: Dict with scores (only if status='completed')
+        - score_source: 'ragas' or 'heuristic' (only if status='completed')
+        - provisional_scores: Heuristic scores computed at log time
     """
     try:
-        db = get_db_session()
-        try:
-            query_log = db.query(QueryLog).filter(QueryLog.id == query_log_id).first()
-
-            if not query_log:
-                raise HTTPException(status_code=404, detail="Query log not found")
-
-            response = {
-                "query_log_id": query_log.id,
-                "evaluation_status": query_log.evaluation_status,
-                "ragas_scores": None
-            }
-
-            if query_log.evaluation_status == 'completed':
-                response["ragas_scores"] = {
-                    "faithfulness": float(query_log.faithfulness_score) if query_log.faithfulness_score else 0.0,
-                    "answer_relevance": float(query_log.answer_relevance_score) if query_log.answer_relevance_score else 0.0,
-                    "context_utilization": float(query_log.context_precision_score) if query_log.context_precision_score else 0.0
-                }
+        status = await asyncio.to_thread(status_service.get_status, query_log_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to retrieve query status: {str(e)}"
+        )
 
-            return response
+    if status is None:
+        raise HTTPException(status_code=404, detail="Query log not found")
+
+    etag = compute_etag(status)
+    headers = _retry_after_headers([status])
+    if etag_matches(request, etag):
+        return not_modified(etag, headers)
+
+    return JSONResponse(content=status, headers={"ETag": etag, **headers})
+
+
+def _retry_after_headers(statuses: list) -> dict:
+    """Suggest a polling interval while any evaluation is still running."""
+    if any(status["evaluation_status"] not in status_service.TERMINAL_STATUSES for status in statuses):
+        return {"Retry-After": str(STATUS_RETRY_AFTER_SECONDS)}
+    return {}
 
-        finally:
-            db.close()
 
-    except HTTPException:
-        raise
+def _format_sse(payload: dict) -> str:
+    """Format a status payload as an SSE message named after its status."""
+    return f"event: {payload['evaluation_status']}\ndata: {json.dumps(payload)}\n\n"
+
+
+async def _status_event_stream(request: Request, query_log_id: int, queue: asyncio.Queue, current: dict):
+    """Yield the current status, then each transition until a terminal status."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + SSE_MAX_STREAM_SECONDS
+    try:
+        yield _format_sse(current)
+        last = current
+
+        while last["evaluation_status"] not in status_service.TERMINAL_STATUSES:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=min(SSE_HEARTBEAT_SECONDS, remaining))
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                # Re-check in case a transition was missed (e.g. marked failed by the sweeper)
+                event = await asyncio.to_thread(status_service.get_status, query_log_id)
+                if event is None:
+                    break
+                if event == last:
+                    yield ": keep-alive\n\n"
+                    continue
+
+            if event != last:
+                yield _format_sse(event)
+                last = event
+    finally:
+        evaluation_events.unsubscribe(query_log_id, queue)
+
+
+@router.get("/api/query/{query_log_id}/events")
+async def stream_query_status(query_log_id: int, request: Request):
+    """
+    Stream evaluation status transitions for a query as Server-Sent Events.
+
+    Sends the current status immediately, then one event per transition
+    ('evaluating', 'completed' with scores, 'failed'). Event names are the
+    status and data is the same payload as GET /api/query/{query_log_id}.
+    The stream ends after a terminal status or SSE_MAX_STREAM_SECONDS.
+    """
+    # Subscribe before reading the current status so no transition is missed
+    queue = evaluation_events.subscribe(query_log_id)
+    try:
+        current = await asyncio.to_thread(status_service.get_status, query_log_id)
     except Exception as e:
+        evaluation_events.unsubscribe(query_log_id, queue)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to retrieve query status: {str(e)}"
         )
+
+    if current is None:
+        evaluation_events.unsubscribe(query_log_id, queue)
+        raise HTTPException(status_code=404, detail="Query log not found")
+
+    return StreamingResponse(
+        _status_event_stream(request, query_log_id, queue, current),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,57 @@
+"""Propose indexes for the SQL the LLM generates, from EXPLAIN of logged queries.
+
+Usage:
+    python -m app.db.advise_indexes                       # print ranked candidates
+    python -m app.db.advise_indexes --min-rows 100000     # only scans/sorts of 100k+ rows
+    python -m app.db.advise_indexes --emit-migration      # write the top candidates as an Alembic migration
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+import app.db.env  # loads .env; keep before the other app imports
+
+from app.services import index_advisor
+
+VERSIONS_DIR = Path(__file__).resolve().parents[2] / "alembic" / "versions"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Recommend indexes from logged generated SQL")
+    parser.add_argument("--min-rows", type=int, default=index_advisor.DEFAULT_MIN_ROWS,
+                        help="smallest sequential scan or sort worth indexing")
+    parser.add_argument("--limit", type=int, default=index_advisor.DEFAULT_STATEMENT_LIMIT,
+                        help="distinct fingerprints to replay, most frequent first")
+    parser.add_argument("--top", type=int, default=5, help="candidates to include in the migration")
+    parser.add_argument("--no-hypopg", action="store_true", help="estimate savings even if hypopg is installed")
+    parser.add_argument("--emit-migration", action="store_true", help="write an Alembic migration")
+    parser.add_argument("--json", action="store_true", help="print the full advice as JSON")
+    args = parser.parse_args(argv)
+
+    advice = index_advisor.advise(args.min_rows, args.limit, use_hypopg=False if args.no_hypopg else None)
+    candidates = advice["candidates"]
+
+    if args.json:
+        print(json.dumps(advice, indent=2, default=str))
+    else:
+        print(f"Replayed {advice['statements']} statements ({advice['skipped']} skipped), "
+              f"{len(advice['hotspots'])} scans/sorts over {args.min_rows:,} rows")
+        if not candidates:
+            print("✅ No index candidates")
+        for rank, candidate in enumerate(candidates, 1):
+            print(f"{rank:>3}. benefit {candidate['benefit']:>14,.0f} ({advice['benefit_source']}), "
+                  f"{candidate['executions']} executions")
+            print(f"     {candidate['ddl']};")
+
+    if args.emit_migration and candidates:
+        revision, down_revision = index_advisor.next_revision(VERSIONS_DIR)
+        path = VERSIONS_DIR / f"{revision}_add_advised_indexes.py"
+        path.write_text(index_advisor.render_migration(candidates[:args.top], revision, down_revision))
+        print(f"✅ Wrote {path}", file=sys.stderr if args.json else sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
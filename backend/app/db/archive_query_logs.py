@@ -0,0 +1,47 @@
+"""Export old query logs to the Parquet archive.
+
+Usage:
+    python -m app.db.archive_query_logs                       # archive and drop detached partitions
+    python -m app.db.archive_query_logs --keep                # archive detached partitions, keep the tables
+    python -m app.db.archive_query_logs --before 2026-01-01   # copy live months before January 2026
+    python -m app.db.archive_query_logs --baseline            # print the archive's score baseline
+"""
+
+import sys
+import json
+import argparse
+from datetime import date
+
+import app.db.env  # loads .env; keep before the other app imports
+
+from app.services import archive_service
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Archive query_logs to compressed Parquet files")
+    parser.add_argument("--dir", default=archive_service.ARCHIVE_DIR, help="archive root directory")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--before", type=date.fromisoformat,
+                      help="copy whole months of live query_logs before this date")
+    mode.add_argument("--baseline", action="store_true", help="print baseline scores from the archive")
+    parser.add_argument("--keep", action="store_true", help="keep detached partitions after archiving")
+    args = parser.parse_args(argv)
+
+    if args.baseline:
+        print(json.dumps(archive_service.archive_baseline(args.dir), indent=2))
+        return 0
+
+    if args.before:
+        archived = archive_service.archive_live_months(args.before, directory=args.dir)
+    else:
+        archived = archive_service.archive_detached(args.dir, drop=not args.keep)
+
+    for name, rows in archived.items():
+        print(f"✅ {name}: {rows} rows")
+    if not archived:
+        print("Nothing to archive")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Fill query_type and sql_fingerprint for query logs created before they existed.
+
+Rows are processed in primary-key order in batches, each committed on its
+own, so the backfill holds no long locks, can run while the API serves
+traffic, and resumes where it stopped if interrupted.
+
+Usage:
+    python -m app.db.backfill_query_types                   # default batch size
+    python -m app.db.backfill_query_types --batch-size 500
+"""
+
+import sys
+import argparse
+from sqlalchemy import or_, update
+import structlog
+
+import app.db.env  # loads .env; keep before the other app imports
+
+from app.db.session import get_db_session
+from app.db.models import QueryLog
+from app.services.query_classifier import classify_sql, sql_fingerprint
+
+logger = structlog.get_logger()
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def backfill(batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Classify and fingerprint every query log missing either column.
+
+    Args:
+        batch_size: Rows updated per transaction
+
+    Returns:
+        Number of rows updated
+    """
+    updated = 0
+    last_id = 0
+    while True:
+        db = get_db_session()
+        try:
+            rows = (
+                db.query(QueryLog.id, QueryLog.generated_sql)
+                .filter(QueryLog.id > last_id,
+                        or_(QueryLog.query_type.is_(None), QueryLog.sql_fingerprint.is_(None)))
+                .order_by(QueryLog.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+
+            # Bulk UPDATE ... WHERE id = :id, one statement per batch
+            db.execute(update(QueryLog), [
+                {"id": row.id, "query_type": classify_sql(row.generated_sql),
+                 "sql_fingerprint": sql_fingerprint(row.generated_sql)}
+                for row in rows
+            ])
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        updated += len(rows)
+        last_id = rows[-1].id
+        logger.info("query_types_backfilled", rows=updated, last_id=last_id)
+
+    return updated
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Backfill query_logs.query_type and sql_fingerprint")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="rows per transaction")
+    args = parser.parse_args(argv)
+
+    rows = backfill(args.batch_size)
+    print(f"✅ Backfilled query_type/sql_fingerprint ({rows} rows)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+"""Load .env for the command-line jobs in app.db.
+
+Service settings are read from the environment when their modules load, so
+the jobs import this module before any other app module.
+"""
+
+from dotenv import load_dotenv
+
+load_dotenv()
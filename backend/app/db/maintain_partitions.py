@@ -0,0 +1,40 @@
+"""Create upcoming query_logs partitions and apply retention.
+
+Usage:
+    python -m app.db.maintain_partitions                          # settings from environment
+    python -m app.db.maintain_partitions --retention-months 12 --mode drop
+"""
+
+import sys
+import argparse
+
+import app.db.env  # loads .env; keep before the other app imports
+
+from app.services import partition_service
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Maintain query_logs monthly partitions")
+    parser.add_argument("--months-ahead", type=int, default=partition_service.PARTITION_MONTHS_AHEAD,
+                        help="future months that must have a partition")
+    parser.add_argument("--retention-months", type=int, default=partition_service.RETENTION_MONTHS,
+                        help="full months of history to keep (0 keeps everything)")
+    parser.add_argument("--mode", choices=("detach", "drop"), default=partition_service.RETENTION_MODE,
+                        help="what to do with expired partitions")
+    args = parser.parse_args(argv)
+
+    outcome = partition_service.run_maintenance(
+        months_ahead=args.months_ahead, retention_months=args.retention_months, mode=args.mode
+    )
+    if not outcome["lock_acquired"]:
+        print("Partition maintenance already running elsewhere, skipping")
+        return 0
+
+    print(f"✅ Partitions created: {', '.join(outcome['created']) or 'none'}")
+    print(f"✅ Partitions {'dropped' if args.mode == 'drop' else 'detached'}: "
+          f"{', '.join(outcome['removed']) or 'none'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, DECIMAL, TIMESTAMP, text
+from sqlalchemy import Column, Integer, String, Date, DECIMAL, NUMERIC, TIMESTAMP, text
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -30,16 +30,59 @@ class QueryLog(Base):
     """QueryLog ORM model for query history with Ragas scores"""
     __tablename__ = 'query_logs'
 
+    # Partitioned by month on created_at (migration 012); the table's key is (id, created_at),
+    # ids stay unique through the sequence
     id = Column(Integer, primary_key=True, autoincrement=True)
     natural_language_query = Column(String, nullable=False)
     generated_sql = Column(String, nullable=False)
     evaluation_status = Column(String(20), server_default=text("'pending'"), nullable=False)  # 'pending', 'evaluating', 'completed', 'failed'
+    evaluation_updated_at = Column(TIMESTAMP, nullable=True)  # Last evaluation_status transition (used by sweeper)
     faithfulness_score = Column(DECIMAL(3, 2), nullable=True)
     answer_relevance_score = Column(DECIMAL(3, 2), nullable=True)
     context_precision_score = Column(DECIMAL(3, 2), nullable=True)
+    heuristic_faithfulness_score = Column(DECIMAL(3, 2), nullable=True)  # Provisional zero-LLM scores
+    heuristic_answer_relevance_score = Column(DECIMAL(3, 2), nullable=True)
+    heuristic_context_utilization_score = Column(DECIMAL(3, 2), nullable=True)
+    score_source = Column(String(20), nullable=True)  # 'ragas' or 'heuristic' (tier that filled the score columns)
+    query_type = Column(String(20), nullable=True)  # query_classifier.classify_sql() of generated_sql
+    sql_fingerprint = Column(String(16), nullable=True)  # query_classifier.sql_fingerprint() of generated_sql
     result_count = Column(Integer, nullable=True)
     execution_time_ms = Column(Integer, nullable=True)
+    llm_time_ms = Column(Integer, nullable=True)  # Stage timings within execution_time_ms
+    validation_time_ms = Column(Integer, nullable=True)
+    db_time_ms = Column(Integer, nullable=True)
     created_at = Column(TIMESTAMP, server_default=text('CURRENT_TIMESTAMP'), nullable=False)
 
     def __repr__(self):
         return f"<QueryLog(id={self.id}, query='{self.natural_language_query[:50]}...', created_at={self.created_at})>"
+
+
+class QueryLogStats(Base):
+    """Running report aggregates per day and query type, maintained as query logs complete"""
+    __tablename__ = 'query_log_stats'
+
+    day = Column(Date, primary_key=True)
+    query_type = Column(String(20), primary_key=True)
+    query_count = Column(Integer, server_default=text('0'), nullable=False)  # All logged queries
+    # Per-metric sums/counts of completed, non-zero scores (overall averages)
+    faithfulness_sum = Column(NUMERIC(14, 2), server_default=text('0'), nullable=False)
+    faithfulness_count = Column(Integer, server_default=text('0'), nullable=False)
+    answer_relevance_sum = Column(NUMERIC(14, 2), server_default=text('0'), nullable=False)
+    answer_relevance_count = Column(Integer, server_default=text('0'), nullable=False)
+    context_precision_sum = Column(NUMERIC(14, 2), server_default=text('0'), nullable=False)
+    context_precision_count = Column(Integer, server_default=text('0'), nullable=False)
+    # Sums over queries with all three scores set (per-type averages)
+    complete_count = Column(Integer, server_default=text('0'), nullable=False)
+    complete_faithfulness_sum = Column(NUMERIC(14, 2), server_default=text('0'), nullable=False)
+    complete_answer_relevance_sum = Column(NUMERIC(14, 2), server_default=text('0'), nullable=False)
+    complete_context_precision_sum = Column(NUMERIC(14, 2), server_default=text('0'), nullable=False)
+    # Weak-query counts (any score < 0.7) and the patterns recommendations look for
+    weak_count = Column(Integer, server_default=text('0'), nullable=False)
+    weak_low_faithfulness = Column(Integer, server_default=text('0'), nullable=False)
+    weak_low_answer_relevance = Column(Integer, server_default=text('0'), nullable=False)
+    weak_low_context_precision = Column(Integer, server_default=text('0'), nullable=False)
+    weak_salary = Column(Integer, server_default=text('0'), nullable=False)
+    weak_short = Column(Integer, server_default=text('0'), nullable=False)
+
+    def __repr__(self):
+        return f"<QueryLogStats(day={self.day}, query_type={self.query_type}, query_count={self.query_count})>"
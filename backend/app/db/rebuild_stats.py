@@ -0,0 +1,45 @@
+"""Rebuild or verify the query_log_stats report aggregates.
+
+Usage:
+    python -m app.db.rebuild_stats             # recompute from query_logs
+    python -m app.db.rebuild_stats --check     # report drift without writing
+    python -m app.db.rebuild_stats --if-empty  # initial backfill (deploy step)
+"""
+
+import sys
+import argparse
+
+import app.db.env  # loads .env; keep before the other app imports
+
+from app.services import stats_service
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild or verify query_log_stats")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--check", action="store_true", help="compare stored aggregates with a recomputation")
+    mode.add_argument("--if-empty", action="store_true", help="rebuild only when query_log_stats has no rows")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        mismatches = stats_service.check_stats()
+        if not mismatches:
+            print("✅ query_log_stats is consistent with query_logs")
+            return 0
+        print(f"❌ {len(mismatches)} (day, query_type) rows differ from query_logs:")
+        for mismatch in mismatches:
+            print(f"  {mismatch['day']} {mismatch['query_type']}: "
+                  f"stored={mismatch['stored']} expected={mismatch['expected']}")
+        return 1
+
+    if args.if_empty and not stats_service.is_empty():
+        print("query_log_stats already populated, skipping rebuild")
+        return 0
+
+    rows = stats_service.rebuild_stats()
+    print(f"✅ Rebuilt query_log_stats ({rows} rows)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
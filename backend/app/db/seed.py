@@ -490,8 +490,40 @@ def validate_test_scenarios(session):
         raise ValueError("Test scenario validation failed")
 
 
+def seed_synthetic(engine, rows: int, seed: int, truncate: bool):
+    """Bulk-load generated employees with COPY, then check the test scenarios"""
+    from sqlalchemy.orm import sessionmaker
+    from app.db.synthetic_employees import load_employees
+
+    print(f"Loading {rows:,} synthetic employees (seed {seed})...")
+    result = load_employees(engine, rows, seed=seed, truncate=truncate)
+    print(f"✓ Loaded {result['rows']:,} rows in {result['seconds']}s ({result['rows_per_second']:,} rows/s)")
+
+    session = sessionmaker(bind=engine)()
+    try:
+        print("\nValidating test scenarios...")
+        validate_test_scenarios(session)
+    finally:
+        session.close()
+
+
 if __name__ == "__main__":
+    import argparse
+    from app.db.synthetic_employees import DEFAULT_SEED
+
+    parser = argparse.ArgumentParser(description="Seed the employees table")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("fixed", help="Insert the hand-written employees (default)")
+    synthetic = commands.add_parser("synthetic", help="Bulk-load generated employees with COPY")
+    synthetic.add_argument("--rows", type=int, default=100_000)
+    synthetic.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    synthetic.add_argument("--truncate", action="store_true", help="Empty the employees table first")
+    args = parser.parse_args()
+
     print("Starting database seed process...")
     engine = get_engine()
-    seed_employees(engine)
+    if args.command == "synthetic":
+        seed_synthetic(engine, args.rows, args.seed, args.truncate)
+    else:
+        seed_employees(engine)
     print("\n✅ Database seed completed successfully")
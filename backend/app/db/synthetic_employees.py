@@ -0,0 +1,262 @@
+"""
+Deterministic synthetic employees, bulk-loaded with Postgres COPY.
+
+generate_employees() yields rows with the same shape as the hand-written
+seed (departments, roles, managers, leave types, salary bands) at any size.
+The first rows are anchors that guarantee the test scenarios checked by
+validate_seed_data.py (recent hires, Engineering high earners, parental
+leave, John Doe reports); the rest are drawn from a seeded RNG, so the same
+seed, count and reference date always produce the same table.
+
+load_employees() streams the rows into COPY ... FROM STDIN without building
+them in memory. Run it via `python -m app.db.seed synthetic --rows N`.
+"""
+
+import sys
+import time
+import random
+from datetime import date, timedelta
+from typing import Iterator, Tuple
+import structlog
+
+logger = structlog.get_logger()
+
+COLUMNS = (
+    "first_name", "last_name", "department", "role", "employment_status", "hire_date",
+    "leave_type", "salary_local", "salary_usd", "manager_name",
+)
+
+DEFAULT_SEED = 42
+DEFAULT_BATCH_ROWS = 10_000
+COPY_READ_BYTES = 1 << 20
+MAX_ENCODED_VALUES = 100_000
+
+FIRST_NAMES = (
+    "Emma", "Liam", "Sophia", "Noah", "Olivia", "Ava", "James", "Michael", "William", "Alexander",
+    "Isabella", "Mia", "Ethan", "Charlotte", "Benjamin", "Amelia", "Lucas", "Harper", "Henry", "Evelyn",
+    "Priya", "Wei", "Carlos", "Amara", "Yuki", "Fatima", "Mateo", "Chloe", "Daniel", "Grace",
+)
+LAST_NAMES = (
+    "Johnson", "Martinez", "Davis", "Garcia", "Rodriguez", "Wilson", "Anderson", "Brown", "Taylor",
+    "Harris", "Thomas", "Moore", "Jackson", "Martin", "Lee", "Clark", "Lewis", "Walker", "Young",
+    "Allen", "Patel", "Chen", "Kim", "Nguyen", "Okafor", "Silva", "Cohen", "Novak", "Berg", "Tanaka",
+)
+
+# department: (share of headcount, managers, roles as (title, salary low, salary high))
+DEPARTMENTS = {
+    "Engineering": (0.35, ("Sarah Williams", "David Park"), (
+        ("Software Engineer", 85_000, 125_000),
+        ("Senior Software Engineer", 120_000, 160_000),
+        ("Staff Software Engineer", 140_000, 185_000),
+        ("DevOps Engineer", 95_000, 140_000),
+        ("QA Engineer", 70_000, 105_000),
+        ("Data Engineer", 100_000, 150_000),
+        ("Engineering Manager", 145_000, 190_000),
+    )),
+    "Sales": (0.20, ("John Doe", "Matthew White"), (
+        ("Sales Representative", 55_000, 80_000),
+        ("Account Executive", 70_000, 110_000),
+        ("Sales Engineer", 90_000, 130_000),
+        ("Sales Manager", 110_000, 150_000),
+    )),
+    "Marketing": (0.17, ("Michael Thompson", "Jessica Moore"), (
+        ("Marketing Coordinator", 50_000, 70_000),
+        ("Marketing Analyst", 60_000, 85_000),
+        ("Content Marketing Manager", 80_000, 110_000),
+        ("Senior Marketing Manager", 95_000, 130_000),
+    )),
+    "HR": (0.12, ("Jennifer Lee",), (
+        ("HR Coordinator", 48_000, 62_000),
+        ("HR Specialist", 55_000, 75_000),
+        ("Recruiter", 60_000, 90_000),
+        ("HR Director", 120_000, 160_000),
+    )),
+    "Finance": (0.16, ("Robert Chen",), (
+        ("Accountant", 60_000, 85_000),
+        ("Financial Analyst", 65_000, 95_000),
+        ("Senior Accountant", 80_000, 110_000),
+        ("Controller", 130_000, 170_000),
+    )),
+}
+
+LEAVE_TYPES = ("Parental Leave", "Medical Leave", "Sick Leave")
+# Shares of all employees: on leave (split evenly across LEAVE_TYPES) and terminated
+ON_LEAVE_SHARE = 0.05
+TERMINATED_SHARE = 0.07
+# Share hired within the last 180 days (the rest spread over HIRE_YEARS)
+RECENT_HIRE_SHARE = 0.06
+HIRE_YEARS = 10
+
+
+def _anchors(today: date) -> Tuple[tuple, ...]:
+    """Rows that guarantee the validate_seed_data.py scenarios at any table size."""
+    def row(first, last, department, role, status, hired, leave, salary, manager):
+        return (first, last, department, role, status, hired, leave, salary, salary, manager)
+
+    return (
+        # Recent hires (5+ in the last 6 months)
+        row("Emma", "Johnson", "Engineering", "Software Engineer", "Active", today - timedelta(days=120), None, 95_000, "Sarah Williams"),
+        row("Liam", "Martinez", "Marketing", "Marketing Coordinator", "Active", today - timedelta(days=90), None, 62_000, "Michael Thompson"),
+        row("Sophia", "Davis", "Sales", "Sales Representative", "Active", today - timedelta(days=60), None, 68_000, "John Doe"),
+        row("Noah", "Garcia", "Engineering", "DevOps Engineer", "Active", today - timedelta(days=30), None, 105_000, "Sarah Williams"),
+        row("Olivia", "Rodriguez", "HR", "HR Specialist", "Active", today - timedelta(days=60), None, 58_000, "Jennifer Lee"),
+        # Engineering high earners (3+ above 120K)
+        row("James", "Anderson", "Engineering", "Senior Software Engineer", "Active", date(2022, 3, 15), None, 135_000, "Sarah Williams"),
+        row("Michael", "Brown", "Engineering", "Engineering Manager", "Active", date(2021, 6, 1), None, 155_000, "David Park"),
+        row("William", "Taylor", "Engineering", "Staff Software Engineer", "Active", date(2020, 9, 10), None, 175_000, "David Park"),
+        # Parental leave (2+)
+        row("Isabella", "Thomas", "Marketing", "Senior Marketing Manager", "On Leave", date(2022, 1, 15), "Parental Leave", 98_000, "Michael Thompson"),
+        row("Mia", "Moore", "Engineering", "Software Engineer", "On Leave", date(2023, 4, 1), "Parental Leave", 110_000, "Sarah Williams"),
+        # John Doe reports (4+, with Sophia Davis above)
+        row("Ethan", "Jackson", "Sales", "Account Executive", "Active", date(2021, 8, 20), None, 85_000, "John Doe"),
+        row("Charlotte", "Martin", "Sales", "Sales Engineer", "Active", date(2020, 5, 11), None, 112_000, "John Doe"),
+        row("Benjamin", "Lee", "Sales", "Account Executive", "Active", date(2022, 10, 3), None, 79_000, "John Doe"),
+    )
+
+
+def generate_employees(count: int, seed: int = DEFAULT_SEED, today: date | None = None) -> Iterator[tuple]:
+    """
+    Yield count employee rows (values in COLUMNS order; salaries in whole USD).
+
+    Args:
+        count: Number of rows
+        seed: RNG seed (same seed, count and today give the same rows)
+        today: Reference date for hire dates (defaults to today)
+    """
+    today = today or date.today()
+    rng = random.Random(seed)
+
+    anchors = _anchors(today)
+    yield from anchors[:count]
+
+    departments = list(DEPARTMENTS)
+    weights = [DEPARTMENTS[name][0] for name in departments]
+    # Index into precomputed dates instead of building a timedelta per row
+    recent_dates = [today - timedelta(days=offset) for offset in range(180)]
+    history_dates = [today - timedelta(days=offset) for offset in range(HIRE_YEARS * 365)]
+    remaining = count - len(anchors)
+    while remaining > 0:
+        # Draw per batch: random.choices with k is much faster than one call per row
+        size = min(remaining, DEFAULT_BATCH_ROWS)
+        for department in rng.choices(departments, weights, k=size):
+            _, managers, roles = DEPARTMENTS[department]
+            role, low, high = roles[int(rng.random() * len(roles))]
+            dates = recent_dates if rng.random() < RECENT_HIRE_SHARE else history_dates
+            hired = dates[int(rng.random() * len(dates))]
+            status_draw = rng.random()
+            if status_draw < ON_LEAVE_SHARE:
+                status, leave = "On Leave", LEAVE_TYPES[int(status_draw / ON_LEAVE_SHARE * len(LEAVE_TYPES))]
+            elif status_draw < ON_LEAVE_SHARE + TERMINATED_SHARE:
+                status, leave = "Terminated", None
+            else:
+                status, leave = "Active", None
+            salary = round(low + (high - low) * rng.random(), -2)
+            yield (
+                FIRST_NAMES[int(rng.random() * len(FIRST_NAMES))],
+                LAST_NAMES[int(rng.random() * len(LAST_NAMES))],
+                department, role, status, hired, leave, int(salary), int(salary),
+                managers[int(rng.random() * len(managers))],
+            )
+        remaining -= size
+
+
+def _copy_value(value) -> str:
+    """Encode one value in COPY text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, str):
+        return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+    return str(value)
+
+
+class _EncodedValues(dict):
+    """Memo of encoded values; generated rows repeat a few thousand distinct values."""
+
+    def __missing__(self, value):
+        self[value] = text = _copy_value(value)
+        return text
+
+
+def copy_lines(rows) -> Iterator[str]:
+    """
+    Rows as COPY text-format lines (tab separated, \\N for NULL).
+
+    Values are memoised by equality, so rows must not mix values that compare
+    equal but encode differently (True and 1, 1 and 1.0); generated rows do not.
+    """
+    encoded = _EncodedValues()
+    for row in rows:
+        if len(encoded) > MAX_ENCODED_VALUES:
+            encoded.clear()
+        yield "\t".join(map(encoded.__getitem__, row)) + "\n"
+
+
+class CopyStream:
+    """Read-only file over a line iterator, as consumed by psycopg2 copy_expert()."""
+
+    def __init__(self, lines: Iterator[str], batch_lines: int = DEFAULT_BATCH_ROWS):
+        self._lines = lines
+        self._batch_lines = batch_lines
+        self._buffer = b""
+        self._offset = 0
+        self.rows = 0
+
+    def _fill(self, size: int):
+        """Encode batches of lines until size bytes are buffered or the lines run out."""
+        pending = [self._buffer[self._offset:]]
+        available = len(pending[0])
+        while available < size:
+            batch = [line for _, line in zip(range(self._batch_lines), self._lines)]
+            if not batch:
+                break
+            self.rows += len(batch)
+            pending.append("".join(batch).encode())
+            available += len(pending[-1])
+        self._buffer, self._offset = b"".join(pending), 0
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = sys.maxsize
+        if len(self._buffer) - self._offset < size:
+            self._fill(size)
+        chunk = self._buffer[self._offset:self._offset + size]
+        self._offset += len(chunk)
+        return chunk
+
+
+def load_employees(engine, count: int, seed: int = DEFAULT_SEED, today: date | None = None,
+                   truncate: bool = False) -> dict:
+    """
+    Stream count synthetic employees into the employees table with COPY.
+
+    Args:
+        engine: SQLAlchemy engine (Postgres)
+        count: Rows to generate
+        seed: RNG seed
+        today: Reference date for hire dates
+        truncate: Empty the table (and restart employee_id) first
+
+    Returns:
+        Dictionary with rows, seconds and rows_per_second
+    """
+    started = time.perf_counter()
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        if truncate:
+            cursor.execute("TRUNCATE employees RESTART IDENTITY")
+        stream = CopyStream(copy_lines(generate_employees(count, seed, today)))
+        cursor.copy_expert(f"COPY employees ({', '.join(COLUMNS)}) FROM STDIN", stream, size=COPY_READ_BYTES)
+        # Fresh statistics so the planner sees the new size immediately
+        cursor.execute("ANALYZE employees")
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+    seconds = time.perf_counter() - started
+    result = {"rows": count, "seconds": round(seconds, 2), "rows_per_second": int(count / seconds) if seconds else None}
+    logger.info("synthetic_employees_loaded", seed=seed, truncate=truncate, **result)
+    return result
@@ -9,26 +9,45 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 
+# Load environment variables before the app modules, which read their settings at import
+load_dotenv()
+
 from app.middleware.request_id import RequestIDMiddleware
 from app.api.routes import router
 from app.utils.logger import structlog
 from app.services.llm_service import validate_api_key
-from app.services.ragas_service import initialize_ragas
-
-# Load environment variables
-load_dotenv()
+from app.services.ragas_service import initialize_ragas, shutdown_executor
+from app.services import evaluation_sweeper, evaluation_events, partition_service, health_service, metrics, profiling
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan context manager for startup/shutdown logic."""
-    # Startup: Validate OpenAI API key
+    # Startup: Refuse profiling settings whose profiles could not be downloaded
+    profiling.validate_settings()
+    # Validate OpenAI API key
     if not os.getenv("SKIP_API_KEY_VALIDATION"):
         await validate_api_key()
     # Initialize Ragas framework
     await initialize_ragas()
+    # Recover evaluations left in 'pending'/'evaluating' by crashed workers
+    if os.getenv("EVALUATION_SWEEPER_ENABLED", "true").lower() == "true":
+        evaluation_sweeper.start_sweeper()
+    # Keep future query_logs partitions created and apply retention
+    if os.getenv("PARTITION_MAINTENANCE_ENABLED", "true").lower() == "true":
+        partition_service.start_maintenance()
+    # Keep database health cached so /api/health never waits on the pool
+    health_service.start_prober()
+    # Relay evaluation status events published by other processes to SSE clients
+    evaluation_events.start_listener()
     yield
-    # Shutdown: Cleanup logic (if needed in future)
+    # Shutdown: stop background jobs and evaluation workers
+    await evaluation_sweeper.stop_sweeper()
+    await partition_service.stop_maintenance()
+    await health_service.stop_prober()
+    await evaluation_events.stop_listener()
+    shutdown_executor()
+    metrics.mark_process_dead()
 
 
 # Initialize FastAPI application with lifespan
@@ -0,0 +1,252 @@
+"""Columnar (Parquet) archive of old query logs.
+
+Rows are streamed from Postgres through a server-side cursor and written
+month by month to zstd-compressed Parquet files laid out as
+
+    QUERY_LOG_ARCHIVE_DIR/month=YYYY-MM/query_logs.parquet
+
+so pyarrow.dataset (or DuckDB) can read the archive with hive partitioning
+and prune months. Sources are query_logs partitions detached by retention
+(see partition_service), which are dropped once archived, or months still
+in the live table, which are copied.
+
+read_archive() and archive_baseline() compute historical baselines from the
+files alone, without a database connection.
+"""
+
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Optional
+from sqlalchemy import func, text, table, column, select
+import structlog
+
+from app.db.session import get_db_session
+from app.db.models import QueryLog
+# Module import: partition_service imports report_cache, which imports this module through report_service
+from app.services import partition_service
+
+logger = structlog.get_logger()
+
+ARCHIVE_DIR = os.getenv("QUERY_LOG_ARCHIVE_DIR", "archive/query_logs")
+ARCHIVE_BATCH_SIZE = int(os.getenv("QUERY_LOG_ARCHIVE_BATCH_SIZE", "5000"))
+ARCHIVE_COMPRESSION = "zstd"
+ARCHIVE_FILE = "query_logs.parquet"
+
+ARCHIVE_COLUMNS = tuple(column_.name for column_ in QueryLog.__table__.columns)
+SCORE_NAMES = ('faithfulness', 'answer_relevance', 'context_precision')
+
+
+def _schema():
+    """Arrow schema mirroring query_logs (scores as float64 for analysis)."""
+    import pyarrow as pa
+
+    types = {'Integer': pa.int32(), 'String': pa.string(), 'DECIMAL': pa.float64(), 'TIMESTAMP': pa.timestamp('us')}
+    return pa.schema([
+        (column_.name, types[type(column_.type).__name__]) for column_ in QueryLog.__table__.columns
+    ])
+
+
+def month_path(directory: str, month: date) -> str:
+    """Parquet file holding one month."""
+    return os.path.join(directory, f"month={month.strftime('%Y-%m')}", ARCHIVE_FILE)
+
+
+def _to_arrow_value(value):
+    return float(value) if isinstance(value, Decimal) else value
+
+
+def write_month(db, source: str, month: date, directory: str = ARCHIVE_DIR,
+                batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """
+    Stream one month of rows from a table into its Parquet file.
+
+    The file is written under a temporary name and renamed into place, so a
+    failed export never leaves a partial month behind.
+
+    Args:
+        db: Database session
+        source: Table to read (query_logs or a detached query_logs_YYYY_MM)
+        month: First day of the month to export
+        directory: Archive root
+        batch_size: Rows fetched per round trip and written per row group
+
+    Returns:
+        Number of rows archived
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    logs = table(source, *(column(name) for name in ARCHIVE_COLUMNS))
+    statement = (
+        select(*logs.c)
+        .where(logs.c.created_at >= month, logs.c.created_at < partition_service.add_months(month, 1))
+        .order_by(logs.c.created_at, logs.c.id)
+    )
+
+    path = month_path(directory, month)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Dot-prefixed so dataset readers ignore an in-progress file
+    temporary = os.path.join(os.path.dirname(path), f".{ARCHIVE_FILE}.tmp")
+    schema = _schema()
+    rows = 0
+
+    # stream_results uses a named (server-side) cursor: memory stays at one batch
+    result = db.connection().execution_options(stream_results=True).execute(statement)
+    try:
+        with pq.ParquetWriter(temporary, schema, compression=ARCHIVE_COMPRESSION) as writer:
+            for batch in result.partitions(batch_size):
+                columns = {name: [_to_arrow_value(row[i]) for row in batch]
+                           for i, name in enumerate(ARCHIVE_COLUMNS)}
+                writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+                rows += len(batch)
+        os.replace(temporary, path)
+    except Exception:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    finally:
+        result.close()
+
+    logger.info("query_logs_archived", source=source, month=month.isoformat(), rows=rows, path=path)
+    return rows
+
+
+def list_detached_partitions(db) -> List[str]:
+    """query_logs_YYYY_MM tables that are no longer attached to query_logs."""
+    names = db.execute(text("""
+        SELECT relname FROM pg_class
+        WHERE relkind = 'r'
+          AND relname LIKE 'query_logs_%'
+          AND NOT EXISTS (SELECT 1 FROM pg_inherits WHERE pg_inherits.inhrelid = pg_class.oid)
+    """)).scalars()
+    return sorted(name for name in names if partition_service.partition_month(name) is not None)
+
+
+def archive_detached(directory: str = ARCHIVE_DIR, drop: bool = True) -> Dict[str, int]:
+    """
+    Archive every detached partition, dropping each once its file is written.
+
+    Returns:
+        {table name: rows archived}
+    """
+    archived = {}
+    db = get_db_session()
+    try:
+        for name in list_detached_partitions(db):
+            archived[name] = write_month(db, name, partition_service.partition_month(name), directory)
+            if drop:
+                db.execute(text(f"DROP TABLE {name}"))
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    return archived
+
+
+def archive_live_months(before: date, since: Optional[date] = None,
+                        directory: str = ARCHIVE_DIR) -> Dict[str, int]:
+    """
+    Copy whole months of the live query_logs table into the archive.
+
+    Rows stay in Postgres (retention removes them); re-running a month
+    replaces its file.
+
+    Args:
+        before: Archive months starting before this date's month
+        since: First month to archive (defaults to the oldest row's month)
+
+    Returns:
+        {partition name: rows archived}
+    """
+    archived = {}
+    db = get_db_session()
+    try:
+        if since is None:
+            oldest = db.query(func.min(QueryLog.created_at)).scalar()
+            if oldest is None:
+                return archived
+            since = oldest.date()
+        month = since.replace(day=1)
+        while month < before.replace(day=1):
+            archived[partition_service.partition_name(month)] = write_month(db, "query_logs", month, directory)
+            month = partition_service.add_months(month, 1)
+        db.commit()
+    finally:
+        db.close()
+    return archived
+
+
+def read_archive(directory: str = ARCHIVE_DIR, columns: Optional[List[str]] = None,
+                 since: Optional[datetime] = None, until: Optional[datetime] = None):
+    """
+    Load archived rows as a pyarrow Table, reading only the needed months and columns.
+
+    Args:
+        directory: Archive root
+        columns: Columns to load (None for all)
+        since: Only rows created at or after this time
+        until: Only rows created before this time
+
+    Returns:
+        pyarrow.Table (empty when nothing is archived)
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    if not os.path.isdir(directory):
+        schema = _schema()
+        return pa.schema([schema.field(name) for name in columns or schema.names]).empty_table()
+
+    partitioning = ds.partitioning(pa.schema([("month", pa.string())]), flavor="hive")
+    dataset = ds.dataset(directory, format="parquet", partitioning=partitioning)
+
+    # The month conditions skip whole files; the created_at ones trim the edge months
+    conditions = []
+    if since is not None:
+        conditions += [ds.field("month") >= since.strftime('%Y-%m'),
+                       ds.field("created_at") >= pa.scalar(since, pa.timestamp('us'))]
+    if until is not None:
+        conditions += [ds.field("month") <= until.strftime('%Y-%m'),
+                       ds.field("created_at") < pa.scalar(until, pa.timestamp('us'))]
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return dataset.to_table(columns=columns, filter=expression)
+
+
+def baseline_from_table(logs) -> Dict:
+    """
+    Baseline score statistics of a Table with *_score and evaluation_status columns.
+
+    Averages cover completed rows with a non-zero score, as in the analysis report.
+
+    Returns:
+        Dictionary with total_queries, evaluated, average_scores and zero_faithfulness
+    """
+    import pyarrow.compute as pc
+
+    completed = logs.filter(pc.equal(logs["evaluation_status"], "completed"))
+    average_scores = {}
+    for name in SCORE_NAMES:
+        scores = completed[f"{name}_score"]
+        valid = scores.filter(pc.greater(pc.fill_null(scores, 0.0), 0.0))
+        mean = pc.mean(valid).as_py() if len(valid) else None
+        average_scores[name] = round(mean, 3) if mean is not None else 0.0
+
+    faithfulness = completed["faithfulness_score"]
+    return {
+        "total_queries": logs.num_rows,
+        "evaluated": completed.num_rows,
+        "average_scores": average_scores,
+        "zero_faithfulness": pc.sum(pc.equal(pc.fill_null(faithfulness, 0.0), 0.0)).as_py() or 0
+    }
+
+
+def archive_baseline(directory: str = ARCHIVE_DIR, since: Optional[datetime] = None,
+                     until: Optional[datetime] = None) -> Dict:
+    """Historical baseline computed from the Parquet archive only (no database access)."""
+    columns = ["evaluation_status", *(f"{name}_score" for name in SCORE_NAMES)]
+    return baseline_from_table(read_archive(directory, columns, since, until))
@@ -0,0 +1,244 @@
+"""In-process pub/sub for evaluation status transitions.
+
+evaluate_and_update_async publishes every status transition ('evaluating',
+'completed' with scores, 'failed'). Subscribers (the SSE endpoint) receive
+them through asyncio queues keyed by query log ID.
+
+Evaluations that run in another process (another replica, the sweeper on a
+different worker, a dedicated evaluator) reach subscribers through Postgres
+LISTEN/NOTIFY: publish() queues a NOTIFY on the caller's session, delivered
+on commit, and every API process relays notifications from other origins
+into its local subscribers.
+
+Events published with a session reach local subscribers the same way: only
+once that session commits, and never if it rolls back, so nobody sees a
+status the database does not hold.
+"""
+
+import os
+import json
+import uuid
+import asyncio
+from collections import defaultdict
+from sqlalchemy import event as orm_event, text
+import structlog
+
+from app.db.session import get_engine
+
+logger = structlog.get_logger()
+
+NOTIFY_CHANNEL = "evaluation_events"
+NOTIFY_ENABLED = os.getenv("EVALUATION_EVENTS_NOTIFY", "true").lower() == "true"
+LISTENER_RECONNECT_SECONDS = 5
+
+# Identifies events published by this process so relayed NOTIFYs are not delivered twice
+ORIGIN = uuid.uuid4().hex
+
+_subscribers = defaultdict(set)
+# Callables (query_log_id, event) invoked for every event, e.g. cache invalidation
+_listeners = []
+_listener_connection = None
+_listener_task = None
+# Event loop the subscriber queues belong to (commits in worker threads hand events to it)
+_loop = None
+
+# Session.info key of the events waiting for that session's commit
+_PENDING_KEY = "evaluation_events_pending"
+_HOOKS_KEY = "evaluation_events_hooks"
+
+
+def subscribe(query_log_id: int) -> asyncio.Queue:
+    """Register a queue that receives events for query_log_id."""
+    global _loop
+    _loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    _subscribers[query_log_id].add(queue)
+    return queue
+
+
+def unsubscribe(query_log_id: int, queue: asyncio.Queue):
+    """Remove a queue registered with subscribe()."""
+    queues = _subscribers.get(query_log_id)
+    if queues is None:
+        return
+    queues.discard(queue)
+    if not queues:
+        del _subscribers[query_log_id]
+
+
+def add_listener(callback):
+    """Register callback(query_log_id, event) for every event, local or relayed."""
+    _listeners.append(callback)
+
+
+def _deliver(query_log_id: int, event: dict):
+    """Fan an event out to local subscribers and listeners."""
+    for queue in list(_subscribers.get(query_log_id, ())):
+        queue.put_nowait(event)
+    for callback in _listeners:
+        try:
+            callback(query_log_id, event)
+        except Exception as e:
+            logger.error("evaluation_event_listener_failed", query_log_id=query_log_id, error=str(e))
+
+
+def _deliver_threadsafe(query_log_id: int, event: dict):
+    """Deliver an event on the subscribers' event loop, from that loop or any other thread."""
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if _loop is not None and running is not _loop and _loop.is_running():
+        _loop.call_soon_threadsafe(_deliver, query_log_id, event)
+    else:
+        _deliver(query_log_id, event)
+
+
+def _deliver_committed(session):
+    """after_commit hook: deliver the events published in the committed transaction."""
+    if session.in_nested_transaction():
+        return  # A savepoint was released; the transaction can still roll back
+    pending = session.info.pop(_PENDING_KEY, [])
+    for query_log_id, event in pending:
+        _deliver_threadsafe(query_log_id, event)
+
+
+def _drop_rolled_back(session):
+    """after_rollback hook: discard events of a transaction that did not commit."""
+    if session.in_nested_transaction():
+        return
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _defer_until_commit(db, query_log_id: int, event: dict):
+    """Hold an event until db commits (the hooks are installed once per session)."""
+    if _HOOKS_KEY not in db.info:
+        db.info[_HOOKS_KEY] = True
+        orm_event.listen(db, "after_commit", _deliver_committed)
+        orm_event.listen(db, "after_rollback", _drop_rolled_back)
+    db.info.setdefault(_PENDING_KEY, []).append((query_log_id, event))
+
+
+def publish(query_log_id: int, event: dict, db=None):
+    """
+    Publish a status event to subscribers in this and other processes.
+
+    Without db the event is delivered locally at once. With db it is
+    delivered when that session commits (from any thread) and dropped if it
+    rolls back; when NOTIFY is enabled, a NOTIFY is queued on the session too.
+
+    Args:
+        query_log_id: Query log the event belongs to
+        event: Status payload (see status_service.build_status_payload)
+        db: Optional session used to notify other processes
+    """
+    if db is not None and NOTIFY_ENABLED:
+        try:
+            payload = json.dumps({"query_log_id": query_log_id, "origin": ORIGIN, "event": event})
+            db.execute(text("SELECT pg_notify(:channel, :payload)"),
+                       {"channel": NOTIFY_CHANNEL, "payload": payload})
+        except Exception as e:
+            logger.warning("evaluation_event_notify_failed", query_id=query_log_id, error=str(e))
+
+    if db is not None:
+        _defer_until_commit(db, query_log_id, event)
+    else:
+        _deliver(query_log_id, event)
+
+
+def _handle_notifications():
+    """Relay NOTIFYs from other processes (add_reader callback)."""
+    global _listener_connection
+    connection = _listener_connection
+    try:
+        connection.poll()
+    except Exception as e:
+        logger.error("evaluation_event_listener_lost", error=str(e))
+        _stop_reader()
+        _schedule_reconnect()
+        return
+
+    while connection.notifies:
+        notification = connection.notifies.pop(0)
+        try:
+            message = json.loads(notification.payload)
+        except ValueError:
+            continue
+        if message.get("origin") == ORIGIN:
+            continue
+        _deliver(message["query_log_id"], message["event"])
+
+
+def _connect_listener():
+    """Open a dedicated autocommit connection and LISTEN on the events channel."""
+    global _listener_connection
+    raw_connection = get_engine().raw_connection()
+    raw_connection.detach()  # Dedicated for LISTEN; never returned to the pool
+    connection = raw_connection.dbapi_connection
+    connection.autocommit = True
+    with connection.cursor() as cursor:
+        cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+
+    _listener_connection = connection
+    asyncio.get_running_loop().add_reader(connection.fileno(), _handle_notifications)
+    logger.info("evaluation_event_listener_started", channel=NOTIFY_CHANNEL)
+
+
+def _stop_reader():
+    """Detach the listener connection from the event loop and close it."""
+    global _listener_connection
+    if _listener_connection is None:
+        return
+    try:
+        asyncio.get_running_loop().remove_reader(_listener_connection.fileno())
+    except Exception:
+        pass
+    try:
+        _listener_connection.close()
+    except Exception:
+        pass
+    _listener_connection = None
+
+
+async def _reconnect_loop():
+    """Retry the listener connection until it succeeds."""
+    while True:
+        await asyncio.sleep(LISTENER_RECONNECT_SECONDS)
+        try:
+            _connect_listener()
+            return
+        except Exception as e:
+            logger.warning("evaluation_event_listener_retry", error=str(e))
+
+
+def _schedule_reconnect():
+    """Start reconnecting in the background (idempotent)."""
+    global _listener_task
+    if _listener_task is None or _listener_task.done():
+        _listener_task = asyncio.get_running_loop().create_task(_reconnect_loop())
+
+
+def start_listener():
+    """Start relaying NOTIFYs from other processes; retries in the background on failure."""
+    global _loop
+    _loop = asyncio.get_running_loop()
+    if not NOTIFY_ENABLED:
+        return
+    try:
+        _connect_listener()
+    except Exception as e:
+        logger.warning("evaluation_event_listener_unavailable", error=str(e))
+        _schedule_reconnect()
+
+
+async def stop_listener():
+    """Stop the NOTIFY relay."""
+    global _listener_task
+    if _listener_task is not None:
+        _listener_task.cancel()
+        try:
+            await _listener_task
+        except asyncio.CancelledError:
+            pass
+        _listener_task = None
+    _stop_reader()
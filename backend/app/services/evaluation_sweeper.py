@@ -0,0 +1,186 @@
+"""Sweeper for query logs stuck in 'pending' or 'evaluating'.
+
+If the process dies or the event loop is cancelled mid-evaluation, the
+background task never writes a terminal status and the frontend keeps
+polling forever. The sweeper periodically finds rows whose status has not
+changed for longer than a timeout and either re-enqueues them (rows that
+never started evaluating) or marks them 'failed' (rows that did).
+
+Only one replica sweeps at a time: each sweep runs in a single transaction
+guarded by a Postgres transaction-level advisory lock.
+"""
+
+import os
+import asyncio
+from sqlalchemy import text, func
+import structlog
+
+from app.db.session import get_db_session
+from app.db.models import QueryLog
+from app.services import ragas_service, evaluation_events, status_service, periodic
+from app.services.query_service import fetch_results
+from app.services.validation_service import validate_sql
+
+logger = structlog.get_logger()
+
+SWEEPER_LOCK_KEY = 726_001
+
+STUCK_TIMEOUT_SECONDS = int(os.getenv("EVALUATION_STUCK_TIMEOUT_SECONDS", "300"))
+SWEEP_INTERVAL_SECONDS = int(os.getenv("EVALUATION_SWEEP_INTERVAL_SECONDS", "60"))
+SWEEP_BATCH_SIZE = int(os.getenv("EVALUATION_SWEEP_BATCH_SIZE", "50"))
+REQUEUE_PENDING = os.getenv("EVALUATION_SWEEP_REQUEUE", "true").lower() == "true"
+
+_sweeper = periodic.PeriodicJob("evaluation_sweeper")
+_requeued_tasks = set()
+
+
+def sweep_stuck_evaluations(batch_size: int = SWEEP_BATCH_SIZE,
+                            timeout_seconds: int = STUCK_TIMEOUT_SECONDS,
+                            requeue: bool = REQUEUE_PENDING) -> dict:
+    """
+    Find one batch of stuck query logs and resolve them.
+
+    Stuck rows are selected through idx_evaluation_status and locked with
+    SKIP LOCKED. Rows stuck in 'evaluating' are marked 'failed' and a
+    'failed' status event is published for each. Rows stuck
+    in 'pending' are claimed for re-evaluation (status set to 'evaluating')
+    when requeue is enabled, so a second crash leaves them to be failed by
+    the next sweep instead of being retried forever.
+
+    Args:
+        batch_size: Maximum rows to resolve in this sweep
+        timeout_seconds: Age of last status change after which a row is stuck
+        requeue: Whether to re-enqueue rows that never started evaluating
+
+    Returns:
+        Dictionary with lock_acquired, failed (count) and requeue
+        (list of (id, natural_language_query, generated_sql) tuples)
+    """
+    db = get_db_session()
+    try:
+        if not periodic.try_advisory_lock(db, SWEEPER_LOCK_KEY):
+            db.rollback()
+            logger.debug("evaluation_sweep_skipped", reason="lock held by another replica")
+            return {"lock_acquired": False, "failed": 0, "requeue": []}
+
+        cutoff = text("LOCALTIMESTAMP - make_interval(secs => :timeout_seconds)").bindparams(
+            timeout_seconds=timeout_seconds
+        )
+        last_change = func.coalesce(QueryLog.evaluation_updated_at, QueryLog.created_at)
+
+        stuck = (
+            db.query(
+                *status_service.STATUS_COLUMNS,
+                QueryLog.natural_language_query,
+                QueryLog.generated_sql
+            )
+            .filter(QueryLog.evaluation_status.in_(('pending', 'evaluating')))
+            .filter(last_change < cutoff)
+            .order_by(QueryLog.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+        requeue_rows = [row for row in stuck if requeue and row.evaluation_status == 'pending']
+        failed_rows = [row for row in stuck if not (requeue and row.evaluation_status == 'pending')]
+        failed_ids = [row.id for row in failed_rows]
+
+        if failed_ids:
+            db.query(QueryLog).filter(QueryLog.id.in_(failed_ids)).update(
+                {"evaluation_status": 'failed', "evaluation_updated_at": func.now()},
+                synchronize_session=False
+            )
+            # Open status streams for these rows end on the 'failed' event (sent on commit)
+            for row in failed_rows:
+                evaluation_events.publish(
+                    row.id, {**status_service.build_status_payload(row), "evaluation_status": 'failed'}, db=db
+                )
+        if requeue_rows:
+            db.query(QueryLog).filter(QueryLog.id.in_([row.id for row in requeue_rows])).update(
+                {"evaluation_status": 'evaluating', "evaluation_updated_at": func.now()},
+                synchronize_session=False
+            )
+        db.commit()
+
+        if stuck:
+            logger.info("evaluation_sweep_completed",
+                failed_count=len(failed_ids),
+                requeued_count=len(requeue_rows),
+                failed_ids=failed_ids
+            )
+
+        return {
+            "lock_acquired": True,
+            "failed": len(failed_ids),
+            "requeue": [
+                (row.id, row.natural_language_query, row.generated_sql)
+                for row in requeue_rows
+            ]
+        }
+
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _refetch_results(sql: str) -> list:
+    """Re-run a logged query so its results can be re-evaluated."""
+    validate_sql(sql)
+    db = get_db_session()
+    try:
+        return fetch_results(db, sql)
+    finally:
+        db.close()
+
+
+async def _requeue_evaluation(query_id: int, nl_query: str, sql: str):
+    """Re-run the logged SQL and evaluate it again in the background."""
+    try:
+        results = await asyncio.to_thread(_refetch_results, sql)
+    except Exception as e:
+        logger.error("evaluation_requeue_failed", query_id=query_id, error=str(e))
+        await asyncio.to_thread(_mark_failed, query_id)
+        return
+
+    await ragas_service.evaluate_and_update_async(query_id, nl_query, sql, results)
+
+
+def _mark_failed(query_id: int):
+    """Mark a single query log as failed and publish its 'failed' status."""
+    db = get_db_session()
+    try:
+        db.query(QueryLog).filter(QueryLog.id == query_id).update(
+            {"evaluation_status": 'failed', "evaluation_updated_at": func.now()},
+            synchronize_session=False
+        )
+        row = status_service.find_by_id(db.query(*status_service.STATUS_COLUMNS), query_id)
+        if row:
+            evaluation_events.publish(query_id, status_service.build_status_payload(row), db=db)
+        db.commit()
+    finally:
+        db.close()
+
+
+async def run_sweep_once() -> dict:
+    """Run one sweep off the event loop and schedule re-evaluations."""
+    outcome = await asyncio.to_thread(sweep_stuck_evaluations)
+
+    for query_id, nl_query, sql in outcome["requeue"]:
+        task = asyncio.create_task(_requeue_evaluation(query_id, nl_query, sql))
+        _requeued_tasks.add(task)
+        task.add_done_callback(_requeued_tasks.discard)
+
+    return outcome
+
+
+def start_sweeper(interval_seconds: int = SWEEP_INTERVAL_SECONDS):
+    """Start the periodic sweeper on the running event loop (idempotent)."""
+    return _sweeper.start(run_sweep_once, interval_seconds)
+
+
+async def stop_sweeper():
+    """Cancel the periodic sweeper and wait for it to exit."""
+    await _sweeper.stop()
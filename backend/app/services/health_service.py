@@ -0,0 +1,126 @@
+"""Cached database health for /api/health.
+
+A background prober runs SELECT 1 every HEALTH_PROBE_INTERVAL_SECONDS and
+stores the result, so shallow health checks (compose healthcheck, load
+balancers, uptime monitors) answer from memory and never queue for a pooled
+connection. Deep checks probe on demand but give up after
+HEALTH_DEEP_TIMEOUT_SECONDS instead of waiting out the pool timeout.
+"""
+
+import os
+import time
+import asyncio
+from datetime import datetime, timezone
+from sqlalchemy import text
+import structlog
+
+from app.db.session import get_db_session, get_pool_status
+from app.services import periodic
+
+logger = structlog.get_logger()
+
+HEALTH_PROBE_INTERVAL_SECONDS = float(os.getenv("HEALTH_PROBE_INTERVAL_SECONDS", "5"))
+HEALTH_DEEP_TIMEOUT_SECONDS = float(os.getenv("HEALTH_DEEP_TIMEOUT_SECONDS", "2"))
+# A cached result older than this (prober stalled or not running) is re-probed on demand
+HEALTH_STALE_SECONDS = float(os.getenv("HEALTH_STALE_SECONDS", str(HEALTH_PROBE_INTERVAL_SECONDS * 3)))
+
+_state = None
+_checked_at = 0.0
+_probe_task = None
+_prober = periodic.PeriodicJob("health_prober")
+
+
+def _timestamp() -> str:
+    return datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+def _check_database() -> dict:
+    """Run SELECT 1 on a pooled connection (blocking; runs in a worker thread)."""
+    db = get_db_session()
+    try:
+        db.execute(text("SELECT 1"))
+    finally:
+        db.close()
+    return {"database": "connected", "error": None}
+
+
+async def probe(timeout: float = HEALTH_DEEP_TIMEOUT_SECONDS) -> dict:
+    """
+    Check the database now and cache the result.
+
+    Concurrent callers share one probe. On timeout the result is
+    'disconnected'; the abandoned check finishes in its thread.
+
+    Returns:
+        Dictionary with database, error and checked_at
+    """
+    global _probe_task
+    if _probe_task is None or _probe_task.done() or _probe_task.get_loop() is not asyncio.get_running_loop():
+        _probe_task = asyncio.create_task(_probe(timeout))
+    return await asyncio.shield(_probe_task)
+
+
+async def _probe(timeout: float) -> dict:
+    global _state, _checked_at
+    try:
+        result = await asyncio.wait_for(asyncio.to_thread(_check_database), timeout)
+    except asyncio.TimeoutError:
+        result = {"database": "disconnected", "error": f"Database check timed out after {timeout}s"}
+    except Exception as e:
+        result = {"database": "disconnected", "error": str(e)}
+
+    if result["error"] and (_state is None or not _state["error"]):
+        logger.warning("health_probe_failed", error=result["error"])
+    _state = {**result, "checked_at": _timestamp()}
+    _checked_at = time.monotonic()
+    return _state
+
+
+async def get_health(deep: bool = False) -> dict:
+    """
+    Get API health.
+
+    Shallow checks return the prober's cached database state (probing once
+    if it is missing or stale); deep checks probe now. Pool statistics are
+    in-process counters and always current.
+
+    Returns:
+        Dictionary with status, database, timestamp, checked_at, pool_status and error
+    """
+    if deep or _state is None or time.monotonic() - _checked_at > HEALTH_STALE_SECONDS:
+        state = await probe()
+    else:
+        state = _state
+
+    try:
+        pool_status = get_pool_status()
+    except Exception as e:
+        logger.warning("pool_status_failed", error=str(e))
+        pool_status = None
+
+    healthy = state["database"] == "connected"
+    return {
+        "status": "healthy" if healthy else "unhealthy",
+        "database": state["database"],
+        "timestamp": _timestamp(),
+        "checked_at": state["checked_at"],
+        "pool_status": pool_status if healthy else None,
+        "error": state["error"]
+    }
+
+
+def clear():
+    """Forget the cached state (used by tests)."""
+    global _state, _checked_at, _probe_task
+    _state = _probe_task = None
+    _checked_at = 0.0
+
+
+def start_prober(interval_seconds: float = HEALTH_PROBE_INTERVAL_SECONDS):
+    """Start the background health prober on the running event loop (idempotent)."""
+    return _prober.start(probe, interval_seconds)
+
+
+async def stop_prober():
+    """Cancel the background health prober and wait for it to exit."""
+    await _prober.stop()
@@ -0,0 +1,207 @@
+"""Zero-LLM heuristic scoring tier for instant provisional scores.
+
+The RAGAS answer is built as "The {key} is {value}." claims from the same
+rows that make up the contexts, so checking the claims against the rows
+would always pass. Faithfulness instead checks the rows against the SQL's
+select list: every selected value should come back as its own, named
+column, or the answer built from the row silently drops or mislabels it.
+Relevance and context utilization are approximated from column/keyword
+overlap between the question, the generated SQL and the returned columns.
+
+Scores use the same keys as ragas_service.evaluate() so they can be shown
+wherever RAGAS scores are shown.
+"""
+
+import os
+import re
+from typing import Dict
+
+# Same threshold the analysis report uses for weak queries
+WEAK_SCORE_THRESHOLD = float(os.getenv("HEURISTIC_WEAK_THRESHOLD", "0.7"))
+
+# Question keywords that indicate a column is relevant
+COLUMN_KEYWORDS = {
+    'employee_id': ('id', 'ids'),
+    'first_name': ('name', 'names', 'who', 'first'),
+    'last_name': ('name', 'names', 'who', 'last', 'surname'),
+    'department': ('department', 'departments', 'dept', 'team', 'teams', 'engineering',
+                   'marketing', 'sales', 'hr', 'finance'),
+    'role': ('role', 'roles', 'title', 'titles', 'position', 'positions', 'job', 'jobs'),
+    'employment_status': ('status', 'active', 'terminated', 'employed'),
+    'hire_date': ('hired', 'hire', 'hires', 'joined', 'started', 'tenure', 'recent', 'recently'),
+    'leave_type': ('leave', 'parental', 'medical', 'sick', 'absence'),
+    'salary_local': ('local', 'currency'),
+    'salary_usd': ('salary', 'salaries', 'paid', 'pay', 'earn', 'earns', 'earner', 'earners',
+                   'earning', 'compensation', 'usd', 'wage', 'wages'),
+    'manager_name': ('manager', 'managers', 'managed', 'manages', 'reports', 'report', 'reporting'),
+}
+
+# Columns that identify an employee and are useful in any listing
+IDENTITY_COLUMNS = {'employee_id', 'first_name', 'last_name'}
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Select-list parsing for _faithfulness()
+_SELECT_TOKEN = re.compile(r"""[(),'"]|\b(?:select|from)\b""", re.IGNORECASE)
+_DISTINCT = re.compile(r"^\s*distinct\s+(?:on\s*\(.*?\)\s*)?", re.IGNORECASE | re.DOTALL)
+_IDENTIFIER = r'(?:"[^"]+"|[a-z_][a-z0-9_]*)'
+_ALIAS = re.compile(rf"\bas\s+({_IDENTIFIER})$", re.IGNORECASE)
+# An alias without AS: an identifier after a complete expression (column, call, literal or CASE ... END)
+_IMPLICIT_ALIAS = re.compile(rf"""(\S*[\w)'"\]])\s+({_IDENTIFIER})$""", re.IGNORECASE)
+# Trailing words that end an expression rather than name it, and words an operand follows
+_NOT_ALIASES = {'end', 'null', 'true', 'false', 'unknown'}
+_OPERATOR_WORDS = {'and', 'or', 'not', 'is', 'in', 'like', 'ilike', 'similar', 'between', 'case', 'when',
+                   'then', 'else', 'distinct', 'from', 'interval', 'date', 'time', 'timestamp'}
+_COLUMN = re.compile(rf"(?:{_IDENTIFIER}\.)?{_IDENTIFIER}", re.IGNORECASE)
+_FUNCTION = re.compile(r"([a-z_][a-z0-9_]*)\s*\(", re.IGNORECASE)
+_CAST = re.compile(r"(?:\s*::\s*[a-z_][a-z0-9_]*(?:\s*\([0-9,\s]*\))?)+$", re.IGNORECASE)
+
+
+def _question_columns(nl_query: str) -> set:
+    """Columns the question refers to via keywords."""
+    words = set(_WORD.findall(nl_query.lower()))
+    return {column for column, keywords in COLUMN_KEYWORDS.items() if words.intersection(keywords)}
+
+
+def _sql_columns(sql: str) -> set:
+    """Known employee columns referenced anywhere in the SQL."""
+    sql_lower = (sql or "").lower()
+    return {column for column in COLUMN_KEYWORDS if re.search(rf"\b{column}\b", sql_lower)}
+
+
+def _select_items(sql: str) -> list | None:
+    """Top-level items of the outermost SELECT list (None when there is none)."""
+    sql = sql or ""
+    depth = 0
+    quote = None
+    select_end = None
+    items, start = [], None
+    for match in _SELECT_TOKEN.finditer(sql):
+        token = match.group()
+        if quote:
+            quote = None if token == quote else quote
+        elif token in ("'", '"'):
+            quote = token
+        elif token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif depth == 0 and token.lower() == "select" and select_end is None:
+            select_end = start = match.end()
+        elif depth == 0 and select_end is not None and token.lower() == "from":
+            items.append(sql[start:match.start()])
+            break
+        elif depth == 0 and select_end is not None and token == ",":
+            items.append(sql[start:match.start()])
+            start = match.end()
+    else:
+        if select_end is None:
+            return None
+        items.append(sql[start:])
+
+    items[0] = _DISTINCT.sub("", items[0])
+    return [item.strip() for item in items]
+
+
+def _output_name(item: str) -> str | None:
+    """Column name Postgres gives a select item ('?column?' when unnamed, None for *)."""
+    if item == "*" or item.endswith(".*"):
+        return None
+    alias = _ALIAS.search(item)
+    if alias:
+        return _identifier_name(alias.group(1))
+    implicit = _IMPLICIT_ALIAS.search(item)
+    if (implicit and implicit.group(2).lower() not in _NOT_ALIASES
+            and implicit.group(1).lower() not in _OPERATOR_WORDS):
+        return _identifier_name(implicit.group(2))
+
+    # A trailing cast keeps the name of the casted column or function
+    item = _CAST.sub("", item)
+    function = _FUNCTION.match(item)
+    if _COLUMN.fullmatch(item):
+        return _identifier_name(item.rsplit(".", 1)[-1])
+    if function and item.endswith(")") and _closes_at_end(item, function.end() - 1):
+        return function.group(1).lower()
+    return "?column?"
+
+
+def _closes_at_end(text: str, open_index: int) -> bool:
+    """Whether the parenthesis at open_index is closed by the last character."""
+    depth = 0
+    for index in range(open_index, len(text)):
+        depth += {"(": 1, ")": -1}.get(text[index], 0)
+        if depth == 0:
+            return index == len(text) - 1
+    return False
+
+
+def _identifier_name(name: str) -> str:
+    """Name of an SQL identifier as it comes back (unquoted names fold to lower case)."""
+    return name[1:-1] if name.startswith('"') else name.lower()
+
+
+def _faithfulness(sql: str, results: list) -> float:
+    """Fraction of selected values returned under a distinct, meaningful column name."""
+    items = _select_items(sql)
+    if not results or not items:
+        # "No results were found" is faithful to an empty context
+        return 1.0
+
+    result_columns = set(results[0].keys())
+    names = [_output_name(item) for item in items]
+    supported = sum(
+        name is None
+        or (name != "?column?" and names.count(name) == 1 and name in result_columns)
+        for name in names
+    )
+    return supported / len(names)
+
+
+def _context_utilization(question_columns: set, sql_columns: set, result_columns: set) -> float:
+    """Fraction of returned columns that the question or the SQL predicates make use of."""
+    if not result_columns:
+        return 1.0
+
+    useful = question_columns | sql_columns | IDENTITY_COLUMNS
+    # Computed columns (COUNT(*) AS employee_count, ...) exist because the SQL asked for them
+    computed = {column for column in result_columns if column not in COLUMN_KEYWORDS}
+    return len((result_columns & useful) | computed) / len(result_columns)
+
+
+def _answer_relevance(question_columns: set, sql_columns: set, result_columns: set) -> float:
+    """Fraction of question concepts covered by the SQL or the returned columns."""
+    # Identity keywords ("who", "name") are satisfied by any listing
+    concepts = question_columns - IDENTITY_COLUMNS
+    if not concepts:
+        return 1.0 if result_columns else 0.5
+
+    covered = concepts & (sql_columns | result_columns)
+    return len(covered) / len(concepts)
+
+
+def score(nl_query: str, sql: str, results: list) -> Dict[str, float]:
+    """
+    Compute provisional scores without calling an LLM.
+
+    Args:
+        nl_query: Natural language query string
+        sql: Generated SQL query
+        results: Query results as list of dicts
+
+    Returns:
+        Dictionary with faithfulness, answer_relevance, context_utilization scores
+    """
+    question_columns = _question_columns(nl_query)
+    sql_columns = _sql_columns(sql)
+    result_columns = set(results[0].keys()) if results else set()
+
+    return {
+        'faithfulness': round(_faithfulness(sql, results), 2),
+        'answer_relevance': round(_answer_relevance(question_columns, sql_columns, result_columns), 2),
+        'context_utilization': round(_context_utilization(question_columns, sql_columns, result_columns), 2),
+    }
+
+
+def is_weak(scores: Dict[str, float]) -> bool:
+    """Check whether any provisional score falls below the weak-query threshold."""
+    return any(value < WEAK_SCORE_THRESHOLD for value in scores.values())
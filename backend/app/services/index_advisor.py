@@ -0,0 +1,434 @@
+"""Index recommendations from the SQL the LLM actually generates.
+
+Distinct generated_sql statements (one per sql_fingerprint, weighted by how
+often it was logged) are replayed through EXPLAIN (never executed). Plan nodes
+that touch more than min_rows rows are hotspots:
+- Seq Scan over a large table with an indexable filter: equality columns
+  first, then one range column, becomes a composite index; a column that is
+  mostly NULL and filtered by a non-NULL value makes it a partial index
+  (WHERE column IS NOT NULL)
+- Sort of a table scan's rows: the scan's equality columns followed by the
+  sort keys, so the index returns rows already ordered
+
+Candidates already served by an existing index (same leading columns) are
+dropped; the rest are ranked by estimated planner cost saved across all logged
+executions. With the hypopg extension installed the saving is measured by
+re-planning with a hypothetical index; otherwise it is estimated from the
+hotspot's cost and selectivity.
+
+Everything runs in one transaction that is rolled back, with parallel
+plans disabled so row estimates are per table rather than per worker.
+"""
+
+import re
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func, text
+import structlog
+
+from app.db.session import get_db_session
+from app.db.models import QueryLog
+from app.services.validation_service import validate_sql
+
+logger = structlog.get_logger()
+
+DEFAULT_MIN_ROWS = 10_000
+DEFAULT_STATEMENT_LIMIT = 500
+EXPLAIN_TIMEOUT_MS = 5000
+# Columns at least this NULL get partial indexes when the filter excludes NULLs
+PARTIAL_NULL_FRACTION = 0.5
+MAX_INDEX_COLUMNS = 3
+# Postgres' default random_page_cost: an index fetch costs ~4x a sequential read per row
+RANDOM_PAGE_COST = 4.0
+POSTGRES_MAX_IDENTIFIER = 63
+
+SCAN_NODES = ('Seq Scan',)
+PREDICATE = re.compile(
+    r"^\(*(?:\w+\.)?(?P<column>\w+)\)*(?:::[\w ]+(?:\[\])?)?\s+"
+    r"(?P<op>=|<=|>=|<|>|IS NOT NULL|IS NULL)(?P<rest>.*)$"
+)
+# Right-hand sides that are constants (literals, parameters, CURRENT_DATE arithmetic, ANY arrays)
+CONSTANT = re.compile(r"^[\s(]*('|-?\d|\$\d|CURRENT_|LOCALTIMESTAMP|now\(\)|ANY\b)", re.IGNORECASE)
+SORT_KEY = re.compile(r"^\(*(?:\w+\.)?(?P<column>\w+)\)*(?: (?P<direction>DESC|ASC))?(?: NULLS (?:FIRST|LAST))?$")
+
+
+def strip_parens(condition: str) -> str:
+    """Remove parentheses that wrap the whole condition."""
+    condition = condition.strip()
+    while condition.startswith("(") and _closing_paren(condition) == len(condition) - 1:
+        condition = condition[1:-1].strip()
+    return condition
+
+
+def _closing_paren(condition: str) -> int:
+    """Index of the parenthesis closing the one at position 0 (-1 if unbalanced)."""
+    depth, quoted = 0, False
+    for index, char in enumerate(condition):
+        if char == "'":
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+            if depth == 0:
+                return index
+    return -1
+
+
+def split_conjuncts(condition: str) -> Optional[List[str]]:
+    """Top-level AND terms of a plan condition, or None when it has a top-level OR."""
+    condition = strip_parens(condition)
+    terms, depth, quoted, start = [], 0, False, 0
+    index = 0
+    while index < len(condition):
+        char = condition[index]
+        if char == "'":
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0:
+            if condition.startswith(" OR ", index):
+                return None
+            if condition.startswith(" AND ", index):
+                terms.append(condition[start:index])
+                start = index + len(" AND ")
+                index = start
+                continue
+        index += 1
+    terms.append(condition[start:])
+    return [strip_parens(term) for term in terms]
+
+
+def parse_predicate(term: str) -> Optional[Tuple[str, str]]:
+    """
+    (column, kind) of a single-column comparison with a constant, else None.
+
+    kind is 'eq' (= or = ANY), 'range' (<, <=, >, >=), 'is_null' or 'not_null'.
+    LIKE, <> and expressions over columns are not btree-indexable as written.
+    """
+    match = PREDICATE.match(strip_parens(term))
+    if not match:
+        return None
+    op, rest = match.group("op"), match.group("rest")
+    if op == "IS NULL":
+        return (match.group("column"), 'is_null') if not rest.strip() else None
+    if op == "IS NOT NULL":
+        return (match.group("column"), 'not_null') if not rest.strip() else None
+    if not CONSTANT.match(rest):
+        return None
+    return match.group("column"), 'eq' if op == "=" else 'range'
+
+
+def _nodes(plan: Dict):
+    """Nodes of a plan tree, depth first."""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+def find_hotspots(plan: Dict, table_rows: Dict[str, float], min_rows: int = DEFAULT_MIN_ROWS) -> List[Dict]:
+    """
+    Seq scans and sorts in a plan that process at least min_rows rows.
+
+    Args:
+        plan: Root "Plan" object of EXPLAIN (FORMAT JSON)
+        table_rows: Estimated rows per relation (pg_class.reltuples)
+        min_rows: Smallest scan or sort worth indexing
+
+    Returns:
+        List of dictionaries with node, relation, rows, cost and either filter
+        (scans) or sort_key and scan_filter (sorts)
+    """
+    hotspots = []
+    for node in _nodes(plan):
+        node_type = node.get("Node Type")
+        if node_type in SCAN_NODES and node.get("Filter"):
+            rows = table_rows.get(node.get("Relation Name"), 0)
+            if rows >= min_rows:
+                hotspots.append({
+                    "node": node_type, "relation": node["Relation Name"], "rows": rows,
+                    "matched_rows": node.get("Plan Rows", 0), "cost": node.get("Total Cost", 0.0),
+                    "filter": node["Filter"]
+                })
+        elif node_type == "Sort" and node.get("Plan Rows", 0) >= min_rows:
+            # Only sorts fed directly by a table scan can be replaced by an ordered index
+            child = (node.get("Plans") or [{}])[0]
+            if child.get("Node Type") in SCAN_NODES:
+                hotspots.append({
+                    "node": "Sort", "relation": child["Relation Name"], "rows": node["Plan Rows"],
+                    "cost": node.get("Total Cost", 0.0) - child.get("Total Cost", 0.0),
+                    "sort_key": node.get("Sort Key", []), "scan_filter": child.get("Filter")
+                })
+    return hotspots
+
+
+def _predicates(condition: Optional[str]) -> List[Tuple[str, str]]:
+    terms = split_conjuncts(condition) if condition else []
+    return [predicate for predicate in map(parse_predicate, terms or []) if predicate]
+
+
+def candidate_index(hotspot: Dict, null_fraction: Dict[str, float]) -> Optional[Dict]:
+    """
+    Index that would serve a hotspot, or None when its filter or sort keys are not indexable.
+
+    Returns:
+        Dictionary with table, columns (list of (column, 'ASC'/'DESC')) and
+        where (partial index predicate or None)
+    """
+    is_sort = hotspot["node"] == "Sort"
+    predicates = _predicates(hotspot["scan_filter"] if is_sort else hotspot["filter"])
+
+    equality = list(dict.fromkeys(column for column, kind in predicates if kind in ('eq', 'is_null')))
+    columns = [(column, 'ASC') for column in equality]
+    if is_sort:
+        for key in hotspot["sort_key"]:
+            match = SORT_KEY.match(key)
+            if not match:
+                return None  # Expression sort keys (aggregates, casts) need an expression index
+            columns.append((match.group("column"), match.group("direction") or 'ASC'))
+    else:
+        ranges = [column for column, kind in predicates if kind == 'range' and column not in equality]
+        columns += [(column, 'ASC') for column in ranges[:1]]
+
+    excludes_null = [column for column, kind in predicates if kind != 'is_null']
+    if not columns and not is_sort:
+        columns = [(column, 'ASC') for column in excludes_null[:1]]
+    if not columns:
+        return None
+
+    partial = next((column for column in excludes_null
+                    if null_fraction.get(column, 0.0) >= PARTIAL_NULL_FRACTION), None)
+    return {
+        "table": hotspot["relation"],
+        "columns": list(dict.fromkeys(columns))[:MAX_INDEX_COLUMNS],
+        "where": f"{partial} IS NOT NULL" if partial else None
+    }
+
+
+def estimated_saving(hotspot: Dict) -> float:
+    """
+    Planner cost an index would save on one execution (without hypopg).
+
+    Sorts save the sort itself. Scans keep RANDOM_PAGE_COST times the cost
+    share of the rows they match, so filters matching more than
+    1/RANDOM_PAGE_COST of the table save nothing.
+    """
+    if hotspot["node"] == "Sort":
+        return max(0.0, hotspot["cost"])
+    selectivity = hotspot["matched_rows"] / hotspot["rows"] if hotspot["rows"] else 1.0
+    return max(0.0, hotspot["cost"] * (1 - RANDOM_PAGE_COST * selectivity))
+
+
+def index_name(candidate: Dict) -> str:
+    parts = [column if direction == 'ASC' else f"{column}_desc" for column, direction in candidate["columns"]]
+    name = f"idx_{candidate['table']}_{'_'.join(parts)}" + ("_partial" if candidate["where"] else "")
+    return name[:POSTGRES_MAX_IDENTIFIER]
+
+
+def index_columns(candidate: Dict) -> str:
+    return ", ".join(column if direction == 'ASC' else f"{column} {direction}"
+                     for column, direction in candidate["columns"])
+
+
+def index_ddl(candidate: Dict, concurrently: bool = True) -> str:
+    """CREATE INDEX statement for a candidate."""
+    ddl = (f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}{index_name(candidate)} "
+           f"ON {candidate['table']} ({index_columns(candidate)})")
+    return ddl + (f" WHERE {candidate['where']}" if candidate["where"] else "")
+
+
+def is_covered(candidate: Dict, existing: List[Tuple[str, ...]]) -> bool:
+    """True when an existing full index starts with the candidate's columns."""
+    wanted = tuple(column for column, _ in candidate["columns"])
+    return any(columns[:len(wanted)] == wanted for columns in existing)
+
+
+def logged_statements(db, limit: int = DEFAULT_STATEMENT_LIMIT) -> List[Dict]:
+    """One generated_sql per fingerprint with its execution count, most frequent first."""
+    executions = func.count().label("executions")
+    rows = (
+        db.query(QueryLog.sql_fingerprint, func.min(QueryLog.generated_sql).label("sql"), executions)
+        .filter(QueryLog.sql_fingerprint.isnot(None))
+        .group_by(QueryLog.sql_fingerprint)
+        .order_by(executions.desc())
+        .limit(limit)
+        .all()
+    )
+    return [{"fingerprint": row.sql_fingerprint, "sql": row.sql, "executions": row.executions} for row in rows]
+
+
+def explain(db, sql: str) -> Dict:
+    """Root plan node of EXPLAIN (FORMAT JSON) for a validated SELECT."""
+    result = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    return result[0]["Plan"]
+
+
+def table_statistics(db, table: str) -> Dict:
+    """Estimated rows, per-column NULL fraction and existing full-index column lists of a table."""
+    rows = db.execute(text("SELECT reltuples FROM pg_class WHERE relname = :table AND relkind IN ('r', 'p')"),
+                      {"table": table}).scalar()
+    null_fraction = dict(db.execute(text(
+        "SELECT attname, null_frac FROM pg_stats WHERE schemaname = current_schema() AND tablename = :table"
+    ), {"table": table}).all())
+    indexes = db.execute(text("""
+        SELECT array_agg(a.attname ORDER BY k.position)
+        FROM pg_index i
+        JOIN pg_class t ON t.oid = i.indrelid
+        CROSS JOIN LATERAL unnest(i.indkey) WITH ORDINALITY AS k(attnum, position)
+        JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = k.attnum
+        WHERE t.relname = :table AND i.indpred IS NULL
+        GROUP BY i.indexrelid
+    """), {"table": table}).scalars().all()
+    return {"rows": max(rows or 0, 0), "null_fraction": null_fraction,
+            "indexes": [tuple(columns) for columns in indexes]}
+
+
+def hypopg_available(db) -> bool:
+    return bool(db.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'hypopg'")).scalar())
+
+
+def _hypothetical_saving(db, candidate: Dict, statements: List[Dict]) -> float:
+    """Planner cost saved across statements' executions with candidate as a hypothetical index."""
+    db.execute(text("SELECT indexrelid FROM hypopg_create_index(:ddl)"),
+               {"ddl": index_ddl(candidate, concurrently=False)})
+    try:
+        return sum(max(0.0, statement["cost"] - explain(db, statement["sql"])["Total Cost"]) * statement["executions"]
+                   for statement in statements)
+    finally:
+        db.execute(text("SELECT hypopg_reset()"))
+
+
+def advise(min_rows: int = DEFAULT_MIN_ROWS, limit: int = DEFAULT_STATEMENT_LIMIT,
+           use_hypopg: Optional[bool] = None) -> Dict:
+    """
+    Replay logged statements through EXPLAIN and rank candidate indexes.
+
+    Args:
+        min_rows: Smallest scan or sort worth indexing
+        limit: Distinct fingerprints to replay (most frequent first)
+        use_hypopg: Measure savings with hypothetical indexes (default: when installed)
+
+    Returns:
+        Dictionary with statements (replayed count), skipped (failed to
+        plan), hotspots, benefit_source ('hypopg' or 'estimate') and
+        candidates ranked by benefit, each with name, ddl, benefit,
+        executions and fingerprints
+    """
+    db = get_db_session()
+    try:
+        db.execute(text("SET LOCAL max_parallel_workers_per_gather = 0"))
+        db.execute(text(f"SET LOCAL statement_timeout = {EXPLAIN_TIMEOUT_MS}"))
+        use_hypopg = hypopg_available(db) if use_hypopg is None else use_hypopg
+
+        statements = logged_statements(db, limit)
+        tables, hotspots, candidates, skipped = {}, [], {}, 0
+        for statement in statements:
+            try:
+                validate_sql(statement["sql"])
+                with db.begin_nested():
+                    plan = explain(db, statement["sql"])
+            except Exception as e:
+                skipped += 1
+                logger.warning("index_advisor_explain_failed", fingerprint=statement["fingerprint"], error=str(e))
+                continue
+            statement["cost"] = plan.get("Total Cost", 0.0)
+
+            relations = {node["Relation Name"] for node in _nodes(plan) if "Relation Name" in node}
+            for relation in relations - tables.keys():
+                tables[relation] = table_statistics(db, relation)
+            table_rows = {relation: stats["rows"] for relation, stats in tables.items()}
+
+            for hotspot in find_hotspots(plan, table_rows, min_rows):
+                hotspot["fingerprint"] = statement["fingerprint"]
+                hotspots.append(hotspot)
+                stats = tables[hotspot["relation"]]
+                candidate = candidate_index(hotspot, stats["null_fraction"])
+                if candidate is None or is_covered(candidate, stats["indexes"]):
+                    continue
+                entry = candidates.setdefault(index_name(candidate), {
+                    **candidate, "name": index_name(candidate), "ddl": index_ddl(candidate),
+                    "benefit": 0.0, "executions": 0, "statements": []
+                })
+                if statement not in entry["statements"]:
+                    entry["statements"].append(statement)
+                    entry["executions"] += statement["executions"]
+                entry["benefit"] += estimated_saving(hotspot) * statement["executions"]
+
+        if use_hypopg:
+            for entry in candidates.values():
+                entry["benefit"] = _hypothetical_saving(db, entry, entry["statements"])
+    finally:
+        db.rollback()
+        db.close()
+
+    ranked = sorted(candidates.values(), key=lambda entry: entry["benefit"], reverse=True)
+    for entry in ranked:
+        entry["benefit"] = round(entry["benefit"], 1)
+        entry["fingerprints"] = [statement["fingerprint"] for statement in entry.pop("statements")]
+    logger.info("index_advice_computed", statements=len(statements), skipped=skipped,
+                hotspots=len(hotspots), candidates=len(ranked))
+    return {
+        "statements": len(statements) - skipped,
+        "skipped": skipped,
+        "hotspots": hotspots,
+        "benefit_source": 'hypopg' if use_hypopg else 'estimate',
+        "candidates": [entry for entry in ranked if entry["benefit"] > 0]
+    }
+
+
+def next_revision(versions_dir: Path) -> Tuple[str, str]:
+    """(new revision, down revision) after the highest NNN_ migration in versions_dir."""
+    numbers = [int(match.group(1)) for path in versions_dir.glob("*.py")
+               if (match := re.match(r"^(\d{3})_", path.name))]
+    latest = max(numbers)
+    return f"{latest + 1:03d}", f"{latest:03d}"
+
+
+def render_migration(candidates: List[Dict], revision: str, down_revision: str,
+                     created: Optional[date] = None) -> str:
+    """Alembic migration creating candidates concurrently (and dropping them on downgrade)."""
+    indexes = "\n".join(
+        f"    ({candidate['name']!r}, {candidate['table']!r}, {index_columns(candidate)!r}, "
+        f"{candidate['where']!r}),  # benefit {candidate['benefit']:,.0f}"
+        for candidate in candidates
+    )
+    return f'''"""add indexes advised from logged generated SQL
+
+Revision ID: {revision}
+Revises: {down_revision}
+Create Date: {(created or date.today()).isoformat()}
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = {revision!r}
+down_revision: Union[str, None] = {down_revision!r}
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, partial index predicate), ranked by estimated planner cost saved
+INDEXES = (
+{indexes}
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps the tables writable while building; it cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            predicate = f" WHERE {{where}}" if where else ""
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {{name}} ON {{table}} ({{columns}}){{predicate}}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {{name}}")
+'''
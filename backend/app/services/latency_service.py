@@ -0,0 +1,93 @@
+"""Latency percentiles over query_logs execution and stage timings."""
+
+from datetime import datetime, timedelta
+from typing import Dict
+from sqlalchemy import func, cast, Date
+import structlog
+
+from app.db.session import get_db_session
+from app.db.models import QueryLog
+
+logger = structlog.get_logger()
+
+DEFAULT_WINDOW_DAYS = 30
+MAX_WINDOW_DAYS = 365
+
+PERCENTILES = (('p50', 0.5), ('p90', 0.9), ('p99', 0.99))
+
+# (metric name, milliseconds column); stages are NULL for rows logged before they were recorded
+LATENCY_COLUMNS = (
+    ('total', QueryLog.execution_time_ms),
+    ('llm', QueryLog.llm_time_ms),
+    ('validation', QueryLog.validation_time_ms),
+    ('db', QueryLog.db_time_ms),
+)
+
+
+def _percentile_columns():
+    """percentile_cont aggregates for every metric, labelled <metric>_<pN>."""
+    return [
+        func.percentile_cont(fraction).within_group(column).label(f"{name}_{label}")
+        for name, column in LATENCY_COLUMNS
+        for label, fraction in PERCENTILES
+    ]
+
+
+def _format(row) -> Dict:
+    """Shape one aggregate row as {count, <metric>: {p50, p90, p99}}."""
+    def value(name, label):
+        result = getattr(row, f"{name}_{label}")
+        return round(float(result), 1) if result is not None else None
+
+    return {
+        "count": int(row.count),
+        **{name: {label: value(name, label) for label, _ in PERCENTILES} for name, _ in LATENCY_COLUMNS}
+    }
+
+
+def get_latency_report(days: int = DEFAULT_WINDOW_DAYS) -> Dict:
+    """
+    Compute latency percentiles for the last `days` days.
+
+    Percentiles come from percentile_cont in SQL, overall, per query type and
+    per day, for the total execution time and each recorded stage (LLM, SQL
+    validation, database). Only rows in the window are read, via idx_created_at.
+
+    Args:
+        days: Window size in days
+
+    Returns:
+        Dictionary with window_days, overall, by_query_type and by_day; each
+        entry has count and {p50, p90, p99} in milliseconds per metric
+        (None where a stage has no timings)
+    """
+    since = datetime.now() - timedelta(days=days)
+    day = cast(QueryLog.created_at, Date)
+
+    db = get_db_session()
+    try:
+        in_window = QueryLog.created_at >= since
+        overall = db.query(func.count().label("count"), *_percentile_columns()).filter(in_window).one()
+        by_type = (
+            db.query(QueryLog.query_type, func.count().label("count"), *_percentile_columns())
+            .filter(in_window)
+            .group_by(QueryLog.query_type)
+            .all()
+        )
+        by_day = (
+            db.query(day.label("day"), func.count().label("count"), *_percentile_columns())
+            .filter(in_window)
+            .group_by(day)
+            .order_by(day)
+            .all()
+        )
+    finally:
+        db.close()
+
+    return {
+        "window_days": days,
+        "overall": _format(overall),
+        # Rows not yet backfilled with a query_type are reported as 'unclassified'
+        "by_query_type": {row.query_type or 'unclassified': _format(row) for row in by_type},
+        "by_day": [{"day": row.day.isoformat(), **_format(row)} for row in by_day]
+    }
@@ -0,0 +1,119 @@
+"""Prometheus metrics for the query pipeline, exposed at GET /metrics.
+
+With several uvicorn workers, set PROMETHEUS_MULTIPROC_DIR to an empty
+directory shared by the workers (wiped before they start): every process
+writes its samples there and /metrics aggregates all of them, whichever
+worker serves the scrape.
+"""
+
+import os
+import time
+from sqlalchemy import event
+from sqlalchemy.pool import Pool
+from prometheus_client import (
+    REGISTRY, CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram,
+    generate_latest, multiprocess
+)
+
+# Pipeline stages timed by query_service (label values of hr_query_stage_seconds)
+STAGES = ('sanitize', 'llm', 'validate', 'db_execute', 'serialize', 'log_insert')
+
+STAGE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0)
+EVALUATION_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 45.0, 60.0, 90.0, 120.0)
+
+# Outcomes of one RAGAS metric (label values of hr_evaluation_metric_seconds)
+METRIC_OUTCOMES = ('completed', 'timeout', 'error')
+
+STAGE_SECONDS = Histogram(
+    "hr_query_stage_seconds", "Time spent in each query pipeline stage", ["stage"], buckets=STAGE_BUCKETS
+)
+QUERY_SECONDS = Histogram(
+    "hr_query_duration_seconds", "End-to-end execution time of POST /api/query", buckets=QUERY_BUCKETS
+)
+EVALUATION_METRIC_SECONDS = Histogram(
+    "hr_evaluation_metric_seconds", "Time scoring each RAGAS metric, from the start of its job",
+    ["metric", "outcome"], buckets=EVALUATION_BUCKETS
+)
+QUERY_ERRORS = Counter(
+    "hr_query_errors_total", "Failed queries by error type", ["error_type"]
+)
+# livesum: summed over live worker processes
+POOL_CHECKED_OUT = Gauge(
+    "hr_db_pool_checked_out", "Database connections currently checked out of the pool",
+    multiprocess_mode="livesum"
+)
+EVALUATIONS_IN_FLIGHT = Gauge(
+    "hr_evaluations_in_flight", "RAGAS evaluations started and not yet finished (evaluation queue depth)",
+    multiprocess_mode="livesum"
+)
+
+
+class StageTimer:
+    """Context manager timing one pipeline stage; exposes the elapsed time as .ms."""
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.seconds = 0.0
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.seconds = time.perf_counter() - self._started
+        STAGE_SECONDS.labels(self.stage).observe(self.seconds)
+        return False
+
+    @property
+    def ms(self) -> int:
+        return int(self.seconds * 1000)
+
+
+def time_stage(stage: str) -> StageTimer:
+    """Time a block as one of STAGES."""
+    return StageTimer(stage)
+
+
+def record_query(execution_time_ms: int, error_type: str | None):
+    """Record one finished /api/query request."""
+    QUERY_SECONDS.observe(execution_time_ms / 1000)
+    if error_type:
+        QUERY_ERRORS.labels(error_type).inc()
+
+
+@event.listens_for(Pool, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    POOL_CHECKED_OUT.inc()
+
+
+@event.listens_for(Pool, "checkin")
+def _on_checkin(dbapi_connection, connection_record):
+    POOL_CHECKED_OUT.dec()
+
+
+@event.listens_for(Pool, "detach")
+def _on_detach(dbapi_connection, connection_record):
+    # Detached connections (e.g. the LISTEN connection) never check back in
+    POOL_CHECKED_OUT.dec()
+
+
+def render() -> tuple:
+    """
+    Render all metrics in the Prometheus text format.
+
+    Returns:
+        (body bytes, content type)
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead():
+    """Drop this worker's live gauges from the multi-process aggregate (call on shutdown)."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(os.getpid())
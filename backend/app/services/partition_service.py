@@ -0,0 +1,217 @@
+"""Monthly partition maintenance and retention for query_logs.
+
+query_logs is range-partitioned by created_at into query_logs_YYYY_MM tables
+(migration 012). Maintenance keeps PARTITION_MONTHS_AHEAD future partitions
+created so inserts never land in query_logs_default (rows that did, e.g.
+after a long outage, are moved into their month's partition when it is
+created), and applies retention:
+partitions whose whole month is older than QUERY_LOG_RETENTION_MONTHS are
+detached (kept as standalone tables for archiving) or dropped. Expired rows
+stranded in query_logs_default get their month's partition created first,
+so they are detached or dropped with it like any other month.
+
+Removing a partition subtracts its days from query_log_stats in the same
+transaction, so the analysis report keeps matching the rows that remain.
+
+Only one replica maintains at a time: each run holds a transaction-level
+advisory lock (periodic.try_advisory_lock).
+"""
+
+import os
+import re
+import asyncio
+from datetime import date
+from typing import Dict, List
+from sqlalchemy import text
+import structlog
+
+from app.db.session import get_db_session
+from app.db.models import QueryLogStats
+from app.services import report_cache, periodic
+
+logger = structlog.get_logger()
+
+MAINTENANCE_LOCK_KEY = 726_002
+
+PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+# 0 keeps every partition
+RETENTION_MONTHS = int(os.getenv("QUERY_LOG_RETENTION_MONTHS", "0"))
+# 'detach' keeps expired partitions as standalone tables (see archive job); 'drop' deletes them
+RETENTION_MODE = os.getenv("QUERY_LOG_RETENTION_MODE", "detach")
+MAINTENANCE_INTERVAL_SECONDS = int(os.getenv("PARTITION_MAINTENANCE_INTERVAL_SECONDS", "21600"))
+
+# Catch-all partition for rows outside the monthly partitions (migration 012)
+DEFAULT_PARTITION = "query_logs_default"
+
+PARTITION_NAME = re.compile(r"^query_logs_(\d{4})_(\d{2})$")
+
+_maintenance = periodic.PeriodicJob("partition_maintenance")
+
+
+def month_start(day: date) -> date:
+    """First day of the month containing day."""
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    """Shift a first-of-month date by a number of months."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Name of the partition holding the given month."""
+    return f"query_logs_{month.year:04d}_{month.month:02d}"
+
+
+def partition_month(name: str) -> date | None:
+    """Month of a query_logs_YYYY_MM table name (None for other tables)."""
+    match = PARTITION_NAME.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def list_partitions(db) -> List[date]:
+    """Months that currently have an attached query_logs partition, oldest first."""
+    names = db.execute(text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = 'query_logs'
+    """)).scalars()
+    return sorted(month for month in map(partition_month, names) if month is not None)
+
+
+def missing_partitions(existing: List[date], today: date, months_ahead: int) -> List[date]:
+    """Months from the current one through months_ahead that lack a partition."""
+    current = month_start(today)
+    wanted = [add_months(current, offset) for offset in range(months_ahead + 1)]
+    return [month for month in wanted if month not in existing]
+
+
+def expired_partitions(existing: List[date], today: date, retention_months: int) -> List[date]:
+    """Months entirely older than the retention window (none when retention is off)."""
+    if retention_months <= 0:
+        return []
+    cutoff = add_months(month_start(today), -retention_months)
+    return [month for month in existing if month < cutoff]
+
+
+def expired_default_months(db, today: date, retention_months: int) -> List[date]:
+    """Months older than the retention window that still have rows in query_logs_default."""
+    if retention_months <= 0:
+        return []
+    cutoff = add_months(month_start(today), -retention_months)
+    return sorted(db.execute(text(f"""
+        SELECT DISTINCT date_trunc('month', created_at)::date
+        FROM {DEFAULT_PARTITION}
+        WHERE created_at < :cutoff
+    """), {"cutoff": cutoff}).scalars())
+
+
+def _create_partition(db, month: date) -> int:
+    """
+    Create a month's partition, moving in any of its rows that landed in query_logs_default.
+
+    CREATE TABLE ... PARTITION OF fails while the default partition holds rows
+    in the new range, so the table is created standalone, filled from the
+    default partition and then attached (which builds the partitioned indexes).
+
+    Returns:
+        Number of rows moved out of the default partition
+    """
+    name = partition_name(month)
+    bounds = {"start": month, "end": add_months(month, 1)}
+    db.execute(text(f"CREATE TABLE {name} (LIKE query_logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    moved = db.execute(text(f"""
+        WITH moved AS (
+            DELETE FROM {DEFAULT_PARTITION} WHERE created_at >= :start AND created_at < :end RETURNING *
+        )
+        INSERT INTO {name} SELECT * FROM moved
+    """), bounds).rowcount
+    db.execute(text(
+        f"ALTER TABLE query_logs ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{bounds['start'].isoformat()}') TO ('{bounds['end'].isoformat()}')"
+    ))
+    if moved:
+        logger.warning("partition_rows_moved_from_default", partition=name, rows=moved)
+    return moved
+
+
+def _remove_partition(db, month: date, mode: str):
+    """Detach (and optionally drop) a partition and subtract it from query_log_stats."""
+    name = partition_name(month)
+    db.execute(text(f"ALTER TABLE query_logs DETACH PARTITION {name}"))
+    db.query(QueryLogStats).filter(
+        QueryLogStats.day >= month, QueryLogStats.day < add_months(month, 1)
+    ).delete(synchronize_session=False)
+    if mode == 'drop':
+        db.execute(text(f"DROP TABLE {name}"))
+
+
+def run_maintenance(today: date | None = None, months_ahead: int = PARTITION_MONTHS_AHEAD,
+                    retention_months: int = RETENTION_MONTHS, mode: str = RETENTION_MODE) -> Dict:
+    """
+    Create upcoming partitions and apply retention in one transaction.
+
+    Args:
+        today: Reference date (defaults to today)
+        months_ahead: Future months that must have a partition
+        retention_months: Full months of history to keep (0 keeps everything)
+        mode: 'detach' or 'drop' for expired partitions
+
+    Returns:
+        Dictionary with lock_acquired, created and removed (partition names)
+    """
+    if mode not in ('detach', 'drop'):
+        raise ValueError(f"Unknown retention mode: {mode}")
+    today = today or date.today()
+
+    db = get_db_session()
+    try:
+        if not periodic.try_advisory_lock(db, MAINTENANCE_LOCK_KEY):
+            db.rollback()
+            logger.debug("partition_maintenance_skipped", reason="lock held by another replica")
+            return {"lock_acquired": False, "created": [], "removed": []}
+
+        existing = list_partitions(db)
+        created = missing_partitions(existing, today, months_ahead)
+        removed = expired_partitions(existing, today, retention_months)
+        stranded = expired_default_months(db, today, retention_months)
+
+        for month in created + stranded:
+            _create_partition(db, month)
+        removed = sorted(removed + stranded)
+        for month in removed:
+            _remove_partition(db, month, mode)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    if removed:
+        report_cache.invalidate()
+    if created or removed:
+        logger.info("partition_maintenance_completed",
+            created=[partition_name(month) for month in created],
+            removed=[partition_name(month) for month in removed],
+            mode=mode
+        )
+
+    return {
+        "lock_acquired": True,
+        "created": [partition_name(month) for month in created],
+        "removed": [partition_name(month) for month in removed]
+    }
+
+
+def start_maintenance(interval_seconds: int = MAINTENANCE_INTERVAL_SECONDS):
+    """Start periodic partition maintenance on the running event loop (idempotent)."""
+    return _maintenance.start(lambda: asyncio.to_thread(run_maintenance), interval_seconds)
+
+
+async def stop_maintenance():
+    """Cancel periodic partition maintenance and wait for it to exit."""
+    await _maintenance.stop()
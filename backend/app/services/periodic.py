@@ -0,0 +1,64 @@
+"""Periodic background jobs shared by the services.
+
+A PeriodicJob runs a coroutine forever on the event loop, sleeping between
+runs and logging (not raising) its failures, so one bad run never stops the
+job. Jobs that touch shared tables take a Postgres advisory lock per run so
+only one replica does the work.
+"""
+
+import asyncio
+from typing import Awaitable, Callable
+from sqlalchemy import text
+import structlog
+
+logger = structlog.get_logger()
+
+
+def try_advisory_lock(db, key: int) -> bool:
+    """
+    Take a transaction-level advisory lock without waiting.
+
+    Args:
+        db: Session whose transaction holds the lock until commit or rollback
+        key: Lock key shared by all replicas (arbitrary, must be unique per job)
+
+    Returns:
+        True if this session holds the lock, False if another replica does
+    """
+    return db.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": key}).scalar()
+
+
+class PeriodicJob:
+    """A named coroutine run on the event loop every interval_seconds."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._task = None
+
+    async def _loop(self, run: Callable[[], Awaitable], interval_seconds: float):
+        while True:
+            try:
+                await run()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"{self.name}_failed", error=str(e))
+            await asyncio.sleep(interval_seconds)
+
+    def start(self, run: Callable[[], Awaitable], interval_seconds: float) -> asyncio.Task:
+        """Start running the job on the running event loop (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop(run, interval_seconds))
+            logger.info(f"{self.name}_started", interval_seconds=interval_seconds)
+        return self._task
+
+    async def stop(self):
+        """Cancel the job and wait for it to exit."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -0,0 +1,114 @@
+"""Opt-in cProfile profiling of POST /api/query requests.
+
+A request is profiled when it carries X-Profile-Token matching
+PROFILE_ADMIN_TOKEN, or at random with probability PROFILE_SAMPLE_RATE. The
+profile is saved as PROFILE_DIR/<X-Request-ID>.prof (pstats format, open with
+`python -m pstats` or snakeviz) and downloaded from GET /api/profiles/{id}.
+
+With neither setting configured ENABLED is False and the route skips
+profiling entirely. Sampling without a token is refused at startup
+(validate_settings): the sampled profiles could never be downloaded. cProfile follows the event loop thread, so coroutines of
+other requests that run while the profiled one awaits appear in its profile.
+"""
+
+import os
+import hmac
+import uuid
+import random
+import cProfile
+from contextlib import contextmanager
+import structlog
+
+logger = structlog.get_logger()
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+# Oldest profiles are removed beyond this many files
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "200"))
+PROFILE_HEADER = "X-Profile-Token"
+
+ENABLED = bool(PROFILE_ADMIN_TOKEN) or PROFILE_SAMPLE_RATE > 0
+
+# Only one cProfile profiler can be active per thread (the event loop's)
+_active = False
+
+
+def validate_settings():
+    """
+    Check the profiling settings on startup.
+
+    Raises:
+        RuntimeError: If PROFILE_SAMPLE_RATE is set without PROFILE_ADMIN_TOKEN
+    """
+    if PROFILE_SAMPLE_RATE > 0 and not PROFILE_ADMIN_TOKEN:
+        logger.error("profiling_misconfigured", sample_rate=PROFILE_SAMPLE_RATE,
+                     reason="PROFILE_SAMPLE_RATE requires PROFILE_ADMIN_TOKEN to download profiles")
+        raise RuntimeError("PROFILE_SAMPLE_RATE requires PROFILE_ADMIN_TOKEN: "
+                           "sampled profiles can only be downloaded with the admin token")
+
+
+def is_admin(token: str | None) -> bool:
+    """Check a token against PROFILE_ADMIN_TOKEN (always False when no token is configured)."""
+    # compare_digest rejects str with non-ASCII characters, which headers can carry
+    return (bool(PROFILE_ADMIN_TOKEN) and token is not None
+            and hmac.compare_digest(token.encode(), PROFILE_ADMIN_TOKEN.encode()))
+
+
+def should_profile(headers) -> bool:
+    """Decide whether to profile a request: admin token header, else sampling."""
+    if is_admin(headers.get(PROFILE_HEADER)):
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def profile_path(request_id: str, directory: str = PROFILE_DIR) -> str | None:
+    """Path of a request's profile (None when request_id is not a UUID)."""
+    try:
+        request_id = str(uuid.UUID(request_id))
+    except ValueError:
+        return None
+    return os.path.join(directory, f"{request_id}.prof")
+
+
+def _prune(directory: str, max_files: int):
+    profiles = sorted(
+        (entry for entry in os.scandir(directory) if entry.name.endswith(".prof")),
+        key=lambda entry: entry.stat().st_mtime
+    )
+    for entry in profiles[:max(len(profiles) - max_files, 0)]:
+        os.remove(entry.path)
+
+
+@contextmanager
+def profile(request_id: str, directory: str = PROFILE_DIR):
+    """
+    Profile the enclosed block and save it under the request ID.
+
+    While another request is being profiled the block runs unprofiled.
+    """
+    global _active
+    if _active:
+        logger.info("request_profile_skipped", request_id=request_id, reason="another profile is running")
+        yield None
+        return
+
+    profiler = cProfile.Profile()
+    _active = True
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        _active = False
+        path = profile_path(request_id, directory)
+        if path is None:
+            logger.warning("request_profile_skipped", request_id=request_id, reason="invalid request id")
+        else:
+            try:
+                os.makedirs(directory, exist_ok=True)
+                profiler.dump_stats(path)
+                _prune(directory, PROFILE_MAX_FILES)
+                logger.info("request_profiled", request_id=request_id, path=path)
+            except OSError as e:
+                logger.error("request_profile_save_failed", request_id=request_id, error=str(e))
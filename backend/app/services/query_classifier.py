@@ -0,0 +1,87 @@
+"""SQL pattern classification shared by query logging and reporting.
+
+classify_sql() and query_type_expression() are generated from the same
+QUERY_TYPE_RULES so a query is categorized identically in Python and in SQL.
+sql_fingerprint() groups queries that differ only in literal values.
+"""
+
+import re
+import hashlib
+from sqlalchemy import func, or_, case
+
+# SQL pattern types in priority order (most specific first); anything else is simple_select
+QUERY_TYPE_RULES = (
+    ('join', ('JOIN',)),
+    ('aggregation', ('DISTINCT', 'GROUP BY', 'COUNT(', 'SUM(', 'AVG(', 'MAX(', 'MIN(')),
+    ('date_range', ('INTERVAL', 'DATE_SUB', 'DATE_ADD', 'DATE(')),
+    ('where_filter', ('WHERE',)),
+)
+DEFAULT_QUERY_TYPE = 'simple_select'
+# Order in which types appear in reports
+QUERY_TYPES = ('simple_select', 'where_filter', 'date_range', 'aggregation', 'join')
+
+# Hex digits kept from the normalized SQL's SHA-1 (query_logs.sql_fingerprint)
+FINGERPRINT_LENGTH = 16
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def contains_any(column, keywords):
+    """Case-sensitive substring match of any keyword (strpos avoids LIKE wildcards in '_')."""
+    return or_(*(func.strpos(column, keyword) > 0 for keyword in keywords))
+
+
+def classify_sql(sql: str) -> str:
+    """
+    Categorize a SQL query by pattern type (see QUERY_TYPE_RULES).
+
+    Args:
+        sql: Generated SQL query
+
+    Returns:
+        One of QUERY_TYPES
+    """
+    sql_upper = sql.upper()
+    for query_type, keywords in QUERY_TYPE_RULES:
+        if any(keyword in sql_upper for keyword in keywords):
+            return query_type
+    return DEFAULT_QUERY_TYPE
+
+
+def query_type_expression(sql_column):
+    """SQL CASE expression equivalent to classify_sql() for a SQL text column."""
+    sql_upper = func.upper(sql_column)
+    return case(
+        *((contains_any(sql_upper, keywords), query_type) for query_type, keywords in QUERY_TYPE_RULES),
+        else_=DEFAULT_QUERY_TYPE
+    )
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Replace literals with '?' and canonicalize whitespace and case.
+
+    Lists of literals collapse to a single '?', so IN (1, 2) and IN (3)
+    normalize the same way.
+    """
+    normalized = _STRING_LITERAL.sub('?', sql)
+    normalized = _NUMBER_LITERAL.sub('?', normalized)
+    normalized = _PLACEHOLDER_LIST.sub('?', normalized)
+    normalized = _WHITESPACE.sub(' ', normalized).strip().rstrip(';').strip()
+    return normalized.upper()
+
+
+def sql_fingerprint(sql: str) -> str:
+    """
+    Hash of the literal-stripped SQL, shared by queries of the same shape.
+
+    Args:
+        sql: Generated SQL query
+
+    Returns:
+        FINGERPRINT_LENGTH hex characters
+    """
+    return hashlib.sha1(normalize_sql(sql).encode("utf-8")).hexdigest()[:FINGERPRINT_LENGTH]
@@ -0,0 +1,162 @@
+"""Paginated browsing of query history (query_logs)."""
+
+import base64
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy import and_, or_
+import structlog
+
+from app.db.session import get_db_session
+from app.db.models import QueryLog
+
+logger = structlog.get_logger()
+
+EVALUATION_STATUSES = ('pending', 'evaluating', 'completed', 'failed')
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Fields a client may request; id and created_at are always returned (they form the cursor)
+LOG_FIELDS = (
+    'id', 'created_at', 'natural_language_query', 'generated_sql', 'query_type', 'sql_fingerprint',
+    'evaluation_status', 'evaluation_updated_at', 'faithfulness_score', 'answer_relevance_score',
+    'context_precision_score', 'score_source', 'result_count', 'execution_time_ms', 'llm_time_ms',
+    'validation_time_ms', 'db_time_ms',
+)
+CURSOR_FIELDS = ('id', 'created_at')
+
+# Score filter name -> column (min_<name> / max_<name>)
+SCORE_FILTERS = {
+    'faithfulness': QueryLog.faithfulness_score,
+    'answer_relevance': QueryLog.answer_relevance_score,
+    'context_precision': QueryLog.context_precision_score,
+}
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """Opaque cursor for the position after (created_at, id)."""
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Parse a cursor from encode_cursor().
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_at, id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def resolve_fields(fields: Optional[Sequence[str]]) -> List[str]:
+    """
+    Validate a field projection (None for all fields).
+
+    Raises:
+        ValueError: If an unknown field is requested
+    """
+    if not fields:
+        return list(LOG_FIELDS)
+    unknown = [name for name in fields if name not in LOG_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return [name for name in LOG_FIELDS if name in CURSOR_FIELDS or name in fields]
+
+
+def _serialize(value):
+    """Convert column values to JSON-serializable types."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def build_query_logs_query(db, fields: Sequence[str], since: Optional[datetime] = None,
+                           until: Optional[datetime] = None, statuses: Optional[Sequence[str]] = None,
+                           score_range: Optional[Dict[str, tuple]] = None, after: Optional[tuple] = None,
+                           limit: int = DEFAULT_PAGE_SIZE):
+    """
+    Build the page query, newest first.
+
+    Filtering and ordering on (created_at, id) walk idx_created_at; the
+    keyset condition is written with a plain created_at <= bound so it stays
+    an index range scan rather than a row comparison.
+    """
+    query = db.query(*(getattr(QueryLog, name) for name in fields))
+
+    if since is not None:
+        query = query.filter(QueryLog.created_at >= since)
+    if until is not None:
+        query = query.filter(QueryLog.created_at < until)
+    if statuses:
+        query = query.filter(QueryLog.evaluation_status.in_(statuses))
+    for name, (minimum, maximum) in (score_range or {}).items():
+        column = SCORE_FILTERS[name]
+        if minimum is not None:
+            query = query.filter(column >= minimum)
+        if maximum is not None:
+            query = query.filter(column <= maximum)
+    if after is not None:
+        created_at, id = after
+        query = query.filter(and_(
+            QueryLog.created_at <= created_at,
+            or_(QueryLog.created_at < created_at, QueryLog.id < id)
+        ))
+
+    return query.order_by(QueryLog.created_at.desc(), QueryLog.id.desc()).limit(limit)
+
+
+def list_query_logs(since: Optional[datetime] = None, until: Optional[datetime] = None,
+                    statuses: Optional[Sequence[str]] = None, score_range: Optional[Dict[str, tuple]] = None,
+                    cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+                    fields: Optional[Sequence[str]] = None) -> Dict:
+    """
+    Get one page of query logs, newest first.
+
+    Args:
+        since: Only logs created at or after this time
+        until: Only logs created before this time
+        statuses: Only logs with one of these evaluation statuses
+        score_range: {score name: (min, max)} inclusive bounds (None for open)
+        cursor: next_cursor from the previous page
+        limit: Page size (1..MAX_PAGE_SIZE)
+        fields: Columns to return (None for all of LOG_FIELDS)
+
+    Returns:
+        Dictionary with items and next_cursor (None on the last page)
+
+    Raises:
+        ValueError: If the cursor, fields, statuses or score names are invalid
+    """
+    selected = resolve_fields(fields)
+    after = decode_cursor(cursor) if cursor else None
+    invalid = [status for status in statuses or () if status not in EVALUATION_STATUSES]
+    if invalid:
+        raise ValueError(f"Unknown statuses: {', '.join(invalid)}")
+    unknown_scores = [name for name in score_range or {} if name not in SCORE_FILTERS]
+    if unknown_scores:
+        raise ValueError(f"Unknown scores: {', '.join(unknown_scores)}")
+
+    db = get_db_session()
+    try:
+        # One extra row tells whether another page exists
+        rows = build_query_logs_query(db, selected, since, until, statuses, score_range,
+                                      after, limit + 1).all()
+    finally:
+        db.close()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    return {
+        "items": [{name: _serialize(getattr(row, name)) for name in selected} for row in rows],
+        "next_cursor": next_cursor
+    }
@@ -1,5 +1,6 @@
 """Query service for executing SQL queries against the database."""
 
+import time
 from datetime import datetime, date
 from decimal import Decimal
 from sqlalchemy import text
@@ -10,7 +11,8 @@ from app.db.session import get_db_session
 from app.api.models import QueryResponse
 from app.services.llm_service import generate_sql
 from app.services.validation_service import sanitize_input, validate_sql
-from app.services import ragas_service
+from app.services import ragas_service, heuristic_scorer, stats_service, metrics
+from app.services.query_classifier import classify_sql, sql_fingerprint
 from app.db.models import QueryLog
 
 logger = structlog.get_logger()
@@ -25,36 +27,130 @@ def _serialize_value(value):
     return value
 
 
-def _log_query(nl_query: str, sql: str, results: list, elapsed_ms: int) -> int | None:
+def fetch_results(db, sql: str) -> list:
+    """
+    Execute validated SQL and return JSON-serializable result rows.
+
+    Args:
+        db: Open database session
+        sql: Validated SELECT statement
+
+    Returns:
+        List of row dicts, capped at 1000 rows
+    """
+    with metrics.time_stage('db_execute'):
+        result = db.execute(
+            text(sql).execution_options(timeout=3)
+        )
+
+    # Convert to list of dicts using SQLAlchemy 2.0 pattern
+    # Serialize Decimal and date types to JSON-compatible types
+    # (rows are streamed from the result; psycopg2 has already fetched them during execute)
+    with metrics.time_stage('serialize'):
+        results = [
+            {key: _serialize_value(value) for key, value in row.items()}
+            for row in result.mappings()
+        ]
+
+    # Check result size (AC4: max 1000 rows)
+    if len(results) > 1000:
+        logger.warning("result_set_truncated", count=len(results))
+        results = results[:1000]
+
+    return results
+
+
+def _elapsed_ms(started: float) -> int:
+    """Milliseconds since a time.perf_counter() reading."""
+    return int((time.perf_counter() - started) * 1000)
+
+
+def _provisional_scores(nl_query: str, sql: str, results: list) -> dict | None:
+    """Compute instant heuristic scores; never blocks the query on failure."""
+    try:
+        return heuristic_scorer.score(nl_query, sql, results)
+    except Exception as e:
+        logger.error("heuristic_scoring_failed", error=str(e))
+        return None
+
+
+def _needs_ragas(provisional_scores: dict | None) -> bool:
+    """Decide whether full RAGAS evaluation should run (see RAGAS_MODE)."""
+    if ragas_service.RAGAS_MODE == 'off':
+        return False
+    if ragas_service.RAGAS_MODE == 'weak_only':
+        return provisional_scores is None or heuristic_scorer.is_weak(provisional_scores)
+    return True
+
+
+def _log_query(nl_query: str, sql: str, results: list, elapsed_ms: int,
+               provisional_scores: dict | None = None, run_ragas: bool = True,
+               stage_timings: dict | None = None) -> int | None:
     """
     Log query execution to query_logs table.
 
     RAGAS scores are calculated asynchronously in background task.
     Initial status is 'pending', will be updated to 'evaluating' -> 'completed'/'failed'.
+    When RAGAS is skipped, the heuristic scores become the final scores and the
+    row is logged as 'completed' with score_source='heuristic'.
 
     Args:
         nl_query: Natural language query
         sql: Generated SQL
         results: Query results
         elapsed_ms: Execution time in milliseconds
+        provisional_scores: Heuristic scores from heuristic_scorer.score()
+        run_ragas: Whether a background RAGAS evaluation will follow
+        stage_timings: Milliseconds spent in the 'llm', 'validation' and 'db' stages
 
     Returns:
         Query log ID for background task reference, or None if logging failed
     """
+    started = time.perf_counter()
+    stage_timings = stage_timings or {}
     try:
         db = get_db_session()
         try:
+            evaluation_status = 'pending' if run_ragas else 'completed'
+            query_type = classify_sql(sql)
             query_log = QueryLog(
                 natural_language_query=nl_query,
                 generated_sql=sql,
-                evaluation_status='pending',  # Will be updated by background task
+                query_type=query_type,
+                sql_fingerprint=sql_fingerprint(sql),
+                evaluation_status=evaluation_status,  # 'pending' will be updated by background task
                 result_count=len(results),
-                execution_time_ms=elapsed_ms
+                execution_time_ms=elapsed_ms,
+                llm_time_ms=stage_timings.get('llm'),
+                validation_time_ms=stage_timings.get('validation'),
+                db_time_ms=stage_timings.get('db')
             )
+            if provisional_scores:
+                query_log.heuristic_faithfulness_score = provisional_scores['faithfulness']
+                query_log.heuristic_answer_relevance_score = provisional_scores['answer_relevance']
+                query_log.heuristic_context_utilization_score = provisional_scores['context_utilization']
+                if not run_ragas:
+                    query_log.faithfulness_score = provisional_scores['faithfulness']
+                    query_log.answer_relevance_score = provisional_scores['answer_relevance']
+                    query_log.context_precision_score = provisional_scores['context_utilization']
+                    query_log.score_source = 'heuristic'
             db.add(query_log)
+
+            # Report aggregates commit together with the log row
+            stats_service.record_logged(db, query_type)
+            if not run_ragas:
+                stats_service.record_completed(db, None, query_type, nl_query, {
+                    "faithfulness": query_log.faithfulness_score,
+                    "answer_relevance": query_log.answer_relevance_score,
+                    "context_precision": query_log.context_precision_score
+                })
+
             db.commit()
             query_log_id = query_log.id
-            logger.info("query_logged", query_log_id=query_log_id, evaluation_status='pending')
+            # The write itself cannot be stored in the row it creates, so it is only logged
+            metrics.STAGE_SECONDS.labels('log_insert').observe(time.perf_counter() - started)
+            logger.info("query_logged", query_log_id=query_log_id, evaluation_status=evaluation_status,
+                        log_time_ms=_elapsed_ms(started))
             return query_log_id
         finally:
             db.close()
@@ -67,6 +163,11 @@ async def execute_query(nl_query: str) -> QueryResponse:
     """
     Execute a natural language query against the database.
 
+    Each stage's duration is recorded in milliseconds and returned as
+    QueryResponse.timings ('sanitize', 'llm', 'validation', 'db' and 'log';
+    failed queries carry the stages that completed). The llm, validation and db
+    timings are also stored on the query log row.
+
     Args:
         nl_query: Natural language query string
 
@@ -74,41 +175,43 @@ async def execute_query(nl_query: str) -> QueryResponse:
         QueryResponse with results or error information
     """
     start_time = datetime.now()
+    stage_timings = {}
 
     try:
         # Step 1: Sanitize input
-        sanitized_query = sanitize_input(nl_query)
+        with metrics.time_stage('sanitize') as timer:
+            sanitized_query = sanitize_input(nl_query)
+        stage_timings['sanitize'] = timer.ms
 
         # Step 2: Generate SQL from LLM
-        sql = await generate_sql(sanitized_query)
+        with metrics.time_stage('llm') as timer:
+            sql = await generate_sql(sanitized_query)
+        stage_timings['llm'] = timer.ms
 
         # Step 3: Validate SQL
-        validate_sql(sql, nl_query=nl_query)
+        with metrics.time_stage('validate') as timer:
+            validate_sql(sql, nl_query=nl_query)
+        stage_timings['validation'] = timer.ms
 
         # Step 4: Execute SQL with timeout
+        stage_start = time.perf_counter()
         db = get_db_session()
         try:
-            result = db.execute(
-                text(sql).execution_options(timeout=3)
-            )
-
-            # Convert to list of dicts using SQLAlchemy 2.0 pattern
-            # Serialize Decimal and date types to JSON-compatible types
-            results = [
-                {key: _serialize_value(value) for key, value in row.items()}
-                for row in result.mappings()
-            ]
-
-            # Check result size (AC4: max 1000 rows)
-            if len(results) > 1000:
-                logger.warning("result_set_truncated", count=len(results))
-                results = results[:1000]
+            results = fetch_results(db, sql)
+            stage_timings['db'] = _elapsed_ms(stage_start)
 
             elapsed_ms = int((datetime.now() - start_time).total_seconds() * 1000)
 
+            # Instant zero-LLM scores; full RAGAS may be skipped when they look strong
+            provisional_scores = _provisional_scores(nl_query, sql, results)
+            run_ragas = _needs_ragas(provisional_scores)
+
             # Log query to query_logs table with 'pending' status
             # RAGAS evaluation will run in background task
-            query_log_id = _log_query(nl_query, sql, results, elapsed_ms)
+            stage_start = time.perf_counter()
+            query_log_id = _log_query(nl_query, sql, results, elapsed_ms, provisional_scores, run_ragas,
+                                      stage_timings)
+            stage_timings['log'] = _elapsed_ms(stage_start)
 
             return QueryResponse(
                 success=True,
@@ -118,7 +221,10 @@ async def execute_query(nl_query: str) -> QueryResponse:
                 result_count=len(results),
                 execution_time_ms=elapsed_ms,
                 query_log_id=query_log_id,  # For background task
-                evaluation_status='pending'  # RAGAS scores will be calculated async
+                evaluation_status='pending' if run_ragas else 'completed',  # RAGAS scores will be calculated async
+                ragas_scores=None if run_ragas else provisional_scores,
+                provisional_scores=provisional_scores,
+                timings=stage_timings
             )
 
         finally:
@@ -132,7 +238,8 @@ async def execute_query(nl_query: str) -> QueryResponse:
             query=nl_query,
             error="Query execution timed out (>3s). Try simplifying your query.",
             error_type="DB_ERROR",
-            execution_time_ms=elapsed_ms
+            execution_time_ms=elapsed_ms,
+            timings=stage_timings
         )
 
     except OperationalError as e:
@@ -143,7 +250,8 @@ async def execute_query(nl_query: str) -> QueryResponse:
             query=nl_query,
             error="Database connection failed. Please try again.",
             error_type="DB_ERROR",
-            execution_time_ms=elapsed_ms
+            execution_time_ms=elapsed_ms,
+            timings=stage_timings
         )
 
     except IntegrityError as e:
@@ -154,7 +262,8 @@ async def execute_query(nl_query: str) -> QueryResponse:
             query=nl_query,
             error="Database integrity error occurred.",
             error_type="DB_ERROR",
-            execution_time_ms=elapsed_ms
+            execution_time_ms=elapsed_ms,
+            timings=stage_timings
         )
 
     except ValueError as e:
@@ -165,7 +274,8 @@ async def execute_query(nl_query: str) -> QueryResponse:
             query=nl_query,
             error=str(e),
             error_type="VALIDATION_ERROR",
-            execution_time_ms=elapsed_ms
+            execution_time_ms=elapsed_ms,
+            timings=stage_timings
         )
 
     except DatabaseError as e:
@@ -176,7 +286,8 @@ async def execute_query(nl_query: str) -> QueryResponse:
             query=nl_query,
             error=f"Database error: {str(e)}",
             error_type="DB_ERROR",
-            execution_time_ms=elapsed_ms
+            execution_time_ms=elapsed_ms,
+            timings=stage_timings
         )
 
     except Exception as e:
@@ -187,5 +298,6 @@ async def execute_query(nl_query: str) -> QueryResponse:
             query=nl_query,
             error=str(e),
             error_type="LLM_ERROR",
-            execution_time_ms=elapsed_ms
+            execution_time_ms=elapsed_ms,
+            timings=stage_timings
         )
@@ -1,10 +1,15 @@
 import os
 import asyncio
+import importlib.util
 import math
+import multiprocessing
+import time
 import traceback
 import structlog
-from typing import Dict
-from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+
+from app.services import metrics
 
 logger = structlog.get_logger()
 
@@ -38,18 +43,324 @@ Constraints:
 - hire_date cannot be in the future
 """
 
-# Import ragas dependencies with graceful fallback
-try:
-    from ragas import evaluate as ragas_evaluate
-    from ragas.metrics import Faithfulness, AnswerRelevancy, ContextUtilization
-    from ragas.llms import LangchainLLMWrapper
-    from langchain_openai import ChatOpenAI
-    from datasets import Dataset
-    RAGAS_AVAILABLE = True
-except ImportError:
-    RAGAS_AVAILABLE = False
+# Ragas dependencies are imported lazily on first evaluation.
+# ragas/langchain_openai/datasets pull in pyarrow and pandas, which add seconds
+# of startup time and hundreds of MB of RSS to API workers that never evaluate.
+# Availability is detected from module specs without importing anything.
+RAGAS_AVAILABLE = all(
+    importlib.util.find_spec(module) is not None
+    for module in ("ragas", "langchain_openai", "datasets")
+)
+if not RAGAS_AVAILABLE:
     logger.warning("ragas_not_installed", message="Ragas dependencies not available. Install with: pip install ragas langchain datasets")
 
+ragas_evaluate = None
+Faithfulness = None
+AnswerRelevancy = None
+ContextUtilization = None
+LangchainLLMWrapper = None
+ChatOpenAI = None
+Dataset = None
+
+
+def _ragas_loaded() -> bool:
+    """Check whether the Ragas evaluation stack has been imported in this process."""
+    return None not in (ragas_evaluate, Faithfulness, AnswerRelevancy, ContextUtilization,
+                        LangchainLLMWrapper, ChatOpenAI, Dataset)
+
+
+def _load_ragas():
+    """Import the Ragas evaluation stack into module globals (once per process)."""
+    global ragas_evaluate, Faithfulness, AnswerRelevancy, ContextUtilization
+    global LangchainLLMWrapper, ChatOpenAI, Dataset
+
+    # Names already bound (e.g. patched in tests) are left untouched
+    start_time = time.perf_counter()
+    if ragas_evaluate is None:
+        from ragas import evaluate as ragas_evaluate
+    if Faithfulness is None or AnswerRelevancy is None or ContextUtilization is None:
+        from ragas.metrics import Faithfulness, AnswerRelevancy, ContextUtilization
+    if LangchainLLMWrapper is None:
+        from ragas.llms import LangchainLLMWrapper
+    if ChatOpenAI is None:
+        from langchain_openai import ChatOpenAI
+    if Dataset is None:
+        from datasets import Dataset
+
+    logger.info("ragas_stack_loaded",
+        elapsed_ms=int((time.perf_counter() - start_time) * 1000))
+
+
+# When full RAGAS runs: 'always', 'weak_only' (only when the heuristic tier flags
+# a likely weak query; otherwise heuristic scores are final) or 'off'
+RAGAS_MODE = os.getenv("RAGAS_MODE", "always")
+
+# Per-metric deadline; a metric that exceeds it is dropped while the others are kept
+RAGAS_METRIC_TIMEOUT_SECONDS = float(os.getenv("RAGAS_METRIC_TIMEOUT_SECONDS", "60"))
+
+# Where metric scoring runs: 'thread' (in the API process) or 'process' (a
+# ProcessPoolExecutor, keeping Dataset construction and scoring off the API's GIL)
+RAGAS_EXECUTOR = os.getenv("RAGAS_EXECUTOR", "thread")
+# Sizing: every evaluation scores its 3 metrics in parallel, so pool size // 3
+# evaluations run at once. Process pools smaller than 3 are raised to 3 so no
+# metric of an evaluation waits behind the others (a running worker process
+# cannot be cancelled, so a timed-out metric keeps its worker until it returns).
+RAGAS_EXECUTOR_THREADS = int(os.getenv("RAGAS_EXECUTOR_THREADS", "6"))
+RAGAS_PROCESS_WORKERS = int(os.getenv("RAGAS_PROCESS_WORKERS", "3"))
+
+# Rows sampled from the result set for claims and contexts (Bug #002)
+RAGAS_SAMPLE_ROWS = 3
+
+# (score key returned by evaluate(), Ragas result column, query_logs column)
+METRICS = (
+    ('faithfulness', 'faithfulness', 'faithfulness_score'),
+    ('answer_relevance', 'answer_relevancy', 'answer_relevance_score'),
+    ('context_utilization', 'context_utilization', 'context_precision_score'),  # DB column is context_precision_score
+)
+METRIC_COLUMNS = {score_key: column for score_key, _, column in METRICS}
+RESULT_COLUMNS = {score_key: result_column for score_key, result_column, _ in METRICS}
+
+# How often a queued metric job is checked for having started (its deadline starts then)
+EXECUTOR_START_POLL_SECONDS = 0.05
+
+_metric_executor = None
+# Limits concurrent evaluations to what the executor can run without queueing
+_evaluation_slots = None
+_metric_objects = {}
+
+
+def _executor_workers(mode: str) -> int:
+    """Number of metric jobs the executor for mode runs at once (at least one per metric)."""
+    workers = RAGAS_PROCESS_WORKERS if mode == "process" else RAGAS_EXECUTOR_THREADS
+    return max(workers, len(METRICS))
+
+
+def _create_executor(mode: str):
+    """Create the executor metric scoring runs on for the given RAGAS_EXECUTOR mode."""
+    if mode == "process":
+        # spawn: forking a process that owns an event loop and DB pool is unsafe
+        return ProcessPoolExecutor(
+            max_workers=_executor_workers(mode),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker
+        )
+    # Dedicated pool so metric threads left running by a timeout cannot starve
+    # the default executor used by asyncio.to_thread elsewhere in the app
+    return ThreadPoolExecutor(max_workers=_executor_workers(mode), thread_name_prefix="ragas-metric")
+
+
+def _get_executor():
+    """Get or create the metric executor."""
+    global _metric_executor
+    if _metric_executor is None:
+        _metric_executor = _create_executor(RAGAS_EXECUTOR)
+        logger.info("ragas_executor_started", mode=RAGAS_EXECUTOR)
+    return _metric_executor
+
+
+def _get_evaluation_slots() -> asyncio.Semaphore:
+    """Semaphore admitting as many evaluations as the executor has room for all their metrics."""
+    global _evaluation_slots
+    if _evaluation_slots is None:
+        _evaluation_slots = asyncio.Semaphore(max(1, _executor_workers(RAGAS_EXECUTOR) // len(METRICS)))
+    return _evaluation_slots
+
+
+def shutdown_executor():
+    """Shut down the metric executor (worker processes are terminated)."""
+    global _metric_executor, _evaluation_slots
+    if _metric_executor is not None:
+        _metric_executor.shutdown(wait=False, cancel_futures=True)
+        _metric_executor = None
+    _evaluation_slots = None
+
+
+def _get_metric(score_key: str):
+    """Get the metric object for score_key, creating all metrics once per process."""
+    if not _metric_objects:
+        # Configure metrics with gpt-4.1-nano for fastest evaluation
+        # gpt-4.1-nano is OpenAI's fastest model (optimized for speed, low latency)
+        # The request timeout matches the metric deadline so hung calls release their worker
+        openai_llm = ChatOpenAI(model="gpt-4.1-nano", temperature=0, timeout=RAGAS_METRIC_TIMEOUT_SECONDS)
+        evaluator_llm = LangchainLLMWrapper(openai_llm)
+        _metric_objects.update({
+            'faithfulness': Faithfulness(llm=evaluator_llm),
+            'answer_relevance': AnswerRelevancy(llm=evaluator_llm),
+            'context_utilization': ContextUtilization(llm=evaluator_llm)
+        })
+    return _metric_objects[score_key]
+
+
+def _init_worker():
+    """ProcessPoolExecutor initializer: import Ragas and pre-build metric objects."""
+    try:
+        _load_ragas()
+        for score_key, _, _ in METRICS:
+            _get_metric(score_key)
+    except Exception as e:
+        # Leave the worker usable; _score_metric will surface the error per call
+        logger.error("ragas_worker_init_failed", error=str(e))
+
+
+def build_evaluation_sample(nl_query: str, sampled_rows: list, num_results: int) -> tuple:
+    """
+    Build the Ragas answer and contexts from sampled result rows.
+
+    Args:
+        nl_query: Natural language query string
+        sampled_rows: First RAGAS_SAMPLE_ROWS result rows
+        num_results: Total number of result rows
+
+    Returns:
+        (answer, contexts, claim_count)
+    """
+    # Format results as natural language text for RAGAS to parse
+    # RAGAS faithfulness extracts FACTUAL CLAIMS from the answer and verifies them against context
+    # Claims must be simple, declarative statements that can be verified
+    claims = []
+    if not sampled_rows:
+        answer = "No results were found in the database for this query."
+    else:
+        # Extract factual claims from the data
+        # For each result row, create simple declarative statements about the data values
+        for row in sampled_rows:
+            for key, value in row.items():
+                if value is not None:
+                    # Create a simple factual claim: "The {field} is {value}."
+                    # This format is easily verifiable against the context
+                    claims.append(f"The {key} is {value}.")
+
+        # Combine all claims into the answer
+        answer = " ".join(claims)
+        if num_results > len(sampled_rows):
+            answer += f" There are {num_results - len(sampled_rows)} additional records not shown."
+
+    # For text-to-SQL, contexts should be the RAW DATABASE RESULTS, not schema
+    # Faithfulness verifies the formatted answer matches the actual data retrieved
+    # Format raw results as simple factual statements for RAGAS to verify against
+    contexts = []
+    for i, row in enumerate(sampled_rows, 1):
+        # Simple JSON-like representation of each result
+        contexts.append(f"Database record {i}: " + ", ".join([f"{k}={v}" for k, v in row.items() if v is not None]))
+
+    return answer, contexts, len(claims)
+
+
+def _score_metric(score_key: str, nl_query: str, sampled_rows: list, num_results: int):
+    """
+    Score one metric for one query; runs inside the metric executor.
+
+    Only the sampled rows cross the executor boundary, so the payload sent to a
+    worker process stays small. Returns the raw (unsanitized) Ragas score.
+    """
+    if not _ragas_loaded():
+        _load_ragas()
+    answer, contexts, _ = build_evaluation_sample(nl_query, sampled_rows, num_results)
+    dataset = Dataset.from_dict({
+        'question': [nl_query],
+        'answer': [answer],
+        'contexts': [contexts]  # Actual database results for faithfulness validation
+    })
+    evaluation_result = ragas_evaluate(dataset=dataset, metrics=[_get_metric(score_key)])
+    # Ragas Result is a dict of metric name -> score; reading it directly
+    # avoids the to_pandas() conversion for a single-sample evaluation
+    return evaluation_result[RESULT_COLUMNS[score_key]]
+
+
+def _sanitize_score(value, metric_name="unknown"):
+    """Convert NaN/Inf to 0.0 with logging, ensure valid float."""
+    try:
+        score = float(value)
+        if math.isnan(score):
+            logger.warning("ragas_metric_nan",
+                metric=metric_name,
+                message=f"{metric_name} returned NaN - check context format")
+            return 0.0
+        if math.isinf(score):
+            logger.warning("ragas_metric_inf",
+                metric=metric_name,
+                message=f"{metric_name} returned Inf - check data format")
+            return 0.0
+        return score
+    except (TypeError, ValueError) as e:
+        logger.error("ragas_score_error", metric=metric_name, error=str(e))
+        return 0.0
+
+
+async def _wait_until_started(future: Future):
+    """Wait while an executor job is queued (cancelling it if the caller is cancelled)."""
+    # A ProcessPoolExecutor marks a job running when it hands it to its call queue,
+    # which holds at most one job beyond the free workers
+    try:
+        while not (future.running() or future.done()):
+            await asyncio.sleep(EXECUTOR_START_POLL_SECONDS)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+
+
+async def _run_metric(score_key: str, nl_query: str, sampled_rows: list, num_results: int,
+                      on_metric: Callable[[str, float], Awaitable[None]] | None,
+                      latencies_ms: Dict[str, int]) -> tuple:
+    """
+    Evaluate a single Ragas metric under RAGAS_METRIC_TIMEOUT_SECONDS.
+
+    The deadline starts when the executor picks the job up, so time spent
+    queued behind other metrics does not count against it.
+
+    Its duration is observed in hr_evaluation_metric_seconds by metric and outcome.
+
+    Returns:
+        (score_key, score) where score is None if the metric timed out or failed
+    """
+    future = _get_executor().submit(_score_metric, score_key, nl_query, sampled_rows, num_results)
+    start_time = time.perf_counter()
+    score = None
+    outcome = 'error'
+
+    try:
+        await _wait_until_started(future)
+        start_time = time.perf_counter()
+        raw_score = await asyncio.wait_for(asyncio.wrap_future(future), timeout=RAGAS_METRIC_TIMEOUT_SECONDS)
+        score = _sanitize_score(raw_score, score_key)
+        outcome = 'completed'
+    except asyncio.TimeoutError:
+        outcome = 'timeout'
+        logger.warning("ragas_metric_timeout",
+            metric=score_key,
+            timeout_s=RAGAS_METRIC_TIMEOUT_SECONDS)
+    except AssertionError as e:
+        logger.error("ragas_assertion_error",
+            metric=score_key,
+            error=str(e),
+            error_type="AssertionError",
+            message="RAGAS metric configuration issue - likely missing LLM setup",
+            traceback_preview=traceback.format_exc()[:1000])
+    except Exception as e:
+        logger.error("ragas_evaluation_exception",
+            metric=score_key,
+            error=str(e),
+            error_type=type(e).__name__,
+            traceback_preview=traceback.format_exc()[:1000])
+
+    elapsed = time.perf_counter() - start_time
+    metrics.EVALUATION_METRIC_SECONDS.labels(score_key, outcome).observe(elapsed)
+    elapsed_ms = int(elapsed * 1000)
+    latencies_ms[score_key] = elapsed_ms
+    logger.info("ragas_metric_finished",
+        metric=score_key,
+        score=score,
+        elapsed_ms=elapsed_ms,
+        timed_out=outcome == 'timeout')
+
+    if score is not None and on_metric is not None:
+        try:
+            await on_metric(score_key, score)
+        except Exception as e:
+            logger.error("ragas_metric_callback_failed", metric=score_key, error=str(e))
+
+    return score_key, score
+
 
 async def initialize_ragas():
     """Initialize Ragas with OpenAI embeddings."""
@@ -72,18 +383,26 @@ async def initialize_ragas():
         raise
 
 
-async def evaluate(nl_query: str, sql: str, results: list) -> Dict[str, float] | None:
+async def evaluate(nl_query: str, sql: str, results: list,
+                   on_metric: Callable[[str, float], Awaitable[None]] | None = None) -> Dict[str, float | None] | None:
     """
     Calculate Ragas scores for query using actual Ragas evaluation.
 
+    Each metric runs under its own RAGAS_METRIC_TIMEOUT_SECONDS deadline.
+    Metrics that time out or fail are returned as None while the others
+    are still reported.
+
     Args:
         nl_query: Natural language query string
         sql: Generated SQL query
         results: Query results as list of dicts
+        on_metric: Optional coroutine function awaited with (score_key, score)
+            as soon as each metric finishes, so partial results can be persisted
 
     Returns:
         Dictionary with faithfulness, answer_relevance, context_utilization scores
-        or None if evaluation fails (graceful degradation)
+        (None for metrics that timed out) or None if every metric failed
+        (graceful degradation)
     """
     try:
         logger.info("ragas_evaluate_start", nl_query=nl_query, result_count=len(results))
@@ -93,144 +412,58 @@ async def evaluate(nl_query: str, sql: str, results: list) -> Dict[str, float] |
             logger.debug("ragas_evaluation_skipped", message="Ragas not available")
             return None
 
-        # Format results as natural language text for RAGAS to parse
-        # RAGAS faithfulness extracts FACTUAL CLAIMS from the answer and verifies them against context
-        # Claims must be simple, declarative statements that can be verified
-        # Limit to first 10 results to avoid token limits
-        if not results:
-            formatted_results = "No results were found in the database for this query."
-        else:
-            num_results = len(results)
-            limited_results = results[:3]  # Reduced from 10 to prevent timeout (Bug #002)
-
-            # Extract factual claims from the data
-            # For each result row, create simple declarative statements about the data values
-            claims = []
-            for row in limited_results:
-                for key, value in row.items():
-                    if value is not None:
-                        # Create a simple factual claim: "The {field} is {value}."
-                        # This format is easily verifiable against the context
-                        claims.append(f"The {key} is {value}.")
-
-            # Combine all claims into the answer
-            if num_results > 3:
-                formatted_results = " ".join(claims) + f" There are {num_results - 3} additional records not shown."
-            else:
-                formatted_results = " ".join(claims)
-
-        # Create Ragas dataset format
-        # For text-to-SQL, contexts should be the RAW DATABASE RESULTS, not schema
-        # Faithfulness verifies the formatted answer matches the actual data retrieved
-        # Format raw results as simple factual statements for RAGAS to verify against
-        result_contexts = []
-        for i, row in enumerate(results[:3], 1):  # Match answer limit (Bug #002)
-            # Simple JSON-like representation of each result
-            row_str = f"Database record {i}: " + ", ".join([f"{k}={v}" for k, v in row.items() if v is not None])
-            result_contexts.append(row_str)
-
-        dataset_dict = {
-            'question': [nl_query],
-            'answer': [formatted_results],
-            'contexts': [result_contexts]  # Actual database results for faithfulness validation
-        }
+        # Only the sampled rows are passed to the metric executor (Bug #002: 3 rows max)
+        sampled_rows = results[:RAGAS_SAMPLE_ROWS]
+        answer, contexts, claim_count = build_evaluation_sample(nl_query, sampled_rows, len(results))
 
         # Log claim count for timeout monitoring (Bug #002)
-        claim_count = len(claims) if results else 0
         logger.info("ragas_dataset_created",
             question_len=len(nl_query),
-            answer_len=len(formatted_results),
-            context_count=len(result_contexts),
+            answer_len=len(answer),
+            context_count=len(contexts),
             claim_count=claim_count,
-            records_sampled=len(limited_results) if results else 0)
+            records_sampled=len(sampled_rows))
 
         # DEBUG: Log actual data being passed to RAGAS for hypothesis verification
         # This helps us verify Hypothesis #1 (format mismatch) and #2 (LLM config)
         logger.debug("ragas_input_data",
-            answer_preview=formatted_results[:500] if formatted_results else "",
-            context_preview=[c[:200] for c in result_contexts[:3]] if result_contexts else [],
+            answer_preview=answer[:500],
+            context_preview=[c[:200] for c in contexts],
             question=nl_query
         )
 
-        dataset = Dataset.from_dict(dataset_dict)
-        logger.info("ragas_dataset_converted", dataset_size=len(dataset))
-
-        # Evaluate using Ragas metrics
-        # Configure metrics with gpt-4.1-nano for fastest evaluation
-        # gpt-4.1-nano is OpenAI's fastest model (optimized for speed, low latency)
-        openai_llm = ChatOpenAI(model="gpt-4.1-nano", temperature=0)
-        evaluator_llm = LangchainLLMWrapper(openai_llm)
-
-        # Initialize metrics with fast LLM
-        faithfulness_metric = Faithfulness(llm=evaluator_llm)
-        answer_relevancy_metric = AnswerRelevancy(llm=evaluator_llm)
-        context_utilization_metric = ContextUtilization(llm=evaluator_llm)
-
-        # Ragas evaluate() is synchronous but conflicts with uvloop in FastAPI
-        # Run in thread pool to avoid "Can't patch loop of type <class 'uvloop.Loop'>" error
-        loop = asyncio.get_event_loop()
-        logger.info("ragas_starting_evaluation", message="Calling ragas_evaluate() with gpt-4.1-nano...")
-
-        # Enhanced error handling to capture AssertionError and other exceptions
-        try:
-            evaluation_result = await loop.run_in_executor(
-                None,  # Use default ThreadPoolExecutor
-                lambda: ragas_evaluate(
-                    dataset=dataset,
-                    metrics=[faithfulness_metric, answer_relevancy_metric, context_utilization_metric]
-                )
-            )
-            logger.info("ragas_evaluation_returned", message="ragas_evaluate() completed")
-        except AssertionError as e:
-            logger.error("ragas_assertion_error",
-                error=str(e),
-                error_type="AssertionError",
-                message="RAGAS metric configuration issue - likely missing LLM setup",
-                traceback_preview=traceback.format_exc()[:1000])
-            return None
-        except Exception as e:
-            logger.error("ragas_evaluation_exception",
-                error=str(e),
-                error_type=type(e).__name__,
-                traceback_preview=traceback.format_exc()[:1000])
+        # In thread mode the first evaluation pays the import cost off the event loop;
+        # worker processes import Ragas in their initializer
+        if RAGAS_EXECUTOR != "process" and not _ragas_loaded():
+            await asyncio.get_event_loop().run_in_executor(_get_executor(), _load_ragas)
+
+        logger.info("ragas_starting_evaluation",
+            message="Calling ragas_evaluate() per metric with gpt-4.1-nano...",
+            executor=RAGAS_EXECUTOR,
+            metric_timeout_s=RAGAS_METRIC_TIMEOUT_SECONDS)
+
+        # Each metric runs separately under its own deadline so a hung call only
+        # loses that metric; finished metrics are reported through on_metric immediately
+        # Evaluations beyond what the executor can run at once wait here, before any deadline starts
+        metric_latencies_ms = {}
+        async with _get_evaluation_slots():
+            metric_results = await asyncio.gather(*[
+                _run_metric(score_key, nl_query, sampled_rows, len(results),
+                            on_metric, metric_latencies_ms)
+                for score_key, _, _ in METRICS
+            ])
+        scores = dict(metric_results)
+
+        if all(score is None for score in scores.values()):
+            logger.warning("ragas_all_metrics_failed", metric_latencies_ms=metric_latencies_ms)
             return None
 
-        # Extract scores from evaluation result
-        # Ragas returns a Result object - convert to pandas to extract scores
-        # Handle NaN/Inf values (replace with 0.0 for JSON compliance)
-        def sanitize_score(value, metric_name="unknown"):
-            """Convert NaN/Inf to 0.0 with logging, ensure valid float."""
-            try:
-                score = float(value)
-                if math.isnan(score):
-                    logger.warning("ragas_metric_nan",
-                        metric=metric_name,
-                        message=f"{metric_name} returned NaN - check context format")
-                    return 0.0
-                if math.isinf(score):
-                    logger.warning("ragas_metric_inf",
-                        metric=metric_name,
-                        message=f"{metric_name} returned Inf - check data format")
-                    return 0.0
-                return score
-            except (TypeError, ValueError) as e:
-                logger.error("ragas_score_error", metric=metric_name, error=str(e))
-                return 0.0
-
-        # Convert Result object to pandas DataFrame to extract scores
-        result_df = evaluation_result.to_pandas()
-
-        # Extract first row scores (we only evaluated one sample)
-        scores = {
-            'faithfulness': sanitize_score(result_df['faithfulness'].iloc[0], 'faithfulness'),
-            'answer_relevance': sanitize_score(result_df['answer_relevancy'].iloc[0], 'answer_relevance'),
-            'context_utilization': sanitize_score(result_df['context_utilization'].iloc[0], 'context_utilization')
-        }
-
         logger.info("ragas_evaluation_complete",
             faithfulness=scores['faithfulness'],
             answer_relevance=scores['answer_relevance'],
-            context_utilization=scores['context_utilization']
+            context_utilization=scores['context_utilization'],
+            metric_latencies_ms=metric_latencies_ms,
+            slowest_metric=max(metric_latencies_ms, key=metric_latencies_ms.get)
         )
 
         return scores
@@ -253,39 +486,81 @@ async def evaluate_and_update_async(query_id: int, nl_query: str, sql: str, resu
         sql: Generated SQL query
         results: Query results as list of dicts
     """
+    from sqlalchemy import func
     from app.db.session import get_db_session
     from app.db.models import QueryLog
+    from app.services import stats_service, status_service
+    from app.services.query_classifier import classify_sql
 
     db = None
+    query_log = None
+
+    def publish_status():
+        """Announce the pending status change to SSE subscribers (delivered once db commits)."""
+        from app.services import evaluation_events
+        try:
+            evaluation_events.publish(query_id, status_service.build_status_payload(query_log), db=db)
+        except Exception as e:
+            logger.warning("ragas_async_publish_failed", query_id=query_id, error=str(e))
+
+    metrics.EVALUATIONS_IN_FLIGHT.inc()
     try:
         # Update status to 'evaluating'
         db = get_db_session()
-        query_log = db.query(QueryLog).filter(QueryLog.id == query_id).first()
+        query_log = status_service.find_by_id(db.query(QueryLog), query_id)
 
         if not query_log:
             logger.error("ragas_async_query_not_found", query_id=query_id)
             return
 
         query_log.evaluation_status = 'evaluating'
+        query_log.evaluation_updated_at = func.now()
+        publish_status()
         db.commit()
 
         logger.info("ragas_async_started", query_id=query_id)
 
+        def write_metric(score_key: str, score: float):
+            setattr(query_log, METRIC_COLUMNS[score_key], score)
+            query_log.evaluation_updated_at = func.now()
+            db.commit()
+
+        # Metrics finishing together must not use the session concurrently
+        write_lock = asyncio.Lock()
+
+        async def persist_metric(score_key: str, score: float):
+            """Write each metric as soon as it finishes, off the event loop, before slower metrics return."""
+            async with write_lock:
+                await asyncio.to_thread(write_metric, score_key, score)
+
         # Run RAGAS evaluation
-        scores = await evaluate(nl_query, sql, results)
+        scores = await evaluate(nl_query, sql, results, on_metric=persist_metric)
 
         if scores is None:
             # Evaluation failed
             query_log.evaluation_status = 'failed'
+            query_log.evaluation_updated_at = func.now()
+            publish_status()
             db.commit()
             logger.warning("ragas_async_failed", query_id=query_id)
             return
 
-        # Update database with scores
-        query_log.faithfulness_score = scores['faithfulness']
-        query_log.answer_relevance_score = scores['answer_relevance']
-        query_log.context_precision_score = scores['context_utilization']  # DB column is context_precision_score
+        # Finished metrics were already persisted; metrics that timed out stay NULL
         query_log.evaluation_status = 'completed'
+        query_log.score_source = 'ragas'
+        query_log.evaluation_updated_at = func.now()
+        stats_service.record_completed(
+            db,
+            query_log.created_at.date() if query_log.created_at else None,
+            query_log.query_type or classify_sql(query_log.generated_sql),
+            query_log.natural_language_query,
+            {
+                "faithfulness": query_log.faithfulness_score,
+                "answer_relevance": query_log.answer_relevance_score,
+                "context_precision": query_log.context_precision_score
+            }
+        )
+        publish_status()
         db.commit()
 
         logger.info("ragas_async_completed",
@@ -299,10 +574,15 @@ async def evaluate_and_update_async(query_id: int, nl_query: str, sql: str, resu
         logger.error("ragas_async_error", query_id=query_id, error=str(e))
         if db and query_log:
             try:
+                # Discard the failed transaction (and the events waiting on its commit)
+                db.rollback()
                 query_log.evaluation_status = 'failed'
+                query_log.evaluation_updated_at = func.now()
+                publish_status()
                 db.commit()
             except:
                 pass
     finally:
+        metrics.EVALUATIONS_IN_FLIGHT.dec()
         if db:
             db.close()
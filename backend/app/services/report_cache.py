@@ -0,0 +1,125 @@
+"""In-process cache for the analysis report.
+
+The report is recomputed off the event loop at most once at a time. Within
+REPORT_CACHE_TTL_SECONDS, or until an evaluation completes, requests are
+served from memory. After that, the first request starts a single
+background refresh and every request is served the stale copy until the
+refresh finishes. Only a cold cache makes requests wait, and they all share
+one computation.
+
+Invalidation follows evaluation events (local and relayed from other
+processes via evaluation_events); the TTL bounds staleness for anything
+else, including newly logged queries, so a steady query rate does not
+recompute the report on every request.
+"""
+
+import os
+import time
+import asyncio
+import structlog
+
+from app.services import report_service, evaluation_events, status_service
+
+logger = structlog.get_logger()
+
+REPORT_CACHE_TTL_SECONDS = float(os.getenv("REPORT_CACHE_TTL_SECONDS", "30"))
+
+_report = None
+_version = None
+_computed_at = 0.0
+# Bumped by invalidate(); a refresh that started before a bump stays stale
+_generation = 0
+_computed_generation = 0
+_refresh_task = None
+
+
+def _compute():
+    """Build the report and the version it reflects (runs in a worker thread)."""
+    try:
+        # Read the version first so it never claims newer data than the report holds
+        version = report_service.get_report_version()
+    except Exception as e:
+        logger.warning("report_version_failed", error=str(e))
+        version = None
+    return report_service.get_analysis_report(), version
+
+
+async def _refresh():
+    """Recompute the report off the event loop and store it."""
+    global _report, _version, _computed_at, _computed_generation
+    generation = _generation
+    started = time.monotonic()
+    report, version = await asyncio.to_thread(_compute)
+    _report, _version = report, version
+    _computed_at = time.monotonic()
+    _computed_generation = generation
+    logger.info("report_cache_refreshed", elapsed_ms=int((_computed_at - started) * 1000))
+
+
+def _start_refresh() -> asyncio.Task:
+    """Start a refresh unless one is already running (single flight)."""
+    global _refresh_task
+    # A task left on a closed loop (e.g. between test clients) never finishes; replace it
+    if (_refresh_task is None or _refresh_task.done()
+            or _refresh_task.get_loop() is not asyncio.get_running_loop()):
+        _refresh_task = asyncio.create_task(_refresh())
+        _refresh_task.add_done_callback(_log_refresh_failure)
+    return _refresh_task
+
+
+def _log_refresh_failure(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("report_cache_refresh_failed", error=str(task.exception()))
+
+
+def _is_fresh() -> bool:
+    return (_computed_generation == _generation
+            and time.monotonic() - _computed_at < REPORT_CACHE_TTL_SECONDS)
+
+
+async def get_report() -> tuple:
+    """
+    Get the analysis report, serving a cached copy when possible.
+
+    Returns:
+        (report, version) where version is report_service.get_report_version()
+        as of the computation (None if unavailable)
+
+    Raises:
+        Exception: If there is no cached report and computing one fails
+    """
+    if REPORT_CACHE_TTL_SECONDS <= 0:
+        return await asyncio.to_thread(_compute)
+
+    if _report is None:
+        # Cold cache: everyone waits on the same computation
+        await asyncio.shield(_start_refresh())
+        return _report, _version
+
+    if not _is_fresh():
+        _start_refresh()
+
+    return _report, _version
+
+
+def invalidate():
+    """Mark the cached report stale; the next request triggers a refresh."""
+    global _generation
+    _generation += 1
+
+
+def clear():
+    """Drop the cached report (used by tests)."""
+    global _report, _version, _computed_at, _generation, _computed_generation, _refresh_task
+    _report = _version = _refresh_task = None
+    _computed_at = 0.0
+    _generation = _computed_generation = 0
+
+
+def _on_evaluation_event(query_log_id: int, event: dict):
+    """Invalidate when an evaluation finishes, here or in another process."""
+    if event.get("evaluation_status") in status_service.TERMINAL_STATUSES:
+        invalidate()
+
+
+evaluation_events.add_listener(_on_evaluation_event)
@@ -1,29 +1,65 @@
 """Report service for query analysis and recommendations."""
 
+from datetime import datetime
 from typing import List, Dict
-from sqlalchemy import func
+from sqlalchemy import func, select
 import structlog
 
 from app.db.session import get_db_session
 from app.db.models import QueryLog
+from app.services import stats_service, archive_service
+from app.services.stats_service import SCORE_COLUMNS, is_weak_query
 
 logger = structlog.get_logger()
 
+# Number of weak queries included in the report
+WEAK_QUERY_LIMIT = 10
+
+# Default number of SQL shapes returned by get_top_repeated_queries
+TOP_QUERY_LIMIT = 10
+
+
+def get_report_version() -> List:
+    """
+    Get a cheap version signature for the analysis report.
+
+    Any new query log raises MAX(id), retention deletes raise MIN(id), and
+    every status/score change bumps evaluation_updated_at, so the report can
+    only change when this signature does. All three resolve through indexes.
+
+    Returns:
+        [min_id, max_id, last_evaluation_update] (ISO timestamp or None)
+    """
+    db = get_db_session()
+    try:
+        min_id, max_id, last_update = db.query(
+            func.min(QueryLog.id),
+            func.max(QueryLog.id),
+            func.max(QueryLog.evaluation_updated_at)
+        ).one()
+        return [min_id, max_id, last_update.isoformat() if last_update else None]
+    finally:
+        db.close()
+
 
 def get_analysis_report() -> Dict:
     """
     Generate comparative analysis report with weak query identification and recommendations.
 
+    Totals, averages, weak-query counts and per-type stats come from the
+    incrementally maintained query_log_stats table (see stats_service), and
+    only the 10 most recent weak queries are loaded from query_logs, so the
+    cost does not grow with the number of logged queries.
+
     Returns:
         Dictionary with total_queries, average_scores, weak_queries, and recommendations
     """
     try:
         db = get_db_session()
         try:
-            # Get all query logs
-            logs = db.query(QueryLog).order_by(QueryLog.created_at.desc()).all()
+            summary = stats_service.get_summary(db)
 
-            if not logs:
+            if not summary["total_queries"]:
                 return {
                     "total_queries": 0,
                     "average_scores": {
@@ -35,61 +71,25 @@ def get_analysis_report() -> Dict:
                     "recommendations": ["No queries executed yet. Run some queries to generate recommendations."]
                 }
 
-            # Calculate average scores (excluding None values and 0.0 from old broken queries)
-            # Filter out 0.0 scores which indicate old queries before Bug #002/#003 fixes
-            faithfulness_scores = [log.faithfulness_score for log in logs if log.faithfulness_score is not None and log.faithfulness_score > 0.0]
-            answer_relevance_scores = [log.answer_relevance_score for log in logs if log.answer_relevance_score is not None and log.answer_relevance_score > 0.0]
-            context_precision_scores = [log.context_precision_score for log in logs if log.context_precision_score is not None and log.context_precision_score > 0.0]
-
-            avg_faithfulness = sum(faithfulness_scores) / len(faithfulness_scores) if faithfulness_scores else 0.0
-            avg_answer_relevance = sum(answer_relevance_scores) / len(answer_relevance_scores) if answer_relevance_scores else 0.0
-            avg_context_precision = sum(context_precision_scores) / len(context_precision_scores) if context_precision_scores else 0.0
-
-            # Identify weak queries (any score < 0.7)
-            weak_queries = []
-            for log in logs:
-                scores = {
-                    "faithfulness": float(log.faithfulness_score) if log.faithfulness_score else None,
-                    "answer_relevance": float(log.answer_relevance_score) if log.answer_relevance_score else None,
-                    "context_precision": float(log.context_precision_score) if log.context_precision_score else None
-                }
-
-                # Check if any score is below 0.7
-                has_weak_score = any(
-                    score is not None and score < 0.7
-                    for score in scores.values()
-                )
-
-                if has_weak_score:
-                    weak_queries.append({
-                        "query": log.natural_language_query,
-                        "scores": scores,
-                        "sql": log.generated_sql,
-                        "created_at": log.created_at.isoformat() if log.created_at else None,
-                        "reason": _identify_weakness_reason(scores)
-                    })
+            weak_queries = _weak_queries(db, limit=WEAK_QUERY_LIMIT)
 
             # Categorize queries by type and calculate type-specific averages
-            query_type_analysis = _categorize_queries_by_type(logs)
+            query_type_analysis = stats_service.get_type_analysis(db)
 
             # Generate actionable recommendations based on weak queries and patterns
-            recommendations = _generate_recommendations(weak_queries, logs, query_type_analysis)
+            recommendations = _generate_recommendations(summary, query_type_analysis)
 
             logger.info("analysis_report_generated",
-                total_queries=len(logs),
-                weak_queries_count=len(weak_queries),
-                avg_faithfulness=avg_faithfulness
+                total_queries=summary["total_queries"],
+                weak_queries_count=summary["weak_count"],
+                avg_faithfulness=summary["average_scores"]["faithfulness"]
             )
 
             return {
-                "total_queries": len(logs),
-                "average_scores": {
-                    "faithfulness": float(round(avg_faithfulness, 2)),
-                    "answer_relevance": float(round(avg_answer_relevance, 2)),
-                    "context_precision": float(round(avg_context_precision, 2))
-                },
+                "total_queries": summary["total_queries"],
+                "average_scores": summary["average_scores"],
                 "query_type_analysis": query_type_analysis,
-                "weak_queries": weak_queries[:10],  # Limit to top 10 for readability
+                "weak_queries": weak_queries,
                 "recommendations": recommendations
             }
 
@@ -101,72 +101,126 @@ def get_analysis_report() -> Dict:
         raise
 
 
-def _categorize_queries_by_type(logs: List[QueryLog]) -> Dict:
+def get_top_repeated_queries(limit: int = TOP_QUERY_LIMIT) -> List[Dict]:
     """
-    Categorize queries by SQL pattern type and calculate type-specific averages.
+    Most frequently generated SQL shapes (same query up to literal values).
+
+    Groups on the indexed sql_fingerprint column; rows logged before it
+    existed are skipped until backfilled.
 
     Args:
-        logs: All query logs
+        limit: Maximum number of fingerprints to return
 
     Returns:
-        Dictionary with query counts and average scores per type
+        List of dicts with fingerprint, query_type, count, last_seen and the
+        latest example query and SQL, most repeated first
     """
-    query_types = {
-        'simple_select': [],
-        'where_filter': [],
-        'date_range': [],
-        'aggregation': [],
-        'join': []
-    }
-
-    for log in logs:
-        if not log.generated_sql:
-            continue
-
-        sql_upper = log.generated_sql.upper()
-
-        # Categorize query type (priority order: most specific first)
-        if 'JOIN' in sql_upper:
-            query_types['join'].append(log)
-        elif any(kw in sql_upper for kw in ['DISTINCT', 'GROUP BY', 'COUNT(', 'SUM(', 'AVG(', 'MAX(', 'MIN(']):
-            query_types['aggregation'].append(log)
-        elif any(kw in sql_upper for kw in ['INTERVAL', 'DATE_SUB', 'DATE_ADD', 'DATE(']):
-            query_types['date_range'].append(log)
-        elif 'WHERE' in sql_upper:
-            query_types['where_filter'].append(log)
-        else:
-            query_types['simple_select'].append(log)
-
-    # Calculate averages per type
-    type_analysis = {}
-    for qtype, queries in query_types.items():
-        if not queries:
-            continue
-
-        # Filter queries with COMPLETE scores (exclude None and 0.0 from old broken queries)
-        # Must match the overall average calculation logic to prevent discrepancies
-        queries_with_scores = [
-            q for q in queries
-            if q.faithfulness_score is not None and q.faithfulness_score > 0.0
-            and q.answer_relevance_score is not None and q.answer_relevance_score > 0.0
-            and q.context_precision_score is not None and q.context_precision_score > 0.0
-        ]
-
-        if not queries_with_scores:
-            continue
-
-        avg_faithfulness = sum(float(q.faithfulness_score) for q in queries_with_scores) / len(queries_with_scores)
-        avg_answer_relevance = sum(float(q.answer_relevance_score) for q in queries_with_scores) / len(queries_with_scores)
-        avg_context_precision = sum(float(q.context_precision_score) for q in queries_with_scores) / len(queries_with_scores)
-
-        type_analysis[qtype] = {
-            'count': len(queries_with_scores),
-            'avg_faithfulness': float(round(avg_faithfulness, 3)),
-            'avg_answer_relevance': float(round(avg_answer_relevance, 3)),
-            'avg_context_precision': float(round(avg_context_precision, 3))
+    db = get_db_session()
+    try:
+        rows = db.execute(build_top_queries_select(limit)).all()
+    finally:
+        db.close()
+
+    return [
+        {
+            "fingerprint": row.sql_fingerprint,
+            "query_type": row.query_type,
+            "count": int(row.count),
+            "last_seen": row.created_at.isoformat() if row.created_at else None,
+            "example_query": row.natural_language_query,
+            "example_sql": row.generated_sql
         }
+        for row in rows
+    ]
 
-    return type_analysis
+
+def get_historical_baseline(since: datetime | None = None, until: datetime | None = None) -> Dict:
+    """
+    Score baseline of archived query logs, read from Parquet without querying Postgres.
+
+    Args:
+        since: Only rows created at or after this time
+        until: Only rows created before this time
+
+    Returns:
+        Dictionary with total_queries, evaluated, average_scores and zero_faithfulness
+    """
+    return archive_service.archive_baseline(since=since, until=until)
+
+
+def build_top_queries_select(limit: int):
+    """
+    SELECT the most repeated fingerprints with their latest example row.
+
+    Only the top groups are joined back to query_logs for the example.
+    """
+    groups = (
+        select(
+            QueryLog.sql_fingerprint,
+            func.count().label("count"),
+            func.max(QueryLog.id).label("latest_id")
+        )
+        .where(QueryLog.sql_fingerprint.isnot(None))
+        .group_by(QueryLog.sql_fingerprint)
+        .having(func.count() > 1)
+        .order_by(func.count().desc(), func.max(QueryLog.id).desc())
+        .limit(limit)
+        .subquery()
+    )
+    return (
+        select(
+            groups.c.sql_fingerprint,
+            groups.c.count,
+            QueryLog.query_type,
+            QueryLog.natural_language_query,
+            QueryLog.generated_sql,
+            QueryLog.created_at
+        )
+        .join(QueryLog, QueryLog.id == groups.c.latest_id)
+        .order_by(groups.c.count.desc(), groups.c.latest_id.desc())
+    )
+
+
+def _weak_queries(db, limit: int) -> List[Dict]:
+    """
+    Load the most recent completed weak queries (any score < 0.7).
+
+    Args:
+        db: Database session
+        limit: Maximum number of weak queries to return
+
+    Returns:
+        List of weak query dicts, newest first
+    """
+    rows = (
+        db.query(
+            QueryLog.natural_language_query,
+            QueryLog.generated_sql,
+            QueryLog.created_at,
+            *(column for _, column in SCORE_COLUMNS)
+        )
+        .filter(QueryLog.evaluation_status == 'completed', is_weak_query())
+        .order_by(QueryLog.created_at.desc(), QueryLog.id.desc())
+        .limit(limit)
+        .all()
+    )
+
+    weak_queries = []
+    for row in rows:
+        scores = {
+            "faithfulness": float(row.faithfulness_score) if row.faithfulness_score else None,
+            "answer_relevance": float(row.answer_relevance_score) if row.answer_relevance_score else None,
+            "context_precision": float(row.context_precision_score) if row.context_precision_score else None
+        }
+        weak_queries.append({
+            "query": row.natural_language_query,
+            "scores": scores,
+            "sql": row.generated_sql,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+            "reason": _identify_weakness_reason(scores)
+        })
+
+    return weak_queries
 
 
 def _identify_weakness_reason(scores: Dict[str, float | None]) -> str:
@@ -201,21 +255,21 @@ def _identify_weakness_reason(scores: Dict[str, float | None]) -> str:
     return "Multiple quality concerns"
 
 
-def _generate_recommendations(weak_queries: List[Dict], all_logs: List[QueryLog], query_type_analysis: Dict) -> List[str]:
+def _generate_recommendations(summary: Dict, query_type_analysis: Dict) -> List[str]:
     """
     Generate actionable recommendations based on query patterns and type analysis.
 
     Args:
-        weak_queries: List of queries with scores < 0.7
-        all_logs: All query logs for pattern analysis
+        summary: Aggregates from stats_service.get_summary (total and weak-query pattern counts)
         query_type_analysis: Query type categorization with averages
 
     Returns:
         List of recommendation strings
     """
     recommendations = []
+    weak_count = summary["weak_count"]
 
-    if not weak_queries:
+    if not weak_count:
         recommendations.append("✅ All queries performing well (scores ≥ 0.7). Continue monitoring.")
         return recommendations
 
@@ -238,53 +292,38 @@ def _generate_recommendations(weak_queries: List[Dict], all_logs: List[QueryLog]
                     f"Standardize INTERVAL syntax in LLM prompt examples."
                 )
 
-    # Analyze common patterns in weak queries
-    weak_query_texts = [q["query"].lower() for q in weak_queries]
-
     # Check for salary-related queries
-    if any("salary" in text or "pay" in text or "compensation" in text for text in weak_query_texts):
+    if summary["weak_salary"]:
         recommendations.append(
             "Add few-shot examples for salary comparisons in LLM prompt (e.g., 'high earner' → salary_usd > 80000)"
         )
 
     # Check for ambiguous queries
-    if any(len(text.split()) < 5 for text in weak_query_texts):
+    if summary["weak_short"]:
         recommendations.append(
             "Provide user guidance for more specific queries (e.g., 'show employees' → 'show all active employees in engineering')"
         )
 
     # Check for faithfulness issues (low faithfulness scores)
-    low_faithfulness_count = sum(
-        1 for q in weak_queries
-        if q["scores"].get("faithfulness") and q["scores"]["faithfulness"] < 0.7
-    )
-    if low_faithfulness_count > len(weak_queries) * 0.5:
+    if summary["weak_low_faithfulness"] > weak_count * 0.5:
         recommendations.append(
             "Include database schema details in prompt context to improve SQL faithfulness"
         )
 
     # Check for context precision issues
-    low_precision_count = sum(
-        1 for q in weak_queries
-        if q["scores"].get("context_precision") and q["scores"]["context_precision"] < 0.7
-    )
-    if low_precision_count > len(weak_queries) * 0.5:
+    if summary["weak_low_context_precision"] > weak_count * 0.5:
         recommendations.append(
             "Refine LLM prompt to encourage selecting only necessary columns (avoid SELECT *)"
         )
 
     # Check for answer relevance issues
-    low_relevance_count = sum(
-        1 for q in weak_queries
-        if q["scores"].get("answer_relevance") and q["scores"]["answer_relevance"] < 0.7
-    )
-    if low_relevance_count > len(weak_queries) * 0.5:
+    if summary["weak_low_answer_relevance"] > weak_count * 0.5:
         recommendations.append(
             "Add semantic validation step to ensure SQL intent matches natural language query"
         )
 
     # Generic recommendation if weak queries > 30% of total
-    if len(weak_queries) > len(all_logs) * 0.3:
+    if weak_count > summary["total_queries"] * 0.3:
         recommendations.append(
             "Consider A/B testing alternative LLM prompts to improve overall query quality"
         )
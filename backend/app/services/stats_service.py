@@ -0,0 +1,314 @@
+"""Incrementally maintained report aggregates (query_log_stats).
+
+Each logged query adds to query_count for its day and query type, and each
+query that reaches evaluation_status='completed' adds its scores to the
+running sums and counts in the same transaction that completes it. The
+analysis report then reads a handful of pre-aggregated rows instead of
+scanning query_logs.
+
+build_stats_select() recomputes the same aggregates from query_logs; it
+backs rebuild_stats() and check_stats() (python -m app.db.rebuild_stats).
+"""
+
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, List
+from sqlalchemy import func, and_, or_, cast, Date, select, text
+from sqlalchemy.dialects.postgresql import insert
+import structlog
+
+from app.db.session import get_db_session
+from app.db.models import QueryLog, QueryLogStats
+from app.services.query_classifier import QUERY_TYPES, contains_any, query_type_expression
+
+logger = structlog.get_logger()
+
+# Queries with any score below this are reported as weak
+WEAK_SCORE_THRESHOLD = 0.7
+
+# Question keywords that mark a weak query as salary-related
+SALARY_KEYWORDS = ('salary', 'pay', 'compensation')
+
+# Questions with fewer words than this are flagged as ambiguous
+SHORT_QUERY_WORDS = 5
+
+# (metric name, query_logs score column)
+SCORE_COLUMNS = (
+    ('faithfulness', QueryLog.faithfulness_score),
+    ('answer_relevance', QueryLog.answer_relevance_score),
+    ('context_precision', QueryLog.context_precision_score),
+)
+
+# Aggregate columns of query_log_stats, all additive
+STAT_COLUMNS = tuple(
+    column.name for column in QueryLogStats.__table__.columns
+    if column.name not in ('day', 'query_type')
+)
+
+
+def is_weak_score(column):
+    """A score counts as weak if it is set, non-zero and below the threshold."""
+    # 0.0 scores come from old queries before Bug #002/#003 fixes and are ignored
+    return and_(column > 0, column < WEAK_SCORE_THRESHOLD)
+
+
+def is_weak_query():
+    """A query is weak if any of its scores is weak."""
+    return or_(*(is_weak_score(column) for _, column in SCORE_COLUMNS))
+
+
+def _upsert(db, day, query_type: str, increments: Dict):
+    """Add increments to the (day, query_type) row, creating it if needed."""
+    table = QueryLogStats.__table__
+    statement = insert(table).values(day=day, query_type=query_type, **increments)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.day, table.c.query_type],
+        set_={name: table.c[name] + statement.excluded[name] for name in increments}
+    )
+    db.execute(statement)
+
+
+def record_logged(db, query_type: str):
+    """
+    Count a newly logged query (call before the insert's commit).
+
+    The day is CURRENT_DATE, matching the row's created_at default.
+    """
+    _upsert(db, func.current_date(), query_type, {"query_count": 1})
+
+
+def stored_score(value) -> float | None:
+    """A score as the DECIMAL(3,2) score columns store it (rounded half away from zero)."""
+    if value is None:
+        return None
+    return float(Decimal(str(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
+
+
+def completion_increments(nl_query: str, scores: Dict) -> Dict:
+    """
+    Compute the aggregate increments contributed by one completed query.
+
+    Scores are rounded as query_logs stores them first, so the increments
+    match what rebuild_stats() later computes from the stored rows.
+
+    Args:
+        nl_query: Natural language query
+        scores: faithfulness, answer_relevance and context_precision (None if missing)
+
+    Returns:
+        Dictionary of STAT_COLUMNS increments (query_count excluded)
+    """
+    scores = {name: stored_score(value) for name, value in scores.items()}
+    valid = {name: value for name, value in scores.items() if value is not None and value > 0}
+    weak = {name for name, value in valid.items() if value < WEAK_SCORE_THRESHOLD}
+    complete = len(valid) == len(SCORE_COLUMNS)
+
+    increments = {}
+    for name, _ in SCORE_COLUMNS:
+        increments[f"{name}_sum"] = valid.get(name, 0)
+        increments[f"{name}_count"] = int(name in valid)
+        increments[f"complete_{name}_sum"] = valid[name] if complete else 0
+        increments[f"weak_low_{name}"] = int(name in weak)
+    increments["complete_count"] = int(complete)
+    increments["weak_count"] = int(bool(weak))
+
+    query_lower = nl_query.lower()
+    increments["weak_salary"] = int(bool(weak) and any(keyword in query_lower for keyword in SALARY_KEYWORDS))
+    increments["weak_short"] = int(bool(weak) and len(nl_query.split()) < SHORT_QUERY_WORDS)
+    return increments
+
+
+def record_completed(db, day: date | None, query_type: str, nl_query: str, scores: Dict):
+    """
+    Add a completed query's scores to the running aggregates.
+
+    Must run in the transaction that sets evaluation_status='completed' so
+    the aggregates and the query log commit (or roll back) together.
+
+    Args:
+        db: Session holding the completing transaction
+        day: created_at date of the query log (None for CURRENT_DATE)
+        query_type: Query type of the generated SQL
+        nl_query: Natural language query
+        scores: faithfulness, answer_relevance and context_precision
+    """
+    _upsert(db, day if day is not None else func.current_date(), query_type,
+            completion_increments(nl_query, scores))
+
+
+def get_summary(db) -> Dict:
+    """
+    Sum the aggregates over all days and types.
+
+    Returns:
+        Dictionary with total_queries, average_scores, weak_count and the
+        weak_low_* / weak_salary / weak_short pattern counts
+    """
+    table = QueryLogStats.__table__
+    row = db.query(
+        *(func.coalesce(func.sum(table.c[name]), 0).label(name) for name in STAT_COLUMNS)
+    ).one()
+
+    def average(name):
+        count = getattr(row, f"{name}_count")
+        return float(round(float(getattr(row, f"{name}_sum")) / count, 2)) if count else 0.0
+
+    return {
+        "total_queries": int(row.query_count),
+        "average_scores": {name: average(name) for name, _ in SCORE_COLUMNS},
+        "weak_count": int(row.weak_count),
+        "weak_low_faithfulness": int(row.weak_low_faithfulness),
+        "weak_low_answer_relevance": int(row.weak_low_answer_relevance),
+        "weak_low_context_precision": int(row.weak_low_context_precision),
+        "weak_salary": int(row.weak_salary),
+        "weak_short": int(row.weak_short)
+    }
+
+
+def get_type_analysis(db) -> Dict:
+    """
+    Per-type averages over queries with all three scores set.
+
+    Returns:
+        Dictionary keyed by query type (in QUERY_TYPES order) with count and
+        avg_faithfulness / avg_answer_relevance / avg_context_precision
+    """
+    rows = db.query(
+        QueryLogStats.query_type,
+        func.sum(QueryLogStats.complete_count).label("count"),
+        *(func.sum(getattr(QueryLogStats, f"complete_{name}_sum")).label(f"{name}_sum")
+          for name, _ in SCORE_COLUMNS)
+    ).group_by(QueryLogStats.query_type).all()
+
+    by_type = {row.query_type: row for row in rows if row.count}
+
+    type_analysis = {}
+    for query_type in QUERY_TYPES:
+        row = by_type.get(query_type)
+        if row is None:
+            continue
+        type_analysis[query_type] = {
+            'count': int(row.count),
+            **{f'avg_{name}': float(round(float(getattr(row, f"{name}_sum")) / row.count, 3))
+               for name, _ in SCORE_COLUMNS}
+        }
+
+    return type_analysis
+
+
+def build_stats_select():
+    """
+    SELECT recomputing query_log_stats rows from query_logs.
+
+    Scores count only for completed queries, exactly as record_completed()
+    adds them.
+    """
+    completed = QueryLog.evaluation_status == 'completed'
+    word_count = func.array_length(
+        func.regexp_split_to_array(func.btrim(QueryLog.natural_language_query), r'\s+'), 1
+    )
+
+    logs = select(
+        cast(QueryLog.created_at, Date).label("day"),
+        # Rows logged before query_type existed and not yet backfilled are classified inline
+        func.coalesce(QueryLog.query_type, query_type_expression(QueryLog.generated_sql)).label("query_type"),
+        *(column.label(name) for name, column in SCORE_COLUMNS),
+        completed.label("completed"),
+        and_(completed, is_weak_query()).label("weak"),
+        contains_any(func.lower(QueryLog.natural_language_query), SALARY_KEYWORDS).label("salary"),
+        (func.coalesce(word_count, 0) < SHORT_QUERY_WORDS).label("short")
+    ).subquery()
+
+    def valid(name):
+        return and_(logs.c.completed, logs.c[name] > 0)
+
+    complete = and_(*(valid(name) for name, _ in SCORE_COLUMNS))
+
+    def total(column, condition):
+        return func.coalesce(func.sum(column).filter(condition), 0)
+
+    aggregates = {"query_count": func.count()}
+    for name, _ in SCORE_COLUMNS:
+        aggregates[f"{name}_sum"] = total(logs.c[name], valid(name))
+        aggregates[f"{name}_count"] = func.count().filter(valid(name))
+        aggregates[f"complete_{name}_sum"] = total(logs.c[name], complete)
+        aggregates[f"weak_low_{name}"] = func.count().filter(
+            and_(logs.c.completed, is_weak_score(logs.c[name]))
+        )
+    aggregates["complete_count"] = func.count().filter(complete)
+    aggregates["weak_count"] = func.count().filter(logs.c.weak)
+    aggregates["weak_salary"] = func.count().filter(and_(logs.c.weak, logs.c.salary))
+    aggregates["weak_short"] = func.count().filter(and_(logs.c.weak, logs.c.short))
+
+    return (
+        select(logs.c.day, logs.c.query_type, *(aggregates[name].label(name) for name in STAT_COLUMNS))
+        .group_by(logs.c.day, logs.c.query_type)
+    )
+
+
+def rebuild_stats() -> int:
+    """
+    Recompute query_log_stats from scratch.
+
+    Runs in one transaction holding an EXCLUSIVE lock on query_log_stats, so
+    completions that happen meanwhile wait and are applied on top of the
+    rebuilt rows.
+
+    Returns:
+        Number of (day, query_type) rows written
+    """
+    db = get_db_session()
+    try:
+        db.execute(text("LOCK TABLE query_log_stats IN EXCLUSIVE MODE"))
+        db.query(QueryLogStats).delete(synchronize_session=False)
+        result = db.execute(
+            insert(QueryLogStats.__table__).from_select(
+                ["day", "query_type", *STAT_COLUMNS], build_stats_select()
+            )
+        )
+        db.commit()
+        logger.info("query_log_stats_rebuilt", rows=result.rowcount)
+        return result.rowcount
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def check_stats() -> List[Dict]:
+    """
+    Compare query_log_stats with a fresh recomputation.
+
+    Returns:
+        One entry per mismatched (day, query_type) with 'stored' and
+        'expected' column values (None for a missing row); empty if consistent
+    """
+    db = get_db_session()
+    try:
+        expected = {(row.day, row.query_type): row for row in db.execute(build_stats_select())}
+        stored = {(row.day, row.query_type): row for row in db.query(QueryLogStats).all()}
+    finally:
+        db.close()
+
+    mismatches = []
+    for key in sorted(set(expected) | set(stored), key=lambda k: (k[0], k[1])):
+        expected_values = {name: getattr(expected[key], name) for name in STAT_COLUMNS} if key in expected else None
+        stored_values = {name: getattr(stored[key], name) for name in STAT_COLUMNS} if key in stored else None
+        if expected_values != stored_values:
+            mismatches.append({
+                "day": key[0].isoformat(),
+                "query_type": key[1],
+                "stored": stored_values,
+                "expected": expected_values
+            })
+    return mismatches
+
+
+def is_empty() -> bool:
+    """Check whether query_log_stats has no rows yet."""
+    db = get_db_session()
+    try:
+        return db.query(QueryLogStats.day).first() is None
+    finally:
+        db.close()
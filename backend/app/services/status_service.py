@@ -0,0 +1,144 @@
+"""Evaluation status lookups and payloads for query logs.
+
+query_logs is partitioned by created_at (migration 012), so a lookup by id
+alone probes the primary key of every partition. Status is almost always
+requested within moments of the query, so lookups first bound created_at to
+RECENT_LOOKUP_WINDOW (the planner prunes to the latest one or two
+partitions) and only fall back to all partitions for older or missing IDs.
+"""
+
+from datetime import timedelta
+from sqlalchemy import any_, bindparam, func, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+import structlog
+
+from app.db.session import get_db_session
+from app.db.models import QueryLog
+
+logger = structlog.get_logger()
+
+# Statuses after which a query log no longer changes
+TERMINAL_STATUSES = ('completed', 'failed')
+
+# Lookups search rows created this recently before scanning every partition
+RECENT_LOOKUP_WINDOW = timedelta(days=1)
+
+# Only the columns needed for a status payload (skips the large SQL/query text)
+STATUS_COLUMNS = (
+    QueryLog.id,
+    QueryLog.evaluation_status,
+    QueryLog.faithfulness_score,
+    QueryLog.answer_relevance_score,
+    QueryLog.context_precision_score,
+    QueryLog.heuristic_faithfulness_score,
+    QueryLog.heuristic_answer_relevance_score,
+    QueryLog.heuristic_context_utilization_score,
+    QueryLog.score_source,
+)
+
+
+def recent_rows():
+    """Filter on created_at that limits a query to the partitions holding recent rows."""
+    return QueryLog.created_at >= func.localtimestamp() - RECENT_LOOKUP_WINDOW
+
+
+def find_by_id(query, query_log_id: int):
+    """First row of query with query_log_id, searching recent partitions before all of them."""
+    return (query.filter(QueryLog.id == query_log_id, recent_rows()).first()
+            or query.filter(QueryLog.id == query_log_id).first())
+
+
+def _score(value) -> float | None:
+    return float(value) if value is not None else None
+
+
+def build_status_payload(row) -> dict:
+    """
+    Build the evaluation status payload for a query log.
+
+    Args:
+        row: QueryLog instance or row with the STATUS_COLUMNS attributes
+
+    Returns:
+        Dictionary with query_log_id, evaluation_status, ragas_scores (a
+        metric is None when it timed out), score_source and provisional_scores
+    """
+    payload = {
+        "query_log_id": row.id,
+        "evaluation_status": row.evaluation_status,
+        "ragas_scores": None,
+        "score_source": None,
+        "provisional_scores": None
+    }
+
+    if row.heuristic_faithfulness_score is not None:
+        payload["provisional_scores"] = {
+            "faithfulness": float(row.heuristic_faithfulness_score),
+            "answer_relevance": float(row.heuristic_answer_relevance_score),
+            "context_utilization": float(row.heuristic_context_utilization_score)
+        }
+
+    if row.evaluation_status == 'completed':
+        # A metric that timed out stays NULL and is reported as null, not as a score of 0
+        payload["ragas_scores"] = {
+            "faithfulness": _score(row.faithfulness_score),
+            "answer_relevance": _score(row.answer_relevance_score),
+            "context_utilization": _score(row.context_precision_score)
+        }
+        payload["score_source"] = row.score_source or 'ragas'
+
+    return payload
+
+
+def get_status(query_log_id: int) -> dict | None:
+    """
+    Load the evaluation status payload for one query log.
+
+    Returns:
+        Status payload, or None if the query log does not exist
+    """
+    db = get_db_session()
+    try:
+        row = find_by_id(db.query(*STATUS_COLUMNS), query_log_id)
+        return build_status_payload(row) if row else None
+    finally:
+        db.close()
+
+
+def get_statuses(query_log_ids: list) -> list:
+    """
+    Load evaluation status payloads for many query logs in one query.
+
+    Uses a single array parameter (WHERE id = ANY(:ids)) so the statement
+    is the same for any number of IDs and resolves through the primary key.
+    IDs not found among recent rows are looked up in all partitions.
+
+    Args:
+        query_log_ids: Query log IDs (duplicates are ignored)
+
+    Returns:
+        Status payloads in the order of query_log_ids; missing IDs are omitted
+    """
+    ids = list(dict.fromkeys(query_log_ids))
+    if not ids:
+        return []
+
+    def lookup(wanted: list, *criteria) -> list:
+        return (
+            db.query(*STATUS_COLUMNS)
+            .filter(QueryLog.id == any_(bindparam("ids", wanted, type_=ARRAY(Integer))), *criteria)
+            .all()
+        )
+
+    db = get_db_session()
+    try:
+        rows = lookup(ids, recent_rows())
+        found = {row.id for row in rows}
+        older = [id for id in ids if id not in found]
+        if older:
+            rows += lookup(older)
+    finally:
+        db.close()
+
+    payloads = {row.id: build_status_payload(row) for row in rows}
+    return [payloads[id] for id in ids if id in payloads]
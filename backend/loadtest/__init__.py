@@ -0,0 +1 @@
+"""Load-testing tools: a fake OpenAI-compatible server and an asyncio load generator."""
@@ -0,0 +1,247 @@
+"""
+Fake OpenAI-compatible API for load testing without an OpenAI key.
+
+Serves the endpoints the backend uses:
+- POST /v1/chat/completions: SQL generation prompts (llm_service.SYSTEM_PROMPT)
+  are answered with the SQL of the closest few-shot example in that prompt;
+  RAGAS metric prompts get minimal well-formed JSON answers
+- POST /v1/embeddings: deterministic unit vectors derived from the input text
+- GET /v1/models
+
+Each completion and embedding call waits for a latency drawn from a
+configurable distribution, and a fraction of calls can fail with HTTP 500.
+
+Point the API at it with OPENAI_BASE_URL (read by the OpenAI SDK, and so by
+LangChain's ChatOpenAI/OpenAIEmbeddings used by RAGAS):
+
+    python -m loadtest.fake_openai --port 8100 --latency lognormal:400:0.5
+    OPENAI_BASE_URL=http://localhost:8100/v1 OPENAI_API_KEY=fake uvicorn app.main:app
+"""
+
+import re
+import sys
+import json
+import math
+import time
+import random
+import asyncio
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.services.llm_service import SYSTEM_PROMPT
+
+EXAMPLE = re.compile(r'User: "(.+?)"\nSQL: (.+)')
+WORD = re.compile(r"[a-z0-9]+")
+
+FALLBACK_SQL = "SELECT * FROM employees"
+EMBEDDING_DIMENSIONS = 1536
+
+
+def few_shot_examples(prompt: str = SYSTEM_PROMPT) -> List[Tuple[str, str]]:
+    """(question, SQL) pairs of the few-shot examples in the SQL generation prompt."""
+    return [(question, sql.strip()) for question, sql in EXAMPLE.findall(prompt)]
+
+
+def _words(text: str) -> set:
+    return set(WORD.findall(text.lower()))
+
+
+def answer_sql(question: str, examples: List[Tuple[str, str]]) -> str:
+    """SQL of the example question sharing the most words with question (Jaccard similarity)."""
+    asked = _words(question)
+    best_sql, best_score = FALLBACK_SQL, 0.0
+    for example_question, sql in examples:
+        words = _words(example_question)
+        score = len(asked & words) / len(asked | words) if asked | words else 0.0
+        if score > best_score:
+            best_sql, best_score = sql, score
+    return best_sql
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Parse a latency distribution in milliseconds into a sampler returning seconds.
+
+    Formats: constant:MS, uniform:LOW:HIGH, normal:MEAN:STDDEV,
+    lognormal:MEDIAN:SIGMA (heavy-tailed, closest to real API latency).
+
+    Raises:
+        ValueError: For an unknown distribution or wrong parameter count
+    """
+    name, *params = spec.split(":")
+    try:
+        values = [float(param) for param in params]
+    except ValueError:
+        raise ValueError(f"Invalid latency parameters: {spec}")
+
+    distributions = {
+        'constant': (1, lambda rng, ms: ms),
+        'uniform': (2, lambda rng, low, high: rng.uniform(low, high)),
+        'normal': (2, lambda rng, mean, stddev: rng.gauss(mean, stddev)),
+        'lognormal': (2, lambda rng, median, sigma: rng.lognormvariate(math.log(median), sigma)),
+    }
+    if name not in distributions:
+        raise ValueError(f"Unknown latency distribution: {name} (use {', '.join(distributions)})")
+    arity, sample = distributions[name]
+    if len(values) != arity:
+        raise ValueError(f"{name} latency takes {arity} parameter(s): {spec}")
+    return lambda rng: max(sample(rng, *values), 0.0) / 1000
+
+
+def _last_field(prompt: str, field: str) -> str:
+    """Value of the last 'field: ...' line in a prompt (the actual input after the examples)."""
+    matches = re.findall(rf"^{field}:\s*(.*)$", prompt, re.IGNORECASE | re.MULTILINE)
+    return matches[-1].strip() if matches else ""
+
+
+def ragas_answer(prompt: str) -> str:
+    """
+    Minimal well-formed answer to a RAGAS 0.1 metric prompt.
+
+    Recognises the answer-relevancy question generation, faithfulness
+    statement extraction and verification (NLI) and context precision
+    prompts; anything else gets a plain 'OK'.
+    """
+    if "noncommittal" in prompt:
+        return json.dumps({"question": _last_field(prompt, "answer") or "What does the data show?",
+                           "noncommittal": 0})
+    if "simpler_statements" in prompt:
+        return json.dumps([{"sentence_index": 0,
+                            "simpler_statements": [_last_field(prompt, "answer") or "No results were found."]}])
+    if "statements" in prompt and "verdict" in prompt:
+        try:
+            statements = json.loads(_last_field(prompt, "statements"))
+        except json.JSONDecodeError:
+            statements = []
+        return json.dumps([{"statement": statement, "reason": "Supported by the context.", "verdict": 1}
+                           for statement in statements if isinstance(statement, str)])
+    if "verdict" in prompt:
+        return json.dumps({"reason": "The context was useful in arriving at the answer.", "verdict": 1})
+    return "OK"
+
+
+def embedding(text: str, dimensions: int = EMBEDDING_DIMENSIONS) -> List[float]:
+    """Deterministic unit vector for text (same text, same vector)."""
+    rng = random.Random(hashlib.sha256(text.encode()).digest())
+    vector = [rng.gauss(0.0, 1.0) for _ in range(dimensions)]
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+
+def _usage(prompt: str, completion: str = "") -> dict:
+    prompt_tokens = len(prompt.split())
+    completion_tokens = len(completion.split())
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens}
+
+
+def create_app(latency: str = "lognormal:400:0.5", embedding_latency: str = "constant:20",
+               error_rate: float = 0.0, seed: int | None = None) -> FastAPI:
+    """
+    Build the fake API.
+
+    Args:
+        latency: Chat completion latency distribution (see parse_latency)
+        embedding_latency: Embedding latency distribution
+        error_rate: Fraction of calls answered with HTTP 500
+        seed: Random seed for reproducible latencies and failures
+    """
+    app = FastAPI(title="Fake OpenAI API")
+    rng = random.Random(seed)
+    completion_delay = parse_latency(latency)
+    embedding_delay = parse_latency(embedding_latency)
+    examples = few_shot_examples()
+
+    async def simulate(delay: Callable[[random.Random], float]) -> JSONResponse | None:
+        await asyncio.sleep(delay(rng))
+        if error_rate > 0 and rng.random() < error_rate:
+            return JSONResponse(status_code=500, content={
+                "error": {"message": "Simulated server error", "type": "server_error", "code": None}
+            })
+        return None
+
+    @app.get("/v1/models")
+    async def list_models():
+        return {"object": "list", "data": [{"id": "gpt-4o-mini", "object": "model", "owned_by": "fake"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        error = await simulate(completion_delay)
+        if error:
+            return error
+
+        messages = body.get("messages", [])
+        system = next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+        user = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+        if "SQL query generator" in system:
+            content = answer_sql(user, examples)
+        else:
+            content = ragas_answer("\n".join(str(m.get("content", "")) for m in messages))
+
+        choices = [
+            {"index": index, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+            for index in range(body.get("n") or 1)
+        ]
+        return {
+            "id": f"chatcmpl-fake-{time.time_ns()}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4o-mini"),
+            "choices": choices,
+            "usage": _usage(user, content)
+        }
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        error = await simulate(embedding_delay)
+        if error:
+            return error
+
+        inputs = body.get("input", [])
+        if isinstance(inputs, str) or (inputs and isinstance(inputs[0], int)):
+            inputs = [inputs]
+        dimensions = body.get("dimensions") or EMBEDDING_DIMENSIONS
+        return {
+            "object": "list",
+            "data": [{"object": "embedding", "index": index, "embedding": embedding(str(text), dimensions)}
+                     for index, text in enumerate(inputs)],
+            "model": body.get("model", "text-embedding-ada-002"),
+            "usage": _usage(" ".join(map(str, inputs)))
+        }
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible API for load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", default="lognormal:400:0.5",
+                        help="Chat completion latency in ms: constant:MS, uniform:LOW:HIGH, "
+                             "normal:MEAN:STDDEV or lognormal:MEDIAN:SIGMA (default: %(default)s)")
+    parser.add_argument("--embedding-latency", default="constant:20",
+                        help="Embedding latency in ms (default: %(default)s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls failing with HTTP 500")
+    parser.add_argument("--seed", type=int, help="Random seed")
+    args = parser.parse_args()
+
+    try:
+        app = create_app(args.latency, args.embedding_latency, args.error_rate, args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Asyncio load generator for POST /api/query.
+
+Keeps `concurrency` requests in flight until `requests` have been sent (or
+`duration` seconds have passed), optionally polls each query's evaluation
+status until it finishes, and reports throughput, latency percentiles and
+the error mix:
+
+    python -m loadtest.generator --base-url http://localhost:8000 --concurrency 20 --requests 500 --poll
+
+Queries default to the few-shot example questions, which the fake OpenAI
+server (loadtest.fake_openai) answers with valid SQL.
+"""
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+import itertools
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx
+
+from loadtest.fake_openai import few_shot_examples
+
+TERMINAL_STATUSES = ('completed', 'failed')
+PERCENTILES = (('p50', 0.5), ('p95', 0.95), ('p99', 0.99))
+
+
+def default_queries() -> List[str]:
+    return [question for question, _ in few_shot_examples()]
+
+
+def percentile(values: List[float], fraction: float) -> float | None:
+    """Linearly interpolated percentile of values (None when empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _distribution(values: List[float]) -> Dict:
+    result = {label: round(percentile(values, fraction), 1) if values else None for label, fraction in PERCENTILES}
+    result["max"] = round(max(values), 1) if values else None
+    return result
+
+
+async def _poll_evaluation(client: httpx.AsyncClient, query_log_id: int, interval: float,
+                           timeout: float) -> tuple:
+    """Poll GET /api/query/{id} until a terminal status; returns (status or 'timeout', seconds)."""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        response = await client.get(f"/api/query/{query_log_id}")
+        if response.status_code == 200:
+            status = response.json().get("evaluation_status")
+            if status in TERMINAL_STATUSES:
+                return status, time.perf_counter() - started
+        await asyncio.sleep(interval)
+    return 'timeout', time.perf_counter() - started
+
+
+async def _send_query(client: httpx.AsyncClient, query: str, poll: bool, poll_interval: float,
+                      poll_timeout: float) -> Dict:
+    """Send one query; outcome is 'ok', the response's error_type, HTTP_<status> or the exception name."""
+    started = time.perf_counter()
+    result = {"evaluation_status": None, "evaluation_ms": None}
+    try:
+        response = await client.post("/api/query", json={"query": query})
+        result["latency_ms"] = (time.perf_counter() - started) * 1000
+        body = response.json() if response.headers.get("content-type", "").startswith("application/json") else {}
+        if response.status_code != 200:
+            result["outcome"] = f"HTTP_{response.status_code}"
+        elif not body.get("success"):
+            result["outcome"] = body.get("error_type") or "UNKNOWN_ERROR"
+        else:
+            result["outcome"] = "ok"
+            status = body.get("evaluation_status")
+            if poll and body.get("query_log_id") and status not in TERMINAL_STATUSES:
+                status, seconds = await _poll_evaluation(client, body["query_log_id"], poll_interval, poll_timeout)
+                result["evaluation_ms"] = seconds * 1000
+            result["evaluation_status"] = status
+    except httpx.HTTPError as e:
+        result["latency_ms"] = (time.perf_counter() - started) * 1000
+        result["outcome"] = type(e).__name__
+    return result
+
+
+def summarize(results: List[Dict], elapsed_seconds: float) -> Dict:
+    """
+    Aggregate per-request results.
+
+    Returns:
+        Dictionary with requests, duration_seconds, throughput_rps, latency_ms
+        (p50/p95/p99/max over all requests), outcomes (count per outcome) and
+        evaluations (count per final status and latency_ms of polled ones)
+    """
+    polled = [result["evaluation_ms"] for result in results if result["evaluation_ms"] is not None]
+    return {
+        "requests": len(results),
+        "duration_seconds": round(elapsed_seconds, 2),
+        "throughput_rps": round(len(results) / elapsed_seconds, 1) if elapsed_seconds else None,
+        "latency_ms": _distribution([result["latency_ms"] for result in results]),
+        "outcomes": dict(Counter(result["outcome"] for result in results).most_common()),
+        "evaluations": {
+            "statuses": dict(Counter(result["evaluation_status"] for result in results
+                                     if result["evaluation_status"]).most_common()),
+            "latency_ms": _distribution(polled)
+        }
+    }
+
+
+async def run_load(base_url: str, queries: Optional[List[str]] = None, concurrency: int = 10,
+                   requests: Optional[int] = 100, duration: Optional[float] = None, poll: bool = False,
+                   poll_interval: float = 0.5, poll_timeout: float = 120.0, timeout: float = 30.0,
+                   transport: Optional[httpx.AsyncBaseTransport] = None) -> Dict:
+    """
+    Drive POST /api/query at a fixed concurrency.
+
+    Args:
+        base_url: API root, e.g. http://localhost:8000
+        queries: Natural language queries, sent round-robin (defaults to the few-shot questions)
+        concurrency: Requests in flight at once
+        requests: Total requests to send (None to run for duration only)
+        duration: Stop starting new requests after this many seconds
+        poll: Poll each pending evaluation until it completes or fails
+        poll_interval: Seconds between status polls
+        poll_timeout: Give up polling an evaluation after this many seconds
+        timeout: HTTP timeout per request in seconds
+        transport: httpx transport override (tests)
+
+    Returns:
+        Summary from summarize()
+    """
+    if requests is None and duration is None:
+        raise ValueError("Set requests, duration or both")
+    queries = queries or default_queries()
+    sent = itertools.count()
+    results = []
+    started = time.perf_counter()
+
+    def next_query() -> str | None:
+        index = next(sent)
+        if requests is not None and index >= requests:
+            return None
+        if duration is not None and time.perf_counter() - started >= duration:
+            return None
+        return queries[index % len(queries)]
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits, transport=transport) as client:
+        async def worker():
+            while (query := next_query()) is not None:
+                results.append(await _send_query(client, query, poll, poll_interval, poll_timeout))
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return summarize(results, time.perf_counter() - started)
+
+
+def format_report(summary: Dict) -> str:
+    """Human-readable summary."""
+    def distribution(values: Dict) -> str:
+        return "  ".join(f"{label}={value if value is not None else '-'}" for label, value in values.items())
+
+    lines = [
+        f"Requests:    {summary['requests']} in {summary['duration_seconds']}s "
+        f"({summary['throughput_rps']} req/s)",
+        f"Latency ms:  {distribution(summary['latency_ms'])}",
+        "Outcomes:    " + ", ".join(f"{outcome}={count}" for outcome, count in summary["outcomes"].items()),
+    ]
+    evaluations = summary["evaluations"]
+    if evaluations["statuses"]:
+        lines.append("Evaluations: " + ", ".join(f"{status}={count}"
+                                                  for status, count in evaluations["statuses"].items()))
+        lines.append(f"Eval ms:     {distribution(evaluations['latency_ms'])}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test POST /api/query")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, help="Total requests (default 100 unless --duration is set)")
+    parser.add_argument("--duration", type=float, help="Seconds to keep sending requests")
+    parser.add_argument("--poll", action="store_true", help="Poll evaluation status until each finishes")
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    parser.add_argument("--poll-timeout", type=float, default=120.0)
+    parser.add_argument("--queries", type=Path, help="File with one natural language query per line")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args()
+
+    queries = None
+    if args.queries:
+        queries = [line.strip() for line in args.queries.read_text().splitlines() if line.strip()]
+    requests = args.requests if args.requests is not None or args.duration is not None else 100
+
+    summary = asyncio.run(run_load(
+        args.base_url, queries, args.concurrency, requests, args.duration,
+        args.poll, args.poll_interval, args.poll_timeout
+    ))
+    print(json.dumps(summary, indent=2) if args.json else format_report(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Data-size scaling benchmark for the query path.
+
+Reloads the employees table with synthetic rows (app.db.synthetic_employees)
+at each size, then runs a fixed set of representative generated SQL
+statements through the real query_service.execute_query with the LLM stubbed
+out, and reports per size and statement:
+- latency_ms: end-to-end execute_query time (median of --repeat runs)
+- db_ms: the 'db' stage (execute and serialize) from QueryResponse.timings
+- rows_serialized: rows the statement matches, all of which are serialized
+  before the 1000-row cap is applied
+- peak_rss_mb / rss_growth_mb: process peak RSS during the run and its growth
+  over the RSS before it
+
+This replaces the contents of the employees table; it needs --yes, and the
+hand-written seed rows are restored afterwards unless --keep is given:
+
+    python -m loadtest.scaling --sizes 10000,100000,1000000,10000000 --yes --csv scaling.csv
+"""
+
+import re
+import gc
+import sys
+import csv
+import json
+import time
+import asyncio
+import argparse
+import resource
+import statistics
+from pathlib import Path
+from typing import Dict, List, Tuple
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import text
+
+from app.db.session import get_engine
+from app.db.synthetic_employees import DEFAULT_SEED, load_employees
+from app.services import query_service
+from loadtest.fake_openai import few_shot_examples
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000, 10_000_000)
+BAR_WIDTH = 30
+
+# Filters and sorts the few-shot examples do not cover (columns without an index)
+EXTRA_STATEMENTS = (
+    ("Who are the Sales Representatives?",
+     "SELECT * FROM employees WHERE role = 'Sales Representative'"),
+    ("Find Priya Patel",
+     "SELECT * FROM employees WHERE first_name = 'Priya' AND last_name = 'Patel'"),
+    ("Top 10 highest paid employees",
+     "SELECT first_name, last_name, department, salary_usd FROM employees ORDER BY salary_usd DESC LIMIT 10"),
+    ("Average salary by department",
+     "SELECT department, AVG(salary_usd) AS avg_salary FROM employees GROUP BY department ORDER BY department"),
+)
+
+
+def default_statements() -> List[Tuple[str, str]]:
+    """Distinct few-shot example statements plus EXTRA_STATEMENTS, as (question, sql)."""
+    statements = {}
+    for question, sql in [*few_shot_examples(), *EXTRA_STATEMENTS]:
+        statements.setdefault(sql, question)
+    return [(question, sql) for sql, question in statements.items()]
+
+
+def _status_mb(field: str) -> float | None:
+    """A memory field of /proc/self/status in MB (Linux only)."""
+    try:
+        match = re.search(rf"^{field}:\s+(\d+) kB", Path("/proc/self/status").read_text(), re.MULTILINE)
+    except OSError:
+        return None
+    return int(match.group(1)) / 1024 if match else None
+
+
+def reset_peak_rss() -> bool:
+    """Reset the kernel's peak RSS (VmHWM) so the next reading covers only what follows."""
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb() -> float:
+    """Peak RSS in MB since the last reset_peak_rss() (since process start where unsupported)."""
+    peak = _status_mb("VmHWM")
+    if peak is not None:
+        return peak
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, kilobytes elsewhere
+    return maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def current_rss_mb() -> float | None:
+    return _status_mb("VmRSS")
+
+
+async def measure_statement(question: str, sql: str, repeat: int = 3) -> Dict:
+    """
+    Run one statement through execute_query repeat times with the LLM stubbed out.
+
+    The query log insert is skipped so the benchmark leaves query_logs untouched.
+
+    Returns:
+        Dictionary with latency_ms, db_ms, rows_returned, peak_rss_mb and
+        rss_growth_mb, or error/error_type when the query failed
+    """
+    async def stub_generate_sql(_query: str) -> str:
+        return sql
+
+    latencies, db_timings, peaks, growths = [], [], [], []
+    with patch.object(query_service, "generate_sql", stub_generate_sql), \
+            patch.object(query_service, "_log_query", return_value=None):
+        for _ in range(repeat):
+            gc.collect()
+            before = current_rss_mb()
+            reset_peak_rss()
+            started = time.perf_counter()
+            response = await query_service.execute_query(question)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if not response.success:
+                return {"error": response.error, "error_type": response.error_type}
+            peak = peak_rss_mb()
+            peaks.append(peak)
+            growths.append(peak - before if before is not None else None)
+            db_timings.append(response.timings["db"])
+            rows_returned = response.result_count
+            del response
+
+    return {
+        "latency_ms": round(statistics.median(latencies), 1),
+        "db_ms": statistics.median(db_timings),
+        "rows_returned": rows_returned,
+        "peak_rss_mb": round(max(peaks), 1),
+        "rss_growth_mb": round(max(growths), 1) if None not in growths else None,
+    }
+
+
+def matched_rows(engine, sql: str) -> int:
+    """Rows a statement produces before the result cap."""
+    with engine.connect() as connection:
+        return connection.execute(text(f"SELECT COUNT(*) FROM ({sql}) AS matched")).scalar()
+
+
+async def run_scaling(engine, sizes=DEFAULT_SIZES, statements: List[Tuple[str, str]] | None = None,
+                      repeat: int = 3, seed: int = DEFAULT_SEED) -> List[Dict]:
+    """
+    Load each table size and measure every statement against it.
+
+    Returns:
+        One dictionary per (size, statement) with table_rows, question, sql,
+        rows_serialized and the fields from measure_statement()
+    """
+    statements = statements or default_statements()
+    results = []
+    for size in sizes:
+        load = load_employees(engine, size, seed=seed, truncate=True)
+        print(f"Loaded {size:,} employees in {load['seconds']}s", file=sys.stderr)
+        for question, sql in statements:
+            measurement = await measure_statement(question, sql, repeat)
+            results.append({"table_rows": size, "question": question, "sql": sql,
+                            "rows_serialized": matched_rows(engine, sql), **measurement})
+    return results
+
+
+def _bar(value: float, largest: float) -> str:
+    return "#" * max(1, round(BAR_WIDTH * value / largest)) if largest else ""
+
+
+def format_report(results: List[Dict]) -> str:
+    """Per statement, a table of the metrics by table size with a latency bar."""
+    lines = []
+    by_sql = {}
+    for result in results:
+        by_sql.setdefault(result["sql"], []).append(result)
+    for sql, rows in by_sql.items():
+        lines.append(sql)
+        lines.append(f"  {'rows':>12} {'latency ms':>11} {'db ms':>8} {'serialized':>11} {'peak MB':>8} {'+MB':>7}")
+        slowest = max((row.get("latency_ms") or 0 for row in rows), default=0)
+        for row in rows:
+            if "error" in row:
+                lines.append(f"  {row['table_rows']:>12,} {row['error_type']}: {row['error']}")
+                continue
+            growth = f"{row['rss_growth_mb']:>7.1f}" if row["rss_growth_mb"] is not None else f"{'-':>7}"
+            lines.append(
+                f"  {row['table_rows']:>12,} {row['latency_ms']:>11.1f} {row['db_ms']:>8} "
+                f"{row['rows_serialized']:>11,} {row['peak_rss_mb']:>8.1f} {growth}  "
+                f"{_bar(row['latency_ms'], slowest)}"
+            )
+        lines.append("")
+    return "\n".join(lines)
+
+
+def write_csv(results: List[Dict], path: Path):
+    """Write results with one row per (size, statement), for charting elsewhere."""
+    fields = ["table_rows", "sql", "question", "latency_ms", "db_ms", "rows_serialized", "rows_returned",
+              "peak_rss_mb", "rss_growth_mb", "error_type", "error"]
+    with path.open("w", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def restore_seed_data(engine):
+    """Replace the synthetic rows with the hand-written seed employees."""
+    from app.db.seed import seed_employees
+
+    with engine.begin() as connection:
+        connection.execute(text("TRUNCATE employees RESTART IDENTITY"))
+    seed_employees(engine)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the query path against growing employees tables")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="Comma-separated table sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per statement and size")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--csv", type=Path, help="Also write the results as CSV")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    parser.add_argument("--keep", action="store_true", help="Leave the largest synthetic table loaded")
+    parser.add_argument("--yes", action="store_true", help="Confirm replacing the employees table")
+    args = parser.parse_args()
+
+    if not args.yes:
+        parser.error("this replaces the contents of the employees table; pass --yes to continue")
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    engine = get_engine()
+    try:
+        results = asyncio.run(run_scaling(engine, sizes, repeat=args.repeat, seed=args.seed))
+    finally:
+        if not args.keep:
+            restore_seed_data(engine)
+
+    if args.csv:
+        write_csv(results, args.csv)
+    print(json.dumps(results, indent=2) if args.json else format_report(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,15 @@ Capture baseline RAGAS scores before fixing faithfulness metric.
 
 This script queries the query_logs table and generates a baseline report
 showing current RAGAS scores (with broken faithfulness metric).
+
+With --archive [DIR] the baseline is computed from the Parquet archive of
+old query logs instead (see app/services/archive_service.py), without
+connecting to Postgres.
 """
 
 import sys
 import os
+import argparse
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -81,5 +86,42 @@ def capture_baseline():
     finally:
         db.close()
 
+def capture_archive_baseline(directory):
+    """Generate the baseline report from archived query logs."""
+    from app.services import archive_service
+
+    baseline = archive_service.archive_baseline(directory)
+    if not baseline["evaluated"]:
+        print(f"❌ No evaluated query logs found in archive {directory}.")
+        return
+
+    print(f"\n{'='*80}")
+    print("HISTORICAL RAGAS BASELINE (ARCHIVE)")
+    print(f"{'='*80}\n")
+    print(f"Archived queries: {baseline['total_queries']}")
+    print(f"Evaluated queries: {baseline['evaluated']}\n")
+
+    print("AVERAGE SCORES (non-zero):")
+    print(f"  Faithfulness: {baseline['average_scores']['faithfulness']:.3f}")
+    print(f"  Answer Relevance: {baseline['average_scores']['answer_relevance']:.3f}")
+    print(f"  Context Precision: {baseline['average_scores']['context_precision']:.3f}")
+    print()
+
+    zero_count = baseline["zero_faithfulness"]
+    print(f"FAITHFULNESS DISTRIBUTION:")
+    print(f"  Zero scores (0.0): {zero_count}/{baseline['evaluated']} "
+          f"({zero_count/baseline['evaluated']*100:.1f}%)")
+    print()
+
+
 if __name__ == "__main__":
-    capture_baseline()
+    parser = argparse.ArgumentParser(description="Capture baseline RAGAS scores")
+    parser.add_argument("--archive", nargs="?", const="", metavar="DIR",
+                        help="read the Parquet archive (default QUERY_LOG_ARCHIVE_DIR) instead of Postgres")
+    args = parser.parse_args()
+
+    if args.archive is not None:
+        from app.services.archive_service import ARCHIVE_DIR
+        capture_archive_baseline(args.archive or ARCHIVE_DIR)
+    else:
+        capture_baseline()
@@ -0,0 +1,88 @@
+"""Fixed, seeded corpora for the hot-path microbenchmarks."""
+
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+SEED = 42
+
+DEPARTMENTS = ('Engineering', 'Marketing', 'Sales', 'HR', 'Finance')
+ROLES = ('Software Engineer', 'Product Manager', 'Account Executive', 'Recruiter', 'Analyst')
+LEAVE_TYPES = (None, None, None, 'Parental Leave', 'Medical Leave', 'Sick Leave')
+FIRST_NAMES = ('John', 'Jane', 'Priya', 'Wei', 'Carlos', 'Amara', 'Lars', 'Yuki')
+LAST_NAMES = ('Doe', 'Smith', 'Patel', 'Chen', 'Garcia', 'Okafor', 'Berg', 'Tanaka')
+
+QUESTIONS = (
+    "Show me employees in {department} with salary greater than {salary}",
+    "List employees hired in the last {months} months",
+    "Who is on {leave}?",
+    "How many employees are in each department?",
+    "What are the unique roles in {department}?",
+    "Show employees reporting to {first} {last}",
+    "Average salary by department for {department}",
+    "List all departments",
+)
+
+SQL_TEMPLATES = (
+    "SELECT * FROM employees WHERE department = '{department}' AND salary_usd > {salary}",
+    "SELECT * FROM employees WHERE hire_date >= CURRENT_DATE - INTERVAL '{months} months'",
+    "SELECT * FROM employees WHERE leave_type = '{leave}'",
+    "SELECT department, COUNT(*) as employee_count FROM employees GROUP BY department ORDER BY department",
+    "SELECT DISTINCT role FROM employees WHERE department = '{department}' ORDER BY role",
+    "SELECT first_name, last_name, role FROM employees WHERE manager_name = '{first} {last}'",
+    "SELECT department, AVG(salary_usd) FROM employees WHERE department = '{department}' GROUP BY department",
+    "SELECT employee_id, first_name, last_name, salary_usd FROM employees WHERE employee_id IN ({ids}) "
+    "ORDER BY salary_usd DESC LIMIT {limit}",
+)
+
+
+def _values(rng: random.Random) -> dict:
+    return {
+        "department": rng.choice(DEPARTMENTS),
+        "salary": rng.randrange(50_000, 200_000, 5_000),
+        "months": rng.randint(1, 24),
+        "leave": rng.choice(LEAVE_TYPES[3:]),
+        "first": rng.choice(FIRST_NAMES),
+        "last": rng.choice(LAST_NAMES),
+        "ids": ", ".join(str(rng.randint(1, 5000)) for _ in range(rng.randint(1, 8))),
+        "limit": rng.choice((10, 50, 100)),
+    }
+
+
+def result_rows(count: int = 1000) -> list:
+    """Employee rows as returned by result.mappings() (Decimal, date and NULL values)."""
+    rng = random.Random(SEED)
+    start = date(2015, 1, 1)
+    return [
+        {
+            "employee_id": index + 1,
+            "first_name": rng.choice(FIRST_NAMES),
+            "last_name": rng.choice(LAST_NAMES),
+            "department": rng.choice(DEPARTMENTS),
+            "role": rng.choice(ROLES),
+            "employment_status": "Active",
+            "hire_date": start + timedelta(days=rng.randint(0, 3650)),
+            "leave_type": rng.choice(LEAVE_TYPES),
+            "salary_local": Decimal(rng.randint(4_000_000, 20_000_000)) / 100,
+            "salary_usd": Decimal(rng.randint(4_000_000, 20_000_000)) / 100,
+            "manager_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        }
+        for index in range(count)
+    ]
+
+
+def sql_strings(count: int = 1000) -> list:
+    """Valid generated SELECT statements with varied literals."""
+    rng = random.Random(SEED)
+    return [rng.choice(SQL_TEMPLATES).format(**_values(rng)) for _ in range(count)]
+
+
+def logged_queries(count: int = 10_000) -> list:
+    """(natural language query, generated SQL) pairs, as stored in query_logs."""
+    rng = random.Random(SEED)
+    pairs = []
+    for _ in range(count):
+        index = rng.randrange(len(QUESTIONS))
+        values = _values(rng)
+        pairs.append((QUESTIONS[index].format(**values), SQL_TEMPLATES[index].format(**values)))
+    return pairs
@@ -0,0 +1,14 @@
+"""Picklable workloads for benchmarks that run in worker processes."""
+
+
+def burn_cpu(iterations: int) -> int:
+    """Pure-Python CPU work that holds the GIL, standing in for RAGAS scoring."""
+    total = 0
+    for i in range(iterations):
+        total += i * i % 7
+    return total
+
+
+def noop() -> None:
+    """Warm-up task used to start worker processes before measuring."""
+    return None
@@ -0,0 +1,102 @@
+"""
+API latency benchmark with evaluation running in the background.
+
+Measures p50/p99 latency of POST /api/query through the ASGI app while
+GIL-holding CPU work (a stand-in for Dataset construction and RAGAS
+scoring) runs on the evaluation executor, once per RAGAS_EXECUTOR mode.
+As in loadtest.scaling, the LLM is stubbed out and the query log insert
+skipped; the database returns a fixed set of rows, so each request still
+sanitizes, validates, serializes and heuristically scores a real result.
+- thread: work shares the API process GIL and inflates request latency
+- process: work runs in a ProcessPoolExecutor and leaves the GIL free
+"""
+
+import asyncio
+import os
+import statistics
+import time
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from app.main import app
+from app.services import ragas_service
+from app.services import query_service
+from tests.benchmarks._corpora import result_rows
+from tests.benchmarks._workloads import burn_cpu, noop
+
+REQUESTS = int(os.getenv("EXECUTOR_BENCH_REQUESTS", "300"))
+BACKGROUND_EVALUATIONS = 2
+BURN_ITERATIONS = 2_000_000
+QUESTION = "Show me employees in Engineering with salary greater than 120000"
+SQL = "SELECT * FROM employees WHERE department = 'Engineering' AND salary_usd > 120000"
+RESULT_ROWS = result_rows(50)
+
+
+def _percentile(samples: list, pct: float) -> float:
+    """Nearest-rank percentile of samples."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def _measure_api_latency(mode: str) -> dict:
+    """Measure /api/query latency while evaluations saturate the executor."""
+    executor = ragas_service._create_executor(mode)
+    loop = asyncio.get_running_loop()
+    try:
+        # Start worker processes/threads before measuring
+        await asyncio.gather(*[loop.run_in_executor(executor, noop) for _ in range(BACKGROUND_EVALUATIONS)])
+
+        stop = asyncio.Event()
+
+        async def evaluation_load():
+            while not stop.is_set():
+                await loop.run_in_executor(executor, burn_cpu, BURN_ITERATIONS)
+
+        load_tasks = [asyncio.create_task(evaluation_load()) for _ in range(BACKGROUND_EVALUATIONS)]
+
+        latencies_ms = []
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            for _ in range(REQUESTS):
+                start = time.perf_counter()
+                response = await client.post("/api/query", json={"query": QUESTION})
+                latencies_ms.append((time.perf_counter() - start) * 1000)
+                assert response.status_code == 200 and response.json()["success"]
+
+        stop.set()
+        await asyncio.gather(*load_tasks)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    return {
+        "p50": statistics.median(latencies_ms),
+        "p99": _percentile(latencies_ms, 99),
+    }
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_api_latency_with_evaluation_running():
+    """Report API p99 with evaluation in a thread vs a worker process."""
+    async def stub_generate_sql(_query: str) -> str:
+        return SQL
+
+    db = MagicMock()
+    db.execute.return_value.mappings.return_value = RESULT_ROWS
+    with patch.object(query_service, "generate_sql", stub_generate_sql), \
+            patch.object(query_service, "get_db_session", return_value=db), \
+            patch.object(query_service, "_log_query", return_value=None):
+        thread_stats = await _measure_api_latency("thread")
+        process_stats = await _measure_api_latency("process")
+
+    print(f"\n{'executor':<10} {'p50_ms':>8} {'p99_ms':>8}")
+    for mode, stats in (("thread", thread_stats), ("process", process_stats)):
+        print(f"{mode:<10} {stats['p50']:>8.2f} {stats['p99']:>8.2f}")
+
+    # Only meaningful when worker processes get their own cores
+    if (os.cpu_count() or 1) > BACKGROUND_EVALUATIONS:
+        max_ratio = float(os.getenv("EXECUTOR_BENCH_MAX_P99_RATIO", "1.0"))
+        assert process_stats["p99"] <= thread_stats["p99"] * max_ratio
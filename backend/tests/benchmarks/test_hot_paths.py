@@ -0,0 +1,183 @@
+"""
+Microbenchmarks for the pure-Python code that runs per request or per report.
+
+Each path runs over a fixed corpus (see _corpora.py): 1000 result rows, 1k
+SQL strings or 10k logged queries. Timings are the best CPU time of
+MICROBENCH_REPEAT runs divided by that of a fixed calibration loop measured
+right before, so the stored baselines (hot_path_baselines.json) are relative
+costs that transfer between machines. A path fails when its relative cost
+exceeds the baseline by more than MICROBENCH_MAX_REGRESSION_PCT percent.
+
+Like the other benchmarks these are deselected in a plain pytest run and
+only run with -m benchmark.
+
+After an intended change, refresh the baselines with
+
+    MICROBENCH_UPDATE_BASELINES=1 pytest tests/benchmarks/test_hot_paths.py -m benchmark
+"""
+
+import json
+import os
+import time
+import random
+import timeit
+from pathlib import Path
+
+import pytest
+
+from app.services import heuristic_scorer, stats_service
+from app.services.validation_service import sanitize_input, validate_sql
+from app.services.query_service import fetch_results
+from app.services.query_classifier import classify_sql, sql_fingerprint
+from app.services.ragas_service import build_evaluation_sample, RAGAS_SAMPLE_ROWS
+from app.services.report_service import _generate_recommendations
+from tests.benchmarks._corpora import result_rows, sql_strings, logged_queries, SEED
+from tests.benchmarks._workloads import burn_cpu
+
+BASELINE_FILE = Path(__file__).with_name("hot_path_baselines.json")
+# Generous by default (shared machines vary by up to ~60% run to run); lower it on a quiet host
+MAX_REGRESSION_PCT = float(os.getenv("MICROBENCH_MAX_REGRESSION_PCT", "100"))
+UPDATE_BASELINES = os.getenv("MICROBENCH_UPDATE_BASELINES") == "1"
+BENCH_REPEAT = int(os.getenv("MICROBENCH_REPEAT", "7"))
+# Slow paths stop repeating once they have used this much CPU time (after 3 runs)
+BENCH_BUDGET_SECONDS = 2.0
+CALIBRATION_ITERATIONS = 200_000
+
+ROWS = result_rows(1000)
+SQL = sql_strings(1000)
+LOGGED = logged_queries(10_000)
+
+
+class _Result:
+    """Stands in for a SQLAlchemy Result (mappings() over fixed rows)."""
+
+    def mappings(self):
+        return ROWS
+
+
+class _Session:
+    def execute(self, statement):
+        return _Result()
+
+
+def _sanitize_queries():
+    for nl_query, _ in LOGGED:
+        sanitize_input(nl_query)
+
+
+def _validate_sql_strings():
+    for sql in SQL:
+        validate_sql(sql)
+
+
+def _serialize_rows():
+    fetch_results(_Session(), SQL[0])
+
+
+def _build_claims():
+    for nl_query, _ in LOGGED[:1000]:
+        build_evaluation_sample(nl_query, ROWS[:RAGAS_SAMPLE_ROWS], len(ROWS))
+
+
+def _heuristic_scores():
+    for nl_query, sql in LOGGED[:100]:
+        heuristic_scorer.score(nl_query, sql, ROWS)
+
+
+def _scores():
+    rng = random.Random(SEED)
+    return [{name: round(rng.uniform(0.4, 1.0), 3) for name in ('faithfulness', 'answer_relevance',
+                                                                'context_precision')} for _ in LOGGED]
+
+
+SCORES = _scores()
+
+
+def _categorize_logged_queries():
+    """Per-log classification and stats increments, then recommendations (the report's Python work)."""
+    summary = {"total_queries": len(LOGGED), "weak_count": 0, "weak_salary": 0, "weak_short": 0, "weak_low_faithfulness": 0,
+               "weak_low_answer_relevance": 0, "weak_low_context_precision": 0}
+    by_type = {}
+    for (nl_query, sql), scores in zip(LOGGED, SCORES):
+        query_type = classify_sql(sql)
+        sql_fingerprint(sql)
+        increments = stats_service.completion_increments(nl_query, scores)
+        for key in summary.keys() - {"total_queries"}:
+            summary[key] += increments[key]
+        totals = by_type.setdefault(query_type, {"count": 0, "faithfulness": 0.0})
+        totals["count"] += 1
+        totals["faithfulness"] += scores["faithfulness"]
+    type_analysis = {qtype: {"count": totals["count"], "avg_faithfulness": totals["faithfulness"] / totals["count"]}
+                     for qtype, totals in by_type.items()}
+    _generate_recommendations(summary, type_analysis)
+
+
+HOT_PATHS = {
+    "sanitize_input_10k_queries": _sanitize_queries,
+    "validate_sql_1k_statements": _validate_sql_strings,
+    "serialize_1000_rows": _serialize_rows,
+    "ragas_claims_1k_samples": _build_claims,
+    "heuristic_score_100x1000_rows": _heuristic_scores,
+    "categorize_10k_logged_queries": _categorize_logged_queries,
+}
+
+
+def best_time(fn, repeat: int = BENCH_REPEAT) -> float:
+    """Best CPU time of fn in seconds over up to repeat runs (after one warm-up)."""
+    fn()
+    timer = timeit.Timer(fn, timer=time.process_time)
+    timings = []
+    while len(timings) < repeat and (len(timings) < 3 or sum(timings) < BENCH_BUDGET_SECONDS):
+        timings.append(timer.timeit(number=1))
+    return min(timings)
+
+
+def _calibration():
+    burn_cpu(CALIBRATION_ITERATIONS)
+
+
+def measure(name: str) -> tuple:
+    """(best seconds, cost relative to the calibration loop) of one hot path."""
+    calibration_seconds = best_time(_calibration)
+    seconds = best_time(HOT_PATHS[name])
+    return seconds, seconds / calibration_seconds
+
+
+@pytest.fixture(scope="module")
+def quiet_logging():
+    """Drop log output (validation logs per statement) so stdout capture is not measured."""
+    import structlog
+    config = structlog.get_config()
+    structlog.configure(logger_factory=structlog.ReturnLoggerFactory())
+    yield
+    structlog.configure(**config)
+
+
+def _load_baselines() -> dict:
+    return json.loads(BASELINE_FILE.read_text()) if BASELINE_FILE.exists() else {}
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("name", list(HOT_PATHS))
+def test_hot_path_has_not_regressed(name, quiet_logging):
+    """Compare a hot path's calibrated cost with its stored baseline."""
+    seconds, relative = measure(name)
+
+    if UPDATE_BASELINES:
+        baselines = _load_baselines()
+        baselines[name] = round(relative, 4)
+        BASELINE_FILE.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        return
+
+    baseline = _load_baselines().get(name)
+    if baseline is None:
+        pytest.skip(f"No baseline for {name}; run with MICROBENCH_UPDATE_BASELINES=1")
+    limit = baseline * (1 + MAX_REGRESSION_PCT / 100)
+    if relative > limit:
+        # A real regression survives a second measurement; a noisy neighbour usually does not
+        seconds, relative = min((seconds, relative), measure(name), key=lambda timing: timing[1])
+    assert relative <= limit, (
+        f"{name} is {(relative / baseline - 1) * 100:.0f}% slower than its baseline "
+        f"({seconds * 1000:.2f} ms, {relative:.3f}x vs {baseline:.3f}x calibration, "
+        f"limit {MAX_REGRESSION_PCT:.0f}%)"
+    )
@@ -2,12 +2,37 @@
 
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import Mock, patch
+from types import SimpleNamespace
+from unittest.mock import Mock, MagicMock, patch
 from decimal import Decimal
 from datetime import datetime
 
 from app.main import app
 from app.db.models import QueryLog
+from app.services.stats_service import STAT_COLUMNS
+
+
+def _mock_db(total, weak_logs=(), **counts):
+    """
+    Mock session for the stats-backed report.
+
+    The query_log_stats summary returns total/weak counts and the
+    weak-query SELECT returns weak_logs (rows expose QueryLog's attributes).
+    """
+    summary = {name: 0 for name in STAT_COLUMNS}
+    summary.update(query_count=total, weak_count=len(weak_logs))
+    if total:
+        summary.update(faithfulness_sum=Decimal("0.85"), faithfulness_count=1,
+                       answer_relevance_sum=Decimal("0.8"), answer_relevance_count=1,
+                       context_precision_sum=Decimal("0.8"), context_precision_count=1)
+    summary.update(counts)
+
+    mock_db = MagicMock()
+    chain = mock_db.query.return_value
+    chain.one.return_value = SimpleNamespace(**summary)
+    chain.filter.return_value.order_by.return_value.limit.return_value.all.return_value = list(weak_logs)
+    chain.group_by.return_value.all.return_value = []
+    return mock_db
 
 
 @pytest.fixture
@@ -22,11 +47,7 @@ class TestAnalysisEndpoint:
     def test_analysis_endpoint_returns_200(self, client):
         """Test that analysis endpoint returns 200 OK"""
         # Arrange
-        mock_logs = []
-        mock_db = Mock()
-        mock_query = Mock()
-        mock_query.order_by().all.return_value = mock_logs
-        mock_db.query.return_value = mock_query
+        mock_db = _mock_db(0)
 
         with patch('app.services.report_service.get_db_session', return_value=mock_db):
             # Act
@@ -38,15 +59,9 @@ class TestAnalysisEndpoint:
     def test_analysis_endpoint_response_structure(self, client):
         """Test response structure matches specification"""
         # Arrange
-        mock_logs = [
-            self._create_mock_log(1, "query 1", 0.9, 0.85, 0.8),
+        mock_db = _mock_db(2, [
             self._create_mock_log(2, "query 2", 0.65, 0.7, 0.75)  # weak query
-        ]
-
-        mock_db = Mock()
-        mock_query = Mock()
-        mock_query.order_by().all.return_value = mock_logs
-        mock_db.query.return_value = mock_query
+        ], weak_low_faithfulness=1)
 
         with patch('app.services.report_service.get_db_session', return_value=mock_db):
             # Act
@@ -66,17 +81,11 @@ class TestAnalysisEndpoint:
 
     def test_analysis_endpoint_identifies_weak_queries(self, client):
         """Test that weak queries (scores < 0.7) are identified"""
-        # Arrange
-        mock_logs = [
-            self._create_mock_log(1, "strong query", 0.9, 0.85, 0.88),
+        # Arrange - only weak rows come back from the weak-query SELECT
+        mock_db = _mock_db(3, [
             self._create_mock_log(2, "weak query 1", 0.65, 0.8, 0.75),
             self._create_mock_log(3, "weak query 2", 0.8, 0.6, 0.85)
-        ]
-
-        mock_db = Mock()
-        mock_query = Mock()
-        mock_query.order_by().all.return_value = mock_logs
-        mock_db.query.return_value = mock_query
+        ], weak_low_faithfulness=1, weak_low_answer_relevance=1)
 
         with patch('app.services.report_service.get_db_session', return_value=mock_db):
             # Act
@@ -92,14 +101,9 @@ class TestAnalysisEndpoint:
     def test_analysis_endpoint_includes_recommendations(self, client):
         """Test that recommendations are included"""
         # Arrange
-        mock_logs = [
+        mock_db = _mock_db(1, [
             self._create_mock_log(1, "show high salary employees", 0.6, 0.65, 0.7)
-        ]
-
-        mock_db = Mock()
-        mock_query = Mock()
-        mock_query.order_by().all.return_value = mock_logs
-        mock_db.query.return_value = mock_query
+        ], weak_low_faithfulness=1, weak_low_answer_relevance=1, weak_salary=1, weak_short=1)
 
         with patch('app.services.report_service.get_db_session', return_value=mock_db):
             # Act
@@ -114,10 +118,7 @@ class TestAnalysisEndpoint:
     def test_analysis_endpoint_handles_empty_logs(self, client):
         """Test endpoint with no query logs"""
         # Arrange
-        mock_db = Mock()
-        mock_query = Mock()
-        mock_query.order_by().all.return_value = []
-        mock_db.query.return_value = mock_query
+        mock_db = _mock_db(0)
 
         with patch('app.services.report_service.get_db_session', return_value=mock_db):
             # Act
@@ -147,14 +148,9 @@ class TestAnalysisEndpoint:
     def test_weak_query_contains_scores_and_reason(self, client):
         """Test that weak queries include scores and reason"""
         # Arrange
-        mock_logs = [
+        mock_db = _mock_db(1, [
             self._create_mock_log(1, "problematic query", 0.6, 0.75, 0.8)
-        ]
-
-        mock_db = Mock()
-        mock_query = Mock()
-        mock_query.order_by().all.return_value = mock_logs
-        mock_db.query.return_value = mock_query
+        ], weak_low_faithfulness=1)
 
         with patch('app.services.report_service.get_db_session', return_value=mock_db):
             # Act
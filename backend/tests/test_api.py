@@ -9,8 +9,9 @@ sys.path.insert(0, str(backend_dir))
 
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from app.main import app
+from app.api.models import QueryResponse
 
 client = TestClient(app)
 
@@ -83,6 +84,17 @@ class TestQueryEndpoint:
         request_id = response.headers["X-Request-ID"]
         assert len(request_id) == 36  # UUID v4 length
 
+    def test_query_endpoint_server_timing_header(self):
+        """Test that stage timings are sent in the Server-Timing header and the body."""
+        timed = QueryResponse(success=True, query="test query", generated_sql="SELECT 1",
+                              execution_time_ms=845, timings={"llm": 812, "validation": 3, "db": 25})
+
+        with patch('app.api.routes.execute_query', new_callable=AsyncMock, return_value=timed):
+            response = client.post("/api/query", json={"query": "test query"})
+
+        assert response.headers["Server-Timing"] == "llm;dur=812, validation;dur=3, db;dur=25, total;dur=845"
+        assert response.json()["timings"] == {"llm": 812, "validation": 3, "db": 25}
+
     def test_query_endpoint_empty_query(self):
         """Test validation error for empty query."""
         response = client.post(
@@ -125,8 +137,8 @@ class TestQueryEndpoint:
 class TestHealthEndpoint:
     """Tests for GET /api/health endpoint."""
 
-    @patch('app.api.routes.get_pool_status')
-    @patch('app.api.routes.get_db_session')
+    @patch('app.services.health_service.get_pool_status')
+    @patch('app.services.health_service.get_db_session')
     def test_health_endpoint_database_connected(self, mock_get_db_session, mock_get_pool_status):
         """Test health check when database is connected."""
         mock_session = MagicMock()
@@ -153,7 +165,7 @@ class TestHealthEndpoint:
         mock_session.execute.assert_called_once()
         mock_session.close.assert_called_once()
 
-    @patch('app.api.routes.get_db_session')
+    @patch('app.services.health_service.get_db_session')
     def test_health_endpoint_database_disconnected(self, mock_get_db_session):
         """Test health check when database connection fails."""
         mock_get_db_session.side_effect = Exception("Connection failed")
@@ -167,7 +179,7 @@ class TestHealthEndpoint:
         assert data["database"] == "disconnected"
         assert "timestamp" in data
 
-    @patch('app.api.routes.get_db_session')
+    @patch('app.services.health_service.get_db_session')
     def test_health_endpoint_request_id_header(self, mock_get_db_session):
         """Test that X-Request-ID header is present in health checks."""
         mock_session = MagicMock()
@@ -296,7 +308,7 @@ class TestResponseModels:
         for field in required_fields:
             assert field in data
 
-    @patch('app.api.routes.get_db_session')
+    @patch('app.services.health_service.get_db_session')
     def test_health_response_schema(self, mock_get_db_session):
         """Test that health response matches expected schema."""
         mock_session = MagicMock()
@@ -375,3 +387,198 @@ class TestEdgeCases:
         )
 
         assert response.status_code == 200
+
+
+class TestBulkStatusEndpoint:
+    """Tests for GET/POST /api/query/status endpoint."""
+
+    STATUSES = [
+        {"query_log_id": 1, "evaluation_status": "completed", "score_source": "ragas",
+         "ragas_scores": {"faithfulness": 0.9, "answer_relevance": 0.8, "context_utilization": 0.7},
+         "provisional_scores": None},
+        {"query_log_id": 2, "evaluation_status": "pending", "score_source": None,
+         "ragas_scores": None, "provisional_scores": None},
+    ]
+
+    @patch('app.api.routes.status_service.get_statuses')
+    def test_get_returns_statuses_missing_and_etag(self, mock_get_statuses):
+        """Test that all IDs are resolved in one lookup and unknown IDs are reported."""
+        mock_get_statuses.return_value = self.STATUSES
+
+        response = client.get("/api/query/status?ids=1,2,3")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [s["query_log_id"] for s in data["statuses"]] == [1, 2]
+        assert data["missing"] == [3]
+        assert response.headers["ETag"]
+        mock_get_statuses.assert_called_once_with([1, 2, 3])
+
+    @patch('app.api.routes.status_service.get_statuses')
+    def test_get_returns_304_when_unchanged(self, mock_get_statuses):
+        """Test that If-None-Match with the current ETag returns an empty 304."""
+        mock_get_statuses.return_value = self.STATUSES
+        etag = client.get("/api/query/status?ids=1,2").headers["ETag"]
+
+        response = client.get("/api/query/status?ids=1,2", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+    @patch('app.api.routes.status_service.get_statuses')
+    def test_get_returns_200_when_a_status_changed(self, mock_get_statuses):
+        """Test that a changed status invalidates the ETag."""
+        mock_get_statuses.return_value = self.STATUSES
+        etag = client.get("/api/query/status?ids=1,2").headers["ETag"]
+
+        changed = [self.STATUSES[0], {**self.STATUSES[1], "evaluation_status": "evaluating"}]
+        mock_get_statuses.return_value = changed
+        response = client.get("/api/query/status?ids=1,2", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_get_rejects_invalid_ids(self):
+        """Test that non-integer or too many IDs are rejected."""
+        assert client.get("/api/query/status?ids=1,abc").status_code == 422
+        too_many = ",".join(str(i) for i in range(101))
+        assert client.get(f"/api/query/status?ids={too_many}").status_code == 422
+
+    @patch('app.api.routes.status_service.get_statuses')
+    def test_post_accepts_id_list(self, mock_get_statuses):
+        """Test the POST variant for long ID lists."""
+        mock_get_statuses.return_value = self.STATUSES
+
+        response = client.post("/api/query/status", json={"ids": [1, 2]})
+
+        assert response.status_code == 200
+        assert len(response.json()["statuses"]) == 2
+
+    def test_post_rejects_empty_id_list(self):
+        """Test that an empty ID list fails validation."""
+        response = client.post("/api/query/status", json={"ids": []})
+
+        assert response.status_code == 422
+
+
+class TestConditionalRequests:
+    """Tests for ETag / If-None-Match on status and report endpoints."""
+
+    PENDING = {"query_log_id": 7, "evaluation_status": "pending", "score_source": None,
+               "ragas_scores": None, "provisional_scores": None}
+
+    @patch('app.api.routes.status_service.get_status')
+    def test_status_pending_has_etag_and_retry_after(self, mock_get_status):
+        """Test that a running evaluation tells clients when to poll again."""
+        mock_get_status.return_value = self.PENDING
+
+        response = client.get("/api/query/7")
+
+        assert response.status_code == 200
+        assert response.json() == self.PENDING
+        assert response.headers["ETag"]
+        assert response.headers["Retry-After"] == "2"
+
+    @patch('app.api.routes.status_service.get_status')
+    def test_status_unchanged_returns_304(self, mock_get_status):
+        """Test that polling with the current ETag returns 304."""
+        mock_get_status.return_value = self.PENDING
+        etag = client.get("/api/query/7").headers["ETag"]
+
+        response = client.get("/api/query/7", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.headers["Retry-After"] == "2"
+
+    @patch('app.api.routes.status_service.get_status')
+    def test_status_completed_has_no_retry_after(self, mock_get_status):
+        """Test that terminal statuses do not ask clients to poll again."""
+        mock_get_status.return_value = {**self.PENDING, "evaluation_status": "failed"}
+
+        response = client.get("/api/query/7")
+
+        assert "Retry-After" not in response.headers
+
+    @patch('app.api.routes.status_service.get_status', return_value=None)
+    def test_status_not_found(self, mock_get_status):
+        """Test that an unknown query log returns 404."""
+        assert client.get("/api/query/999").status_code == 404
+
+    @patch('app.services.report_service.get_analysis_report')
+    @patch('app.services.report_service.get_report_version', return_value=[1, 10, None])
+    def test_report_unchanged_skips_rebuild(self, mock_version, mock_report):
+        """Test that a matching ETag returns 304 without building the report."""
+        mock_report.return_value = {"total_queries": 10}
+        etag = client.get("/api/reports/analysis").headers["ETag"]
+        mock_report.reset_mock()
+
+        response = client.get("/api/reports/analysis", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        mock_report.assert_not_called()
+
+    @patch('app.services.report_service.get_analysis_report')
+    @patch('app.services.report_service.get_report_version')
+    def test_report_rebuilt_after_new_evaluation(self, mock_version, mock_report):
+        """Test that a new evaluation changes the report ETag."""
+        mock_report.return_value = {"total_queries": 10}
+        mock_version.return_value = [1, 10, None]
+        etag = client.get("/api/reports/analysis").headers["ETag"]
+
+        mock_version.return_value = [1, 10, "2026-10-19T12:00:00"]
+        with patch('app.services.report_cache.REPORT_CACHE_TTL_SECONDS', 0):
+            response = client.get("/api/reports/analysis", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.json() == {"total_queries": 10}
+
+    @patch('app.services.report_service.get_analysis_report', return_value={"total_queries": 0})
+    @patch('app.services.report_service.get_report_version', side_effect=Exception("db down"))
+    def test_report_served_without_etag_when_version_fails(self, mock_version, mock_report):
+        """Test that a failing version query does not fail the report."""
+        response = client.get("/api/reports/analysis")
+
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
+
+
+class TestTopQueriesEndpoint:
+    """Tests for GET /api/reports/top-queries"""
+
+    @patch('app.services.report_service.get_top_repeated_queries', return_value=[])
+    def test_limit_is_passed_and_bounded(self, mock_top):
+        """Test that the limit is forwarded and out-of-range values are rejected."""
+        response = client.get("/api/reports/top-queries?limit=3")
+
+        assert response.status_code == 200
+        assert response.json() == {"top_queries": []}
+        mock_top.assert_called_once_with(3)
+        assert client.get("/api/reports/top-queries?limit=0").status_code == 422
+
+
+class TestQueryLogsEndpoint:
+    """Tests for GET /api/query-logs"""
+
+    @patch('app.services.query_log_service.list_query_logs')
+    def test_filters_are_forwarded(self, mock_list):
+        """Test that query parameters map onto list_query_logs arguments."""
+        mock_list.return_value = {"items": [], "next_cursor": None}
+
+        response = client.get("/api/query-logs?status=completed&status=failed&max_faithfulness=0.7"
+                              "&fields=evaluation_status,execution_time_ms&limit=20")
+
+        assert response.status_code == 200
+        kwargs = mock_list.call_args.kwargs
+        assert kwargs["statuses"] == ["completed", "failed"]
+        assert kwargs["score_range"] == {"faithfulness": (None, 0.7)}
+        assert kwargs["fields"] == ["evaluation_status", "execution_time_ms"]
+        assert kwargs["limit"] == 20
+
+    @patch('app.services.query_log_service.list_query_logs', side_effect=ValueError("Invalid cursor"))
+    def test_invalid_input_returns_422(self, mock_list):
+        """Test that service validation errors surface as 422."""
+        response = client.get("/api/query-logs?cursor=bogus")
+
+        assert response.status_code == 422
+        assert response.json()["error"] == "Invalid cursor"
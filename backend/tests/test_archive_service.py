@@ -0,0 +1,99 @@
+"""Tests for the Parquet archive of old query logs."""
+
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+from app.services import archive_service
+
+
+def _log_row(id, created_at, status='completed', faithfulness=None):
+    """Create a query_logs row tuple in ARCHIVE_COLUMNS order."""
+    values = {name: None for name in archive_service.ARCHIVE_COLUMNS}
+    values.update(id=id, created_at=created_at, natural_language_query="q", generated_sql="SELECT 1",
+                  evaluation_status=status, faithfulness_score=faithfulness)
+    return tuple(values[name] for name in archive_service.ARCHIVE_COLUMNS)
+
+
+def _streaming_db(rows):
+    """Create a session whose streamed result yields rows in batches of 2."""
+    db = MagicMock()
+    result = db.connection.return_value.execution_options.return_value.execute.return_value
+    result.partitions.return_value = [rows[i:i + 2] for i in range(0, len(rows), 2)]
+    return db
+
+
+class TestDetachedPartitions:
+    """Tests for list_detached_partitions() / archive_detached()"""
+
+    def test_only_monthly_tables_are_listed(self):
+        """Test that unrelated query_logs_* tables are ignored"""
+        db = MagicMock()
+        db.execute.return_value.scalars.return_value = ["query_logs_2026_02", "query_logs_stats_old",
+                                                        "query_logs_2026_01"]
+
+        assert archive_service.list_detached_partitions(db) == ["query_logs_2026_01", "query_logs_2026_02"]
+
+    def test_each_partition_dropped_after_its_file_is_written(self):
+        """Test that a partition is dropped only in the transaction after its export"""
+        db = MagicMock()
+
+        with patch('app.services.archive_service.get_db_session', return_value=db), \
+             patch('app.services.archive_service.list_detached_partitions', return_value=["query_logs_2026_01"]), \
+             patch('app.services.archive_service.write_month', return_value=42) as mock_write:
+            archived = archive_service.archive_detached("/tmp/archive")
+
+        assert archived == {"query_logs_2026_01": 42}
+        mock_write.assert_called_once_with(db, "query_logs_2026_01", date(2026, 1, 1), "/tmp/archive")
+        assert str(db.execute.call_args[0][0]) == "DROP TABLE query_logs_2026_01"
+        db.commit.assert_called_once()
+
+    def test_failed_export_keeps_partition(self):
+        """Test that an export error rolls back without dropping"""
+        db = MagicMock()
+
+        with patch('app.services.archive_service.get_db_session', return_value=db), \
+             patch('app.services.archive_service.list_detached_partitions', return_value=["query_logs_2026_01"]), \
+             patch('app.services.archive_service.write_month', side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                archive_service.archive_detached("/tmp/archive")
+
+        db.execute.assert_not_called()
+        db.rollback.assert_called_once()
+
+
+class TestParquetRoundTrip:
+    """Tests for write_month() / read_archive() / archive_baseline()"""
+
+    def test_written_month_is_read_back_for_baseline(self, tmp_path):
+        """Test that streamed batches land in one month file and feed the baseline"""
+        pytest.importorskip("pyarrow")
+        rows = [
+            _log_row(1, datetime(2026, 1, 5, 9, 0), faithfulness=Decimal("0.80")),
+            _log_row(2, datetime(2026, 1, 6, 9, 0), faithfulness=Decimal("0.00")),
+            _log_row(3, datetime(2026, 1, 7, 9, 0), status='failed'),
+        ]
+
+        written = archive_service.write_month(_streaming_db(rows), "query_logs_2026_01", date(2026, 1, 1),
+                                              str(tmp_path))
+
+        assert written == 3
+        assert (tmp_path / "month=2026-01" / "query_logs.parquet").exists()
+        assert archive_service.read_archive(str(tmp_path), ["id"]).column("id").to_pylist() == [1, 2, 3]
+        assert archive_service.read_archive(str(tmp_path), ["id"], since=datetime(2026, 1, 6)).num_rows == 2
+
+        baseline = archive_service.archive_baseline(str(tmp_path))
+        assert baseline["total_queries"] == 3
+        assert baseline["evaluated"] == 2
+        assert baseline["average_scores"]["faithfulness"] == 0.8
+        assert baseline["zero_faithfulness"] == 1
+
+    def test_missing_archive_reads_empty(self, tmp_path):
+        """Test that an absent archive directory yields an empty baseline"""
+        pytest.importorskip("pyarrow")
+
+        baseline = archive_service.archive_baseline(str(tmp_path / "missing"))
+
+        assert baseline["total_queries"] == 0
+        assert baseline["average_scores"]["faithfulness"] == 0.0
@@ -0,0 +1,51 @@
+"""Tests for the query_type / sql_fingerprint backfill."""
+
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from app.db import backfill_query_types
+from app.services.query_classifier import sql_fingerprint
+
+
+def _session(rows):
+    """Create a session whose batch query returns rows."""
+    db = MagicMock()
+    db.query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = rows
+    return db
+
+
+class TestBackfill:
+    """Tests for backfill()"""
+
+    def test_updates_batches_until_exhausted(self):
+        """Test that each batch is updated and committed in its own session"""
+        first = _session([SimpleNamespace(id=1, generated_sql="SELECT * FROM employees"),
+                          SimpleNamespace(id=2, generated_sql="SELECT COUNT(*) FROM employees")])
+        second = _session([SimpleNamespace(id=5, generated_sql="SELECT * FROM employees WHERE id = 3")])
+        done = _session([])
+
+        with patch('app.db.backfill_query_types.get_db_session', side_effect=[first, second, done]):
+            assert backfill_query_types.backfill(batch_size=2) == 3
+
+        params = first.execute.call_args[0][1]
+        assert params[0] == {"id": 1, "query_type": 'simple_select',
+                             "sql_fingerprint": sql_fingerprint("SELECT * FROM employees")}
+        assert params[1]["query_type"] == 'aggregation'
+        assert second.execute.call_args[0][1][0]["query_type"] == 'where_filter'
+        for db in (first, second, done):
+            db.close.assert_called_once()
+        first.commit.assert_called_once()
+        done.execute.assert_not_called()
+
+    def test_failed_batch_rolls_back(self):
+        """Test that an update error rolls back the batch and stops"""
+        db = _session([SimpleNamespace(id=1, generated_sql="SELECT 1")])
+        db.execute.side_effect = Exception("deadlock")
+
+        with patch('app.db.backfill_query_types.get_db_session', return_value=db):
+            with pytest.raises(Exception, match="deadlock"):
+                backfill_query_types.backfill()
+
+        db.rollback.assert_called_once()
+        db.commit.assert_not_called()
@@ -0,0 +1,281 @@
+"""Tests for evaluation status events and the SSE status stream."""
+
+import json
+import asyncio
+import threading
+import pytest
+from types import SimpleNamespace
+from fastapi.testclient import TestClient
+from unittest.mock import MagicMock, patch, AsyncMock
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.main import app
+from app.api import routes
+from app.services import evaluation_events, ragas_service
+
+client = TestClient(app)
+
+
+def _status(status, scores=None):
+    """Create a status payload as built by status_service."""
+    return {
+        "query_log_id": 1,
+        "evaluation_status": status,
+        "ragas_scores": scores,
+        "score_source": 'ragas' if scores else None,
+        "provisional_scores": None
+    }
+
+
+def _session():
+    """A real session (SQLite) so commit and rollback hooks run."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    return Session(engine)
+
+
+def _parse_sse(body):
+    """Parse an SSE body into (event, data) tuples, skipping comments."""
+    messages = []
+    for block in body.strip().split("\n\n"):
+        lines = [line for line in block.split("\n") if not line.startswith(":")]
+        if not lines:
+            continue
+        fields = dict(line.split(": ", 1) for line in lines)
+        messages.append((fields["event"], json.loads(fields["data"])))
+    return messages
+
+
+class TestPubSub:
+    """Tests for in-process subscribe/publish."""
+
+    @pytest.mark.asyncio
+    async def test_publish_reaches_subscribers_of_same_query_only(self):
+        """Test that events are delivered only to subscribers of their query"""
+        queue = evaluation_events.subscribe(1)
+        other = evaluation_events.subscribe(2)
+        try:
+            evaluation_events.publish(1, _status('evaluating'))
+
+            assert queue.get_nowait()["evaluation_status"] == 'evaluating'
+            assert other.empty()
+        finally:
+            evaluation_events.unsubscribe(1, queue)
+            evaluation_events.unsubscribe(2, other)
+
+        assert 1 not in evaluation_events._subscribers
+
+    @pytest.mark.asyncio
+    async def test_publish_queues_notify_on_session(self):
+        """Test that publishing with a session issues pg_notify tagged with this process"""
+        db = _session()
+
+        with patch.object(db, 'execute') as mock_execute:
+            evaluation_events.publish(1, _status('failed'), db=db)
+
+        params = mock_execute.call_args[0][1]
+        assert params["channel"] == evaluation_events.NOTIFY_CHANNEL
+        assert json.loads(params["payload"])["origin"] == evaluation_events.ORIGIN
+
+    @pytest.mark.asyncio
+    async def test_session_events_delivered_on_commit_only(self):
+        """Test that an event published with a session waits for its commit and is dropped on rollback"""
+        db = _session()
+        queue = evaluation_events.subscribe(1)
+        try:
+            db.execute(text("SELECT 1"))
+            with patch.object(db, 'execute'):
+                evaluation_events.publish(1, _status('completed'), db=db)
+            assert queue.empty()
+            db.rollback()
+
+            db.execute(text("SELECT 1"))
+            with patch.object(db, 'execute'):
+                evaluation_events.publish(1, _status('failed'), db=db)
+            db.commit()
+
+            assert queue.get_nowait()["evaluation_status"] == 'failed'
+            assert queue.empty()
+        finally:
+            evaluation_events.unsubscribe(1, queue)
+
+    @pytest.mark.asyncio
+    async def test_commit_in_worker_thread_delivers_on_event_loop(self):
+        """Test that a commit in another thread hands its events to the subscribers' loop"""
+        db = _session()
+        queue = evaluation_events.subscribe(1)
+        try:
+            with patch.object(db, 'execute'):
+                evaluation_events.publish(1, _status('failed'), db=db)
+            await asyncio.to_thread(db.commit)
+
+            assert (await asyncio.wait_for(queue.get(), 1))["evaluation_status"] == 'failed'
+        finally:
+            evaluation_events.unsubscribe(1, queue)
+
+    @pytest.mark.asyncio
+    async def test_notify_failure_still_delivers_locally(self):
+        """Test that a failed NOTIFY does not drop the local event"""
+        db = _session()
+        queue = evaluation_events.subscribe(1)
+        try:
+            with patch.object(db, 'execute', side_effect=Exception("connection closed")):
+                evaluation_events.publish(1, _status('failed'), db=db)
+            db.commit()
+            assert queue.get_nowait()["evaluation_status"] == 'failed'
+        finally:
+            evaluation_events.unsubscribe(1, queue)
+
+
+class TestNotificationRelay:
+    """Tests for relaying LISTEN notifications from other processes."""
+
+    def _notification(self, origin, status):
+        payload = json.dumps({"query_log_id": 1, "origin": origin, "event": _status(status)})
+        return SimpleNamespace(payload=payload)
+
+    @pytest.mark.asyncio
+    async def test_relays_other_origins_and_skips_own(self):
+        """Test that NOTIFYs from this process are not delivered twice"""
+        connection = MagicMock()
+        connection.notifies = [
+            self._notification(evaluation_events.ORIGIN, 'evaluating'),
+            self._notification('other-replica', 'completed'),
+        ]
+        queue = evaluation_events.subscribe(1)
+        try:
+            with patch.object(evaluation_events, '_listener_connection', connection):
+                evaluation_events._handle_notifications()
+
+            assert queue.get_nowait()["evaluation_status"] == 'completed'
+            assert queue.empty()
+        finally:
+            evaluation_events.unsubscribe(1, queue)
+
+
+class TestEvaluationPublishing:
+    """Tests for status events published by evaluate_and_update_async()."""
+
+    @pytest.mark.asyncio
+    async def test_publishes_evaluating_then_completed(self):
+        """Test that each status transition is published before it is committed"""
+        query_log = SimpleNamespace(
+            id=1, evaluation_status='pending', faithfulness_score=0.9,
+            answer_relevance_score=0.8, context_precision_score=0.7,
+            heuristic_faithfulness_score=None, heuristic_answer_relevance_score=None,
+            heuristic_context_utilization_score=None, score_source=None,
+            evaluation_updated_at=None, created_at=None, natural_language_query="q", query_type=None,
+            generated_sql="SELECT 1"
+        )
+        mock_db = MagicMock()
+        mock_db.query.return_value.filter.return_value.first.return_value = query_log
+        scores = {'faithfulness': 0.9, 'answer_relevance': 0.8, 'context_utilization': 0.7}
+
+        with patch('app.db.session.get_db_session', return_value=mock_db), \
+             patch('app.services.ragas_service.evaluate', new_callable=AsyncMock, return_value=scores), \
+             patch('app.services.evaluation_events.publish') as mock_publish:
+            await ragas_service.evaluate_and_update_async(1, "q", "SELECT 1", [])
+
+        published = [c[0][1] for c in mock_publish.call_args_list]
+        assert [event["evaluation_status"] for event in published] == ['evaluating', 'completed']
+        assert published[-1]["ragas_scores"]["faithfulness"] == 0.9
+        assert mock_publish.call_args.kwargs["db"] is mock_db
+
+    @pytest.mark.asyncio
+    async def test_finished_metrics_are_committed_off_the_event_loop(self):
+        """Test that each metric's score is committed from a worker thread as it finishes"""
+        query_log = SimpleNamespace(
+            id=1, evaluation_status='pending', faithfulness_score=None,
+            answer_relevance_score=None, context_precision_score=None,
+            heuristic_faithfulness_score=None, heuristic_answer_relevance_score=None,
+            heuristic_context_utilization_score=None, score_source=None,
+            evaluation_updated_at=None, created_at=None, natural_language_query="q", query_type=None,
+            generated_sql="SELECT 1"
+        )
+        mock_db = MagicMock()
+        mock_db.query.return_value.filter.return_value.first.return_value = query_log
+        commits = []
+        mock_db.commit.side_effect = lambda: commits.append(
+            (threading.current_thread() is threading.main_thread(), query_log.faithfulness_score))
+        scores = {'faithfulness': 0.9, 'answer_relevance': 0.8, 'context_utilization': 0.7}
+
+        async def fake_evaluate(nl_query, sql, results, on_metric=None):
+            await asyncio.gather(*[on_metric(key, score) for key, score in scores.items()])
+            return scores
+
+        with patch('app.db.session.get_db_session', return_value=mock_db), \
+             patch('app.services.ragas_service.evaluate', side_effect=fake_evaluate), \
+             patch('app.services.evaluation_events.publish'):
+            await ragas_service.evaluate_and_update_async(1, "q", "SELECT 1", [])
+
+        # 'evaluating', one commit per metric from a worker thread, then 'completed'
+        assert [on_loop for on_loop, _ in commits] == [True, False, False, False, True]
+        assert commits[-1][1] == 0.9
+        assert query_log.context_precision_score == 0.7
+
+
+class TestStatusEventStream:
+    """Tests for GET /api/query/{query_log_id}/events"""
+
+    def test_unknown_query_returns_404(self):
+        """Test that streaming a missing query log returns 404 and unsubscribes"""
+        with patch('app.api.routes.status_service.get_status', return_value=None):
+            response = client.get("/api/query/999/events")
+
+        assert response.status_code == 404
+        assert 999 not in evaluation_events._subscribers
+
+    def test_terminal_status_is_sent_and_stream_closes(self):
+        """Test that a finished evaluation yields one event and ends the stream"""
+        completed = _status('completed', {"faithfulness": 0.9, "answer_relevance": 0.8,
+                                          "context_utilization": 0.7})
+        with patch('app.api.routes.status_service.get_status', return_value=completed):
+            response = client.get("/api/query/1/events")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert _parse_sse(response.text) == [('completed', completed)]
+
+    @pytest.mark.asyncio
+    async def test_stream_emits_transitions_until_terminal(self):
+        """Test that published transitions are streamed in order"""
+        request = MagicMock()
+        request.is_disconnected = AsyncMock(return_value=False)
+        queue = evaluation_events.subscribe(1)
+        for status in ('evaluating', 'evaluating', 'failed'):
+            queue.put_nowait(_status(status))
+
+        body = "".join([chunk async for chunk in
+                        routes._status_event_stream(request, 1, queue, _status('pending'))])
+
+        assert [event for event, _ in _parse_sse(body)] == ['pending', 'evaluating', 'failed']
+        assert 1 not in evaluation_events._subscribers
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_rechecks_status(self):
+        """Test that a missed transition is picked up when the heartbeat re-checks"""
+        request = MagicMock()
+        request.is_disconnected = AsyncMock(return_value=False)
+        queue = evaluation_events.subscribe(1)
+
+        with patch.object(routes, 'SSE_HEARTBEAT_SECONDS', 0.01), \
+             patch('app.api.routes.status_service.get_status', return_value=_status('failed')):
+            body = "".join([chunk async for chunk in
+                            routes._status_event_stream(request, 1, queue, _status('evaluating'))])
+
+        assert [event for event, _ in _parse_sse(body)] == ['evaluating', 'failed']
+
+    @pytest.mark.asyncio
+    async def test_stream_stops_when_client_disconnects(self):
+        """Test that the stream ends on heartbeat once the client is gone"""
+        request = MagicMock()
+        request.is_disconnected = AsyncMock(return_value=True)
+        queue = evaluation_events.subscribe(1)
+
+        with patch.object(routes, 'SSE_HEARTBEAT_SECONDS', 0.01):
+            chunks = [chunk async for chunk in
+                      routes._status_event_stream(request, 1, queue, _status('evaluating'))]
+
+        assert len(chunks) == 1
+        assert 1 not in evaluation_events._subscribers
@@ -0,0 +1,187 @@
+"""Tests for the stuck-evaluation sweeper."""
+
+import os
+import sys
+import subprocess
+from pathlib import Path
+import pytest
+from types import SimpleNamespace
+from unittest.mock import Mock, MagicMock, patch, AsyncMock
+
+from app.services import evaluation_sweeper
+
+
+def _stuck_row(id, status, query="show employees", sql="SELECT * FROM employees"):
+    """Create a row tuple as returned by the stuck-row query."""
+    return SimpleNamespace(id=id, evaluation_status=status, faithfulness_score=None,
+                           answer_relevance_score=None, context_precision_score=None,
+                           heuristic_faithfulness_score=None, heuristic_answer_relevance_score=None,
+                           heuristic_context_utilization_score=None, score_source=None,
+                           natural_language_query=query, generated_sql=sql)
+
+
+def _mock_db(lock_acquired=True, stuck_rows=None):
+    """Create a mock session whose stuck-row query returns stuck_rows."""
+    mock_db = MagicMock()
+    mock_db.execute.return_value.scalar.return_value = lock_acquired
+    chain = mock_db.query.return_value
+    chain.filter.return_value = chain
+    chain.order_by.return_value = chain
+    chain.limit.return_value = chain
+    chain.with_for_update.return_value = chain
+    chain.all.return_value = stuck_rows or []
+    return mock_db
+
+
+class TestSweepStuckEvaluations:
+    """Tests for sweep_stuck_evaluations()"""
+
+    @pytest.fixture(autouse=True)
+    def mock_publish(self):
+        with patch('app.services.evaluation_sweeper.evaluation_events.publish') as mock_publish:
+            yield mock_publish
+
+    def test_skips_when_lock_held_by_another_replica(self):
+        """Test that the sweep does nothing when the advisory lock is taken"""
+        mock_db = _mock_db(lock_acquired=False)
+
+        with patch('app.services.evaluation_sweeper.get_db_session', return_value=mock_db):
+            outcome = evaluation_sweeper.sweep_stuck_evaluations()
+
+        assert outcome == {"lock_acquired": False, "failed": 0, "requeue": []}
+        mock_db.query.assert_not_called()
+        mock_db.rollback.assert_called_once()
+        mock_db.close.assert_called_once()
+
+    def test_marks_stuck_evaluating_rows_failed(self):
+        """Test that rows stuck in 'evaluating' are marked failed, not requeued"""
+        mock_db = _mock_db(stuck_rows=[_stuck_row(1, 'evaluating'), _stuck_row(2, 'evaluating')])
+
+        with patch('app.services.evaluation_sweeper.get_db_session', return_value=mock_db):
+            outcome = evaluation_sweeper.sweep_stuck_evaluations(requeue=True)
+
+        assert outcome["failed"] == 2
+        assert outcome["requeue"] == []
+        update_values = mock_db.query.return_value.update.call_args[0][0]
+        assert update_values["evaluation_status"] == 'failed'
+        mock_db.commit.assert_called_once()
+
+    def test_failed_rows_publish_failed_events(self, mock_publish):
+        """Test that every row the sweep fails publishes a 'failed' event on the sweep session"""
+        mock_db = _mock_db(stuck_rows=[_stuck_row(1, 'evaluating'), _stuck_row(2, 'pending')])
+
+        with patch('app.services.evaluation_sweeper.get_db_session', return_value=mock_db):
+            evaluation_sweeper.sweep_stuck_evaluations(requeue=False)
+
+        published = {c[0][0]: c for c in mock_publish.call_args_list}
+        assert set(published) == {1, 2}
+        for call in published.values():
+            assert call[0][1]["evaluation_status"] == 'failed'
+            assert call[1]["db"] is mock_db
+
+    def test_requeues_stuck_pending_rows(self):
+        """Test that pending rows are claimed for re-evaluation when requeue is enabled"""
+        mock_db = _mock_db(stuck_rows=[_stuck_row(1, 'pending'), _stuck_row(2, 'evaluating')])
+
+        with patch('app.services.evaluation_sweeper.get_db_session', return_value=mock_db):
+            outcome = evaluation_sweeper.sweep_stuck_evaluations(requeue=True)
+
+        assert outcome["failed"] == 1
+        assert outcome["requeue"] == [(1, "show employees", "SELECT * FROM employees")]
+        statuses = [c[0][0]["evaluation_status"] for c in mock_db.query.return_value.update.call_args_list]
+        assert statuses == ['failed', 'evaluating']
+
+    def test_fails_pending_rows_when_requeue_disabled(self):
+        """Test that pending rows are failed when requeue is disabled"""
+        mock_db = _mock_db(stuck_rows=[_stuck_row(1, 'pending')])
+
+        with patch('app.services.evaluation_sweeper.get_db_session', return_value=mock_db):
+            outcome = evaluation_sweeper.sweep_stuck_evaluations(requeue=False)
+
+        assert outcome["failed"] == 1
+        assert outcome["requeue"] == []
+
+    def test_respects_batch_size(self):
+        """Test that the stuck-row query is bounded by batch_size"""
+        mock_db = _mock_db()
+
+        with patch('app.services.evaluation_sweeper.get_db_session', return_value=mock_db):
+            evaluation_sweeper.sweep_stuck_evaluations(batch_size=7)
+
+        mock_db.query.return_value.limit.assert_called_once_with(7)
+        mock_db.query.return_value.with_for_update.assert_called_once_with(skip_locked=True)
+
+    def test_rolls_back_and_closes_on_error(self):
+        """Test that database errors roll back the sweep transaction"""
+        mock_db = _mock_db()
+        mock_db.query.side_effect = Exception("Database connection failed")
+
+        with patch('app.services.evaluation_sweeper.get_db_session', return_value=mock_db):
+            with pytest.raises(Exception, match="Database connection failed"):
+                evaluation_sweeper.sweep_stuck_evaluations()
+
+        mock_db.rollback.assert_called_once()
+        mock_db.close.assert_called_once()
+
+
+class TestRunSweepOnce:
+    """Tests for run_sweep_once()"""
+
+    @pytest.mark.asyncio
+    async def test_requeued_rows_are_reevaluated(self):
+        """Test that requeued rows re-run their SQL and are evaluated again"""
+        outcome = {"lock_acquired": True, "failed": 0,
+                   "requeue": [(5, "who is on leave", "SELECT * FROM employees")]}
+        results = [{"employee_id": 1}]
+
+        with patch('app.services.evaluation_sweeper.sweep_stuck_evaluations', return_value=outcome), \
+             patch('app.services.evaluation_sweeper._refetch_results', return_value=results), \
+             patch('app.services.evaluation_sweeper.ragas_service.evaluate_and_update_async',
+                   new_callable=AsyncMock) as mock_evaluate:
+            await evaluation_sweeper.run_sweep_once()
+            for task in list(evaluation_sweeper._requeued_tasks):
+                await task
+
+        mock_evaluate.assert_awaited_once_with(5, "who is on leave", "SELECT * FROM employees", results)
+
+    @pytest.mark.asyncio
+    async def test_refetch_failure_marks_row_failed(self):
+        """Test that a row whose SQL can no longer run is marked failed"""
+        outcome = {"lock_acquired": True, "failed": 0,
+                   "requeue": [(6, "bad", "SELECT * FROM employees")]}
+
+        with patch('app.services.evaluation_sweeper.sweep_stuck_evaluations', return_value=outcome), \
+             patch('app.services.evaluation_sweeper._refetch_results', side_effect=Exception("boom")), \
+             patch('app.services.evaluation_sweeper._mark_failed') as mock_mark_failed, \
+             patch('app.services.evaluation_sweeper.ragas_service.evaluate_and_update_async',
+                   new_callable=AsyncMock) as mock_evaluate:
+            await evaluation_sweeper.run_sweep_once()
+            for task in list(evaluation_sweeper._requeued_tasks):
+                await task
+
+        mock_mark_failed.assert_called_once_with(6)
+        mock_evaluate.assert_not_awaited()
+
+
+class TestSettings:
+    """Tests for reading sweeper settings from .env"""
+
+    def test_dotenv_values_apply_to_service_settings(self, tmp_path):
+        """Test that app.main loads .env before the services read their settings"""
+        env_file = tmp_path / ".env"
+        env_file.write_text("EVALUATION_SWEEP_BATCH_SIZE=7\n")
+        # load_dotenv() finds .env from the calling module's directory; point it at the temporary file
+        script = (
+            "import functools, dotenv\n"
+            f"dotenv.load_dotenv = functools.partial(dotenv.load_dotenv, dotenv_path={str(env_file)!r})\n"
+            "import app.main\n"
+            "from app.services import evaluation_sweeper\n"
+            "print(evaluation_sweeper.SWEEP_BATCH_SIZE)\n"
+        )
+        env = {key: value for key, value in os.environ.items() if key != "EVALUATION_SWEEP_BATCH_SIZE"}
+
+        result = subprocess.run([sys.executable, "-c", script], cwd=Path(__file__).resolve().parents[1],
+                                env=env, capture_output=True, text=True, timeout=120)
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().splitlines()[-1] == "7"
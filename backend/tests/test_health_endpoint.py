@@ -1,8 +1,10 @@
 """Tests for health endpoint with pool status."""
 
+import time
 import pytest
 from unittest.mock import patch, MagicMock
 from app.api.routes import health
+from app.services import health_service
 
 
 @pytest.mark.asyncio
@@ -20,8 +22,8 @@ class TestHealthEndpoint:
             "total": 5
         }
 
-        with patch('app.api.routes.get_db_session') as mock_get_session, \
-             patch('app.api.routes.get_pool_status', return_value=mock_pool_status):
+        with patch('app.services.health_service.get_db_session') as mock_get_session, \
+             patch('app.services.health_service.get_pool_status', return_value=mock_pool_status):
 
             mock_db = MagicMock()
             mock_db.execute.return_value = None
@@ -38,7 +40,7 @@ class TestHealthEndpoint:
     @pytest.mark.asyncio
     async def test_health_endpoint_database_failure(self):
         """Test health endpoint when database connection fails."""
-        with patch('app.api.routes.get_db_session') as mock_get_session:
+        with patch('app.services.health_service.get_db_session') as mock_get_session:
             mock_db = MagicMock()
             mock_db.execute.side_effect = Exception("Connection failed")
             mock_get_session.return_value = mock_db
@@ -60,8 +62,8 @@ class TestHealthEndpoint:
             "total": 6
         }
 
-        with patch('app.api.routes.get_db_session') as mock_get_session, \
-             patch('app.api.routes.get_pool_status', return_value=mock_pool_status):
+        with patch('app.services.health_service.get_db_session') as mock_get_session, \
+             patch('app.services.health_service.get_pool_status', return_value=mock_pool_status):
 
             mock_db = MagicMock()
             mock_db.execute.return_value = None
@@ -75,3 +77,64 @@ class TestHealthEndpoint:
             assert "checked_out" in pool_status
             assert "overflow" in pool_status
             assert "total" in pool_status
+
+
+@pytest.mark.asyncio
+class TestCachedHealth:
+    """Test cases for the cached health prober (shallow vs deep checks)."""
+
+    @pytest.mark.asyncio
+    async def test_shallow_check_uses_cached_state(self):
+        """Test that shallow checks answer from the last probe without a new query."""
+        with patch('app.services.health_service.get_db_session') as mock_get_session, \
+             patch('app.services.health_service.get_pool_status', return_value={"checked_out": 0}):
+            await health_service.probe()
+            mock_get_session.reset_mock()
+
+            response = await health()
+
+            assert response.status == "healthy"
+            assert response.checked_at is not None
+            mock_get_session.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_deep_check_probes_now(self):
+        """Test that ?deep=1 runs a fresh database check."""
+        with patch('app.services.health_service.get_db_session') as mock_get_session, \
+             patch('app.services.health_service.get_pool_status', return_value={}):
+            await health_service.probe()
+            mock_get_session.return_value.execute.side_effect = Exception("Connection lost")
+
+            response = await health(deep=True)
+
+            assert response.status == "unhealthy"
+            assert response.error == "Connection lost"
+
+    @pytest.mark.asyncio
+    async def test_deep_check_times_out_instead_of_queueing(self):
+        """Test that a check stuck waiting for the pool reports unhealthy after the timeout."""
+        def blocked_checkout():
+            time.sleep(0.5)
+            return MagicMock()
+
+        with patch('app.services.health_service.get_db_session', side_effect=blocked_checkout), \
+             patch.object(health_service, 'HEALTH_DEEP_TIMEOUT_SECONDS', 0.05):
+            start = time.perf_counter()
+            state = await health_service.probe(timeout=0.05)
+
+            assert time.perf_counter() - start < 0.4
+            assert state["database"] == "disconnected"
+            assert "timed out" in state["error"]
+
+    @pytest.mark.asyncio
+    async def test_stale_state_is_reprobed(self):
+        """Test that a cached result older than the staleness limit triggers a probe."""
+        with patch('app.services.health_service.get_db_session') as mock_get_session, \
+             patch('app.services.health_service.get_pool_status', return_value={}), \
+             patch.object(health_service, 'HEALTH_STALE_SECONDS', 0):
+            await health_service.probe()
+            mock_get_session.reset_mock()
+
+            await health()
+
+            mock_get_session.assert_called_once()
@@ -0,0 +1,165 @@
+"""Tests for heuristic_scorer.py"""
+
+import pytest
+from unittest.mock import patch
+
+from app.services import heuristic_scorer
+
+
+EMPLOYEE_ROW = {
+    "employee_id": 1, "first_name": "Emma", "last_name": "Johnson", "department": "Engineering",
+    "role": "Software Engineer", "employment_status": "Active", "hire_date": "2025-06-01",
+    "leave_type": None, "salary_local": 130000.0, "salary_usd": 130000.0, "manager_name": "Sarah Williams"
+}
+
+
+class TestScore:
+    """Tests for score()"""
+
+    def test_claims_from_results_are_faithful(self):
+        """Test that rows returning every selected column are fully faithful"""
+        scores = heuristic_scorer.score(
+            "Show me employees in Engineering",
+            "SELECT * FROM employees WHERE department = 'Engineering'",
+            [EMPLOYEE_ROW] * 5
+        )
+
+        assert scores["faithfulness"] == 1.0
+
+    def test_empty_results_are_faithful(self):
+        """Test that the 'no results' answer is treated as faithful"""
+        scores = heuristic_scorer.score(
+            "Who is on parental leave?",
+            "SELECT * FROM employees WHERE leave_type = 'Parental Leave'",
+            []
+        )
+
+        assert scores == {"faithfulness": 1.0, "answer_relevance": 1.0, "context_utilization": 1.0}
+
+    def test_values_lost_from_rows_lower_faithfulness(self):
+        """Test that selected values sharing a name, or with no name, lower faithfulness"""
+        scores = heuristic_scorer.score(
+            "Which departments have employees on leave?",
+            "SELECT e.department, d.department, COUNT(*) + 1 FROM employees e JOIN employees d ON true",
+            [{"department": "HR", "?column?": 4}]
+        )
+
+        assert scores["faithfulness"] == 0.0
+
+    @pytest.mark.parametrize("item, name", [
+        ("first_name", "first_name"),
+        ("e.Salary_USD", "salary_usd"),
+        ('AVG(salary_usd) AS "Average Salary"', "Average Salary"),
+        ("ROUND(AVG(salary_usd), 2)", "round"),
+        ("salary_usd::numeric(10, 2)", "salary_usd"),
+        ("first_name name", "name"),
+        ("COUNT(*) total", "total"),
+        ("salary_usd * 12 annual_pay", "annual_pay"),
+        ("salary_usd::int pay", "pay"),
+        ("CASE WHEN leave_type IS NULL THEN 'Working' ELSE 'Away' END status", "status"),
+        ("CASE WHEN leave_type IS NULL THEN 'Working' END", "?column?"),
+        ("leave_type IS NOT NULL", "?column?"),
+        ("salary_usd > 100000 AND department", "?column?"),
+        ("COUNT(*) + 1", "?column?"),
+        ("COALESCE(leave_type, 'None') || role", "?column?"),
+        ("e.*", None),
+    ])
+    def test_output_names(self, item, name):
+        """Test the column name expected for each kind of select item"""
+        assert heuristic_scorer._output_name(item) == name
+
+    def test_implicit_alias_is_as_faithful_as_explicit(self):
+        """Test that an alias written without AS names its column like one with AS"""
+        for sql in ("SELECT first_name name FROM employees", "SELECT first_name AS name FROM employees"):
+            assert heuristic_scorer.score("Who works here?", sql, [{"name": "Emma"}])["faithfulness"] == 1.0
+
+    def test_select_list_ignores_subqueries_and_literals(self):
+        """Test that only top-level commas of the outermost SELECT split items"""
+        sql = ("SELECT DISTINCT department, 'a, b' AS label, (SELECT MAX(salary_usd) FROM employees) AS top "
+               "FROM employees")
+
+        assert heuristic_scorer._select_items(sql) == ["department", "'a, b' AS label",
+                                                       "(SELECT MAX(salary_usd) FROM employees) AS top"]
+
+    def test_select_star_has_low_context_utilization(self):
+        """Test that returning every column for a narrow question lowers utilization"""
+        scores = heuristic_scorer.score(
+            "Show me employees in Engineering",
+            "SELECT * FROM employees WHERE department = 'Engineering'",
+            [EMPLOYEE_ROW]
+        )
+
+        assert scores["context_utilization"] < 0.7
+
+    def test_focused_aggregation_scores_high(self):
+        """Test that computed columns and grouped columns count as utilized"""
+        scores = heuristic_scorer.score(
+            "How many employees are in each department?",
+            "SELECT department, COUNT(*) as employee_count FROM employees GROUP BY department",
+            [{"department": "HR", "employee_count": 3}]
+        )
+
+        assert scores == {"faithfulness": 1.0, "answer_relevance": 1.0, "context_utilization": 1.0}
+
+    def test_missing_question_concept_lowers_relevance(self):
+        """Test that SQL ignoring a concept from the question scores low relevance"""
+        scores = heuristic_scorer.score(
+            "What is the salary of each manager?",
+            "SELECT first_name FROM employees",
+            [{"first_name": "Emma"}]
+        )
+
+        assert scores["answer_relevance"] == 0.0
+
+
+class TestIsWeak:
+    """Tests for is_weak()"""
+
+    def test_weak_when_any_score_below_threshold(self):
+        """Test that one low score flags the query"""
+        assert heuristic_scorer.is_weak({"faithfulness": 1.0, "answer_relevance": 0.5, "context_utilization": 1.0})
+
+    def test_strong_when_all_scores_meet_threshold(self):
+        """Test that scores at or above the threshold are not flagged"""
+        assert not heuristic_scorer.is_weak({"faithfulness": 1.0, "answer_relevance": 0.7, "context_utilization": 0.9})
+
+
+class TestRagasMode:
+    """Tests for RAGAS_MODE routing in query_service"""
+
+    @pytest.mark.parametrize("mode,scores,expected", [
+        ("always", {"faithfulness": 1.0, "answer_relevance": 1.0, "context_utilization": 1.0}, True),
+        ("weak_only", {"faithfulness": 1.0, "answer_relevance": 1.0, "context_utilization": 1.0}, False),
+        ("weak_only", {"faithfulness": 1.0, "answer_relevance": 0.4, "context_utilization": 1.0}, True),
+        ("weak_only", None, True),
+        ("off", {"faithfulness": 1.0, "answer_relevance": 0.4, "context_utilization": 1.0}, False),
+    ])
+    def test_needs_ragas(self, mode, scores, expected):
+        """Test when full RAGAS evaluation is requested"""
+        from app.services.query_service import _needs_ragas
+
+        with patch('app.services.query_service.ragas_service.RAGAS_MODE', mode):
+            assert _needs_ragas(scores) is expected
+
+    @pytest.mark.asyncio
+    async def test_strong_query_completes_with_heuristic_scores(self):
+        """Test that weak_only mode logs strong queries as completed with heuristic scores"""
+        from unittest.mock import MagicMock
+        from app.services.query_service import execute_query
+
+        mock_db = MagicMock()
+        mock_db.execute.return_value.mappings.return_value = [{"department": "HR", "employee_count": 3}]
+
+        with patch('app.services.query_service.ragas_service.RAGAS_MODE', 'weak_only'), \
+             patch('app.services.query_service.generate_sql',
+                   return_value="SELECT department, COUNT(*) as employee_count FROM employees GROUP BY department"), \
+             patch('app.services.query_service.validate_sql'), \
+             patch('app.services.query_service.get_db_session', return_value=mock_db):
+            response = await execute_query("How many employees are in each department?")
+
+        assert response.evaluation_status == 'completed'
+        assert response.ragas_scores == response.provisional_scores
+        logged = mock_db.add.call_args[0][0]
+        assert logged.evaluation_status == 'completed'
+        assert logged.score_source == 'heuristic'
+        assert logged.faithfulness_score == 1.0
@@ -0,0 +1,199 @@
+"""Tests for the EXPLAIN-driven index advisor."""
+
+import pytest
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+from app.services import index_advisor
+
+SALARY_FILTER = "(((department)::text = 'Engineering'::text) AND (salary_usd > '120000'::numeric))"
+LEAVE_FILTER = "((leave_type)::text = 'Parental Leave'::text)"
+
+
+def _scan(filter_, rows, cost):
+    return {"Node Type": "Seq Scan", "Relation Name": "employees", "Plan Rows": rows, "Total Cost": cost,
+            "Filter": filter_}
+
+
+def _top_salaries_plan():
+    """Plan of SELECT ... ORDER BY salary_usd DESC LIMIT 10 over a 1M row table."""
+    return {"Node Type": "Limit", "Total Cost": 60000.0, "Plans": [{
+        "Node Type": "Sort", "Plan Rows": 1_000_000, "Total Cost": 60000.0,
+        "Sort Key": ["employees.salary_usd DESC"],
+        "Plans": [{"Node Type": "Seq Scan", "Relation Name": "employees", "Plan Rows": 1_000_000,
+                   "Total Cost": 20000.0}]
+    }]}
+
+
+class TestFilterParsing:
+    """Tests for split_conjuncts() / parse_predicate()"""
+
+    def test_and_terms_become_column_predicates(self):
+        """Test equality and range comparisons with constants, including casts and ANY"""
+        terms = index_advisor.split_conjuncts(SALARY_FILTER)
+
+        assert [index_advisor.parse_predicate(term) for term in terms] == [('department', 'eq'), ('salary_usd', 'range')]
+        assert index_advisor.parse_predicate("(hire_date >= (CURRENT_DATE - '6 mons'::interval))") == \
+            ('hire_date', 'range')
+        assert index_advisor.parse_predicate("((role)::text = ANY ('{a,b}'::text[]))") == ('role', 'eq')
+        assert index_advisor.parse_predicate("(leave_type IS NOT NULL)") == ('leave_type', 'not_null')
+
+    def test_quoted_keywords_and_top_level_or(self):
+        """Test that AND inside literals is not split and OR conditions are not indexable"""
+        assert index_advisor.split_conjuncts("((department)::text = 'R AND D'::text)") == \
+            ["(department)::text = 'R AND D'::text"]
+        assert index_advisor.split_conjuncts("((a = 1) OR (b = 2))") is None
+
+    @pytest.mark.parametrize("term", [
+        "(first_name)::text ~~* '%priya%'::text",
+        "(department)::text <> 'Sales'::text",
+        "(manager_name)::text = (first_name)::text",
+        "lower((first_name)::text) = 'priya'::text",
+    ])
+    def test_non_indexable_terms(self, term):
+        """Test LIKE, inequality, column comparisons and expressions are ignored"""
+        assert index_advisor.parse_predicate(term) is None
+
+
+class TestCandidates:
+    """Tests for find_hotspots(), candidate_index() and ranking helpers"""
+
+    def test_small_tables_have_no_hotspots(self):
+        """Test that scans and sorts below min_rows are ignored"""
+        plan = _scan(SALARY_FILTER, 50, 100.0)
+
+        assert index_advisor.find_hotspots(plan, {"employees": 5_000}, min_rows=10_000) == []
+        assert index_advisor.find_hotspots(plan, {"employees": 50_000}, min_rows=10_000)[0]["rows"] == 50_000
+
+    def test_composite_index_puts_equality_before_range(self):
+        """Test a seq scan filter becomes (equality columns, range column)"""
+        hotspot = index_advisor.find_hotspots(_scan(SALARY_FILTER, 5_000, 25_000.0), {"employees": 1_000_000})[0]
+        candidate = index_advisor.candidate_index(hotspot, {})
+
+        assert index_advisor.index_ddl(candidate) == \
+            "CREATE INDEX CONCURRENTLY idx_employees_department_salary_usd ON employees (department, salary_usd)"
+        assert index_advisor.estimated_saving(hotspot) == pytest.approx(25_000 * (1 - 4 * 0.005))
+
+    def test_mostly_null_column_gets_partial_index(self):
+        """Test that filtering a mostly-NULL column by value proposes WHERE column IS NOT NULL"""
+        hotspot = index_advisor.find_hotspots(_scan(LEAVE_FILTER, 1_600, 25_000.0), {"employees": 1_000_000})[0]
+        candidate = index_advisor.candidate_index(hotspot, {"leave_type": 0.95})
+
+        assert candidate == {"table": "employees", "columns": [("leave_type", "ASC")],
+                             "where": "leave_type IS NOT NULL"}
+        assert index_advisor.index_name(candidate) == "idx_employees_leave_type_partial"
+
+    def test_sort_over_scan_gets_ordered_index(self):
+        """Test that a large sort of a table scan proposes an index in sort order"""
+        hotspots = index_advisor.find_hotspots(_top_salaries_plan(), {"employees": 1_000_000})
+        candidate = index_advisor.candidate_index(hotspots[0], {})
+
+        assert [hotspot["node"] for hotspot in hotspots] == ["Sort"]
+        assert index_advisor.index_columns(candidate) == "salary_usd DESC"
+        assert index_advisor.estimated_saving(hotspots[0]) == 40000.0
+
+    def test_unselective_scans_save_nothing(self):
+        """Test that filters matching over a quarter of the table are not worth an index"""
+        hotspot = index_advisor.find_hotspots(_scan(SALARY_FILTER, 400_000, 25_000.0), {"employees": 1_000_000})[0]
+
+        assert index_advisor.estimated_saving(hotspot) == 0.0
+
+    def test_existing_index_prefix_covers_candidate(self):
+        """Test coverage by leading columns of existing full indexes"""
+        candidate = {"table": "employees", "columns": [("department", "ASC")], "where": None}
+
+        assert index_advisor.is_covered(candidate, [("department",), ("hire_date",)])
+        assert not index_advisor.is_covered({**candidate, "columns": [("department", "ASC"), ("salary_usd", "ASC")]},
+                                            [("department",)])
+
+
+class TestAdvise:
+    """Tests for advise()"""
+
+    STATEMENTS = [
+        {"fingerprint": "a1", "executions": 40,
+         "sql": "SELECT * FROM employees WHERE department = 'Engineering' AND salary_usd > 120000"},
+        {"fingerprint": "b2", "executions": 10, "sql": "SELECT * FROM employees WHERE leave_type = 'Parental Leave'"},
+        {"fingerprint": "c3", "executions": 5, "sql": "SELECT * FROM employees WHERE department = 'Sales'"},
+        {"fingerprint": "d4", "executions": 3, "sql": "DELETE FROM employees"},
+    ]
+    PLANS = {
+        "a1": _scan(SALARY_FILTER, 5_000, 25_000.0),
+        "b2": _scan(LEAVE_FILTER, 1_600, 25_000.0),
+        "c3": _scan("((department)::text = 'Sales'::text)", 20_000, 25_000.0),
+    }
+
+    def _advise(self, **kwargs):
+        db = MagicMock()
+        statements = [dict(statement) for statement in self.STATEMENTS]
+        plans = {statement["sql"]: self.PLANS.get(statement["fingerprint"]) for statement in statements}
+        stats = {"rows": 1_000_000, "null_fraction": {"leave_type": 0.95}, "indexes": [("department",)]}
+
+        with patch('app.services.index_advisor.get_db_session', return_value=db), \
+             patch('app.services.index_advisor.logged_statements', return_value=statements), \
+             patch('app.services.index_advisor.explain', side_effect=lambda _, sql: plans[sql]), \
+             patch('app.services.index_advisor.table_statistics', return_value=stats) as mock_stats, \
+             patch('app.services.index_advisor.hypopg_available', return_value=False):
+            advice = index_advisor.advise(min_rows=10_000, **kwargs)
+        return advice, db, mock_stats
+
+    def test_candidates_ranked_by_weighted_benefit(self):
+        """Test ranking by saving x executions, skipping covered candidates and unplannable SQL"""
+        advice, db, mock_stats = self._advise()
+
+        assert [candidate["name"] for candidate in advice["candidates"]] == \
+            ["idx_employees_department_salary_usd", "idx_employees_leave_type_partial"]
+        top = advice["candidates"][0]
+        assert top["benefit"] == pytest.approx(25_000 * (1 - 4 * 0.005) * 40, abs=0.1)
+        assert top["fingerprints"] == ["a1"] and top["executions"] == 40
+        assert advice["statements"] == 3 and advice["skipped"] == 1
+        assert len(advice["hotspots"]) == 3
+        assert advice["benefit_source"] == 'estimate'
+        mock_stats.assert_called_once()
+        db.rollback.assert_called_once()
+        db.close.assert_called_once()
+        db.commit.assert_not_called()
+
+    def test_hypopg_measures_saving(self):
+        """Test that hypothetical indexes replace the estimate with a re-planned cost difference"""
+        with patch('app.services.index_advisor._hypothetical_saving', return_value=500.0) as mock_saving:
+            advice, _, _ = self._advise(use_hypopg=True)
+
+        assert advice["benefit_source"] == 'hypopg'
+        assert {candidate["benefit"] for candidate in advice["candidates"]} == {500.0}
+        assert mock_saving.call_count == 2
+
+
+class TestMigration:
+    """Tests for next_revision() / render_migration()"""
+
+    def test_next_revision_follows_highest_number(self, tmp_path):
+        """Test revision numbering from the versions directory"""
+        for name in ("001_create.py", "012_partition.py", "__init__.py"):
+            (tmp_path / name).write_text("")
+
+        assert index_advisor.next_revision(tmp_path) == ("013", "012")
+
+    def test_rendered_migration_creates_and_drops_indexes(self):
+        """Test that the migration is valid Python creating each index concurrently"""
+        candidate = {"table": "employees", "columns": [("leave_type", "ASC")], "where": "leave_type IS NOT NULL",
+                     "benefit": 23_400.0}
+        candidate["name"] = index_advisor.index_name(candidate)
+        source = index_advisor.render_migration([candidate], "013", "012", created=date(2026, 10, 19))
+
+        executed = []
+        op = MagicMock()
+        op.execute.side_effect = executed.append
+        namespace = {}
+        with patch.dict('sys.modules', {'alembic': MagicMock(op=op)}):
+            exec(compile(source, "013_add_advised_indexes.py", "exec"), namespace)
+            namespace["upgrade"]()
+            namespace["downgrade"]()
+
+        assert namespace["revision"] == "013" and namespace["down_revision"] == "012"
+        assert executed == [
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_employees_leave_type_partial ON employees (leave_type) "
+            "WHERE leave_type IS NOT NULL",
+            "DROP INDEX CONCURRENTLY IF EXISTS idx_employees_leave_type_partial",
+        ]
+        assert "Create Date: 2026-10-19" in source
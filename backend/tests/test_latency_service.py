@@ -0,0 +1,61 @@
+"""Tests for latency percentile reporting."""
+
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.services import latency_service
+
+
+def _row(count, **values):
+    """Create an aggregate row with all percentiles None unless given."""
+    row = {f"{name}_{label}": None for name, _ in latency_service.LATENCY_COLUMNS
+           for label, _ in latency_service.PERCENTILES}
+    row.update(values)
+    return SimpleNamespace(count=count, **row)
+
+
+class TestPercentileColumns:
+    """Tests for _percentile_columns()"""
+
+    def test_percentile_cont_per_metric(self):
+        """Test that each metric gets ordered-set percentiles in SQL"""
+        query = Session().query(*latency_service._percentile_columns())
+        sql = str(query.statement.compile(dialect=postgresql.dialect()))
+
+        assert "percentile_cont(%(percentile_cont_1)s) WITHIN GROUP " \
+               "(ORDER BY query_logs.execution_time_ms) AS total_p50" in sql
+        assert "WITHIN GROUP (ORDER BY query_logs.db_time_ms) AS db_p99" in sql
+
+
+class TestGetLatencyReport:
+    """Tests for get_latency_report()"""
+
+    def test_report_shape(self):
+        """Test overall, per-type and per-day sections with stage breakdowns"""
+        mock_db = MagicMock()
+        mock_db.query.return_value.filter.return_value.one.return_value = _row(
+            10, total_p50=812.5, total_p90=1500.0, total_p99=2950.25, llm_p50=700.0
+        )
+        mock_db.query.return_value.filter.return_value.group_by.return_value.all.return_value = [
+            SimpleNamespace(query_type='join', **vars(_row(4, total_p50=900.0))),
+            SimpleNamespace(query_type=None, **vars(_row(1))),
+        ]
+        mock_db.query.return_value.filter.return_value.group_by.return_value.order_by.return_value.all.return_value = [
+            SimpleNamespace(day=date(2026, 10, 19), **vars(_row(10, db_p90=45.0))),
+        ]
+
+        with patch('app.services.latency_service.get_db_session', return_value=mock_db):
+            report = latency_service.get_latency_report(days=7)
+
+        assert report["window_days"] == 7
+        assert report["overall"]["count"] == 10
+        assert report["overall"]["total"] == {"p50": 812.5, "p90": 1500.0, "p99": 2950.2}
+        assert report["overall"]["llm"]["p50"] == 700.0
+        assert report["overall"]["validation"] == {"p50": None, "p90": None, "p99": None}
+        assert set(report["by_query_type"]) == {'join', 'unclassified'}
+        assert report["by_day"][0]["day"] == "2026-10-19"
+        assert report["by_day"][0]["db"]["p90"] == 45.0
+        mock_db.close.assert_called_once()
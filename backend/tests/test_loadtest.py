@@ -0,0 +1,231 @@
+"""Tests for the load-testing tools (fake OpenAI server and load generator)."""
+
+import json
+import random
+from datetime import date
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+import pytest
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from openai import AsyncOpenAI
+
+from app.services.llm_service import SYSTEM_PROMPT
+from app.services.validation_service import validate_sql
+from loadtest import fake_openai, generator, scaling
+
+
+def _fake_client(**kwargs):
+    return TestClient(fake_openai.create_app(latency="constant:0", embedding_latency="constant:0", **kwargs))
+
+
+class TestCannedAnswers:
+    """Tests for SQL and RAGAS answers of the fake server"""
+
+    def test_few_shot_examples_are_parsed_from_prompt(self):
+        """Test that every example in the SQL generation prompt becomes a canned answer"""
+        examples = fake_openai.few_shot_examples()
+
+        assert len(examples) == SYSTEM_PROMPT.count('User: "')
+        assert ("Who is on parental leave?", "SELECT * FROM employees WHERE leave_type = 'Parental Leave'") in examples
+
+    def test_closest_example_sql_is_answered(self):
+        """Test that a reworded question gets the SQL of the most similar example"""
+        examples = fake_openai.few_shot_examples()
+
+        assert fake_openai.answer_sql("who is currently on parental leave", examples) == \
+            "SELECT * FROM employees WHERE leave_type = 'Parental Leave'"
+        assert fake_openai.answer_sql("zzz", examples) == fake_openai.FALLBACK_SQL
+
+    def test_ragas_prompts_get_well_formed_json(self):
+        """Test the answer shapes for each RAGAS metric prompt"""
+        relevancy = json.loads(fake_openai.ragas_answer(
+            "Generate a question for the given answer and Identify if answer is noncommittal.\nanswer: 3 employees"
+        ))
+        nli = json.loads(fake_openai.ragas_answer(
+            'judge the faithfulness... verdict\nstatements: ["a is 1", "b is 2"]'
+        ))
+        precision = json.loads(fake_openai.ragas_answer("verify if the context was useful. Give verdict"))
+
+        assert relevancy == {"question": "3 employees", "noncommittal": 0}
+        assert [item["verdict"] for item in nli] == [1, 1]
+        assert precision["verdict"] == 1
+
+
+class TestLatency:
+    """Tests for parse_latency()"""
+
+    def test_distributions_sample_seconds(self):
+        """Test that millisecond specs sample non-negative seconds"""
+        rng = random.Random(1)
+
+        assert fake_openai.parse_latency("constant:200")(rng) == 0.2
+        assert 0.1 <= fake_openai.parse_latency("uniform:100:300")(rng) <= 0.3
+        samples = [fake_openai.parse_latency("lognormal:400:0.5")(rng) for _ in range(2001)]
+        assert 0.3 < sorted(samples)[1000] < 0.5
+        assert all(fake_openai.parse_latency("normal:5:50")(rng) >= 0 for _ in range(100))
+
+    @pytest.mark.parametrize("spec", ["gamma:1:2", "uniform:100", "constant:fast"])
+    def test_invalid_spec_raises(self, spec):
+        """Test that unknown distributions and bad parameters are rejected"""
+        with pytest.raises(ValueError):
+            fake_openai.parse_latency(spec)
+
+
+class TestFakeServer:
+    """Tests for the fake OpenAI HTTP endpoints"""
+
+    @pytest.mark.asyncio
+    async def test_openai_sdk_receives_canned_sql(self):
+        """Test that the real OpenAI SDK parses the fake completion"""
+        app = fake_openai.create_app(latency="constant:0")
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport) as http_client:
+            client = AsyncOpenAI(api_key="fake", base_url="http://fake/v1", http_client=http_client)
+            response = await client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[{"role": "system", "content": SYSTEM_PROMPT},
+                          {"role": "user", "content": "List all departments"}],
+                max_tokens=200
+            )
+
+        assert response.choices[0].message.content == "SELECT DISTINCT department FROM employees ORDER BY department"
+
+    def test_embeddings_are_deterministic_unit_vectors(self):
+        """Test that the same text always embeds to the same normalised vector"""
+        client = _fake_client()
+
+        first = client.post("/v1/embeddings", json={"input": ["3 employees", "x"], "model": "m"}).json()
+        second = client.post("/v1/embeddings", json={"input": "3 employees", "model": "m"}).json()
+
+        vector = first["data"][0]["embedding"]
+        assert len(vector) == fake_openai.EMBEDDING_DIMENSIONS
+        assert abs(sum(value * value for value in vector) - 1.0) < 1e-9
+        assert second["data"][0]["embedding"] == vector
+
+    def test_error_rate_returns_server_errors(self):
+        """Test that failing calls answer 500 with an OpenAI error body"""
+        client = _fake_client(error_rate=1.0)
+
+        response = client.post("/v1/chat/completions", json={"messages": [{"role": "user", "content": "hi"}]})
+
+        assert response.status_code == 500
+        assert response.json()["error"]["type"] == "server_error"
+
+
+def _stub_api():
+    """Minimal stand-in for the API: every third query fails validation, evaluations finish on the 2nd poll."""
+    app = FastAPI()
+    state = {"queries": 0, "polls": {}}
+
+    @app.post("/api/query")
+    async def query(body: dict):
+        state["queries"] += 1
+        if state["queries"] % 3 == 0:
+            return {"success": False, "query": body["query"], "error_type": "VALIDATION_ERROR"}
+        return {"success": True, "query": body["query"], "query_log_id": state["queries"],
+                "evaluation_status": "pending"}
+
+    @app.get("/api/query/{query_log_id}")
+    async def status(query_log_id: int):
+        state["polls"][query_log_id] = state["polls"].get(query_log_id, 0) + 1
+        done = state["polls"][query_log_id] >= 2
+        return {"query_log_id": query_log_id, "evaluation_status": "completed" if done else "evaluating"}
+
+    return app, state
+
+
+class TestLoadGenerator:
+    """Tests for run_load() and its summary"""
+
+    def test_percentile_interpolates(self):
+        """Test linear interpolation between ranks"""
+        assert generator.percentile([1, 2, 3, 4], 0.5) == 2.5
+        assert generator.percentile([5], 0.99) == 5
+        assert generator.percentile([], 0.5) is None
+
+    @pytest.mark.asyncio
+    async def test_run_load_reports_outcomes_and_evaluations(self):
+        """Test that every request is sent once and outcomes and polled evaluations are counted"""
+        app, state = _stub_api()
+
+        summary = await generator.run_load(
+            "http://api", ["q1", "q2"], concurrency=4, requests=9, poll=True,
+            poll_interval=0, transport=httpx.ASGITransport(app=app)
+        )
+
+        assert state["queries"] == summary["requests"] == 9
+        assert summary["outcomes"] == {"ok": 6, "VALIDATION_ERROR": 3}
+        assert summary["evaluations"]["statuses"] == {"completed": 6}
+        assert summary["latency_ms"]["p50"] is not None
+        assert "ok=6" in generator.format_report(summary)
+
+    @pytest.mark.asyncio
+    async def test_run_load_requires_a_limit(self):
+        """Test that an unbounded run is rejected"""
+        with pytest.raises(ValueError):
+            await generator.run_load("http://api", requests=None, duration=None)
+
+
+def _employees_session(count):
+    """Session whose execute() returns count employee rows."""
+    rows = [{"employee_id": index, "first_name": "Emma", "hire_date": date(2024, 1, 2),
+             "salary_usd": Decimal("95000.00")} for index in range(count)]
+    db = MagicMock()
+    db.execute.return_value.mappings.return_value = rows
+    return db
+
+
+class TestScaling:
+    """Tests for the data-size scaling benchmark"""
+
+    def test_default_statements_are_distinct_and_valid(self):
+        """Test that every benchmark statement passes SQL validation once"""
+        statements = scaling.default_statements()
+        sqls = [sql for _, sql in statements]
+
+        assert len(sqls) == len(set(sqls))
+        assert set(sql for _, sql in scaling.EXTRA_STATEMENTS) <= set(sqls)
+        for sql in sqls:
+            validate_sql(sql)
+
+    @pytest.mark.asyncio
+    async def test_measure_statement_runs_real_query_path_with_stubbed_llm(self):
+        """Test that the stubbed SQL is executed, capped and timed without logging the query"""
+        sql = "SELECT * FROM employees WHERE leave_type = 'Parental Leave'"
+        db = _employees_session(1500)
+
+        with patch('app.services.query_service.get_db_session', return_value=db):
+            result = await scaling.measure_statement("Who is on parental leave?", sql, repeat=2)
+
+        assert db.execute.call_count == 2
+        assert str(db.execute.call_args[0][0]) == sql
+        db.add.assert_not_called()
+        assert result["rows_returned"] == 1000
+        assert result["latency_ms"] >= 0 and result["db_ms"] >= 0
+        assert result["peak_rss_mb"] > 0
+
+    @pytest.mark.asyncio
+    async def test_measure_statement_reports_failures(self):
+        """Test that a rejected statement returns its error instead of measurements"""
+        result = await scaling.measure_statement("drop it", "DROP TABLE employees", repeat=3)
+
+        assert result["error_type"] == "VALIDATION_ERROR"
+
+    def test_report_and_csv_cover_every_size(self, tmp_path):
+        """Test the text report and CSV rows per (size, statement)"""
+        sql = "SELECT * FROM employees"
+        results = [
+            {"table_rows": size, "question": "q", "sql": sql, "rows_serialized": size, "latency_ms": size / 100,
+             "db_ms": size // 200, "rows_returned": 1000, "peak_rss_mb": 150.0, "rss_growth_mb": size / 10_000}
+            for size in (10_000, 100_000)
+        ] + [{"table_rows": 1_000_000, "question": "q", "sql": sql, "rows_serialized": 1_000_000,
+              "error": "Query execution timed out", "error_type": "DB_ERROR"}]
+
+        report = scaling.format_report(results)
+        scaling.write_csv(results, tmp_path / "scaling.csv")
+
+        assert "100,000" in report and "#" * scaling.BAR_WIDTH in report
+        assert "DB_ERROR: Query execution timed out" in report
+        assert len((tmp_path / "scaling.csv").read_text().splitlines()) == 4
@@ -0,0 +1,190 @@
+"""Tests for Prometheus metrics and the /metrics endpoint."""
+
+import os
+import sys
+import subprocess
+from pathlib import Path
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock, AsyncMock
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from app.main import app
+from app.api.models import QueryResponse
+from app.services import metrics, ragas_service
+from app.services.query_service import fetch_results
+
+client = TestClient(app)
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def _stage_count(stage):
+    return _sample("hr_query_stage_seconds_count", stage=stage)
+
+
+class TestStageTimers:
+    """Tests for per-stage latency histograms"""
+
+    def test_time_stage_observes_elapsed_seconds(self):
+        """Test that a timed block is observed once and exposes its duration"""
+        before = _stage_count('sanitize')
+
+        with metrics.time_stage('sanitize') as timer:
+            pass
+
+        assert _stage_count('sanitize') == before + 1
+        assert timer.seconds >= 0
+        assert timer.ms == int(timer.seconds * 1000)
+
+    def test_failed_stage_is_still_observed(self):
+        """Test that a stage raising an exception still records its time"""
+        before = _stage_count('validate')
+
+        with pytest.raises(ValueError):
+            with metrics.time_stage('validate'):
+                raise ValueError("Only SELECT queries allowed")
+
+        assert _stage_count('validate') == before + 1
+
+    def test_fetch_results_times_execution_and_serialization(self):
+        """Test that fetch_results records db_execute and serialize separately"""
+        mock_db = MagicMock()
+        mock_db.execute.return_value.mappings.return_value = [{"id": 1}]
+        before = {stage: _stage_count(stage) for stage in ('db_execute', 'serialize')}
+
+        assert fetch_results(mock_db, "SELECT id FROM employees") == [{"id": 1}]
+        assert {stage: _stage_count(stage) for stage in before} == {
+            stage: count + 1 for stage, count in before.items()
+        }
+
+
+class TestQueryMetrics:
+    """Tests for query duration and error counters"""
+
+    def test_record_query_counts_errors_by_type(self):
+        """Test that failed queries increment their error type and all are timed"""
+        errors_before = _sample("hr_query_errors_total", error_type="VALIDATION_ERROR")
+        queries_before = _sample("hr_query_duration_seconds_count")
+
+        metrics.record_query(120, None)
+        metrics.record_query(40, "VALIDATION_ERROR")
+
+        assert _sample("hr_query_errors_total", error_type="VALIDATION_ERROR") == errors_before + 1
+        assert _sample("hr_query_duration_seconds_count") == queries_before + 2
+
+    def test_query_endpoint_records_error_type(self):
+        """Test that POST /api/query counts an LLM failure as LLM_ERROR"""
+        failed = QueryResponse(success=False, query="list employees", error="LLM down",
+                               error_type="LLM_ERROR", execution_time_ms=15)
+        before = _sample("hr_query_errors_total", error_type="LLM_ERROR")
+
+        with patch('app.api.routes.execute_query', new_callable=AsyncMock, return_value=failed):
+            response = client.post("/api/query", json={"query": "list employees"})
+
+        assert response.status_code == 200
+        assert _sample("hr_query_errors_total", error_type="LLM_ERROR") == before + 1
+
+
+class TestGauges:
+    """Tests for pool checkout and evaluation gauges"""
+
+    def test_pool_checkout_gauge_follows_connections(self):
+        """Test that checked-out connections are counted until returned"""
+        engine = create_engine("sqlite://")
+        before = _sample("hr_db_pool_checked_out")
+        try:
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+                assert _sample("hr_db_pool_checked_out") == before + 1
+            assert _sample("hr_db_pool_checked_out") == before
+        finally:
+            engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_evaluation_is_in_flight_while_running(self):
+        """Test that the evaluation gauge covers the evaluation and is released after"""
+        query_log = SimpleNamespace(
+            id=1, evaluation_status='pending', evaluation_updated_at=None, created_at=None
+        )
+        mock_db = MagicMock()
+        mock_db.query.return_value.filter.return_value.first.return_value = query_log
+        before = _sample("hr_evaluations_in_flight")
+        during = []
+
+        async def evaluate(*args, **kwargs):
+            during.append(_sample("hr_evaluations_in_flight"))
+            return None
+
+        with patch('app.db.session.get_db_session', return_value=mock_db), \
+             patch('app.services.ragas_service.evaluate', side_effect=evaluate), \
+             patch('app.services.evaluation_events.publish'):
+            await ragas_service.evaluate_and_update_async(1, "q", "SELECT 1", [])
+
+        assert during == [before + 1]
+        assert _sample("hr_evaluations_in_flight") == before
+
+
+class TestEvaluationMetrics:
+    """Tests for the per-metric RAGAS latency histogram"""
+
+    @pytest.mark.asyncio
+    async def test_metric_durations_observed_by_outcome(self):
+        """Test that scored, timed-out and failed metrics are each observed with their outcome"""
+        import time
+
+        def score_metric(score_key, nl_query, sampled_rows, num_results):
+            if score_key == 'answer_relevance':
+                time.sleep(0.3)
+            if score_key == 'context_utilization':
+                raise RuntimeError("OpenAI unavailable")
+            return 0.9
+
+        outcomes = {'faithfulness': 'completed', 'answer_relevance': 'timeout', 'context_utilization': 'error'}
+        before = {key: _sample("hr_evaluation_metric_seconds_count", metric=key, outcome=outcome)
+                  for key, outcome in outcomes.items()}
+
+        with patch('app.services.ragas_service._score_metric', score_metric), \
+             patch('app.services.ragas_service.RAGAS_METRIC_TIMEOUT_SECONDS', 0.1):
+            for score_key in outcomes:
+                await ragas_service._run_metric(score_key, "q", [], 0, None, {})
+
+        assert {key: _sample("hr_evaluation_metric_seconds_count", metric=key, outcome=outcome)
+                for key, outcome in outcomes.items()} == {key: count + 1 for key, count in before.items()}
+
+
+class TestMetricsEndpoint:
+    """Tests for GET /metrics"""
+
+    def test_metrics_are_exposed_in_prometheus_format(self):
+        """Test that /metrics serves the text exposition format (not the SPA)"""
+        with metrics.time_stage('llm'):
+            pass
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'hr_query_stage_seconds_bucket{le="0.001",stage="llm"}' in response.text
+        assert "hr_db_pool_checked_out" in response.text
+
+    def test_multiprocess_directory_aggregates_workers(self, tmp_path, monkeypatch):
+        """Test that samples written by separate worker processes are summed"""
+        worker = (
+            "from app.services import metrics\n"
+            "metrics.record_query(100, 'DB_ERROR')\n"
+        )
+        env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+        for _ in range(2):
+            subprocess.run([sys.executable, "-c", worker], cwd=BACKEND_DIR, env=env, check=True)
+
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+        body, _ = metrics.render()
+
+        assert 'hr_query_errors_total{error_type="DB_ERROR"} 2.0' in body.decode()
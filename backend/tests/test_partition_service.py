@@ -0,0 +1,155 @@
+"""Tests for query_logs partition maintenance and retention."""
+
+import pytest
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+from app.services import partition_service
+
+
+class TestMonthArithmetic:
+    """Tests for month helpers and partition naming."""
+
+    def test_add_months_crosses_years(self):
+        """Test that month shifts wrap around year boundaries"""
+        assert partition_service.add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+        assert partition_service.add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+    def test_partition_names_round_trip(self):
+        """Test that partition names map back to their month and other tables are ignored"""
+        assert partition_service.partition_name(date(2026, 3, 1)) == "query_logs_2026_03"
+        assert partition_service.partition_month("query_logs_2026_03") == date(2026, 3, 1)
+        assert partition_service.partition_month("query_logs_default") is None
+
+
+class TestPlanning:
+    """Tests for missing_partitions() / expired_partitions()"""
+
+    def test_missing_partitions_ahead(self):
+        """Test that the current month and months_ahead future months are required"""
+        existing = [date(2026, 10, 1), date(2026, 11, 1)]
+
+        assert partition_service.missing_partitions(existing, date(2026, 10, 19), 3) == \
+            [date(2026, 12, 1), date(2027, 1, 1)]
+
+    def test_expired_partitions_are_whole_months_past_retention(self):
+        """Test that only months entirely older than the window expire"""
+        existing = [date(2026, 6, 1), date(2026, 7, 1), date(2026, 8, 1), date(2026, 9, 1)]
+
+        assert partition_service.expired_partitions(existing, date(2026, 10, 19), 3) == \
+            [date(2026, 6, 1)]
+        assert partition_service.expired_partitions(existing, date(2026, 10, 19), 0) == []
+
+
+class TestRunMaintenance:
+    """Tests for run_maintenance()"""
+
+    def _db(self, partitions, lock=True, default_months=()):
+        db = MagicMock()
+        result = MagicMock()
+        result.scalar.return_value = lock
+        result.scalars.return_value = partitions
+        result.rowcount = 0
+        default_result = MagicMock()
+        default_result.scalars.return_value = list(default_months)
+        db.execute.side_effect = lambda statement, *args: \
+            default_result if "SELECT DISTINCT" in str(statement) else result
+        return db
+
+    def test_creates_and_detaches_in_one_transaction(self):
+        """Test that upcoming partitions are created and expired ones detached with their stats"""
+        db = self._db(["query_logs_2026_08", "query_logs_2026_09", "query_logs_2026_10", "query_logs_default"])
+
+        with patch('app.services.partition_service.get_db_session', return_value=db), \
+             patch('app.services.partition_service.report_cache.invalidate') as mock_invalidate:
+            outcome = partition_service.run_maintenance(today=date(2026, 10, 19), months_ahead=1,
+                                                        retention_months=1, mode='detach')
+
+        assert outcome == {"lock_acquired": True, "created": ["query_logs_2026_11"],
+                           "removed": ["query_logs_2026_08"]}
+        statements = [str(c[0][0]) for c in db.execute.call_args_list]
+        assert "ALTER TABLE query_logs ATTACH PARTITION query_logs_2026_11 " \
+               "FOR VALUES FROM ('2026-11-01') TO ('2026-12-01')" in statements
+        assert "ALTER TABLE query_logs DETACH PARTITION query_logs_2026_08" in statements
+        assert not any(statement.startswith("DROP TABLE") for statement in statements)
+        db.query.return_value.filter.return_value.delete.assert_called_once()
+        db.commit.assert_called_once()
+        mock_invalidate.assert_called_once()
+
+    def test_new_partition_takes_rows_from_default_partition(self):
+        """Test that rows already in query_logs_default for the month are moved before attaching"""
+        db = self._db(["query_logs_2026_10"])
+        db.execute.return_value.rowcount = 4
+
+        with patch('app.services.partition_service.get_db_session', return_value=db):
+            partition_service.run_maintenance(today=date(2026, 10, 19), months_ahead=1, retention_months=0)
+
+        calls = db.execute.call_args_list
+        statements = [" ".join(str(c[0][0]).split()) for c in calls]
+        create = statements.index("CREATE TABLE query_logs_2026_11 "
+                                  "(LIKE query_logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+        move, attach = statements[create + 1], statements[create + 2]
+        assert move.startswith("WITH moved AS ( DELETE FROM query_logs_default WHERE created_at >= :start")
+        assert move.endswith("INSERT INTO query_logs_2026_11 SELECT * FROM moved")
+        assert calls[create + 1][0][1] == {"start": date(2026, 11, 1), "end": date(2026, 12, 1)}
+        assert attach.startswith("ALTER TABLE query_logs ATTACH PARTITION query_logs_2026_11")
+        db.commit.assert_called_once()
+
+    def test_expired_rows_in_default_partition_are_removed_with_their_month(self):
+        """Test that expired rows stranded in query_logs_default get a partition that retention removes"""
+        db = self._db(["query_logs_2026_09", "query_logs_2026_10"], default_months=[date(2026, 2, 1)])
+
+        with patch('app.services.partition_service.get_db_session', return_value=db), \
+             patch('app.services.partition_service.report_cache.invalidate'):
+            outcome = partition_service.run_maintenance(today=date(2026, 10, 19), months_ahead=0,
+                                                        retention_months=6, mode='drop')
+
+        assert outcome["removed"] == ["query_logs_2026_02"]
+        calls = db.execute.call_args_list
+        statements = [" ".join(str(c[0][0]).split()) for c in calls]
+        lookup = next(i for i, statement in enumerate(statements) if "SELECT DISTINCT" in statement)
+        assert calls[lookup][0][1] == {"cutoff": date(2026, 4, 1)}
+        create = statements.index("CREATE TABLE query_logs_2026_02 "
+                                  "(LIKE query_logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+        assert statements[create + 1].startswith("WITH moved AS ( DELETE FROM query_logs_default")
+        assert statements.index("ALTER TABLE query_logs DETACH PARTITION query_logs_2026_02") > create
+        assert "DROP TABLE query_logs_2026_02" in statements
+        db.query.return_value.filter.return_value.delete.assert_called_once()
+
+    def test_default_partition_not_scanned_without_retention(self):
+        """Test that retention off leaves query_logs_default alone"""
+        db = self._db(["query_logs_2026_10"], default_months=[date(2020, 1, 1)])
+
+        with patch('app.services.partition_service.get_db_session', return_value=db):
+            outcome = partition_service.run_maintenance(today=date(2026, 10, 19), months_ahead=0,
+                                                        retention_months=0)
+
+        assert outcome["removed"] == []
+        assert not any("SELECT DISTINCT" in str(c[0][0]) for c in db.execute.call_args_list)
+
+    def test_drop_mode_drops_detached_partition(self):
+        """Test that drop mode removes the expired table"""
+        db = self._db(["query_logs_2026_01", "query_logs_2026_10"])
+
+        with patch('app.services.partition_service.get_db_session', return_value=db):
+            partition_service.run_maintenance(today=date(2026, 10, 19), months_ahead=0,
+                                              retention_months=6, mode='drop')
+
+        statements = [str(c[0][0]) for c in db.execute.call_args_list]
+        assert "DROP TABLE query_logs_2026_01" in statements
+
+    def test_skips_when_lock_held(self):
+        """Test that only one replica maintains partitions at a time"""
+        db = self._db([], lock=False)
+
+        with patch('app.services.partition_service.get_db_session', return_value=db):
+            outcome = partition_service.run_maintenance(today=date(2026, 10, 19))
+
+        assert outcome["lock_acquired"] is False
+        db.rollback.assert_called_once()
+        db.commit.assert_not_called()
+
+    def test_unknown_mode_rejected(self):
+        """Test that only detach and drop are accepted"""
+        with pytest.raises(ValueError, match="archive"):
+            partition_service.run_maintenance(mode='archive')
@@ -0,0 +1,60 @@
+"""Tests for periodic background jobs."""
+
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.services import periodic
+
+
+class TestTryAdvisoryLock:
+    """Tests for try_advisory_lock()"""
+
+    @pytest.mark.parametrize("held", [True, False])
+    def test_returns_whether_lock_was_taken(self, held):
+        """Test that the lock is taken per transaction with the job's key"""
+        db = MagicMock()
+        db.execute.return_value.scalar.return_value = held
+
+        assert periodic.try_advisory_lock(db, 726_001) is held
+        statement, params = db.execute.call_args[0]
+        assert str(statement) == "SELECT pg_try_advisory_xact_lock(:key)"
+        assert params == {"key": 726_001}
+
+
+class TestPeriodicJob:
+    """Tests for PeriodicJob"""
+
+    @pytest.mark.asyncio
+    async def test_failures_are_logged_and_the_job_keeps_running(self):
+        """Test that a failing run is logged and the next run still happens"""
+        runs = []
+
+        async def run():
+            runs.append(len(runs))
+            if len(runs) == 1:
+                raise Exception("boom")
+
+        job = periodic.PeriodicJob("test_job")
+        with patch('app.services.periodic.logger') as mock_logger:
+            job.start(run, interval_seconds=0)
+            while len(runs) < 2:
+                await asyncio.sleep(0)
+            await job.stop()
+
+        mock_logger.error.assert_any_call("test_job_failed", error="boom")
+        mock_logger.info.assert_called_once_with("test_job_started", interval_seconds=0)
+
+    @pytest.mark.asyncio
+    async def test_start_is_idempotent_and_stop_cancels(self):
+        """Test that a running job is not started twice and stop waits for it to exit"""
+        async def run():
+            pass
+
+        job = periodic.PeriodicJob("test_job")
+        task = job.start(run, interval_seconds=60)
+        assert job.start(run, interval_seconds=60) is task
+
+        await job.stop()
+        assert task.cancelled()
+        await job.stop()
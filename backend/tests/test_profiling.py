@@ -0,0 +1,176 @@
+"""Tests for on-demand request profiling."""
+
+import os
+import time
+import uuid
+import pstats
+import pytest
+from unittest.mock import patch, AsyncMock
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.api.models import QueryResponse
+from app.services import profiling
+
+client = TestClient(app)
+
+TOKEN = "profile-secret"
+
+
+@pytest.fixture
+def profiling_enabled(tmp_path, monkeypatch):
+    """Enable token-triggered profiling, saving profiles under tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    with patch('app.services.profiling.ENABLED', True), \
+         patch('app.services.profiling.PROFILE_ADMIN_TOKEN', TOKEN):
+        yield tmp_path / profiling.PROFILE_DIR
+
+
+def _answer():
+    return QueryResponse(success=True, query="test query", generated_sql="SELECT 1", execution_time_ms=5)
+
+
+class TestValidateSettings:
+    """Tests for validate_settings()"""
+
+    def test_sampling_without_token_fails(self):
+        """Test that sampled profiles nobody could download are refused at startup"""
+        with patch.object(profiling, 'PROFILE_SAMPLE_RATE', 0.1), \
+             patch.object(profiling, 'PROFILE_ADMIN_TOKEN', ""):
+            with pytest.raises(RuntimeError, match="PROFILE_ADMIN_TOKEN"):
+                profiling.validate_settings()
+
+    @pytest.mark.parametrize("rate,token", [(0.1, "secret"), (0, ""), (0, "secret")])
+    def test_downloadable_settings_pass(self, rate, token):
+        """Test that sampling with a token, token-only and disabled profiling are accepted"""
+        with patch.object(profiling, 'PROFILE_SAMPLE_RATE', rate), \
+             patch.object(profiling, 'PROFILE_ADMIN_TOKEN', token):
+            profiling.validate_settings()
+
+
+class TestShouldProfile:
+    """Tests for should_profile()"""
+
+    def test_admin_token_enables_profiling(self):
+        """Test that only the configured admin token triggers profiling"""
+        with patch('app.services.profiling.PROFILE_ADMIN_TOKEN', TOKEN):
+            assert profiling.should_profile({profiling.PROFILE_HEADER: TOKEN}) is True
+            assert profiling.should_profile({profiling.PROFILE_HEADER: "guess"}) is False
+            assert profiling.should_profile({}) is False
+
+    def test_non_ascii_token_is_rejected(self):
+        """Test that a header with non-ASCII characters is a mismatch, not an error"""
+        with patch('app.services.profiling.PROFILE_ADMIN_TOKEN', TOKEN):
+            assert profiling.should_profile({profiling.PROFILE_HEADER: "tökén"}) is False
+
+    def test_no_configured_token_never_matches(self):
+        """Test that an empty PROFILE_ADMIN_TOKEN does not accept an empty header"""
+        with patch('app.services.profiling.PROFILE_ADMIN_TOKEN', ""):
+            assert profiling.should_profile({profiling.PROFILE_HEADER: ""}) is False
+
+    def test_sampling_rate(self):
+        """Test that requests without a token are sampled at PROFILE_SAMPLE_RATE"""
+        with patch('app.services.profiling.PROFILE_SAMPLE_RATE', 0.1), \
+             patch('app.services.profiling.random.random', side_effect=[0.05, 0.5]):
+            assert profiling.should_profile({}) is True
+            assert profiling.should_profile({}) is False
+
+
+class TestProfile:
+    """Tests for profile() and profile_path()"""
+
+    def test_profile_is_saved_under_request_id(self, tmp_path):
+        """Test that the profiled block is written as a loadable pstats file"""
+        request_id = str(uuid.uuid4())
+
+        with profiling.profile(request_id, str(tmp_path)):
+            sorted(range(1000), reverse=True)
+
+        stats = pstats.Stats(str(tmp_path / f"{request_id}.prof"))
+        assert stats.total_calls > 0
+
+    def test_invalid_request_id_is_rejected(self, tmp_path):
+        """Test that non-UUID ids never become file paths"""
+        assert profiling.profile_path("../../etc/passwd", str(tmp_path)) is None
+
+        with profiling.profile("../evil", str(tmp_path)):
+            pass
+
+        assert os.listdir(tmp_path) == []
+
+    def test_nested_profile_runs_unprofiled(self, tmp_path):
+        """Test that a request arriving during another profile is not profiled"""
+        outer, inner = str(uuid.uuid4()), str(uuid.uuid4())
+
+        with profiling.profile(outer, str(tmp_path)):
+            with profiling.profile(inner, str(tmp_path)) as profiler:
+                assert profiler is None
+
+        assert os.listdir(tmp_path) == [f"{outer}.prof"]
+
+    def test_oldest_profiles_are_pruned(self, tmp_path):
+        """Test that only the newest PROFILE_MAX_FILES profiles are kept"""
+        request_ids = [str(uuid.uuid4()) for _ in range(3)]
+        with patch('app.services.profiling.PROFILE_MAX_FILES', 2):
+            for index, request_id in enumerate(request_ids):
+                with profiling.profile(request_id, str(tmp_path)):
+                    pass
+                # Distinct mtimes so the oldest is well defined
+                os.utime(tmp_path / f"{request_id}.prof", (time.time() - 10 + index,) * 2)
+
+        assert sorted(os.listdir(tmp_path)) == sorted(f"{request_id}.prof" for request_id in request_ids[1:])
+
+
+class TestProfiledQueryEndpoint:
+    """Tests for profiling POST /api/query and GET /api/profiles/{request_id}"""
+
+    def test_disabled_profiling_is_skipped(self):
+        """Test that with profiling off no request is inspected or profiled"""
+        with patch('app.services.profiling.ENABLED', False), \
+             patch('app.services.profiling.should_profile') as mock_should_profile, \
+             patch('app.api.routes.execute_query', new_callable=AsyncMock, return_value=_answer()):
+            response = client.post("/api/query", json={"query": "test query"},
+                                   headers={profiling.PROFILE_HEADER: TOKEN})
+
+        assert response.status_code == 200
+        mock_should_profile.assert_not_called()
+
+    def test_token_profiles_request_and_profile_downloads(self, profiling_enabled):
+        """Test that a token request is saved under its X-Request-ID and can be downloaded"""
+        with patch('app.api.routes.execute_query', new_callable=AsyncMock, return_value=_answer()):
+            response = client.post("/api/query", json={"query": "test query"},
+                                   headers={profiling.PROFILE_HEADER: TOKEN})
+
+        request_id = response.headers["X-Request-ID"]
+        assert response.json()["success"] is True
+        assert (profiling_enabled / f"{request_id}.prof").exists()
+
+        download = client.get(f"/api/profiles/{request_id}", headers={profiling.PROFILE_HEADER: TOKEN})
+        assert download.status_code == 200
+        assert download.content == (profiling_enabled / f"{request_id}.prof").read_bytes()
+
+    def test_request_without_token_is_not_profiled(self, profiling_enabled):
+        """Test that ordinary requests are not profiled when sampling is off"""
+        with patch('app.api.routes.execute_query', new_callable=AsyncMock, return_value=_answer()):
+            client.post("/api/query", json={"query": "test query"})
+
+        assert not profiling_enabled.exists()
+
+    def test_download_requires_admin_token(self, profiling_enabled):
+        """Test that profiles are only served to the admin token"""
+        response = client.get(f"/api/profiles/{uuid.uuid4()}", headers={profiling.PROFILE_HEADER: "guess"})
+
+        assert response.status_code == 403
+
+    def test_download_with_non_ascii_token_is_forbidden(self, profiling_enabled):
+        """Test that a non-ASCII token header gets 403 rather than a server error"""
+        response = client.get(f"/api/profiles/{uuid.uuid4()}",
+                              headers={profiling.PROFILE_HEADER: "tökén".encode("latin-1")})
+
+        assert response.status_code == 403
+
+    def test_missing_profile_returns_404(self, profiling_enabled):
+        """Test that an unknown request id returns 404"""
+        response = client.get(f"/api/profiles/{uuid.uuid4()}", headers={profiling.PROFILE_HEADER: TOKEN})
+
+        assert response.status_code == 404
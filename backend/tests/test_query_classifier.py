@@ -0,0 +1,65 @@
+"""Tests for SQL pattern classification."""
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.db.models import QueryLog
+from app.services import query_classifier
+
+
+class TestClassifySql:
+    """Tests for classify_sql()"""
+
+    @pytest.mark.parametrize("sql,expected", [
+        ("SELECT * FROM employees", 'simple_select'),
+        ("SELECT * FROM employees WHERE department = 'Sales'", 'where_filter'),
+        ("SELECT * FROM employees WHERE hire_date >= CURRENT_DATE - INTERVAL '6 months'", 'date_range'),
+        ("SELECT department, COUNT(*) FROM employees GROUP BY department", 'aggregation'),
+        ("SELECT e.* FROM employees e JOIN employees m ON e.manager_id = m.employee_id WHERE 1=1", 'join'),
+        ("select distinct department from employees", 'aggregation'),
+    ])
+    def test_classify_sql(self, sql, expected):
+        """Test priority-ordered keyword classification"""
+        assert query_classifier.classify_sql(sql) == expected
+
+
+class TestQueryTypeExpression:
+    """Tests for query_type_expression()"""
+
+    def test_case_mirrors_rules_without_like_wildcards(self):
+        """Test that the CASE expression follows QUERY_TYPE_RULES using strpos"""
+        sql = str(query_classifier.query_type_expression(QueryLog.generated_sql).compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        ))
+
+        assert sql.startswith("CASE WHEN")
+        assert sql.index("'JOIN'") < sql.index("'GROUP BY'") < sql.index("'INTERVAL'") < sql.index("'WHERE'")
+        assert "strpos(upper(query_logs.generated_sql), 'DATE_SUB')" in sql
+        assert "LIKE" not in sql
+        assert sql.endswith("ELSE 'simple_select' END")
+
+
+class TestSqlFingerprint:
+    """Tests for normalize_sql() / sql_fingerprint()"""
+
+    def test_literals_are_stripped(self):
+        """Test that queries differing only in literals share a fingerprint"""
+        first = "SELECT * FROM employees WHERE department = 'Sales' AND salary_usd > 80000;"
+        second = "select *  from employees\nwhere department = 'O''Brien''s team' and salary_usd > 95000.50"
+
+        assert query_classifier.normalize_sql(first) == \
+            "SELECT * FROM EMPLOYEES WHERE DEPARTMENT = ? AND SALARY_USD > ?"
+        assert query_classifier.sql_fingerprint(first) == query_classifier.sql_fingerprint(second)
+        assert len(query_classifier.sql_fingerprint(first)) == query_classifier.FINGERPRINT_LENGTH
+
+    def test_literal_lists_collapse(self):
+        """Test that IN lists of any length normalize the same way"""
+        assert query_classifier.normalize_sql("SELECT * FROM t WHERE id IN (1, 2, 3)") == \
+            query_classifier.normalize_sql("SELECT * FROM t WHERE id IN (7)")
+
+    def test_structure_changes_fingerprint(self):
+        """Test that different columns or identifiers with digits are not merged"""
+        base = query_classifier.sql_fingerprint("SELECT first_name FROM employees WHERE id = 1")
+
+        assert query_classifier.sql_fingerprint("SELECT last_name FROM employees WHERE id = 1") != base
+        assert query_classifier.normalize_sql("SELECT col1 FROM t2") == "SELECT COL1 FROM T2"
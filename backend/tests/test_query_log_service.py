@@ -0,0 +1,102 @@
+"""Tests for paginated query history."""
+
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.services import query_log_service
+
+
+def _row(id, created_at, **values):
+    return SimpleNamespace(id=id, created_at=created_at, **values)
+
+
+class TestCursor:
+    """Tests for encode_cursor() / decode_cursor()"""
+
+    def test_round_trip(self):
+        """Test that a cursor decodes to the position it encodes"""
+        position = (datetime(2026, 10, 19, 8, 30, 0, 123456), 42)
+
+        assert query_log_service.decode_cursor(query_log_service.encode_cursor(*position)) == position
+
+    def test_malformed_cursor_rejected(self):
+        """Test that garbage cursors raise ValueError"""
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            query_log_service.decode_cursor("not-a-cursor")
+
+
+class TestResolveFields:
+    """Tests for resolve_fields()"""
+
+    def test_projection_keeps_cursor_fields(self):
+        """Test that id and created_at are always selected, in LOG_FIELDS order"""
+        assert query_log_service.resolve_fields(["execution_time_ms", "evaluation_status"]) == \
+            ['id', 'created_at', 'evaluation_status', 'execution_time_ms']
+
+    def test_unknown_field_rejected(self):
+        """Test that only whitelisted columns can be projected"""
+        with pytest.raises(ValueError, match="password"):
+            query_log_service.resolve_fields(["password"])
+
+
+class TestBuildQuery:
+    """Tests for build_query_logs_query()"""
+
+    def test_filters_and_keyset_condition(self):
+        """Test that filters and the keyset bound are index-friendly and newest first"""
+        query = query_log_service.build_query_logs_query(
+            Session(), ['id', 'created_at'], since=datetime(2026, 10, 1), statuses=['completed'],
+            score_range={'faithfulness': (None, 0.7)}, after=(datetime(2026, 10, 19), 42), limit=51
+        )
+        sql = str(query.statement.compile(dialect=postgresql.dialect()))
+
+        assert "SELECT query_logs.id, query_logs.created_at \nFROM query_logs" in sql
+        assert "query_logs.evaluation_status IN (__[POSTCOMPILE_evaluation_status_1])" in sql
+        assert "query_logs.faithfulness_score <= %(faithfulness_score_1)s" in sql
+        assert "query_logs.created_at <= %(created_at_2)s AND (query_logs.created_at < %(created_at_3)s " \
+               "OR query_logs.id < %(id_1)s)" in sql
+        assert "ORDER BY query_logs.created_at DESC, query_logs.id DESC" in sql
+
+
+class TestListQueryLogs:
+    """Tests for list_query_logs()"""
+
+    def _list(self, rows, **kwargs):
+        mock_db = MagicMock()
+        with patch('app.services.query_log_service.get_db_session', return_value=mock_db), \
+             patch('app.services.query_log_service.build_query_logs_query') as mock_build:
+            mock_build.return_value.all.return_value = rows
+            page = query_log_service.list_query_logs(**kwargs)
+        mock_db.close.assert_called_once()
+        return page, mock_build
+
+    def test_page_with_next_cursor(self):
+        """Test that fetching limit+1 rows yields a cursor at the last returned row"""
+        rows = [_row(3, datetime(2026, 10, 19, 10), faithfulness_score=Decimal("0.85")),
+                _row(2, datetime(2026, 10, 19, 9), faithfulness_score=None),
+                _row(1, datetime(2026, 10, 19, 8), faithfulness_score=None)]
+
+        page, mock_build = self._list(rows, limit=2, fields=["faithfulness_score"])
+
+        assert mock_build.call_args[0][-1] == 3
+        assert page["items"] == [
+            {"id": 3, "created_at": "2026-10-19T10:00:00", "faithfulness_score": 0.85},
+            {"id": 2, "created_at": "2026-10-19T09:00:00", "faithfulness_score": None},
+        ]
+        assert query_log_service.decode_cursor(page["next_cursor"]) == (datetime(2026, 10, 19, 9), 2)
+
+    def test_last_page_has_no_cursor(self):
+        """Test that a short page ends pagination"""
+        page, _ = self._list([_row(1, datetime(2026, 10, 19, 8))], limit=2, fields=["id"])
+
+        assert page == {"items": [{"id": 1, "created_at": "2026-10-19T08:00:00"}], "next_cursor": None}
+
+    def test_unknown_status_rejected(self):
+        """Test that invalid statuses are rejected before querying"""
+        with pytest.raises(ValueError, match="done"):
+            query_log_service.list_query_logs(statuses=["done"])
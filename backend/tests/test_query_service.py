@@ -162,6 +162,49 @@ class TestExecuteQuery:
             assert response.execution_time_ms >= 0
             assert response.execution_time_ms < 5000  # Should complete in < 5s
 
+    @pytest.mark.asyncio
+    async def test_stage_timings_are_logged(self):
+        """Test that LLM, validation and database stage timings reach the query log."""
+        with patch('app.services.query_service.sanitize_input', return_value="test query"), \
+             patch('app.services.query_service.generate_sql', return_value="SELECT * FROM employees"), \
+             patch('app.services.query_service.validate_sql'), \
+             patch('app.services.query_service.fetch_results', return_value=[]), \
+             patch('app.services.query_service.get_db_session'), \
+             patch('app.services.query_service._log_query', return_value=1) as mock_log:
+
+            await execute_query("Show me employees")
+
+            stage_timings = mock_log.call_args[0][6]
+            assert {'llm', 'validation', 'db'} <= set(stage_timings)
+            assert all(ms >= 0 for ms in stage_timings.values())
+
+    @pytest.mark.asyncio
+    async def test_stage_timings_are_returned(self):
+        """Test that every stage's duration is returned in QueryResponse.timings."""
+        with patch('app.services.query_service.sanitize_input', return_value="test query"), \
+             patch('app.services.query_service.generate_sql', return_value="SELECT * FROM employees"), \
+             patch('app.services.query_service.validate_sql'), \
+             patch('app.services.query_service.fetch_results', return_value=[]), \
+             patch('app.services.query_service.get_db_session'), \
+             patch('app.services.query_service._log_query', return_value=1):
+
+            response = await execute_query("Show me employees")
+
+            assert set(response.timings) == {'sanitize', 'llm', 'validation', 'db', 'log'}
+            assert all(ms >= 0 for ms in response.timings.values())
+
+    @pytest.mark.asyncio
+    async def test_failed_query_returns_completed_stage_timings(self):
+        """Test that a validation failure reports the stages that finished before it."""
+        with patch('app.services.query_service.sanitize_input', return_value="test query"), \
+             patch('app.services.query_service.generate_sql', return_value="DELETE FROM employees"), \
+             patch('app.services.query_service.validate_sql', side_effect=ValueError("Only SELECT queries allowed")):
+
+            response = await execute_query("Delete employees")
+
+            assert response.error_type == "VALIDATION_ERROR"
+            assert set(response.timings) == {'sanitize', 'llm'}
+
     @pytest.mark.asyncio
     async def test_null_value_handling(self):
         """Test that NULL values are properly serialized (Task 3.3)."""
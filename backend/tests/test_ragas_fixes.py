@@ -12,6 +12,7 @@ import pytest
 from unittest.mock import patch, MagicMock
 from app.services import ragas_service
 from app.services import report_service
+from app.services import query_classifier
 from app.db.models import QueryLog
 
 
@@ -180,23 +181,10 @@ class TestComparativeAnalysis:
             )
         ]
 
-        analysis = report_service._categorize_queries_by_type(logs)
+        types = [query_classifier.classify_sql(log.generated_sql) for log in logs]
 
-        # Verify categorization
-        assert 'simple_select' in analysis, "Should have simple_select category"
-        assert 'where_filter' in analysis, "Should have where_filter category"
-        assert 'aggregation' in analysis, "Should have aggregation category"
-        assert 'date_range' in analysis, "Should have date_range category"
-
-        # Verify counts
-        assert analysis['simple_select']['count'] == 1, "Should have 1 simple SELECT"
-        assert analysis['where_filter']['count'] == 1, "Should have 1 WHERE filter"
-        assert analysis['aggregation']['count'] == 1, "Should have 1 aggregation"
-        assert analysis['date_range']['count'] == 1, "Should have 1 date range"
-
-        # Verify averages are calculated
-        assert 'avg_faithfulness' in analysis['aggregation'], "Should calculate avg faithfulness"
-        assert analysis['aggregation']['avg_faithfulness'] == 0.85, "Should match query score"
+        # Verify categorization (per-type averages are aggregated in SQL, see test_report_service)
+        assert types == ['simple_select', 'where_filter', 'aggregation', 'date_range']
 
     def test_generate_recommendations_for_weak_aggregation(self):
         """Verify recommendations are generated for weak aggregation queries."""
@@ -215,7 +203,10 @@ class TestComparativeAnalysis:
             }
         }
 
-        recommendations = report_service._generate_recommendations([], [], query_type_analysis)
+        summary = {"total_queries": 15, "weak_count": 0, "weak_low_faithfulness": 0,
+                   "weak_low_answer_relevance": 0, "weak_low_context_precision": 0,
+                   "weak_salary": 0, "weak_short": 0}
+        recommendations = report_service._generate_recommendations(summary, query_type_analysis)
 
         # Verify aggregation recommendation is present
         assert any('aggregation' in rec.lower() for rec in recommendations), \
@@ -2,8 +2,10 @@
 
 import pytest
 import os
+import asyncio
 from unittest.mock import patch, MagicMock
-from app.services.ragas_service import initialize_ragas, evaluate
+from app.services import ragas_service
+from app.services.ragas_service import initialize_ragas, evaluate, build_evaluation_sample
 
 
 class TestInitializeRagas:
@@ -169,3 +171,198 @@ class TestEvaluate:
             assert 'faithfulness' in call_args[1]
             assert 'answer_relevance' in call_args[1]
             assert 'context_precision' in call_args[1]
+
+
+class TestPerMetricDeadline:
+    """Test per-metric deadlines and partial results."""
+
+    @staticmethod
+    def _metric_class(name):
+        """Create a fake Ragas metric class whose instances carry a name."""
+        return lambda llm: MagicMock(metric_name=name)
+
+    def _patch_ragas(self, fake_evaluate):
+        """Patch the lazily loaded Ragas stack with fakes."""
+        from contextlib import ExitStack
+        stack = ExitStack()
+        stack.enter_context(patch('app.services.ragas_service.RAGAS_AVAILABLE', True))
+        stack.enter_context(patch('app.services.ragas_service._ragas_loaded', return_value=True))
+        stack.enter_context(patch.dict('app.services.ragas_service._metric_objects', clear=True))
+        stack.enter_context(patch('app.services.ragas_service.Dataset', MagicMock()))
+        stack.enter_context(patch('app.services.ragas_service.ChatOpenAI', MagicMock()))
+        stack.enter_context(patch('app.services.ragas_service.LangchainLLMWrapper', MagicMock()))
+        stack.enter_context(patch('app.services.ragas_service.Faithfulness', self._metric_class('faithfulness')))
+        stack.enter_context(patch('app.services.ragas_service.AnswerRelevancy', self._metric_class('answer_relevancy')))
+        stack.enter_context(patch('app.services.ragas_service.ContextUtilization', self._metric_class('context_utilization')))
+        stack.enter_context(patch('app.services.ragas_service.ragas_evaluate', side_effect=fake_evaluate))
+        return stack
+
+    @pytest.mark.asyncio
+    async def test_timed_out_metric_does_not_drop_finished_metrics(self):
+        """Test that a hung metric is dropped while the others are returned and reported."""
+        import time as time_module
+
+        def fake_evaluate(dataset, metrics):
+            name = metrics[0].metric_name
+            if name == 'answer_relevancy':
+                time_module.sleep(0.5)  # Hung OpenAI call
+            return {name: 0.9}
+
+        reported = {}
+
+        async def on_metric(key, score):
+            reported[key] = score
+
+        with self._patch_ragas(fake_evaluate), \
+             patch('app.services.ragas_service.RAGAS_METRIC_TIMEOUT_SECONDS', 0.1):
+            scores = await evaluate("Show me all employees", "SELECT * FROM employees",
+                                    [{"id": 1}], on_metric=on_metric)
+
+        assert scores == {'faithfulness': 0.9, 'answer_relevance': None, 'context_utilization': 0.9}
+        assert reported == {'faithfulness': 0.9, 'context_utilization': 0.9}
+
+    @pytest.mark.asyncio
+    async def test_deadline_starts_when_metric_leaves_the_queue(self):
+        """Test that time queued behind other metrics does not count against the deadline."""
+        import time as time_module
+        from concurrent.futures import ThreadPoolExecutor
+
+        def fake_evaluate(dataset, metrics):
+            time_module.sleep(0.2)
+            return {metrics[0].metric_name: 0.9}
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            with self._patch_ragas(fake_evaluate), \
+                 patch('app.services.ragas_service._get_executor', return_value=executor), \
+                 patch('app.services.ragas_service._evaluation_slots', None), \
+                 patch('app.services.ragas_service.RAGAS_METRIC_TIMEOUT_SECONDS', 0.35):
+                scores = await evaluate("Show me all employees", "SELECT * FROM employees", [{"id": 1}])
+        finally:
+            executor.shutdown()
+
+        assert scores == {'faithfulness': 0.9, 'answer_relevance': 0.9, 'context_utilization': 0.9}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_evaluations_limited_to_executor_size(self):
+        """Test that evaluations wait for executor room instead of queueing their metrics."""
+        import threading
+        import time as time_module
+
+        lock = threading.Lock()
+        running = []
+        overlaps = []
+
+        def fake_score_metric(score_key, nl_query, sampled_rows, num_results):
+            with lock:
+                overlaps.append({query for query in running if query != nl_query})
+                running.append(nl_query)
+            time_module.sleep(0.05)
+            with lock:
+                running.remove(nl_query)
+            return 0.9
+
+        with patch('app.services.ragas_service.RAGAS_AVAILABLE', True), \
+             patch('app.services.ragas_service._ragas_loaded', return_value=True), \
+             patch('app.services.ragas_service._score_metric', fake_score_metric), \
+             patch('app.services.ragas_service.RAGAS_EXECUTOR_THREADS', 3), \
+             patch('app.services.ragas_service._metric_executor', None), \
+             patch('app.services.ragas_service._evaluation_slots', None):
+            try:
+                results = await asyncio.gather(*[
+                    evaluate(f"Question {index}", "SELECT * FROM employees", [{"id": 1}]) for index in range(3)
+                ])
+            finally:
+                ragas_service.shutdown_executor()
+
+        assert all(scores is not None for scores in results)
+        # With room for one evaluation at a time, metrics of different evaluations never overlap
+        assert overlaps and not any(overlaps)
+
+    @pytest.mark.asyncio
+    async def test_all_metrics_failing_returns_none(self):
+        """Test that evaluate() returns None when no metric finishes."""
+        def fake_evaluate(dataset, metrics):
+            raise RuntimeError("OpenAI unavailable")
+
+        with self._patch_ragas(fake_evaluate):
+            scores = await evaluate("Show me all employees", "SELECT * FROM employees", [{"id": 1}])
+
+        assert scores is None
+
+    @pytest.mark.asyncio
+    async def test_metric_latencies_are_logged(self):
+        """Test that per-metric latencies are recorded with the completion log."""
+        def fake_evaluate(dataset, metrics):
+            return {metrics[0].metric_name: 0.8}
+
+        with self._patch_ragas(fake_evaluate), \
+             patch('app.services.ragas_service.logger') as mock_logger:
+            await evaluate("Show me all employees", "SELECT * FROM employees", [{"id": 1}])
+
+        completion_calls = [c for c in mock_logger.info.call_args_list if c[0][0] == "ragas_evaluation_complete"]
+        assert len(completion_calls) == 1
+        latencies = completion_calls[0][1]['metric_latencies_ms']
+        assert set(latencies) == {'faithfulness', 'answer_relevance', 'context_utilization'}
+        assert completion_calls[0][1]['slowest_metric'] in latencies
+
+
+class TestEvaluationExecutor:
+    """Test evaluation sample building and executor payloads."""
+
+    def test_build_evaluation_sample_claims_and_contexts(self):
+        """Test that claims and contexts are built from the sampled rows only."""
+        rows = [{"first_name": "Emma", "department": "Engineering", "leave_type": None}]
+
+        answer, contexts, claim_count = build_evaluation_sample("Who is in Engineering?", rows, 5)
+
+        assert answer == "The first_name is Emma. The department is Engineering. There are 4 additional records not shown."
+        assert contexts == ["Database record 1: first_name=Emma, department=Engineering"]
+        assert claim_count == 2
+
+    def test_build_evaluation_sample_empty_results(self):
+        """Test the answer used when the query returned no rows."""
+        answer, contexts, claim_count = build_evaluation_sample("Who is on leave?", [], 0)
+
+        assert answer == "No results were found in the database for this query."
+        assert contexts == []
+        assert claim_count == 0
+
+    @pytest.mark.parametrize("mode, threads, workers, expected", [
+        ("thread", 6, 2, 6),
+        ("process", 6, 2, 3),
+        ("process", 6, 8, 8),
+        ("thread", 1, 8, 3),
+    ])
+    def test_executor_has_a_worker_per_metric(self, mode, threads, workers, expected):
+        """Test that an evaluation's metrics never wait for each other's workers."""
+        with patch('app.services.ragas_service.RAGAS_EXECUTOR_THREADS', threads), \
+             patch('app.services.ragas_service.RAGAS_PROCESS_WORKERS', workers):
+            assert ragas_service._executor_workers(mode) == expected
+
+    @pytest.mark.asyncio
+    async def test_executor_receives_only_sampled_rows(self):
+        """Test that each metric submits only the sampled rows to the executor."""
+        from concurrent.futures import Future
+
+        submitted = []
+
+        class RecordingExecutor:
+            def submit(self, fn, *args):
+                submitted.append(args)
+                future = Future()
+                future.set_result(0.9)
+                return future
+
+        results = [{"employee_id": i} for i in range(1000)]
+
+        with patch('app.services.ragas_service.RAGAS_AVAILABLE', True), \
+             patch('app.services.ragas_service._ragas_loaded', return_value=True), \
+             patch('app.services.ragas_service._get_executor', return_value=RecordingExecutor()):
+            scores = await evaluate("Show me all employees", "SELECT * FROM employees", results)
+
+        assert scores == {'faithfulness': 0.9, 'answer_relevance': 0.9, 'context_utilization': 0.9}
+        assert sorted(args[0] for args in submitted) == ['answer_relevance', 'context_utilization', 'faithfulness']
+        for _, _, sampled_rows, num_results in submitted:
+            assert len(sampled_rows) == 3
+            assert num_results == 1000
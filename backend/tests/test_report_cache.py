@@ -0,0 +1,119 @@
+"""Tests for the in-process analysis report cache."""
+
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.services import report_cache, evaluation_events
+
+
+class TestGetReport:
+    """Tests for get_report()"""
+
+    @pytest.mark.asyncio
+    async def test_fresh_report_is_served_from_memory(self):
+        """Test that repeated requests within the TTL compute the report once"""
+        with patch('app.services.report_service.get_analysis_report', return_value={"total_queries": 3}) as mock_report, \
+             patch('app.services.report_service.get_report_version', return_value=[1, 3, None]):
+            first = await report_cache.get_report()
+            second = await report_cache.get_report()
+
+        assert first == second == ({"total_queries": 3}, [1, 3, None])
+        mock_report.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_cold_cache_computes_once_for_concurrent_requests(self):
+        """Test that concurrent requests on a cold cache share one computation"""
+        with patch('app.services.report_service.get_analysis_report', return_value={"total_queries": 1}) as mock_report, \
+             patch('app.services.report_service.get_report_version', return_value=[1, 1, None]):
+            results = await asyncio.gather(*(report_cache.get_report() for _ in range(5)))
+
+        assert all(result == ({"total_queries": 1}, [1, 1, None]) for result in results)
+        mock_report.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_invalidated_report_served_stale_during_single_refresh(self):
+        """Test that after invalidation requests get the stale copy while one refresh runs"""
+        with patch('app.services.report_service.get_analysis_report', return_value={"total_queries": 1}), \
+             patch('app.services.report_service.get_report_version', return_value=[1, 1, None]):
+            await report_cache.get_report()
+
+        report_cache.invalidate()
+        with patch('app.services.report_service.get_analysis_report', return_value={"total_queries": 2}) as mock_report, \
+             patch('app.services.report_service.get_report_version', return_value=[1, 2, None]):
+            stale = await asyncio.gather(*(report_cache.get_report() for _ in range(3)))
+            await report_cache._refresh_task
+            fresh = await report_cache.get_report()
+
+        assert all(report == {"total_queries": 1} for report, _ in stale)
+        assert fresh == ({"total_queries": 2}, [1, 2, None])
+        mock_report.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_expired_report_is_refreshed(self):
+        """Test that a report older than the TTL triggers a refresh"""
+        with patch.object(report_cache, 'REPORT_CACHE_TTL_SECONDS', 0.01), \
+             patch('app.services.report_service.get_analysis_report', side_effect=[{"n": 1}, {"n": 2}]), \
+             patch('app.services.report_service.get_report_version', return_value=None):
+            await report_cache.get_report()
+            await asyncio.sleep(0.02)
+            await report_cache.get_report()
+            await report_cache._refresh_task
+
+            assert (await report_cache.get_report())[0] == {"n": 2}
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_stale_copy(self):
+        """Test that a refresh error does not drop the cached report"""
+        with patch('app.services.report_service.get_analysis_report', return_value={"n": 1}), \
+             patch('app.services.report_service.get_report_version', return_value=[1, 1, None]):
+            await report_cache.get_report()
+
+        report_cache.invalidate()
+        with patch('app.services.report_service.get_analysis_report', side_effect=Exception("db down")), \
+             patch('app.services.report_service.get_report_version', return_value=[1, 2, None]):
+            assert (await report_cache.get_report())[0] == {"n": 1}
+            with pytest.raises(Exception, match="db down"):
+                await report_cache._refresh_task
+
+        assert (await report_cache.get_report())[0] == {"n": 1}
+
+    @pytest.mark.asyncio
+    async def test_cold_cache_failure_raises(self):
+        """Test that with nothing cached a computation error reaches the caller"""
+        with patch('app.services.report_service.get_analysis_report', side_effect=Exception("db down")), \
+             patch('app.services.report_service.get_report_version', return_value=None):
+            with pytest.raises(Exception, match="db down"):
+                await report_cache.get_report()
+
+    @pytest.mark.asyncio
+    async def test_version_failure_serves_report_without_version(self):
+        """Test that a failing version query still caches the report"""
+        with patch('app.services.report_service.get_analysis_report', return_value={"n": 1}), \
+             patch('app.services.report_service.get_report_version', side_effect=Exception("timeout")):
+            assert await report_cache.get_report() == ({"n": 1}, None)
+
+
+class TestInvalidation:
+    """Tests for event-driven invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_terminal_evaluation_event_invalidates(self):
+        """Test that completed/failed events mark the report stale, others do not"""
+        generation = report_cache._generation
+
+        evaluation_events.publish(1, {"evaluation_status": "evaluating"})
+        assert report_cache._generation == generation
+
+        evaluation_events.publish(1, {"evaluation_status": "completed"})
+        assert report_cache._generation == generation + 1
+
+    def test_logged_query_keeps_report_fresh(self):
+        """Test that inserting a query log leaves invalidation to the TTL"""
+        from app.services.query_service import _log_query
+
+        generation = report_cache._generation
+        with patch('app.services.query_service.get_db_session', return_value=MagicMock()):
+            _log_query("Show me all employees", "SELECT * FROM employees", [], 10)
+
+        assert report_cache._generation == generation
@@ -3,194 +3,114 @@
 import pytest
 from datetime import datetime
 from decimal import Decimal
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, MagicMock
 
 from app.services import report_service
 from app.db.models import QueryLog
+from sqlalchemy.dialects import postgresql
+
+
+def _summary(total, weak=0, averages=(0.0, 0.0, 0.0), **counts):
+    """Create stats_service.get_summary output."""
+    summary = {
+        "total_queries": total,
+        "average_scores": dict(zip(("faithfulness", "answer_relevance", "context_precision"), averages)),
+        "weak_count": weak,
+        "weak_low_faithfulness": 0,
+        "weak_low_answer_relevance": 0,
+        "weak_low_context_precision": 0,
+        "weak_salary": 0,
+        "weak_short": 0
+    }
+    summary.update(counts)
+    return summary
 
 
 class TestGetAnalysisReport:
     """Tests for get_analysis_report function"""
 
+    def _report(self, summary, weak_queries=None, type_analysis=None):
+        """Build a report from stubbed aggregates."""
+        mock_db = MagicMock()
+        with patch('app.services.report_service.get_db_session', return_value=mock_db), \
+             patch('app.services.report_service.stats_service.get_summary', return_value=summary), \
+             patch('app.services.report_service._weak_queries', return_value=weak_queries or []) as mock_weak, \
+             patch('app.services.report_service.stats_service.get_type_analysis', return_value=type_analysis or {}):
+            result = report_service.get_analysis_report()
+        mock_db.close.assert_called_once()
+        return result, mock_weak
+
     def test_empty_query_logs(self):
         """Test report generation with no query logs"""
-        # Arrange
-        mock_db = Mock()
-        mock_query = Mock()
-        mock_query.order_by().all.return_value = []
-        mock_db.query.return_value = mock_query
-
-        with patch('app.services.report_service.get_db_session', return_value=mock_db):
-            # Act
-            result = report_service.get_analysis_report()
+        result, mock_weak = self._report(_summary(0))
 
-            # Assert
-            assert result["total_queries"] == 0
-            assert result["average_scores"]["faithfulness"] == 0.0
-            assert result["weak_queries"] == []
-            assert len(result["recommendations"]) > 0
-            assert "No queries executed yet" in result["recommendations"][0]
+        assert result["total_queries"] == 0
+        assert result["average_scores"]["faithfulness"] == 0.0
+        assert result["weak_queries"] == []
+        assert "No queries executed yet" in result["recommendations"][0]
+        mock_weak.assert_not_called()
 
     def test_all_strong_queries(self):
         """Test report with all queries scoring above 0.7"""
-        # Arrange
-        mock_logs = [
-            self._create_mock_log(1, "query 1", 0.9, 0.85, 0.8),
-            self._create_mock_log(2, "query 2", 0.95, 0.9, 0.88),
-            self._create_mock_log(3, "query 3", 0.87, 0.82, 0.79)
-        ]
-
-        mock_db = Mock()
-        mock_query = Mock()
-        mock_query.order_by().all.return_value = mock_logs
-        mock_db.query.return_value = mock_query
+        result, _ = self._report(_summary(3, averages=(0.91, 0.86, 0.82)))
 
-        with patch('app.services.report_service.get_db_session', return_value=mock_db):
-            # Act
-            result = report_service.get_analysis_report()
+        assert result["total_queries"] == 3
+        assert result["average_scores"] == {"faithfulness": 0.91, "answer_relevance": 0.86,
+                                            "context_precision": 0.82}
+        assert len(result["weak_queries"]) == 0
+        assert "All queries performing well" in result["recommendations"][0]
 
-            # Assert
-            assert result["total_queries"] == 3
-            assert result["average_scores"]["faithfulness"] == 0.91
-            assert result["average_scores"]["answer_relevance"] == 0.86
-            assert result["average_scores"]["context_precision"] == 0.82
-            assert len(result["weak_queries"]) == 0
-            assert "All queries performing well" in result["recommendations"][0]
+    def test_weak_queries_limited_in_sql(self):
+        """Test that only the top 10 weak queries are loaded"""
+        weak = [{"query": "show high earners", "scores": {}, "sql": "", "created_at": None, "reason": ""}]
 
-    def test_identifies_weak_queries(self):
-        """Test identification of queries with scores < 0.7"""
-        # Arrange
-        mock_logs = [
-            self._create_mock_log(1, "show high earners", 0.65, 0.7, 0.8),  # weak faithfulness
-            self._create_mock_log(2, "list employees", 0.9, 0.6, 0.75),     # weak answer_relevance
-            self._create_mock_log(3, "salary info", 0.8, 0.85, 0.5),        # weak context_precision
-            self._create_mock_log(4, "good query", 0.9, 0.85, 0.88)         # all strong
-        ]
+        result, mock_weak = self._report(_summary(4, weak=3), weak_queries=weak)
 
-        mock_db = Mock()
-        mock_query = Mock()
-        mock_query.order_by().all.return_value = mock_logs
-        mock_db.query.return_value = mock_query
-
-        with patch('app.services.report_service.get_db_session', return_value=mock_db):
-            # Act
-            result = report_service.get_analysis_report()
-
-            # Assert
-            assert result["total_queries"] == 4
-            assert len(result["weak_queries"]) == 3
-            assert result["weak_queries"][0]["query"] == "show high earners"
-            assert result["weak_queries"][1]["query"] == "list employees"
-            assert result["weak_queries"][2]["query"] == "salary info"
+        assert result["weak_queries"] == weak
+        assert mock_weak.call_args.kwargs["limit"] == 10
 
     def test_salary_query_recommendation(self):
         """Test recommendations for salary-related weak queries"""
-        # Arrange
-        mock_logs = [
-            self._create_mock_log(1, "show me high salary employees", 0.6, 0.65, 0.7),
-            self._create_mock_log(2, "who gets paid the most", 0.65, 0.6, 0.68)
-        ]
-
-        mock_db = Mock()
-        mock_query = Mock()
-        mock_query.order_by().all.return_value = mock_logs
-        mock_db.query.return_value = mock_query
-
-        with patch('app.services.report_service.get_db_session', return_value=mock_db):
-            # Act
-            result = report_service.get_analysis_report()
-
-            # Assert
-            assert any("few-shot examples for salary" in rec.lower() for rec in result["recommendations"])
-
-    def test_handles_none_scores(self):
-        """Test handling of None values in Ragas scores"""
-        # Arrange
-        mock_logs = [
-            self._create_mock_log(1, "query 1", None, None, None),
-            self._create_mock_log(2, "query 2", 0.8, 0.75, None)
-        ]
-
-        mock_db = Mock()
-        mock_query = Mock()
-        mock_query.order_by().all.return_value = mock_logs
-        mock_db.query.return_value = mock_query
-
-        with patch('app.services.report_service.get_db_session', return_value=mock_db):
-            # Act
-            result = report_service.get_analysis_report()
-
-            # Assert - should not crash, should calculate averages from available scores
-            assert result["total_queries"] == 2
-            assert result["average_scores"]["faithfulness"] == 0.8  # only one score available
-            assert result["average_scores"]["answer_relevance"] == 0.75
+        result, _ = self._report(_summary(2, weak=2, weak_salary=2))
 
-    def test_limits_weak_queries_to_10(self):
-        """Test that weak_queries list is limited to 10 items"""
-        # Arrange
-        mock_logs = [
-            self._create_mock_log(i, f"weak query {i}", 0.6, 0.65, 0.68)
-            for i in range(15)
-        ]
-
-        mock_db = Mock()
-        mock_query = Mock()
-        mock_query.order_by().all.return_value = mock_logs
-        mock_db.query.return_value = mock_query
+        assert any("few-shot examples for salary" in rec.lower() for rec in result["recommendations"])
 
-        with patch('app.services.report_service.get_db_session', return_value=mock_db):
-            # Act
-            result = report_service.get_analysis_report()
+    def test_faithfulness_recommendation(self):
+        """Test faithfulness-specific recommendations"""
+        result, _ = self._report(_summary(3, weak=3, weak_low_faithfulness=3))
 
-            # Assert
-            assert len(result["weak_queries"]) == 10  # Limited to 10
+        assert any("schema details" in rec.lower() for rec in result["recommendations"])
 
     def test_db_error_raises_exception(self):
         """Test that database errors are propagated"""
-        # Arrange
         mock_db = Mock()
         mock_db.query.side_effect = Exception("Database connection failed")
 
         with patch('app.services.report_service.get_db_session', return_value=mock_db):
-            # Act & Assert
             with pytest.raises(Exception, match="Database connection failed"):
                 report_service.get_analysis_report()
 
-    def test_faithfulness_recommendation(self):
-        """Test faithfulness-specific recommendations"""
-        # Arrange - majority of weak queries have low faithfulness
-        mock_logs = [
-            self._create_mock_log(1, "query 1", 0.6, 0.8, 0.8),
-            self._create_mock_log(2, "query 2", 0.65, 0.85, 0.82),
-            self._create_mock_log(3, "query 3", 0.68, 0.9, 0.88)
-        ]
 
-        mock_db = Mock()
-        mock_query = Mock()
-        mock_query.order_by().all.return_value = mock_logs
-        mock_db.query.return_value = mock_query
+class TestWeakQueries:
+    """Tests for _weak_queries"""
 
-        with patch('app.services.report_service.get_db_session', return_value=mock_db):
-            # Act
-            result = report_service.get_analysis_report()
+    def test_loads_limited_rows_newest_first(self):
+        """Test that completed weak queries are filtered, ordered and limited in SQL"""
+        row = SimpleNamespace(natural_language_query="show high earners", generated_sql="SELECT 1",
+                              created_at=datetime(2025, 10, 2, 12, 0, 0), faithfulness_score=Decimal("0.65"),
+                              answer_relevance_score=Decimal("0.7"), context_precision_score=None)
+        mock_db = MagicMock()
+        chain = mock_db.query.return_value.filter.return_value.order_by.return_value.limit.return_value
+        chain.all.return_value = [row]
 
-            # Assert
-            assert any("schema details" in rec.lower() for rec in result["recommendations"])
-
-    # Helper methods
-    def _create_mock_log(self, id, query, faithfulness, answer_relevance, context_precision):
-        """Create mock QueryLog object"""
-        mock_log = Mock(spec=QueryLog)
-        mock_log.id = id
-        mock_log.natural_language_query = query
-        mock_log.generated_sql = f"SELECT * FROM employees WHERE {id}"
-        mock_log.faithfulness_score = Decimal(str(faithfulness)) if faithfulness else None
-        mock_log.answer_relevance_score = Decimal(str(answer_relevance)) if answer_relevance else None
-        mock_log.context_precision_score = Decimal(str(context_precision)) if context_precision else None
-        mock_log.result_count = 10
-        mock_log.execution_time_ms = 500
-        mock_log.created_at = datetime(2025, 10, 2, 12, 0, 0)
-        return mock_log
+        weak = report_service._weak_queries(mock_db, limit=10)
+
+        mock_db.query.return_value.filter.return_value.order_by.return_value.limit.assert_called_once_with(10)
+        assert weak[0]["query"] == "show high earners"
+        assert weak[0]["scores"] == {"faithfulness": 0.65, "answer_relevance": 0.7, "context_precision": None}
+        assert weak[0]["created_at"] == "2025-10-02T12:00:00"
+        assert "faithfulness" in weak[0]["reason"].lower()
 
 
 class TestIdentifyWeaknessReason:
@@ -228,3 +148,53 @@ class TestIdentifyWeaknessReason:
 
         # Assert
         assert "context precision" in reason.lower()
+
+
+class TestGetReportVersion:
+    """Tests for get_report_version function"""
+
+    def test_version_combines_id_range_and_last_update(self):
+        """Test that the version reflects inserts, deletes and evaluation updates"""
+        mock_db = MagicMock()
+        mock_db.query.return_value.one.return_value = (3, 42, datetime(2026, 10, 19, 12, 0, 0))
+
+        with patch('app.services.report_service.get_db_session', return_value=mock_db):
+            version = report_service.get_report_version()
+
+        assert version == [3, 42, "2026-10-19T12:00:00"]
+        mock_db.close.assert_called_once()
+
+    def test_version_of_empty_table(self):
+        """Test that an empty table yields a stable version"""
+        mock_db = MagicMock()
+        mock_db.query.return_value.one.return_value = (None, None, None)
+
+        with patch('app.services.report_service.get_db_session', return_value=mock_db):
+            assert report_service.get_report_version() == [None, None, None]
+
+
+class TestTopRepeatedQueries:
+    """Tests for get_top_repeated_queries function"""
+
+    def test_select_groups_by_fingerprint_then_joins_example(self):
+        """Test that grouping and limiting happen before the example join"""
+        sql = str(report_service.build_top_queries_select(5).compile(dialect=postgresql.dialect()))
+
+        assert "GROUP BY query_logs.sql_fingerprint \nHAVING count(*) > " in sql
+        assert "LIMIT %(param_1)s) AS anon_1 JOIN query_logs ON query_logs.id = anon_1.latest_id" in sql
+
+    def test_rows_are_formatted(self):
+        """Test that each fingerprint comes with its count and latest example"""
+        row = SimpleNamespace(sql_fingerprint="abc123", count=4, query_type='where_filter',
+                              natural_language_query="engineers", generated_sql="SELECT 1",
+                              created_at=datetime(2026, 10, 19, 9, 30, 0))
+        mock_db = MagicMock()
+        mock_db.execute.return_value.all.return_value = [row]
+
+        with patch('app.services.report_service.get_db_session', return_value=mock_db):
+            top = report_service.get_top_repeated_queries(limit=5)
+
+        assert top == [{"fingerprint": "abc123", "query_type": 'where_filter', "count": 4,
+                        "last_seen": "2026-10-19T09:30:00", "example_query": "engineers",
+                        "example_sql": "SELECT 1"}]
+        mock_db.close.assert_called_once()
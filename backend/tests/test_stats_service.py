@@ -0,0 +1,207 @@
+"""Tests for incrementally maintained report aggregates."""
+
+import pytest
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from sqlalchemy.dialects import postgresql
+
+from app.services import stats_service
+
+
+def _compile(statement):
+    """Render a statement as PostgreSQL SQL."""
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def _totals(**overrides):
+    """Create a summed query_log_stats row."""
+    row = {name: 0 for name in stats_service.STAT_COLUMNS}
+    row.update(overrides)
+    return SimpleNamespace(**row)
+
+
+class TestCompletionIncrements:
+    """Tests for completion_increments()"""
+
+    def test_strong_complete_query(self):
+        """Test that a query with three good scores feeds overall and per-type sums"""
+        increments = stats_service.completion_increments(
+            "show all active employees in engineering",
+            {"faithfulness": 0.9, "answer_relevance": 0.8, "context_precision": 0.85}
+        )
+
+        assert increments["faithfulness_sum"] == 0.9
+        assert increments["faithfulness_count"] == 1
+        assert increments["complete_count"] == 1
+        assert increments["complete_context_precision_sum"] == 0.85
+        assert increments["weak_count"] == 0
+        assert increments["weak_short"] == 0
+        assert "query_count" not in increments
+
+    def test_weak_partial_query(self):
+        """Test that missing and zero scores are skipped and weak patterns counted"""
+        increments = stats_service.completion_increments(
+            "who has top pay",
+            {"faithfulness": Decimal("0.6"), "answer_relevance": Decimal("0"), "context_precision": None}
+        )
+
+        assert increments["faithfulness_count"] == 1
+        assert increments["answer_relevance_count"] == 0
+        assert increments["context_precision_count"] == 0
+        assert increments["complete_count"] == 0
+        assert increments["complete_faithfulness_sum"] == 0
+        assert increments["weak_count"] == 1
+        assert increments["weak_low_faithfulness"] == 1
+        assert increments["weak_salary"] == 1
+        assert increments["weak_short"] == 1
+
+
+    def test_scores_rounded_as_stored(self):
+        """Test that unrounded heuristic scores count as their DECIMAL(3,2) values would"""
+        increments = stats_service.completion_increments(
+            "show all active employees in engineering",
+            {"faithfulness": 16 / 23, "answer_relevance": 2 / 3, "context_precision": 0.004}
+        )
+
+        assert increments["faithfulness_sum"] == 0.70
+        assert increments["weak_low_faithfulness"] == 0
+        assert increments["answer_relevance_sum"] == 0.67
+        assert increments["weak_low_answer_relevance"] == 1
+        assert increments["context_precision_count"] == 0
+        assert increments["complete_count"] == 0
+
+    def test_stored_score_rounds_half_up(self):
+        """Test rounding matches Postgres NUMERIC rounding rather than float round()"""
+        assert stats_service.stored_score(0.125) == 0.13
+        assert stats_service.stored_score(Decimal("0.70")) == 0.7
+        assert stats_service.stored_score(None) is None
+
+
+class TestRecording:
+    """Tests for record_logged() / record_completed()"""
+
+    def test_record_logged_upserts_query_count(self):
+        """Test that logging a query increments today's row for its type"""
+        mock_db = MagicMock()
+
+        stats_service.record_logged(mock_db, 'join')
+
+        sql = _compile(mock_db.execute.call_args[0][0])
+        assert "VALUES (CURRENT_DATE" in sql
+        assert "ON CONFLICT (day, query_type) DO UPDATE SET query_count = " \
+               "(query_log_stats.query_count + excluded.query_count)" in sql
+
+    def test_record_completed_adds_scores_on_session(self):
+        """Test that completion adds to the running sums in the caller's transaction"""
+        mock_db = MagicMock()
+
+        stats_service.record_completed(mock_db, date(2026, 10, 19), 'aggregation', "count employees",
+                                       {"faithfulness": 0.9, "answer_relevance": 0.8, "context_precision": 0.7})
+
+        statement = mock_db.execute.call_args[0][0]
+        params = statement.compile(dialect=postgresql.dialect()).params
+        assert params["day"] == date(2026, 10, 19)
+        assert params["query_type"] == 'aggregation'
+        assert params["complete_count"] == 1
+        assert "faithfulness_sum = (query_log_stats.faithfulness_sum + excluded.faithfulness_sum)" \
+               in _compile(statement)
+        mock_db.commit.assert_not_called()
+
+
+class TestReading:
+    """Tests for get_summary() / get_type_analysis()"""
+
+    def test_summary_averages_from_sums(self):
+        """Test that averages are sum/count over non-zero completed scores"""
+        mock_db = MagicMock()
+        mock_db.query.return_value.one.return_value = _totals(
+            query_count=4, faithfulness_sum=Decimal("1.70"), faithfulness_count=2,
+            answer_relevance_sum=Decimal("0.75"), answer_relevance_count=1, weak_count=1, weak_salary=1
+        )
+
+        summary = stats_service.get_summary(mock_db)
+
+        assert summary["total_queries"] == 4
+        assert summary["average_scores"] == {"faithfulness": 0.85, "answer_relevance": 0.75,
+                                             "context_precision": 0.0}
+        assert summary["weak_count"] == 1
+        assert summary["weak_salary"] == 1
+
+    def test_type_analysis_in_fixed_order(self):
+        """Test that per-type averages skip types without complete scores"""
+        rows = [
+            SimpleNamespace(query_type='aggregation', count=2, faithfulness_sum=Decimal("1.70"),
+                            answer_relevance_sum=Decimal("1.80"), context_precision_sum=Decimal("1.74")),
+            SimpleNamespace(query_type='join', count=0, faithfulness_sum=Decimal("0"),
+                            answer_relevance_sum=Decimal("0"), context_precision_sum=Decimal("0")),
+            SimpleNamespace(query_type='simple_select', count=1, faithfulness_sum=Decimal("0.9"),
+                            answer_relevance_sum=Decimal("0.85"), context_precision_sum=Decimal("0.88")),
+        ]
+        mock_db = MagicMock()
+        mock_db.query.return_value.group_by.return_value.all.return_value = rows
+
+        analysis = stats_service.get_type_analysis(mock_db)
+
+        assert list(analysis) == ['simple_select', 'aggregation']
+        assert analysis['aggregation'] == {'count': 2, 'avg_faithfulness': 0.85,
+                                           'avg_answer_relevance': 0.9, 'avg_context_precision': 0.87}
+
+
+class TestRebuild:
+    """Tests for rebuild_stats() / check_stats()"""
+
+    def test_stats_select_counts_completed_scores_only(self):
+        """Test that the recomputation mirrors record_completed() semantics"""
+        sql = _compile(stats_service.build_stats_select())
+
+        assert "CAST(query_logs.created_at AS DATE) AS day" in sql
+        assert "query_logs.evaluation_status = %(evaluation_status_1)s AS completed" in sql
+        assert "FILTER (WHERE anon_1.completed AND anon_1.faithfulness > " in sql
+        assert "GROUP BY anon_1.day, anon_1.query_type" in sql
+
+    def test_rebuild_replaces_rows_in_one_locked_transaction(self):
+        """Test that rebuild locks, deletes and re-inserts before committing"""
+        mock_db = MagicMock()
+        mock_db.execute.return_value.rowcount = 12
+
+        with patch('app.services.stats_service.get_db_session', return_value=mock_db):
+            assert stats_service.rebuild_stats() == 12
+
+        statements = [str(c[0][0]) for c in mock_db.execute.call_args_list]
+        assert "LOCK TABLE query_log_stats IN EXCLUSIVE MODE" in statements[0]
+        assert statements[1].startswith("INSERT INTO query_log_stats")
+        mock_db.query.return_value.delete.assert_called_once()
+        mock_db.commit.assert_called_once()
+        mock_db.close.assert_called_once()
+
+    def test_rebuild_rolls_back_on_error(self):
+        """Test that a failed rebuild leaves the existing aggregates"""
+        mock_db = MagicMock()
+        mock_db.execute.side_effect = [None, Exception("insert failed")]
+
+        with patch('app.services.stats_service.get_db_session', return_value=mock_db):
+            with pytest.raises(Exception, match="insert failed"):
+                stats_service.rebuild_stats()
+
+        mock_db.rollback.assert_called_once()
+        mock_db.commit.assert_not_called()
+
+    def test_check_reports_drift(self):
+        """Test that check_stats lists rows that differ from a recomputation"""
+        day = date(2026, 10, 19)
+        expected = SimpleNamespace(day=day, query_type='join', **vars(_totals(query_count=3)))
+        stored = SimpleNamespace(day=day, query_type='join', **vars(_totals(query_count=2)))
+        consistent = SimpleNamespace(day=day, query_type='where_filter', **vars(_totals(query_count=1)))
+        mock_db = MagicMock()
+        mock_db.execute.return_value = [expected, consistent]
+        mock_db.query.return_value.all.return_value = [stored, consistent]
+
+        with patch('app.services.stats_service.get_db_session', return_value=mock_db):
+            mismatches = stats_service.check_stats()
+
+        assert len(mismatches) == 1
+        assert mismatches[0]["query_type"] == 'join'
+        assert mismatches[0]["stored"]["query_count"] == 2
+        assert mismatches[0]["expected"]["query_count"] == 3
@@ -0,0 +1,109 @@
+"""Tests for evaluation status lookups."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from app.services import status_service
+
+
+def _row(id, status='pending', scores=(None, None, None), heuristic=(None, None, None), source=None):
+    """Create a row with the STATUS_COLUMNS attributes."""
+    return SimpleNamespace(
+        id=id, evaluation_status=status,
+        faithfulness_score=scores[0], answer_relevance_score=scores[1], context_precision_score=scores[2],
+        heuristic_faithfulness_score=heuristic[0], heuristic_answer_relevance_score=heuristic[1],
+        heuristic_context_utilization_score=heuristic[2], score_source=source
+    )
+
+
+def _mock_db(rows):
+    """Create a mock session whose column query returns rows."""
+    mock_db = MagicMock()
+    mock_db.query.return_value.filter.return_value.all.return_value = rows
+    return mock_db
+
+
+class TestBuildStatusPayload:
+    """Tests for build_status_payload()"""
+
+    def test_pending_has_no_scores(self):
+        """Test that scores are withheld until evaluation completes"""
+        payload = status_service.build_status_payload(_row(1, scores=(0.5, 0.5, 0.5)))
+
+        assert payload["ragas_scores"] is None
+        assert payload["score_source"] is None
+
+    def test_completed_reports_missing_scores_as_none(self):
+        """Test that timed-out metrics are reported as None rather than a score of 0"""
+        payload = status_service.build_status_payload(
+            _row(1, 'completed', scores=(0.9, None, 0.7), heuristic=(1.0, 0.5, 0.8))
+        )
+
+        assert payload["ragas_scores"] == {"faithfulness": 0.9, "answer_relevance": None,
+                                           "context_utilization": 0.7}
+        assert payload["score_source"] == 'ragas'
+        assert payload["provisional_scores"]["answer_relevance"] == 0.5
+
+
+class TestGetStatuses:
+    """Tests for get_statuses()"""
+
+    def test_single_query_in_request_order(self):
+        """Test that IDs found among recent rows resolve in one query and keep request order"""
+        mock_db = _mock_db([_row(1), _row(3, 'failed')])
+
+        with patch('app.services.status_service.get_db_session', return_value=mock_db):
+            statuses = status_service.get_statuses([3, 1, 3])
+
+        assert [s["query_log_id"] for s in statuses] == [3, 1]
+        mock_db.query.assert_called_once()
+        mock_db.close.assert_called_once()
+
+    def test_older_ids_fall_back_to_all_partitions(self):
+        """Test that IDs missing from the recent window are looked up without the created_at bound"""
+        mock_db = MagicMock()
+        mock_db.query.return_value.filter.return_value.all.side_effect = [[_row(3, 'failed')], [_row(1)]]
+
+        with patch('app.services.status_service.get_db_session', return_value=mock_db):
+            statuses = status_service.get_statuses([3, 2, 1])
+
+        assert [s["query_log_id"] for s in statuses] == [3, 1]
+        recent, older = mock_db.query.return_value.filter.call_args_list
+        assert len(recent[0]) == 2 and "created_at" in str(recent[0][1])
+        assert len(older[0]) == 1
+        assert list(older[0][0].compile().params.values()) == [[2, 1]]
+
+    def test_binds_ids_as_one_array_parameter(self):
+        """Test that the filter is id = ANY(:ids) with deduplicated IDs"""
+        mock_db = _mock_db([])
+
+        with patch('app.services.status_service.get_db_session', return_value=mock_db):
+            status_service.get_statuses([5, 5, 6])
+
+        criterion = mock_db.query.return_value.filter.call_args_list[0][0][0]
+        compiled = criterion.compile()
+        assert "ANY" in str(compiled).upper()
+        assert list(compiled.params.values()) == [[5, 6]]
+
+    def test_empty_ids_skip_database(self):
+        """Test that no session is opened for an empty ID list"""
+        with patch('app.services.status_service.get_db_session') as mock_get_db_session:
+            assert status_service.get_statuses([]) == []
+
+        mock_get_db_session.assert_not_called()
+
+
+class TestGetStatus:
+    """Tests for get_status()"""
+
+    def test_recent_lookup_then_fallback(self):
+        """Test that a row outside the recent window is still found"""
+        mock_db = MagicMock()
+        mock_db.query.return_value.filter.return_value.first.side_effect = [None, _row(7, 'completed')]
+
+        with patch('app.services.status_service.get_db_session', return_value=mock_db):
+            status = status_service.get_status(7)
+
+        assert status["query_log_id"] == 7
+        first, second = mock_db.query.return_value.filter.call_args_list
+        assert len(first[0]) == 2 and len(second[0]) == 1
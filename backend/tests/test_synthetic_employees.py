@@ -0,0 +1,133 @@
+"""Tests for the synthetic employee generator and COPY loader."""
+
+from collections import Counter
+from datetime import date, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.db import synthetic_employees
+from app.db.synthetic_employees import COLUMNS, CopyStream, copy_lines, generate_employees, load_employees
+
+TODAY = date(2026, 6, 1)
+
+
+def _scenario_counts(rows):
+    """Counts for the validate_seed_data.py scenarios (6 months taken as 182 days)."""
+    column = {name: index for index, name in enumerate(COLUMNS)}
+    rows = [dict(zip(column, row)) for row in rows]
+    return {
+        "recent_hires": sum(row["hire_date"] >= TODAY - timedelta(days=182) for row in rows),
+        "engineering_high_earners": sum(row["department"] == "Engineering" and row["salary_usd"] > 120_000
+                                        for row in rows),
+        "parental_leave": sum(row["leave_type"] == "Parental Leave" for row in rows),
+        "john_doe_reports": sum(row["manager_name"] == "John Doe" for row in rows),
+    }
+
+
+class TestGenerateEmployees:
+    """Tests for generate_employees()"""
+
+    def test_same_seed_gives_same_rows(self):
+        """Test that generation is deterministic per seed"""
+        first = list(generate_employees(2000, seed=7, today=TODAY))
+
+        assert first == list(generate_employees(2000, seed=7, today=TODAY))
+        assert first != list(generate_employees(2000, seed=8, today=TODAY))
+        assert len(first) == 2000 and all(len(row) == len(COLUMNS) for row in first)
+
+    @pytest.mark.parametrize("count", [13, 5000])
+    def test_test_scenarios_are_covered(self, count):
+        """Test that every seed-data scenario meets its minimum at small and large sizes"""
+        counts = _scenario_counts(generate_employees(count, today=TODAY))
+
+        assert counts["recent_hires"] >= 5
+        assert counts["engineering_high_earners"] >= 3
+        assert counts["parental_leave"] >= 2
+        assert counts["john_doe_reports"] >= 4
+
+    def test_distributions_follow_configuration(self):
+        """Test department shares, leave consistency and salary bands on a large sample"""
+        rows = list(generate_employees(20_000, today=TODAY))
+        departments = Counter(row[2] for row in rows)
+
+        for name, (share, managers, roles) in synthetic_employees.DEPARTMENTS.items():
+            assert abs(departments[name] / len(rows) - share) < 0.02
+        for first, last, department, role, status, hired, leave, salary_local, salary_usd, manager in rows[13:]:
+            _, managers, roles = synthetic_employees.DEPARTMENTS[department]
+            low, high = next((low, high) for title, low, high in roles if title == role)
+            assert low <= salary_usd <= high and salary_local == salary_usd
+            assert manager in managers
+            assert (leave is not None) == (status == "On Leave")
+            assert hired <= TODAY
+
+
+class TestCopyEncoding:
+    """Tests for copy_lines() and CopyStream"""
+
+    def test_values_are_escaped_and_nulls_marked(self):
+        """Test COPY text format for NULL, dates, numbers and special characters"""
+        lines = list(copy_lines([("O'Brien", "a\tb\\c\nd", None, date(2024, 1, 2), 95000)]))
+
+        assert lines == ["O'Brien\ta\\tb\\\\c\\nd\t\\N\t2024-01-02\t95000\n"]
+
+    def test_stream_reads_in_chunks_of_requested_size(self):
+        """Test that reads return at most size bytes and together the whole payload"""
+        lines = [f"row {index}\n" for index in range(1000)]
+        stream = CopyStream(iter(lines), batch_lines=64)
+
+        chunks = []
+        while chunk := stream.read(100):
+            assert len(chunk) <= 100
+            chunks.append(chunk)
+
+        assert b"".join(chunks) == "".join(lines).encode()
+        assert stream.rows == 1000
+        assert stream.read(100) == b""
+
+    def test_stream_read_all(self):
+        """Test that read() with no size drains the iterator"""
+        stream = CopyStream(iter(["a\n", "b\n"]))
+
+        assert stream.read(1) == b"a"
+        assert stream.read() == b"\nb\n"
+
+
+class TestLoadEmployees:
+    """Tests for load_employees()"""
+
+    def _engine(self):
+        engine = MagicMock()
+        connection = engine.raw_connection.return_value
+        cursor = connection.cursor.return_value
+        cursor.copy_expert.side_effect = lambda sql, stream, size: cursor.copied.append(stream.read())
+        cursor.copied = []
+        return engine, connection, cursor
+
+    def test_streams_rows_through_copy(self):
+        """Test truncate, COPY of every generated row, ANALYZE and commit"""
+        engine, connection, cursor = self._engine()
+
+        result = load_employees(engine, 500, seed=3, today=TODAY, truncate=True)
+
+        statements = [call.args[0] for call in cursor.execute.call_args_list]
+        assert statements == ["TRUNCATE employees RESTART IDENTITY", "ANALYZE employees"]
+        assert cursor.copy_expert.call_args.args[0] == f"COPY employees ({', '.join(COLUMNS)}) FROM STDIN"
+        payload = cursor.copied[0].decode()
+        assert payload == "".join(copy_lines(generate_employees(500, seed=3, today=TODAY)))
+        assert result["rows"] == 500
+        connection.commit.assert_called_once()
+        connection.close.assert_called_once()
+
+    def test_rolls_back_on_failure(self):
+        """Test that a failed COPY is rolled back and the connection closed"""
+        engine, connection, cursor = self._engine()
+        cursor.copy_expert.side_effect = RuntimeError("copy failed")
+
+        with pytest.raises(RuntimeError):
+            load_employees(engine, 10, today=TODAY)
+
+        cursor.execute.assert_not_called()
+        connection.rollback.assert_called_once()
+        connection.commit.assert_not_called()
+        connection.close.assert_called_once()
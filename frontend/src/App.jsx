@@ -6,7 +6,7 @@ import ErrorDisplay from './components/ErrorDisplay';
 import LoadingSpinner from './components/LoadingSpinner';
 import RagasScoreDisplay from './components/RagasScoreDisplay';
 import RagasAnalysisDashboard from './components/RagasAnalysisDashboard';
-import { submitQuery, fetchQueryStatus } from './services/api';
+import { submitQuery, fetchQueryStatus, subscribeQueryStatus } from './services/api';
 
 export default function App() {
   const [currentPage, setCurrentPage] = useState('query'); // 'query' or 'analysis'
@@ -18,6 +18,7 @@ export default function App() {
   const [ragasScores, setRagasScores] = useState(null);
   const [queryLogId, setQueryLogId] = useState(null);
   const [evaluationStatus, setEvaluationStatus] = useState(null);
+  const [useStatusPolling, setUseStatusPolling] = useState(false);
 
   const handleQuerySubmit = async (query) => {
     setIsLoading(true);
@@ -26,6 +27,7 @@ export default function App() {
     setRagasScores(null);
     setQueryLogId(null);
     setEvaluationStatus(null);
+    setUseStatusPolling(false);
 
     try {
       const data = await submitQuery(query);
@@ -46,9 +48,31 @@ export default function App() {
     }
   };
 
-  // Poll for RAGAS scores after query submission
+  // Stream RAGAS status over SSE after query submission; fall back to polling
   useEffect(() => {
-    if (!queryLogId || evaluationStatus === 'completed') return;
+    if (!queryLogId || useStatusPolling) return;
+
+    const close = subscribeQueryStatus(
+      queryLogId,
+      (status) => {
+        setEvaluationStatus(status.evaluation_status);
+        if (status.evaluation_status === 'completed' && status.ragas_scores) {
+          setRagasScores(status.ragas_scores);
+        }
+      },
+      () => setUseStatusPolling(true)
+    );
+
+    if (!close) {
+      setUseStatusPolling(true);
+      return;
+    }
+    return close;
+  }, [queryLogId, useStatusPolling]);
+
+  // Poll for RAGAS scores when SSE is unavailable
+  useEffect(() => {
+    if (!queryLogId || !useStatusPolling || evaluationStatus === 'completed') return;
 
     const pollInterval = setInterval(async () => {
       try {
@@ -74,7 +98,7 @@ export default function App() {
       clearInterval(pollInterval);
       clearTimeout(timeout);
     };
-  }, [queryLogId, evaluationStatus]);
+  }, [queryLogId, evaluationStatus, useStatusPolling]);
 
   const handleTimeout = () => {
     setIsLoading(false);
@@ -134,4 +134,18 @@ describe('RagasScoreDisplay', () => {
     const cards = container.querySelectorAll('.bg-zinc-950.border-2.border-zinc-800');
     expect(cards).toHaveLength(3);
   });
+
+  test('shows a timed-out metric as missing, not as 0', () => {
+    const mockScores = {
+      faithfulness: 0.85,
+      answer_relevance: null,
+      context_utilization: 0.75
+    };
+
+    render(<RagasScoreDisplay scores={mockScores} evaluationStatus="completed" />);
+
+    expect(screen.getByText('--')).toBeInTheDocument();
+    expect(screen.getByLabelText('Answer Relevance score: not available')).toHaveClass('text-zinc-500');
+    expect(screen.queryByText('0.00')).not.toBeInTheDocument();
+  });
 });
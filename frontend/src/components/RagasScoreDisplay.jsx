@@ -4,9 +4,9 @@ import PropTypes from 'prop-types';
  * Displays Ragas evaluation scores with color-coded badges
  * @param {Object} props
  * @param {Object|null} props.scores - Ragas scores object
- * @param {number} props.scores.faithfulness - Score 0.0-1.0
- * @param {number} props.scores.answer_relevance - Score 0.0-1.0
- * @param {number} props.scores.context_utilization - Score 0.0-1.0
+ * @param {number|null} props.scores.faithfulness - Score 0.0-1.0, null if the metric timed out
+ * @param {number|null} props.scores.answer_relevance - Score 0.0-1.0, null if the metric timed out
+ * @param {number|null} props.scores.context_utilization - Score 0.0-1.0, null if the metric timed out
  * @param {string|null} props.evaluationStatus - 'pending', 'evaluating', 'completed', 'failed'
  * @returns {JSX.Element|null} Score badges or null if no evaluation started
  */
@@ -16,11 +16,18 @@ export default function RagasScoreDisplay({ scores, evaluationStatus }) {
   const isLoading = evaluationStatus === 'pending' || evaluationStatus === 'evaluating';
 
   const getColor = (score) => {
+    if (score === null || score === undefined) return 'text-zinc-500';
     if (score > 0.8) return 'text-green-400';
     if (score >= 0.7) return 'text-yellow-400';
     return 'text-red-400';
   };
 
+  // A metric that timed out has no score; show it as missing rather than 0
+  const formatScore = (score) => (score === null || score === undefined ? '--' : score.toFixed(2));
+  const describeScore = (score) => (
+    score === null || score === undefined ? 'not available' : `${score.toFixed(2)} out of 1.0`
+  );
+
   return (
     <div className="mt-4 bg-zinc-900 border-2 border-zinc-700 rounded-lg p-6">
       <h3 className="text-lg font-semibold text-white mb-4 border-b-2 border-zinc-700 pb-2">
@@ -43,27 +50,27 @@ export default function RagasScoreDisplay({ scores, evaluationStatus }) {
             <div className="text-zinc-400 text-sm mb-1">Faithfulness</div>
             <div
               className={`text-2xl font-bold ${getColor(scores.faithfulness)}`}
-              aria-label={`Faithfulness score: ${scores.faithfulness.toFixed(2)} out of 1.0`}
+              aria-label={`Faithfulness score: ${describeScore(scores.faithfulness)}`}
             >
-              {scores.faithfulness.toFixed(2)}
+              {formatScore(scores.faithfulness)}
             </div>
           </div>
           <div className="bg-zinc-950 border-2 border-zinc-800 p-6 rounded-lg flex-1 min-w-[200px]">
             <div className="text-zinc-400 text-sm mb-1">Answer Relevance</div>
             <div
               className={`text-2xl font-bold ${getColor(scores.answer_relevance)}`}
-              aria-label={`Answer Relevance score: ${scores.answer_relevance.toFixed(2)} out of 1.0`}
+              aria-label={`Answer Relevance score: ${describeScore(scores.answer_relevance)}`}
             >
-              {scores.answer_relevance.toFixed(2)}
+              {formatScore(scores.answer_relevance)}
             </div>
           </div>
           <div className="bg-zinc-950 border-2 border-zinc-800 p-6 rounded-lg flex-1 min-w-[200px]">
             <div className="text-zinc-400 text-sm mb-1">Context Utilization</div>
             <div
               className={`text-2xl font-bold ${getColor(scores.context_utilization)}`}
-              aria-label={`Context Utilization score: ${scores.context_utilization.toFixed(2)} out of 1.0`}
+              aria-label={`Context Utilization score: ${describeScore(scores.context_utilization)}`}
             >
-              {scores.context_utilization.toFixed(2)}
+              {formatScore(scores.context_utilization)}
             </div>
           </div>
         </div>
@@ -76,9 +83,9 @@ export default function RagasScoreDisplay({ scores, evaluationStatus }) {
 
 RagasScoreDisplay.propTypes = {
   scores: PropTypes.shape({
-    faithfulness: PropTypes.number.isRequired,
-    answer_relevance: PropTypes.number.isRequired,
-    context_utilization: PropTypes.number.isRequired
+    faithfulness: PropTypes.number,
+    answer_relevance: PropTypes.number,
+    context_utilization: PropTypes.number
   }),
   evaluationStatus: PropTypes.string
 };
@@ -68,6 +68,36 @@ export async function fetchQueryStatus(queryLogId) {
   }
 }
 
+/**
+ * Subscribe to evaluation status events for a query over Server-Sent Events.
+ * Returns a function that closes the stream, or null if EventSource is unavailable.
+ */
+export function subscribeQueryStatus(queryLogId, onStatus, onError) {
+  if (typeof EventSource === 'undefined') {
+    return null;
+  }
+
+  const source = new EventSource(`${API_BASE_URL}/api/query/${queryLogId}/events`);
+  const handleEvent = (event) => {
+    const status = JSON.parse(event.data);
+    // The server ends the stream after a terminal status; close before EventSource reconnects
+    if (status.evaluation_status === 'completed' || status.evaluation_status === 'failed') {
+      source.close();
+    }
+    onStatus(status);
+  };
+
+  ['pending', 'evaluating', 'completed', 'failed'].forEach((status) => {
+    source.addEventListener(status, handleEvent);
+  });
+  source.onerror = () => {
+    source.close();
+    onError();
+  };
+
+  return () => source.close();
+}
+
 export async function fetchAnalysisReport() {
   const controller = new AbortController();
   const timeout = setTimeout(() => controller.abort(), API_TIMEOUT);
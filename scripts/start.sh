@@ -12,6 +12,10 @@ cd /app
 alembic upgrade head
 echo "✅ Migrations completed"
 
+# Backfill derived columns and report aggregates for rows logged before they existed
+python -m app.db.backfill_query_types || echo "⚠️  Query type backfill failed"
+python -m app.db.rebuild_stats --if-empty || echo "⚠️  Report stats backfill failed"
+
 # Step 2: Create read-only user (idempotent)
 echo "👤 Step 2/4: Creating read-only database user..."
 # Set password from environment variable, default if not set